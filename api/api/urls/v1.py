@@ -6,7 +6,11 @@ from drf_yasg.views import get_schema_view
 from rest_framework import authentication, permissions, routers
 
 from environments.identities.traits.views import SDKTraits
-from environments.identities.views import SDKIdentities
+from environments.identities.views import SDKBulkIdentities, SDKIdentities
+from environments.sdk.async_views import (
+    sdk_environment_document_view,
+    sdk_flags_view,
+)
 from environments.sdk.views import SDKEnvironmentAPIView
 from features.views import SDKFeatureStates
 from integrations.github.views import github_webhook
@@ -50,14 +54,27 @@ urlpatterns = [
     re_path(r"github-webhook/", github_webhook, name="github-webhook"),
     re_path(r"cb-webhook/", chargebee_webhook, name="chargebee-webhook"),
     # Client SDK urls
-    re_path(r"^flags/$", SDKFeatureStates.as_view(), name="flags"),
+    re_path(
+        r"^flags/$",
+        sdk_flags_view if settings.USE_ASYNC_SDK_VIEWS else SDKFeatureStates.as_view(),
+        name="flags",
+    ),
     re_path(r"^identities/$", SDKIdentities.as_view(), name="sdk-identities"),
+    re_path(
+        r"^identities/bulk/$",
+        SDKBulkIdentities.as_view(),
+        name="sdk-identities-bulk",
+    ),
     re_path(r"^traits/", include(traits_router.urls), name="traits"),
     re_path(r"^analytics/flags/$", SDKAnalyticsFlags.as_view(), name="analytics-flags"),
     re_path(r"^analytics/telemetry/$", SelfHostedTelemetryAPIView.as_view()),
     re_path(
         r"^environment-document/$",
-        SDKEnvironmentAPIView.as_view(),
+        (
+            sdk_environment_document_view
+            if settings.USE_ASYNC_SDK_VIEWS
+            else SDKEnvironmentAPIView.as_view()
+        ),
         name="environment-document",
     ),
     re_path("", include("features.versioning.urls", namespace="versioning")),
@@ -1,9 +1,11 @@
-from contextlib import suppress
+import hashlib
+import hmac
 
+from django.conf import settings
 from rest_framework import authentication, exceptions
 from rest_framework_api_key.permissions import KeyParser
 
-from api_keys.models import MasterAPIKey
+from api_keys.models import MasterAPIKey, master_api_key_cache
 from api_keys.user import APIKeyUser
 
 key_parser = KeyParser()
@@ -15,9 +17,38 @@ class MasterAPIKeyAuthentication(authentication.BaseAuthentication):
         if not key:
             return None
 
-        with suppress(MasterAPIKey.DoesNotExist):
-            key = MasterAPIKey.objects.get_from_key(key)
-            if not key.has_expired:
-                return APIKeyUser(key), None
+        master_api_key = self._get_master_api_key(key)
+        if master_api_key and not master_api_key.has_expired:
+            return APIKeyUser(master_api_key), None
 
         raise exceptions.AuthenticationFailed("Valid Master API Key not found.")
+
+    @staticmethod
+    def _get_master_api_key(key: str) -> MasterAPIKey | None:
+        """
+        Get the master API key for a presented key.
+
+        Verifying a key against its hash is deliberately slow, so keys that
+        have been verified are cached, along with a (fast) digest of the key
+        that was presented, for MASTER_API_KEY_CACHE_SECONDS. The cached keys
+        are cleared whenever they are updated or deleted.
+        """
+        cache_timeout = settings.MASTER_API_KEY_CACHE_SECONDS
+        prefix, _, _ = key.partition(".")
+        digest = hashlib.sha256(key.encode()).hexdigest()
+
+        if cache_timeout and (cached := master_api_key_cache.get(prefix)):
+            cached_digest, master_api_key = cached
+            if hmac.compare_digest(cached_digest, digest):
+                return master_api_key
+
+        try:
+            master_api_key = MasterAPIKey.objects.get_from_key(key)
+        except MasterAPIKey.DoesNotExist:
+            return None
+
+        if cache_timeout:
+            master_api_key_cache.set(
+                prefix, (digest, master_api_key), timeout=cache_timeout
+            )
+        return master_api_key
@@ -1,11 +1,21 @@
 from django.conf import settings
+from django.core.cache import caches
 from django.db import models
-from django_lifecycle import BEFORE_UPDATE, LifecycleModelMixin, hook
+from django_lifecycle import (
+    AFTER_DELETE,
+    AFTER_UPDATE,
+    BEFORE_UPDATE,
+    LifecycleModelMixin,
+    hook,
+)
 from rest_framework_api_key.models import AbstractAPIKey, APIKeyManager
 from softdelete.models import SoftDeleteManager, SoftDeleteObject
 
 from organisations.models import Organisation
 
+# Keys that have been verified, keyed on their prefix, see `MasterAPIKeyAuthentication`.
+master_api_key_cache = caches[settings.MASTER_API_KEY_CACHE_NAME]
+
 
 class MasterAPIKeyManager(APIKeyManager, SoftDeleteManager):
     pass
@@ -29,3 +39,9 @@ class MasterAPIKey(AbstractAPIKey, LifecycleModelMixin, SoftDeleteObject):
             from rbac.models import MasterAPIKeyRole
 
             MasterAPIKeyRole.objects.filter(master_api_key=self.id).delete()
+
+    @hook(AFTER_UPDATE)
+    @hook(AFTER_DELETE)
+    def clear_verified_key_cache(self) -> None:
+        # Covers the key being revoked, expired, soft deleted or changed otherwise.
+        master_api_key_cache.delete(self.prefix)
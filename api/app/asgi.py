@@ -0,0 +1,24 @@
+"""
+ASGI config for app project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+
+To serve the SDK endpoints with their async views, set USE_ASYNC_SDK_VIEWS and
+run this with an ASGI server, e.g. with uvicorn installed:
+
+    gunicorn --worker-class uvicorn.workers.UvicornWorker app.asgi
+
+Only the middleware that is async capable keeps the requests on the event loop,
+see `environments.sdk.async_views`.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
+"""
+
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "app.settings.local")
+
+application = get_asgi_application()
@@ -268,7 +268,7 @@ REST_FRAMEWORK = {
 }
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "core.middleware.static_files.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -306,6 +306,16 @@ if ENABLE_GZIP_COMPRESSION:
     # ref: https://docs.djangoproject.com/en/2.2/ref/middleware/#middleware-ordering
     MIDDLEWARE.insert(1, "django.middleware.gzip.GZipMiddleware")
 
+# The proportion of requests, between 0 and 1, for which to time the stages of
+# handling the request, e.g. authentication and segment evaluation. The timings are
+# returned in a `Server-Timing` header, and aggregated in histograms. The histograms
+# are only served, at /metrics/server-timing, if SERVER_TIMING_METRICS_TOKEN is set,
+# to the clients that send it as a bearer token.
+SERVER_TIMING_SAMPLE_RATE = env.float("SERVER_TIMING_SAMPLE_RATE", default=0.0)
+SERVER_TIMING_METRICS_TOKEN = env.str("SERVER_TIMING_METRICS_TOKEN", default="")
+if SERVER_TIMING_SAMPLE_RATE > 0:
+    MIDDLEWARE.insert(0, "core.middleware.server_timing.ServerTimingMiddleware")
+
 # Google Analytics Configuration
 GOOGLE_ANALYTICS_KEY = env("GOOGLE_ANALYTICS_KEY", default="")
 GOOGLE_SERVICE_ACCOUNT = env("GOOGLE_SERVICE_ACCOUNT", default=None)
@@ -328,6 +338,19 @@ FEATURE_EVALUATION_CACHE_SECONDS = env.int(
     "FEATURE_EVALUATION_CACHE_SECONDS", default=60
 )
 
+# The requests tracked in Google Analytics and InfluxDB are counted in memory,
+# and sent in batches every GOOGLE_ANALYTICS_CACHE_SECONDS and
+# INFLUXDB_API_USAGE_CACHE_SECONDS respectively. At most
+# REQUEST_TRACKING_CACHE_MAX_KEYS distinct requests (e.g. paths) are counted by
+# each process between flushes, any further ones are dropped.
+GOOGLE_ANALYTICS_CACHE_SECONDS = env.int("GOOGLE_ANALYTICS_CACHE_SECONDS", default=10)
+INFLUXDB_API_USAGE_CACHE_SECONDS = env.int(
+    "INFLUXDB_API_USAGE_CACHE_SECONDS", default=10
+)
+REQUEST_TRACKING_CACHE_MAX_KEYS = env.int(
+    "REQUEST_TRACKING_CACHE_MAX_KEYS", default=10000
+)
+
 ENABLE_API_USAGE_TRACKING = env.bool("ENABLE_API_USAGE_TRACKING", default=True)
 
 if ENABLE_API_USAGE_TRACKING:
@@ -621,6 +644,15 @@ if ENABLE_DB_LOGGING:  # pragma: no cover
 
 CACHE_FLAGS_SECONDS = env.int("CACHE_FLAGS_SECONDS", default=0)
 FLAGS_CACHE_LOCATION = "environment-flags"
+# Cached flags are cleared whenever the environment changes. Use a shared backend
+# (e.g. redis) so that they are cleared for every worker, and set a longer
+# CACHE_FLAGS_SECONDS.
+FLAGS_CACHE_BACKEND = env.str(
+    "CACHE_FLAGS_BACKEND", default="django.core.cache.backends.locmem.LocMemCache"
+)
+FLAGS_CACHE_BACKEND_LOCATION = env.str(
+    "CACHE_FLAGS_LOCATION", default=FLAGS_CACHE_LOCATION
+)
 CHARGEBEE_CACHE_LOCATION = "chargebee-objects"
 
 ENVIRONMENT_CACHE_SECONDS = env.int("ENVIRONMENT_CACHE_SECONDS", default=60)
@@ -632,6 +664,16 @@ ENVIRONMENT_CACHE_NAME = "environment-objects"
 ENVIRONMENT_CACHE_LOCATION = env.str(
     "ENVIRONMENT_CACHE_LOCATION", default=ENVIRONMENT_CACHE_NAME
 )
+# When set, environments are also kept in process memory for this many seconds,
+# in front of the cache configured above. See core/two_tier_cache.py.
+ENVIRONMENT_CACHE_LOCAL_SECONDS = env.int("ENVIRONMENT_CACHE_LOCAL_SECONDS", default=0)
+ENVIRONMENT_CACHE_LOCAL_MAX_ENTRIES = env.int(
+    "ENVIRONMENT_CACHE_LOCAL_MAX_ENTRIES", default=1000
+)
+ENVIRONMENT_CACHE_STATS_LOG_INTERVAL_SECONDS = env.int(
+    "ENVIRONMENT_CACHE_STATS_LOG_INTERVAL_SECONDS", default=0
+)
+ENVIRONMENT_SHARED_CACHE_NAME = "environment-objects-shared"
 
 GET_FLAGS_ENDPOINT_CACHE_SECONDS = env.int(
     "GET_FLAGS_ENDPOINT_CACHE_SECONDS", default=0
@@ -659,6 +701,15 @@ GET_IDENTITIES_ENDPOINT_CACHE_LOCATION = env.str(
     default=GET_IDENTITIES_ENDPOINT_CACHE_NAME,
 )
 
+# Serve the most polled SDK endpoints (flags and the environment document) with
+# async views, which answer cached requests on the event loop. Only useful when
+# the API is served over ASGI, see app/asgi.py.
+USE_ASYNC_SDK_VIEWS = env.bool("USE_ASYNC_SDK_VIEWS", False)
+
+# Maximum number of identities that can be identified in a single request
+# to the bulk identify endpoint (POST /api/v1/identities/bulk/).
+SDK_BULK_IDENTIFY_MAX_IDENTITIES = env.int("SDK_BULK_IDENTIFY_MAX_IDENTITIES", 100)
+
 BAD_ENVIRONMENTS_CACHE_LOCATION = "bad-environments"
 CACHE_BAD_ENVIRONMENTS_SECONDS = env.int("CACHE_BAD_ENVIRONMENTS_SECONDS", 0)
 CACHE_BAD_ENVIRONMENTS_AFTER_FAILURES = env.int(
@@ -668,6 +719,9 @@ CACHE_BAD_ENVIRONMENTS_AFTER_FAILURES = env.int(
 CACHE_PROJECT_SEGMENTS_SECONDS = env.int("CACHE_PROJECT_SEGMENTS_SECONDS", 0)
 PROJECT_SEGMENTS_CACHE_LOCATION = "project-segments"
 
+# Maximum number of compiled segments to keep in memory, per process.
+COMPILED_SEGMENTS_CACHE_SIZE = env.int("COMPILED_SEGMENTS_CACHE_SIZE", 10000)
+
 ENVIRONMENT_SEGMENTS_CACHE_NAME = "environment-segments"
 ENVIRONMENT_SEGMENTS_CACHE_SECONDS = env.int("CACHE_ENVIRONMENT_SEGMENTS_SECONDS", 0)
 ENVIRONMENT_SEGMENTS_CACHE_LOCATION = env(
@@ -678,8 +732,76 @@ ENVIRONMENT_SEGMENTS_CACHE_BACKEND = env(
     "django.core.cache.backends.locmem.LocMemCache",
 )
 
+# When set, the environment default and segment override feature states used to
+# evaluate identity flags are cached, so that only the identity's own overrides
+# (and traits) are read from the database on each request.
+ENVIRONMENT_FEATURE_STATES_CACHE_NAME = "environment-feature-states"
+ENVIRONMENT_FEATURE_STATES_CACHE_SECONDS = env.int(
+    "CACHE_ENVIRONMENT_FEATURE_STATES_SECONDS", 0
+)
+ENVIRONMENT_FEATURE_STATES_CACHE_LOCATION = env(
+    "ENVIRONMENT_FEATURE_STATES_CACHE_LOCATION", "environment-feature-states"
+)
+ENVIRONMENT_FEATURE_STATES_CACHE_BACKEND = env(
+    "CACHE_ENVIRONMENT_FEATURE_STATES_BACKEND",
+    "django.core.cache.backends.locmem.LocMemCache",
+)
+
 CACHE_ENVIRONMENT_DOCUMENT_SECONDS = env.int("CACHE_ENVIRONMENT_DOCUMENT_SECONDS", 0)
 ENVIRONMENT_DOCUMENT_CACHE_LOCATION = "environment-documents"
+# Store a gzip-compressed copy of the rendered environment document alongside
+# the plain one so that it can be served to clients sending `Accept-Encoding: gzip`
+# without compressing it on every request.
+COMPRESS_ENVIRONMENT_DOCUMENT = env.bool("COMPRESS_ENVIRONMENT_DOCUMENT", False)
+# When enabled, the cached environment document is rebuilt by the task processor
+# whenever the environment changes and never expires, so SDK requests don't have
+# to wait for the document to be built.
+CACHE_ENVIRONMENT_DOCUMENT_WRITE_THROUGH = env.bool(
+    "CACHE_ENVIRONMENT_DOCUMENT_WRITE_THROUGH", False
+)
+# When enabled, common changes, e.g. to a feature state's value or a segment's rules,
+# are applied by patching the stored environment documents (the write-through cached
+# one, see above, and the ones in DynamoDB) rather than rebuilding them. The documents
+# of the environments updated recently are then rebuilt every
+# ENVIRONMENT_DOCUMENT_REBUILD_INTERVAL_MINUTES, to verify them.
+ENVIRONMENT_DOCUMENT_INCREMENTAL_UPDATES = env.bool(
+    "ENVIRONMENT_DOCUMENT_INCREMENTAL_UPDATES", False
+)
+ENVIRONMENT_DOCUMENT_REBUILD_INTERVAL_MINUTES = env.int(
+    "ENVIRONMENT_DOCUMENT_REBUILD_INTERVAL_MINUTES", 15
+)
+# When set, the environment updates triggered within a window of this many seconds,
+# e.g. by a bulk edit of flags, are merged into a single rebuild of the environment
+# documents at the end of the window. Requires the environment document cache to be
+# shared by the API and the task processor.
+ENVIRONMENT_UPDATE_COALESCE_SECONDS = env.int("ENVIRONMENT_UPDATE_COALESCE_SECONDS", 0)
+# Maximum number of seconds a request waits for another worker to build the
+# environment document on a cache miss, before building it itself.
+ENVIRONMENT_DOCUMENT_CACHE_LOCK_TIMEOUT_SECONDS = env.int(
+    "ENVIRONMENT_DOCUMENT_CACHE_LOCK_TIMEOUT_SECONDS", 10
+)
+
+# When set, master API keys that have been verified are cached, keyed on a
+# digest of the presented key, so that the (deliberately slow) key hashing isn't
+# repeated on every admin API request. Use a shared backend (e.g. redis) so that
+# revoking a key takes effect in every process straight away.
+MASTER_API_KEY_CACHE_NAME = "master-api-keys"
+MASTER_API_KEY_CACHE_SECONDS = env.int("CACHE_MASTER_API_KEY_SECONDS", 0)
+MASTER_API_KEY_CACHE_LOCATION = env("MASTER_API_KEY_CACHE_LOCATION", "master-api-keys")
+MASTER_API_KEY_CACHE_BACKEND = env(
+    "CACHE_MASTER_API_KEY_BACKEND",
+    "django.core.cache.backends.locmem.LocMemCache",
+)
+
+# The integrations configured for a project and environment, e.g. Datadog, are
+# cached for this long when sending them audit log events.
+CACHE_AUDIT_LOG_INTEGRATIONS_SECONDS = env.int(
+    "CACHE_AUDIT_LOG_INTEGRATIONS_SECONDS", 0
+)
+AUDIT_LOG_INTEGRATIONS_CACHE_LOCATION = "audit-log-integrations"
+# When set, the audit log events for each integration are buffered and sent in
+# batches every this many seconds, rather than as they're logged.
+AUDIT_LOG_INTEGRATION_BATCH_SECONDS = env.int("AUDIT_LOG_INTEGRATION_BATCH_SECONDS", 0)
 
 USER_THROTTLE_CACHE_NAME = "user-throttle"
 USER_THROTTLE_CACHE_BACKEND = env.str(
@@ -717,8 +839,8 @@ CACHES = {
         "TIMEOUT": ENVIRONMENT_CACHE_SECONDS,
     },
     FLAGS_CACHE_LOCATION: {
-        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
-        "LOCATION": FLAGS_CACHE_LOCATION,
+        "BACKEND": FLAGS_CACHE_BACKEND,
+        "LOCATION": FLAGS_CACHE_BACKEND_LOCATION,
     },
     PROJECT_SEGMENTS_CACHE_LOCATION: {
         "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
@@ -752,6 +874,20 @@ CACHES = {
         "LOCATION": ENVIRONMENT_SEGMENTS_CACHE_LOCATION,
         "TIMEOUT": ENVIRONMENT_SEGMENTS_CACHE_SECONDS,
     },
+    ENVIRONMENT_FEATURE_STATES_CACHE_NAME: {
+        "BACKEND": ENVIRONMENT_FEATURE_STATES_CACHE_BACKEND,
+        "LOCATION": ENVIRONMENT_FEATURE_STATES_CACHE_LOCATION,
+        "TIMEOUT": ENVIRONMENT_FEATURE_STATES_CACHE_SECONDS,
+    },
+    MASTER_API_KEY_CACHE_NAME: {
+        "BACKEND": MASTER_API_KEY_CACHE_BACKEND,
+        "LOCATION": MASTER_API_KEY_CACHE_LOCATION,
+        "TIMEOUT": MASTER_API_KEY_CACHE_SECONDS,
+    },
+    AUDIT_LOG_INTEGRATIONS_CACHE_LOCATION: {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": AUDIT_LOG_INTEGRATIONS_CACHE_LOCATION,
+    },
     USER_THROTTLE_CACHE_NAME: {
         "BACKEND": USER_THROTTLE_CACHE_BACKEND,
         "LOCATION": USER_THROTTLE_CACHE_LOCATION,
@@ -759,6 +895,20 @@ CACHES = {
     },
 }
 
+if ENVIRONMENT_CACHE_LOCAL_SECONDS > 0:
+    CACHES[ENVIRONMENT_SHARED_CACHE_NAME] = CACHES[ENVIRONMENT_CACHE_NAME]
+    CACHES[ENVIRONMENT_CACHE_NAME] = {
+        "BACKEND": "core.two_tier_cache.TwoTierCache",
+        "LOCATION": ENVIRONMENT_SHARED_CACHE_NAME,
+        "TIMEOUT": ENVIRONMENT_CACHE_SECONDS,
+        "OPTIONS": {
+            "LOCAL_TIMEOUT": ENVIRONMENT_CACHE_LOCAL_SECONDS,
+            "LOCAL_MAX_ENTRIES": ENVIRONMENT_CACHE_LOCAL_MAX_ENTRIES,
+            "INVALIDATION_CHANNEL": f"{ENVIRONMENT_CACHE_NAME}-invalidations",
+            "STATS_LOG_INTERVAL": ENVIRONMENT_CACHE_STATS_LOG_INTERVAL_SECONDS,
+        },
+    }
+
 TRENCH_AUTH = {
     "BACKUP_CODES_QUANTITY": 5,
     "BACKUP_CODES_LENGTH": 10,  # keep (quantity * length) under 200
@@ -888,6 +1038,22 @@ ENVIRONMENTS_API_KEY_TABLE_NAME_DYNAMO = env.str(
 # DynamoDB table name for storing project metadata(currently only used for identity migration)
 PROJECT_METADATA_TABLE_NAME_DYNAMO = env.str("PROJECT_METADATA_TABLE_NAME_DYNAMO", None)
 
+# Validated environment documents are kept in process memory for edge identity
+# segment evaluation. Entries are only used while they match the environment's
+# current version, so the timeout only bounds how long unused entries are kept.
+EDGE_ENVIRONMENT_MODEL_CACHE_SECONDS = env.int(
+    "EDGE_ENVIRONMENT_MODEL_CACHE_SECONDS", default=300
+)
+EDGE_ENVIRONMENT_MODEL_CACHE_MAX_ENTRIES = env.int(
+    "EDGE_ENVIRONMENT_MODEL_CACHE_MAX_ENTRIES", default=100
+)
+
+# Number of threads used to map a project's environments to their DynamoDB
+# documents when writing them to the environments tables.
+DYNAMODB_ENVIRONMENT_MAPPING_MAX_WORKERS = env.int(
+    "DYNAMODB_ENVIRONMENT_MAPPING_MAX_WORKERS", default=4
+)
+
 # Front end environment variables
 API_URL = env("API_URL", default="/api/v1/")
 ASSET_URL = env("ASSET_URL", default="/")
@@ -959,6 +1125,29 @@ EDGE_API_URL = env.str("EDGE_API_URL", None)
 # Used for signing forwarded request to edge
 EDGE_REQUEST_SIGNING_KEY = env.str("EDGE_REQUEST_SIGNING_KEY", None)
 
+# Requests forwarded to the edge API are enqueued straight away by default. Set this
+# to buffer them in memory for this many seconds instead, and enqueue them in batches
+# of up to EDGE_REQUEST_FORWARDING_MAX_BATCH_SIZE requests. Note that buffered
+# requests are lost if the process is killed before it can flush them.
+EDGE_REQUEST_FORWARDING_BUFFER_SECONDS = env.int(
+    "EDGE_REQUEST_FORWARDING_BUFFER_SECONDS", default=0
+)
+EDGE_REQUEST_FORWARDING_MAX_BATCH_SIZE = env.int(
+    "EDGE_REQUEST_FORWARDING_MAX_BATCH_SIZE", default=100
+)
+# Maximum number of requests sent to the edge API at a time, per batch.
+EDGE_REQUEST_FORWARDING_MAX_WORKERS = env.int(
+    "EDGE_REQUEST_FORWARDING_MAX_WORKERS", default=10
+)
+
+# Identities are migrated to DynamoDB in chunks of this size, written by this
+# many threads at a time. Progress is recorded after each chunk, so that an
+# interrupted migration can be resumed.
+IDENTITY_MIGRATION_CHUNK_SIZE = env.int("IDENTITY_MIGRATION_CHUNK_SIZE", default=2000)
+IDENTITY_MIGRATION_WRITE_WORKERS = env.int(
+    "IDENTITY_MIGRATION_WRITE_WORKERS", default=4
+)
+
 # Aws Event bus used for sending identity migration events
 IDENTITY_MIGRATION_EVENT_BUS_NAME = env.str("IDENTITY_MIGRATION_EVENT_BUS_NAME", None)
 
@@ -1236,6 +1425,15 @@ SEGMENT_RULES_CONDITIONS_LIMIT = env.int("SEGMENT_RULES_CONDITIONS_LIMIT", 100)
 WEBHOOK_BACKOFF_BASE = env.int("WEBHOOK_BACKOFF_BASE", default=2)
 WEBHOOK_BACKOFF_RETRIES = env.int("WEBHOOK_BACKOFF_RETRIES", default=3)
 
+# The deliveries of an event to many webhooks are made concurrently, by up to this
+# many threads, with at most WEBHOOK_MAX_CONCURRENCY_PER_HOST requests to the same
+# host at once. Connections are pooled for up to WEBHOOK_CONNECTION_POOL_HOSTS hosts.
+WEBHOOK_DELIVERY_MAX_WORKERS = env.int("WEBHOOK_DELIVERY_MAX_WORKERS", default=10)
+WEBHOOK_MAX_CONCURRENCY_PER_HOST = env.int(
+    "WEBHOOK_MAX_CONCURRENCY_PER_HOST", default=4
+)
+WEBHOOK_CONNECTION_POOL_HOSTS = env.int("WEBHOOK_CONNECTION_POOL_HOSTS", default=50)
+
 # Split Testing settings
 SPLIT_TESTING_INSTALLED = importlib.util.find_spec("split_testing")
 if SPLIT_TESTING_INSTALLED:
@@ -49,6 +49,15 @@ if settings.DEBUG:
         re_path(r"^__debug__/", include(debug_toolbar.urls)),
     ] + urlpatterns
 
+if settings.SERVER_TIMING_SAMPLE_RATE > 0 and settings.SERVER_TIMING_METRICS_TOKEN:
+    urlpatterns.append(
+        path(
+            "metrics/server-timing",
+            views.server_timing_metrics,
+            name="server-timing-metrics",
+        )
+    )
+
 if settings.SAML_INSTALLED:
     urlpatterns.append(path("api/v1/auth/saml/", include("saml.urls")))
 
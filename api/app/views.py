@@ -1,6 +1,8 @@
+import hmac
 import json
 import logging
 
+from core.server_timing import render_metrics
 from django.conf import settings
 from django.http import HttpResponse, JsonResponse
 from django.template import loader
@@ -16,6 +18,18 @@ def version_info(request: Request) -> JsonResponse:
     return JsonResponse(utils.get_version_info())
 
 
+def server_timing_metrics(request: Request) -> HttpResponse:
+    token = request.headers.get("Authorization", "").removeprefix("Bearer ")
+    if not (
+        settings.SERVER_TIMING_METRICS_TOKEN
+        and hmac.compare_digest(
+            token.encode(), settings.SERVER_TIMING_METRICS_TOKEN.encode()
+        )
+    ):
+        return HttpResponse(status=401)
+    return HttpResponse(render_metrics(), content_type="text/plain; version=0.0.4")
+
+
 @csrf_exempt
 def index(request):
     if request.method != "GET":
@@ -1,54 +1,159 @@
+import itertools
+import logging
+import threading
+import typing
+from abc import ABC, abstractmethod
 from collections import defaultdict
-from threading import Lock
 
-from app_analytics.tasks import track_feature_evaluation, track_request
-from app_analytics.track import track_feature_evaluation_influxdb
+from app_analytics.tasks import track_feature_evaluation, track_requests
+from app_analytics.track import (
+    track_feature_evaluation_influxdb,
+    track_request_counts_googleanalytics,
+    track_request_counts_influxdb,
+)
+from core.background_flusher import BackgroundFlusher
 from django.conf import settings
-from django.utils import timezone
-
-
-class APIUsageCache:
-    def __init__(self):
-        self._cache = {}
-        self._last_flushed_at = timezone.now()
-        self._lock = Lock()
-
-    def _flush(self):
-        for key, value in self._cache.items():
-            track_request.delay(
-                kwargs={
-                    "resource": key[0],
-                    "host": key[1],
-                    "environment_key": key[2],
-                    "count": value,
-                }
+
+logger = logging.getLogger(__name__)
+
+SHARD_COUNT = 16
+
+CountsKey: typing.TypeAlias = typing.Hashable
+
+
+class _CountsShard:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.counts: defaultdict[CountsKey, int] = defaultdict(int)
+        self.dropped = 0
+
+
+class _ShardedCountsCache(ABC):
+    """
+    Accumulates counts in memory and flushes them from a background thread.
+
+    Each thread is assigned its own shard, so tracking only ever waits on the
+    flusher thread, which holds a shard's lock for as long as it takes to swap
+    its counts out. Any counts that are left when the process exits are
+    flushed on shutdown. If flushing the counts fails, they're merged back
+    into the shards, to be flushed with the next counts.
+
+    If the keys aren't bounded, e.g. since they include the request path, set
+    `max_keys` to bound the memory used between flushes. Counts for any further
+    keys are then dropped, and the number dropped is logged on flush.
+    """
+
+    max_keys: int | None = None
+
+    def __init__(self) -> None:
+        self._shards = [_CountsShard() for _ in range(SHARD_COUNT)]
+        self._shard_indexes = itertools.count()
+        self._thread_local = threading.local()
+
+        self._flusher = BackgroundFlusher(
+            name=type(self).__name__,
+            flush=self.flush,
+            get_interval=lambda: self.flush_interval,
+            on_fork=self._reset,
+        )
+
+    @property
+    @abstractmethod
+    def flush_interval(self) -> int:
+        raise NotImplementedError()
+
+    def flush(self) -> None:
+        counts: defaultdict[CountsKey, int] = defaultdict(int)
+        dropped = 0
+        for shard in self._shards:
+            with shard.lock:
+                shard_counts, shard.counts = shard.counts, defaultdict(int)
+                dropped, shard.dropped = dropped + shard.dropped, 0
+            for key, count in shard_counts.items():
+                counts[key] += count
+
+        if dropped:
+            logger.warning(
+                "%s dropped %d counts since the last flush, as it was full.",
+                type(self).__name__,
+                dropped,
             )
+        if counts:
+            try:
+                self._flush(counts)
+            except Exception:
+                self._merge(counts)
+                raise
 
-        self._cache = {}
-        self._last_flushed_at = timezone.now()
+    @abstractmethod
+    def _flush(self, counts: dict[CountsKey, int]) -> None:
+        raise NotImplementedError()
 
-    def track_request(self, resource: int, host: str, environment_key: str):
-        key = (resource, host, environment_key)
-        with self._lock:
-            if key not in self._cache:
-                self._cache[key] = 1
-            else:
-                self._cache[key] += 1
+    def _increment(self, key: CountsKey, count: int) -> None:
+        self._flusher.ensure_started()
+        self._add_to_shard(self._get_shard(), key, count)
+
+    def _merge(self, counts: dict[CountsKey, int]) -> None:
+        for key, count in counts.items():
+            self._add_to_shard(self._shards[hash(key) % SHARD_COUNT], key, count)
+
+    def _add_to_shard(self, shard: _CountsShard, key: CountsKey, count: int) -> None:
+        with shard.lock:
             if (
-                timezone.now() - self._last_flushed_at
-            ).seconds > settings.PG_API_USAGE_CACHE_SECONDS:
-                self._flush()
+                self.max_keys is not None
+                and key not in shard.counts
+                and len(shard.counts) >= self.max_keys // SHARD_COUNT
+            ):
+                shard.dropped += count
+                return
+            shard.counts[key] += count
+
+    def _reset(self) -> None:
+        # the counts inherited from the parent process are its to flush
+        self._shards = [_CountsShard() for _ in range(SHARD_COUNT)]
 
+    def _get_shard(self) -> _CountsShard:
+        try:
+            shard_index = self._thread_local.shard_index
+        except AttributeError:
+            shard_index = self._thread_local.shard_index = (
+                next(self._shard_indexes) % SHARD_COUNT
+            )
+        return self._shards[shard_index]
+
+
+class APIUsageCache(_ShardedCountsCache):
+    @property
+    def flush_interval(self) -> int:
+        return settings.PG_API_USAGE_CACHE_SECONDS
+
+    def _flush(self, counts: dict[tuple[int, str, str], int]) -> None:
+        track_requests.delay(
+            kwargs={
+                "requests": [
+                    {
+                        "resource": resource,
+                        "host": host,
+                        "environment_key": environment_key,
+                        "count": count,
+                    }
+                    for (resource, host, environment_key), count in counts.items()
+                ]
+            }
+        )
 
-class FeatureEvaluationCache:
-    def __init__(self):
-        self._cache = {}
-        self._last_flushed_at = timezone.now()
-        self._lock = Lock()
+    def track_request(self, resource: int, host: str, environment_key: str):
+        self._increment((resource, host, environment_key), 1)
+
+
+class FeatureEvaluationCache(_ShardedCountsCache):
+    @property
+    def flush_interval(self) -> int:
+        return settings.FEATURE_EVALUATION_CACHE_SECONDS
 
-    def _flush(self):
+    def _flush(self, counts: dict[tuple[int, str], int]) -> None:
         evaluation_data = defaultdict(dict)
-        for (environment_id, feature_name), eval_count in self._cache.items():
+        for (environment_id, feature_name), eval_count in counts.items():
             evaluation_data[environment_id][feature_name] = eval_count
 
         for environment_id, feature_evaluations in evaluation_data.items():
@@ -68,20 +173,41 @@ class FeatureEvaluationCache:
                     }
                 )
 
-        self._cache = {}
-        self._last_flushed_at = timezone.now()
-
     def track_feature_evaluation(
         self, environment_id: int, feature_name: str, evaluation_count: int
     ):
-        key = (environment_id, feature_name)
-        with self._lock:
-            if key not in self._cache:
-                self._cache[key] = evaluation_count
-            else:
-                self._cache[key] += evaluation_count
+        self._increment((environment_id, feature_name), evaluation_count)
 
-            if (
-                timezone.now() - self._last_flushed_at
-            ).seconds > settings.FEATURE_EVALUATION_CACHE_SECONDS:
-                self._flush()
+
+class GoogleAnalyticsCache(_ShardedCountsCache):
+    @property
+    def flush_interval(self) -> int:
+        return settings.GOOGLE_ANALYTICS_CACHE_SECONDS
+
+    @property
+    def max_keys(self) -> int:
+        return settings.REQUEST_TRACKING_CACHE_MAX_KEYS
+
+    def _flush(self, counts: dict[tuple[str, str | None], int]) -> None:
+        track_request_counts_googleanalytics(counts)
+
+    def track_request(self, path: str, environment_key: str | None) -> None:
+        self._increment((path, environment_key), 1)
+
+
+class InfluxDBRequestCache(_ShardedCountsCache):
+    @property
+    def flush_interval(self) -> int:
+        return settings.INFLUXDB_API_USAGE_CACHE_SECONDS
+
+    @property
+    def max_keys(self) -> int:
+        return settings.REQUEST_TRACKING_CACHE_MAX_KEYS
+
+    def _flush(self, counts: dict[tuple[str, str, str | None], int]) -> None:
+        track_request_counts_influxdb(counts)
+
+    def track_request(
+        self, resource: str, host: str, environment_key: str | None
+    ) -> None:
+        self._increment((resource, host, environment_key), 1)
@@ -442,6 +442,51 @@ def get_current_api_usage(
     return 0
 
 
+def get_current_api_usage_by_organisation(
+    date_start: datetime | None = None,
+) -> dict[int, int]:
+    """
+    Query influx db for the api usage of every organisation, in a single query
+
+    :param date_start: start of the window for current api usage
+
+    :return: number of current api calls, keyed on organisation id. Organisations
+        without any api calls are omitted.
+    """
+    now = timezone.now()
+    if date_start is None:
+        date_start = now - timedelta(days=30)
+
+    results = InfluxDBWrapper.influx_query_manager(
+        date_start=date_start,
+        bucket=read_bucket,
+        filters=build_filter_string(
+            [
+                'r._measurement == "api_call"',
+                'r["_field"] == "request_count"',
+            ]
+        ),
+        drop_columns=("_start", "_stop", "_time"),
+        extra='|> group(columns: ["organisation_id"]) \
+               |> sum() ',
+    )
+
+    dataset: dict[int, int] = defaultdict(int)
+    for result in results:
+        for record in result.records:
+            try:
+                organisation_id = int(record.values["organisation_id"])
+            except (KeyError, TypeError, ValueError):
+                logger.warning(
+                    "Bad InfluxDB data found with organisation_id %s",
+                    record.values.get("organisation_id"),
+                )
+                continue
+            dataset[organisation_id] += record.get_value()
+
+    return dict(dataset)
+
+
 def build_filter_string(filter_expressions: typing.List[str]) -> str:
     return "|> ".join(
         ["", *[f"filter(fn: (r) => {exp})" for exp in filter_expressions]]
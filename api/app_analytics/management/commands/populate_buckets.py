@@ -1,13 +1,19 @@
 import argparse
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from typing import Any
 
 from app_analytics.constants import ANALYTICS_READ_BUCKET_SIZE
 from app_analytics.tasks import (
+    get_time_buckets,
     populate_api_usage_bucket,
+    populate_api_usage_time_bucket,
     populate_feature_evaluation_bucket,
+    populate_feature_evaluation_time_bucket,
 )
 from django.conf import settings
 from django.core.management import BaseCommand
+from django.db import connections
 
 MINUTES_IN_DAY: int = 1440
 
@@ -21,10 +27,23 @@ class Command(BaseCommand):
             help="Last n days to populate",
             default=30,
         )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            dest="workers",
+            help="Number of threads to populate the buckets with, in parallel chunks",
+            default=1,
+        )
 
-    def handle(self, *args: Any, days_to_populate: int, **options: Any) -> None:
+    def handle(
+        self, *args: Any, days_to_populate: int, workers: int = 1, **options: Any
+    ) -> None:
         if settings.USE_POSTGRES_FOR_ANALYTICS:
             minutes_to_populate = MINUTES_IN_DAY * days_to_populate
+            if workers > 1:
+                self._populate_in_parallel(minutes_to_populate, workers)
+                return
+
             populate_api_usage_bucket(
                 ANALYTICS_READ_BUCKET_SIZE,
                 minutes_to_populate,
@@ -33,3 +52,25 @@ class Command(BaseCommand):
                 ANALYTICS_READ_BUCKET_SIZE,
                 minutes_to_populate,
             )
+
+    def _populate_in_parallel(self, minutes_to_populate: int, workers: int) -> None:
+        time_buckets = get_time_buckets(ANALYTICS_READ_BUCKET_SIZE, minutes_to_populate)
+        chunks = [time_buckets[i::workers] for i in range(workers)]
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # consume the results to surface any errors
+            list(executor.map(self._populate_chunk, chunks))
+
+    @staticmethod
+    def _populate_chunk(time_buckets: list[tuple[datetime, datetime]]) -> None:
+        try:
+            for bucket_start_time, bucket_end_time in time_buckets:
+                populate_api_usage_time_bucket(
+                    ANALYTICS_READ_BUCKET_SIZE, bucket_start_time, bucket_end_time
+                )
+                populate_feature_evaluation_time_bucket(
+                    ANALYTICS_READ_BUCKET_SIZE, bucket_start_time, bucket_end_time
+                )
+        finally:
+            # each thread opens its own database connections
+            connections.close_all()
@@ -1,49 +1,72 @@
-from app_analytics.cache import APIUsageCache
-from app_analytics.tasks import track_request
+from app_analytics.cache import (
+    APIUsageCache,
+    GoogleAnalyticsCache,
+    InfluxDBRequestCache,
+)
+from app_analytics.tasks import track_requests
+from asgiref.sync import sync_to_async
+from core.middleware.base import SyncAndAsyncMiddleware
 from django.conf import settings
 
 from .models import Resource
-from .track import (
-    TRACKED_RESOURCE_ACTIONS,
-    get_resource_from_uri,
-    track_request_googleanalytics_async,
-    track_request_influxdb_async,
-)
+from .track import TRACKED_RESOURCE_ACTIONS, get_resource_from_uri
 
 api_usage_cache = APIUsageCache()
+google_analytics_cache = GoogleAnalyticsCache()
+influxdb_request_cache = InfluxDBRequestCache()
 
 
-class GoogleAnalyticsMiddleware:
-    def __init__(self, get_response):
-        self.get_response = get_response
-
-    def __call__(self, request):
-        # for each API request, trigger a call to Google Analytics to track the request
-        track_request_googleanalytics_async(request)
-
-        response = self.get_response(request)
-
-        return response
-
+class GoogleAnalyticsMiddleware(SyncAndAsyncMiddleware):
+    def handle(self, request):
+        self._track_request(request)
+        return self.get_response(request)
 
-class InfluxDBMiddleware:
-    def __init__(self, get_response):
-        self.get_response = get_response
+    async def ahandle(self, request):
+        self._track_request(request)
+        return await self.get_response(request)
 
-    def __call__(self, request):
-        # for each API request, trigger a call to InfluxDB to track the request
-        track_request_influxdb_async(request)
+    @staticmethod
+    def _track_request(request) -> None:
+        # for each API request, count a page view to send to Google Analytics
+        google_analytics_cache.track_request(
+            request.path, request.headers.get("X-Environment-Key")
+        )
 
-        response = self.get_response(request)
 
-        return response
+class InfluxDBMiddleware(SyncAndAsyncMiddleware):
+    def handle(self, request):
+        self._track_request(request)
+        return self.get_response(request)
 
+    async def ahandle(self, request):
+        self._track_request(request)
+        return await self.get_response(request)
 
-class APIUsageMiddleware:
-    def __init__(self, get_response):
-        self.get_response = get_response
-
-    def __call__(self, request):
+    @staticmethod
+    def _track_request(request) -> None:
+        # for each API request, count the request to send to InfluxDB
+        resource = get_resource_from_uri(request.path)
+        if resource in TRACKED_RESOURCE_ACTIONS:
+            influxdb_request_cache.track_request(
+                resource, request.get_host(), request.headers.get("X-Environment-Key")
+            )
+
+
+class APIUsageMiddleware(SyncAndAsyncMiddleware):
+    def handle(self, request):
+        self._track_request(request)
+        return self.get_response(request)
+
+    async def ahandle(self, request):
+        if settings.USE_CACHE_FOR_USAGE_DATA:
+            self._track_request(request)
+        else:
+            # enqueueing the task writes to the database
+            await sync_to_async(self._track_request)(request)
+        return await self.get_response(request)
+
+    @staticmethod
+    def _track_request(request) -> None:
         resource = get_resource_from_uri(request.path)
         if resource in TRACKED_RESOURCE_ACTIONS:
             kwargs = {
@@ -54,8 +77,4 @@ class APIUsageMiddleware:
             if settings.USE_CACHE_FOR_USAGE_DATA:
                 api_usage_cache.track_request(**kwargs)
             else:
-                track_request.delay(kwargs=kwargs)
-
-        response = self.get_response(request)
-
-        return response
+                track_requests.delay(kwargs={"requests": [kwargs]})
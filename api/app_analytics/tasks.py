@@ -1,4 +1,5 @@
 from datetime import datetime, timedelta
+from operator import attrgetter
 from typing import List, Tuple
 
 from app_analytics.constants import ANALYTICS_READ_BUCKET_SIZE
@@ -109,6 +110,40 @@ def track_request(resource: int, host: str, environment_key: str, count: int = 1
     )
 
 
+@register_task_handler()
+def track_requests(requests: list[dict[str, int | str]]) -> None:
+    """
+    Write the API usage tracked by an `APIUsageCache` flush, or any other batch
+    of requests, in one go.
+
+    :param requests: list of dictionaries with the same keys as the arguments
+        to `track_request`
+    """
+    environment_keys = {request["environment_key"] for request in requests}
+    environment_ids_by_key = {}
+    for environment_id, api_key, server_api_key in Environment.objects.filter(
+        Q(api_key__in=environment_keys) | Q(api_keys__key__in=environment_keys)
+    ).values_list("id", "api_key", "api_keys__key"):
+        environment_ids_by_key[api_key] = environment_id
+        if server_api_key:
+            environment_ids_by_key[server_api_key] = environment_id
+
+    APIUsageRaw.objects.bulk_create(
+        [
+            APIUsageRaw(
+                environment_id=environment_id,
+                resource=request["resource"],
+                host=request["host"],
+                count=request.get("count", 1),
+            )
+            for request in requests
+            if (
+                environment_id := environment_ids_by_key.get(request["environment_key"])
+            )
+        ]
+    )
+
+
 def get_start_of_current_bucket(bucket_size: int) -> datetime:
     if bucket_size > 60:
         raise ValueError("Bucket size cannot be greater than 60 minutes")
@@ -142,34 +177,107 @@ def populate_api_usage_bucket(
     bucket_size: int, run_every: int, source_bucket_size: int = None
 ):
     for bucket_start_time, bucket_end_time in get_time_buckets(bucket_size, run_every):
-        data = _get_api_usage_source_data(
-            bucket_start_time, bucket_end_time, source_bucket_size
+        populate_api_usage_time_bucket(
+            bucket_size, bucket_start_time, bucket_end_time, source_bucket_size
         )
-        for row in data:
-            APIUsageBucket.objects.update_or_create(
-                defaults={"total_count": row["count"]},
-                environment_id=row["environment_id"],
-                resource=row["resource"],
-                bucket_size=bucket_size,
-                created_at=bucket_start_time,
-            )
 
 
 def populate_feature_evaluation_bucket(
     bucket_size: int, run_every: int, source_bucket_size: int = None
 ):
     for bucket_start_time, bucket_end_time in get_time_buckets(bucket_size, run_every):
-        data = _get_feature_evaluation_source_data(
-            bucket_start_time, bucket_end_time, source_bucket_size
+        populate_feature_evaluation_time_bucket(
+            bucket_size, bucket_start_time, bucket_end_time, source_bucket_size
         )
-        for row in data:
-            FeatureEvaluationBucket.objects.update_or_create(
-                defaults={"total_count": row["count"]},
+
+
+def populate_api_usage_time_bucket(
+    bucket_size: int,
+    bucket_start_time: datetime,
+    bucket_end_time: datetime,
+    source_bucket_size: int = None,
+) -> None:
+    data = _get_api_usage_source_data(
+        bucket_start_time, bucket_end_time, source_bucket_size
+    )
+    _upsert_buckets(
+        APIUsageBucket,
+        [
+            APIUsageBucket(
+                environment_id=row["environment_id"],
+                resource=row["resource"],
+                bucket_size=bucket_size,
+                created_at=bucket_start_time,
+                total_count=row["count"],
+            )
+            for row in data
+        ],
+        key_fields=("environment_id", "resource"),
+        bucket_size=bucket_size,
+        created_at=bucket_start_time,
+    )
+
+
+def populate_feature_evaluation_time_bucket(
+    bucket_size: int,
+    bucket_start_time: datetime,
+    bucket_end_time: datetime,
+    source_bucket_size: int = None,
+) -> None:
+    data = _get_feature_evaluation_source_data(
+        bucket_start_time, bucket_end_time, source_bucket_size
+    )
+    _upsert_buckets(
+        FeatureEvaluationBucket,
+        [
+            FeatureEvaluationBucket(
                 environment_id=row["environment_id"],
                 feature_name=row["feature_name"],
                 bucket_size=bucket_size,
                 created_at=bucket_start_time,
+                total_count=row["count"],
             )
+            for row in data
+        ],
+        key_fields=("environment_id", "feature_name"),
+        bucket_size=bucket_size,
+        created_at=bucket_start_time,
+    )
+
+
+def _upsert_buckets(
+    model_class: type[APIUsageBucket] | type[FeatureEvaluationBucket],
+    buckets: list[APIUsageBucket] | list[FeatureEvaluationBucket],
+    key_fields: tuple[str, ...],
+    bucket_size: int,
+    created_at: datetime,
+) -> None:
+    """
+    Bulk equivalent of calling `update_or_create` for each of the buckets, which
+    all share the given size and start time.
+    """
+    if not buckets:
+        return
+
+    get_key = attrgetter(*key_fields)
+    existing_buckets = {
+        get_key(bucket): bucket
+        for bucket in model_class.objects.filter(
+            bucket_size=bucket_size, created_at=created_at
+        ).only("id", "total_count", *key_fields)
+    }
+
+    buckets_to_create = []
+    buckets_to_update = []
+    for bucket in buckets:
+        if existing_bucket := existing_buckets.get(get_key(bucket)):
+            existing_bucket.total_count = bucket.total_count
+            buckets_to_update.append(existing_bucket)
+        else:
+            buckets_to_create.append(bucket)
+
+    model_class.objects.bulk_update(buckets_to_update, ["total_count"])
+    model_class.objects.bulk_create(buckets_to_create)
 
 
 def _get_api_usage_source_data(
@@ -9,7 +9,6 @@ from six.moves.urllib.parse import quote  # python 2/3 compatible urllib import
 from task_processor.decorators import register_task_handler
 
 from environments.models import Environment
-from util.util import postpone
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +17,8 @@ environment_cache = caches[settings.ENVIRONMENT_CACHE_NAME]
 GOOGLE_ANALYTICS_BASE_URL = "https://www.google-analytics.com"
 GOOGLE_ANALYTICS_COLLECT_URL = GOOGLE_ANALYTICS_BASE_URL + "/collect"
 GOOGLE_ANALYTICS_BATCH_URL = GOOGLE_ANALYTICS_BASE_URL + "/batch"
+# the maximum number of hits Google Analytics accepts in a batch
+GOOGLE_ANALYTICS_BATCH_SIZE = 20
 DEFAULT_DATA = "v=1&tid=" + settings.GOOGLE_ANALYTICS_KEY
 
 # dictionary of resources to their corresponding actions
@@ -30,16 +31,6 @@ TRACKED_RESOURCE_ACTIONS = {
 }
 
 
-@postpone
-def track_request_googleanalytics_async(request):
-    return track_request_googleanalytics(request)
-
-
-@postpone
-def track_request_influxdb_async(request):
-    return track_request_influxdb(request)
-
-
 def get_resource_from_uri(request_uri):
     """
     Split the uri so we can determine the resource that is being requested
@@ -57,29 +48,49 @@ def get_resource_from_uri(request_uri):
     return split_uri[2]
 
 
-def track_request_googleanalytics(request):
+def track_request_counts_googleanalytics(
+    request_counts: dict[tuple[str, str | None], int]
+) -> None:
     """
-    Utility function to track a request to the API with the specified URI
+    Send a page view to Google Analytics for each request, along with an event
+    for each request to the SDK endpoints (for managing the number of API
+    requests made by an organisation), in batches.
 
-    :param request: (HttpRequest) the request being made
+    :param request_counts: the number of requests, keyed on their path and
+        environment key
     """
-    pageview_data = DEFAULT_DATA + "t=pageview&dp=" + quote(request.path, safe="")
-    # send pageview request
-    requests.post(GOOGLE_ANALYTICS_COLLECT_URL, data=pageview_data)
+    hits = []
+    for (path, environment_key), count in request_counts.items():
+        hits.extend([_get_pageview_data(path)] * count)
+
+        resource = get_resource_from_uri(path)
+        if resource not in TRACKED_RESOURCE_ACTIONS:
+            continue
+        environment = Environment.get_from_cache(environment_key)
+        if environment is None:
+            continue
+        organisation_slug = environment.project.organisation.get_unique_slug()
+        hits.extend(_get_event_data(organisation_slug, resource) for _ in range(count))
+
+    for i in range(0, len(hits), GOOGLE_ANALYTICS_BATCH_SIZE):
+        requests.post(
+            GOOGLE_ANALYTICS_BATCH_URL,
+            data="\n".join(hits[i : i + GOOGLE_ANALYTICS_BATCH_SIZE]),  # noqa: E203
+        )
 
-    resource = get_resource_from_uri(request.path)
 
-    if resource in TRACKED_RESOURCE_ACTIONS:
-        environment = Environment.get_from_cache(
-            request.headers.get("X-Environment-Key")
-        )
-        if environment is None:
-            return
+def track_event(category, action, label="", value=""):
+    requests.post(
+        GOOGLE_ANALYTICS_COLLECT_URL,
+        data=_get_event_data(category, action, label, value),
+    )
 
-        track_event(environment.project.organisation.get_unique_slug(), resource)
 
+def _get_pageview_data(path: str) -> str:
+    return DEFAULT_DATA + "&t=pageview&dp=" + quote(path, safe="")
 
-def track_event(category, action, label="", value=""):
+
+def _get_event_data(category, action, label="", value="") -> str:
     data = (
         DEFAULT_DATA
         + "&t=event"
@@ -91,24 +102,23 @@ def track_event(category, action, label="", value=""):
         + str(uuid.uuid4())
     )
     data = data + "&el=" + label if label else data
-    data = data + "&ev=" + value if value else data
-    requests.post(GOOGLE_ANALYTICS_COLLECT_URL, data=data)
+    return data + "&ev=" + value if value else data
 
 
-def track_request_influxdb(request):
+def track_request_counts_influxdb(
+    request_counts: dict[tuple[str, str, str | None], int]
+) -> None:
     """
-    Sends API event data to InfluxDB
+    Sends API event data to InfluxDB, in a single write
 
-    :param request: (HttpRequest) the request being made
+    :param request_counts: the number of requests, keyed on their resource, host
+        and environment key
     """
-    resource = get_resource_from_uri(request.path)
-
-    if resource and resource in TRACKED_RESOURCE_ACTIONS:
-        environment = Environment.get_from_cache(
-            request.headers.get("X-Environment-Key")
-        )
+    influxdb = InfluxDBWrapper("api_call")
+    for (resource, host, environment_key), count in request_counts.items():
+        environment = Environment.get_from_cache(environment_key)
         if environment is None:
-            return
+            continue
 
         tags = {
             "resource": resource,
@@ -118,11 +128,11 @@ def track_request_influxdb(request):
             "project_id": environment.project_id,
             "environment": environment.name,
             "environment_id": environment.id,
-            "host": request.get_host(),
+            "host": host,
         }
+        influxdb.add_data_point("request_count", count, tags=tags)
 
-        influxdb = InfluxDBWrapper("api_call")
-        influxdb.add_data_point("request_count", 1, tags=tags)
+    if influxdb.records:
         influxdb.write()
 
 
@@ -0,0 +1,223 @@
+"""
+Fan-out of audit logs to the event integrations, e.g. Datadog or Grafana.
+
+The integration configurations for an audit log's project and environment are
+resolved together, and cached for `CACHE_AUDIT_LOG_INTEGRATIONS_SECONDS`. When
+`AUDIT_LOG_INTEGRATION_BATCH_SECONDS` is set, the events are buffered in memory
+for each integration and sent in batches from a background thread, every that
+many seconds, rather than each from its own thread as it's logged.
+"""
+
+import logging
+import threading
+import typing
+from collections import defaultdict
+
+from core.background_flusher import BackgroundFlusher
+from django.conf import settings
+from django.core.cache import caches
+
+from environments.models import Environment
+from integrations.common.wrapper import AbstractBaseEventIntegrationWrapper
+from integrations.datadog.datadog import DataDogWrapper
+from integrations.dynatrace.dynatrace import DynatraceWrapper
+from integrations.grafana.grafana import GrafanaWrapper
+from integrations.new_relic.new_relic import NewRelicWrapper
+from integrations.slack.slack import SlackWrapper
+from projects.models import Project
+
+if typing.TYPE_CHECKING:
+    from audit.models import AuditLog
+    from integrations.common.models import IntegrationsModel
+
+logger = logging.getLogger(__name__)
+
+audit_log_integrations_cache = caches[settings.AUDIT_LOG_INTEGRATIONS_CACHE_LOCATION]
+
+# The integration name, i.e. its configuration's related name, and the
+# arguments to create its wrapper with.
+AuditLogIntegration: typing.TypeAlias = tuple[str, tuple[tuple[str, typing.Any], ...]]
+
+_WRAPPER_CLASSES: dict[str, type[AbstractBaseEventIntegrationWrapper]] = {
+    "data_dog_config": DataDogWrapper,
+    "new_relic_config": NewRelicWrapper,
+    "dynatrace_config": DynatraceWrapper,
+    "grafana_config": GrafanaWrapper,
+    "slack_config": SlackWrapper,
+}
+
+_PROJECT_INTEGRATIONS = (
+    "data_dog_config",
+    "new_relic_config",
+    "grafana_config",
+    "slack_config",
+)
+_ENVIRONMENT_INTEGRATIONS = ("dynatrace_config",)
+_ORGANISATION_INTEGRATIONS = ("grafana_config",)
+
+
+def fan_out_audit_log_event(audit_log: "AuditLog") -> None:
+    """
+    Send the audit log to each of the integrations configured for it.
+    """
+    for integration in get_audit_log_integrations(audit_log):
+        integration_name, _ = integration
+        event = _WRAPPER_CLASSES[integration_name].generate_event_data(
+            audit_log_record=audit_log
+        )
+        if settings.AUDIT_LOG_INTEGRATION_BATCH_SECONDS:
+            audit_log_event_buffer.add(integration, event)
+        else:
+            _get_wrapper(integration).track_event_async(event=event)
+
+
+def get_audit_log_integrations(
+    audit_log: "AuditLog",
+) -> list[AuditLogIntegration]:
+    """
+    Get the integrations configured for the audit log's project and environment.
+    """
+    cache_key = f"{audit_log.project_id}:{audit_log.environment_id}"
+    if settings.CACHE_AUDIT_LOG_INTEGRATIONS_SECONDS:
+        integrations = audit_log_integrations_cache.get(cache_key)
+        if integrations is not None:
+            return integrations
+
+    integrations = _resolve_audit_log_integrations(audit_log)
+    if settings.CACHE_AUDIT_LOG_INTEGRATIONS_SECONDS:
+        audit_log_integrations_cache.set(
+            cache_key,
+            integrations,
+            timeout=settings.CACHE_AUDIT_LOG_INTEGRATIONS_SECONDS,
+        )
+    return integrations
+
+
+def _resolve_audit_log_integrations(
+    audit_log: "AuditLog",
+) -> list[AuditLogIntegration]:
+    # Fetch all the configurations in one query, with the project's taking
+    # precedence over the environment's, and the environment's over the
+    # organisation's.
+    related = [
+        *_PROJECT_INTEGRATIONS,
+        *(f"organisation__{name}" for name in _ORGANISATION_INTEGRATIONS),
+    ]
+    environment = project = None
+    if audit_log.environment_id:
+        environment = (
+            Environment.objects.select_related(
+                *_ENVIRONMENT_INTEGRATIONS,
+                "project",
+                *(f"project__{name}" for name in related),
+            )
+            .filter(id=audit_log.environment_id)
+            .first()
+        )
+        project = environment and environment.project
+    elif audit_log.project_id:
+        project = (
+            Project.objects.select_related("organisation", *related)
+            .filter(id=audit_log.project_id)
+            .first()
+        )
+    organisation = project.organisation if project else audit_log.organisation
+
+    integrations = []
+    for integration_name in _WRAPPER_CLASSES:
+        # select_related doesn't leave out the soft deleted configurations, so
+        # they're skipped here, in favour of any of the next in precedence.
+        config = next(
+            (
+                getattr(instance, integration_name)
+                for instance in (project, environment, organisation)
+                if hasattr(instance, integration_name)
+                and getattr(instance, integration_name).deleted_at is None
+            ),
+            None,
+        )
+        if config and (
+            wrapper_kwargs := _get_wrapper_kwargs(integration_name, config, environment)
+        ):
+            integrations.append((integration_name, tuple(wrapper_kwargs.items())))
+    return integrations
+
+
+def _get_wrapper_kwargs(
+    integration_name: str,
+    config: "IntegrationsModel",
+    environment: Environment | None,
+) -> dict[str, typing.Any] | None:
+    if integration_name == "new_relic_config":
+        return {
+            "base_url": config.base_url,
+            "api_key": config.api_key,
+            "app_id": config.app_id,
+        }
+    if integration_name == "dynatrace_config":
+        return {
+            "base_url": config.base_url,
+            "api_key": config.api_key,
+            "entity_selector": config.entity_selector,
+        }
+    if integration_name == "slack_config":
+        env_config = config.env_config.filter(
+            environment=environment, enabled=True
+        ).first()
+        if not env_config:
+            return None
+        return {"api_token": config.api_token, "channel_id": env_config.channel_id}
+    return {"base_url": config.base_url, "api_key": config.api_key}
+
+
+def _get_wrapper(
+    integration: AuditLogIntegration,
+) -> AbstractBaseEventIntegrationWrapper:
+    integration_name, wrapper_kwargs = integration
+    return _WRAPPER_CLASSES[integration_name](**dict(wrapper_kwargs))
+
+
+class _AuditLogEventBuffer:
+    """
+    Buffers the events for each integration, and sends them in batches from a
+    background thread. Any events that are left when the process exits are
+    sent on shutdown.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._events: defaultdict[AuditLogIntegration, list[dict]] = defaultdict(list)
+
+        self._flusher = BackgroundFlusher(
+            name=type(self).__name__,
+            flush=self.flush,
+            get_interval=lambda: settings.AUDIT_LOG_INTEGRATION_BATCH_SECONDS,
+            on_fork=self._reset,
+        )
+
+    def add(self, integration: AuditLogIntegration, event: dict) -> None:
+        self._flusher.ensure_started()
+        with self._lock:
+            self._events[integration].append(event)
+
+    def flush(self) -> None:
+        with self._lock:
+            events, self._events = self._events, defaultdict(list)
+
+        for integration, integration_events in events.items():
+            try:
+                _get_wrapper(integration).track_events(integration_events)
+            except Exception:
+                logger.exception(
+                    "Failed to send %d audit log events to %s",
+                    len(integration_events),
+                    integration[0],
+                )
+
+    def _reset(self) -> None:
+        # the events inherited from the parent process are its to send
+        self._lock = threading.Lock()
+        self._events = defaultdict(list)
+
+
+audit_log_event_buffer = _AuditLogEventBuffer()
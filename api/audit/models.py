@@ -148,21 +148,39 @@ class AuditLog(LifecycleModel):
         if not self.project:
             return
 
-        from environments.models import Environment
-        from environments.tasks import process_environment_update
+        from environments.models import (
+            Environment,
+            EnvironmentAPIKey,
+            environment_cache,
+        )
+        from environments.update_coalescing import schedule_environment_update
 
         environments_filter = Q()
         if self.environment_id:
             environments_filter = Q(id=self.environment_id)
 
-        environment_ids = self.project.environments.filter(
-            environments_filter
-        ).values_list("id", flat=True)
+        environments = list(
+            self.project.environments.filter(environments_filter).values_list(
+                "id", "api_key"
+            )
+        )
 
         # Update environment individually to avoid deadlock
-        for environment_id in environment_ids:
+        for environment_id, _ in environments:
             Environment.objects.filter(id=environment_id).update(
                 updated_at=self.created_date
             )
 
-        process_environment_update.delay(args=(self.id,))
+        # The update above skips the environments' lifecycle hooks, so clear
+        # the cached environments here, for their new `updated_at` to be read.
+        environment_ids = [environment_id for environment_id, _ in environments]
+        environment_cache.delete_many(
+            [
+                *(api_key for _, api_key in environments),
+                *EnvironmentAPIKey.objects.filter(
+                    environment_id__in=environment_ids
+                ).values_list("key", flat=True),
+            ]
+        )
+
+        schedule_environment_update(self)
@@ -0,0 +1,102 @@
+"""
+Periodically flushes an in-memory buffer from a daemon thread.
+
+The thread is started lazily, by the first call to `ensure_started` in each
+process, so that it's (re)started in each forked worker process. Anything
+buffered when the process exits is flushed on shutdown.
+
+Since the flush runs outside of the request / response cycle, the thread's
+database connections are closed, if unusable or obsolete, before and after
+each flush, like django does for a request.
+
+Usage:
+------
+
+```python
+class Buffer:
+    def __init__(self) -> None:
+        self._flusher = BackgroundFlusher(
+            name="Buffer",
+            flush=self.flush,
+            get_interval=lambda: settings.BUFFER_SECONDS,
+            on_fork=self._reset,
+        )
+
+    def add(self, item) -> None:
+        self._flusher.ensure_started()
+        ...
+```
+"""
+
+import atexit
+import logging
+import os
+import threading
+import time
+import typing
+
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundFlusher:
+    def __init__(
+        self,
+        name: str,
+        flush: typing.Callable[[], None],
+        get_interval: typing.Callable[[], float],
+        on_fork: typing.Callable[[], None] | None = None,
+    ) -> None:
+        """
+        :param name: the name of the buffer, used for the thread and in logs.
+        :param flush: flushes the buffer.
+        :param get_interval: gets the number of seconds between flushes.
+        :param on_fork: called when the flusher is started in a forked process,
+            to discard the buffer inherited from the parent process, which is
+            the parent's to flush.
+        """
+        self.name = name
+        self._flush = flush
+        self._get_interval = get_interval
+        self._on_fork = on_fork
+
+        self._pid: int | None = None
+        self._lock = threading.Lock()
+
+    def ensure_started(self) -> None:
+        if self._pid == (pid := os.getpid()):
+            return
+        with self._lock:
+            if self._pid == pid:
+                return
+            if self._pid is not None:
+                if self._on_fork:
+                    self._on_fork()
+            else:
+                atexit.register(self._flush_on_exit)
+            self._pid = pid
+
+            threading.Thread(
+                target=self._run,
+                name=f"{self.name}-flusher",
+                daemon=True,
+            ).start()
+
+    def flush_safely(self) -> None:
+        close_old_connections()
+        try:
+            self._flush()
+        except Exception:
+            logger.exception("Failed to flush %s", self.name)
+        finally:
+            close_old_connections()
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self._get_interval())
+            self.flush_safely()
+
+    def _flush_on_exit(self) -> None:
+        if self._pid == os.getpid():
+            self.flush_safely()
@@ -1,17 +1,24 @@
 import logging
 
 from core.helpers import get_ip_address_from_request
+from core.middleware.base import SyncAndAsyncMiddleware
 from django.conf import settings
 from django.core.exceptions import PermissionDenied
 
 logger = logging.getLogger(__name__)
 
 
-class AdminWhitelistMiddleware:
-    def __init__(self, get_response):
-        self.get_response = get_response
+class AdminWhitelistMiddleware(SyncAndAsyncMiddleware):
+    def handle(self, request):
+        self._check_ip_address(request)
+        return self.get_response(request)
+
+    async def ahandle(self, request):
+        self._check_ip_address(request)
+        return await self.get_response(request)
 
-    def __call__(self, request):
+    @staticmethod
+    def _check_ip_address(request) -> None:
         if request.path.startswith("/admin"):
             ip = get_ip_address_from_request(request)
             if (
@@ -21,5 +28,3 @@ class AdminWhitelistMiddleware:
                 # IP address not allowed!
                 logger.info("Denying access to admin for ip address %s" % ip)
                 raise PermissionDenied()
-
-        return self.get_response(request)
@@ -1,13 +1,29 @@
+from asgiref.sync import sync_to_async
 from axes.middleware import AxesMiddleware as DefaultAxesMiddleware
+from core.middleware.base import SyncAndAsyncMiddleware
 from django.conf import settings
 
 
-class AxesMiddleware(DefaultAxesMiddleware):
-    def __call__(self, request):
-        if hasattr(request, "path") and any(
-            url in request.path for url in settings.AXES_BLACKLISTED_URLS
-        ):
-            return super().__call__(request)
+class AxesMiddleware(SyncAndAsyncMiddleware, DefaultAxesMiddleware):
+    def handle(self, request):
+        if self._is_blacklisted(request):
+            return DefaultAxesMiddleware.__call__(self, request)
 
         response = self.get_response(request)
         return response
+
+    async def ahandle(self, request):
+        response = await self.get_response(request)
+        if self._is_blacklisted(request):
+            # axes checks for a lockout once the response is got, in a thread,
+            # since it can query the database
+            response = await sync_to_async(
+                DefaultAxesMiddleware(lambda request: response)
+            )(request)
+        return response
+
+    @staticmethod
+    def _is_blacklisted(request) -> bool:
+        return hasattr(request, "path") and any(
+            url in request.path for url in settings.AXES_BLACKLISTED_URLS
+        )
@@ -0,0 +1,31 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+
+class SyncAndAsyncMiddleware:
+    """
+    Middleware that can be served over either WSGI or ASGI. Over ASGI, its
+    `ahandle` runs on the event loop, rather than in a worker thread, so that
+    the async views stay async.
+
+    See https://docs.djangoproject.com/en/4.2/topics/http/middleware/#asynchronous-support
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(self.get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.ahandle(request)
+        return self.handle(request)
+
+    def handle(self, request):
+        raise NotImplementedError()
+
+    async def ahandle(self, request):
+        raise NotImplementedError()
@@ -1,12 +1,16 @@
+from core.middleware.base import SyncAndAsyncMiddleware
 from django.utils.cache import add_never_cache_headers
 
 
-class NeverCacheMiddleware:
-    def __init__(self, get_response):
-        self.get_response = get_response
+class NeverCacheMiddleware(SyncAndAsyncMiddleware):
+    def handle(self, request):
+        return self._add_never_cache_headers(self.get_response(request))
 
-    def __call__(self, request):
-        response = self.get_response(request)
+    async def ahandle(self, request):
+        return self._add_never_cache_headers(await self.get_response(request))
+
+    @staticmethod
+    def _add_never_cache_headers(response):
         add_never_cache_headers(response)
         response["Pragma"] = "no-cache"
         return response
@@ -0,0 +1,37 @@
+import random
+
+from core.middleware.base import SyncAndAsyncMiddleware
+from core.server_timing import collect_request_timings, timed_stage
+from django.conf import settings
+
+
+class ServerTimingMiddleware(SyncAndAsyncMiddleware):
+    """
+    Collect the timings of a sample of requests, see `core.server_timing`, and
+    report them in the `Server-Timing` response header.
+
+    Over ASGI, only the queries made on the event loop's database connection
+    are counted, i.e. not those made by the views that run in a worker thread.
+    """
+
+    def handle(self, request):
+        if random.random() >= settings.SERVER_TIMING_SAMPLE_RATE:
+            return self.get_response(request)
+
+        with collect_request_timings() as timings:
+            with timed_stage("total"):
+                response = self.get_response(request)
+
+        response["Server-Timing"] = timings.get_header()
+        return response
+
+    async def ahandle(self, request):
+        if random.random() >= settings.SERVER_TIMING_SAMPLE_RATE:
+            return await self.get_response(request)
+
+        with collect_request_timings() as timings:
+            with timed_stage("total"):
+                response = await self.get_response(request)
+
+        response["Server-Timing"] = timings.get_header()
+        return response
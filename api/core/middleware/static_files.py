@@ -0,0 +1,28 @@
+from asgiref.sync import sync_to_async
+from core.middleware.base import SyncAndAsyncMiddleware
+from whitenoise.middleware import (
+    WhiteNoiseMiddleware as DefaultWhiteNoiseMiddleware,
+)
+
+
+class WhiteNoiseMiddleware(SyncAndAsyncMiddleware, DefaultWhiteNoiseMiddleware):
+    """
+    Serves the static files with WhiteNoise, which is sync only, without handing
+    any other requests over to a worker thread when served over ASGI.
+    """
+
+    def __init__(self, get_response):
+        DefaultWhiteNoiseMiddleware.__init__(self, get_response)
+        SyncAndAsyncMiddleware.__init__(self, get_response)
+
+    def handle(self, request):
+        return DefaultWhiteNoiseMiddleware.__call__(self, request)
+
+    async def ahandle(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
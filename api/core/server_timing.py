@@ -0,0 +1,164 @@
+"""
+Per-request timings for the stages of handling a request, e.g. authenticating
+the environment or evaluating segments, along with the number of database
+queries made in each stage.
+
+Requests are sampled by `ServerTimingMiddleware`. For a sampled request the
+stages are reported in a `Server-Timing` response header, and added to the
+histograms served, in the Prometheus text format, by the metrics view. Outside
+of a sampled request, `timed_stage` does nothing but check a context variable.
+
+The histograms are kept in memory by each process, and each series is labelled
+with the process' pid, so that the series of the processes behind a load
+balancer, e.g. gunicorn workers, can be told apart, and summed.
+"""
+
+import os
+import threading
+import time
+import typing
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import connection
+
+DURATION_BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+
+class RequestTimings:
+    """
+    The timings of the stages of a request, in the order they finished. A stage
+    that runs more than once in a request, e.g. for each identity, is reported
+    once with the totals.
+    """
+
+    def __init__(self) -> None:
+        self.queries = 0
+        self.stages: dict[str, list[float | int]] = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        # used as a database execute wrapper, to count the queries
+        self.queries += 1
+        return execute(sql, params, many, context)
+
+    def add(self, stage: str, duration_ms: float, queries: int) -> None:
+        totals = self.stages.setdefault(stage, [0.0, 0])
+        totals[0] += duration_ms
+        totals[1] += queries
+
+    def get_header(self) -> str:
+        return ", ".join(
+            f'{stage};dur={duration_ms:.2f};desc="{queries} queries"'
+            for stage, (duration_ms, queries) in self.stages.items()
+        )
+
+
+_request_timings: ContextVar[RequestTimings | None] = ContextVar(
+    "request_timings", default=None
+)
+
+
+@contextmanager
+def collect_request_timings() -> typing.Generator[RequestTimings, None, None]:
+    """
+    Collect the timings of the stages run in this context, counting the queries
+    made on the default database connection.
+    """
+    timings = RequestTimings()
+    token = _request_timings.set(timings)
+    try:
+        with connection.execute_wrapper(timings):
+            yield timings
+    finally:
+        _request_timings.reset(token)
+        for stage, (duration_ms, queries) in timings.stages.items():
+            stage_durations.observe(stage, duration_ms)
+            stage_queries.observe(stage, queries)
+
+
+@contextmanager
+def timed_stage(stage: str) -> typing.Generator[None, None, None]:
+    """
+    Time a stage of the current request, if its timings are being collected.
+    Can also be used as a function decorator.
+    """
+    timings = _request_timings.get()
+    if timings is None:
+        yield
+        return
+
+    started_at, queries = time.perf_counter(), timings.queries
+    try:
+        yield
+    finally:
+        timings.add(
+            stage,
+            (time.perf_counter() - started_at) * 1000,
+            timings.queries - queries,
+        )
+
+
+class StageHistogram:
+    """
+    A histogram of values observed for each stage, with cumulative buckets, as
+    in Prometheus. The histograms are kept in memory, per process, and labelled
+    with its pid.
+    """
+
+    def __init__(self, name: str, description: str, buckets: tuple[float, ...]):
+        self.name = name
+        self.description = description
+        self.buckets = buckets
+
+        self._lock = threading.Lock()
+        # the counts for each bucket, followed by the total count
+        self._counts: dict[str, list[int]] = {}
+        self._sums: dict[str, float] = {}
+
+    def observe(self, stage: str, value: float) -> None:
+        with self._lock:
+            counts = self._counts.setdefault(stage, [0] * (len(self.buckets) + 1))
+            for i, upper_bound in enumerate(self.buckets):
+                if value <= upper_bound:
+                    counts[i] += 1
+            counts[-1] += 1
+            self._sums[stage] = self._sums.get(stage, 0.0) + value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counts.clear()
+            self._sums.clear()
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} histogram",
+        ]
+        pid = os.getpid()
+        with self._lock:
+            for stage, counts in sorted(self._counts.items()):
+                labels = f'pid="{pid}",stage="{stage}"'
+                for upper_bound, count in zip((*self.buckets, "+Inf"), counts):
+                    lines.append(
+                        f'{self.name}_bucket{{{labels},le="{upper_bound}"}} {count}'
+                    )
+                lines.append(f"{self.name}_sum{{{labels}}} {self._sums[stage]}")
+                lines.append(f"{self.name}_count{{{labels}}} {counts[-1]}")
+        return "\n".join(lines) + "\n"
+
+
+stage_durations = StageHistogram(
+    "flagsmith_request_stage_duration_milliseconds",
+    "Time spent in each stage of the sampled requests.",
+    DURATION_BUCKETS_MS,
+)
+stage_queries = StageHistogram(
+    "flagsmith_request_stage_queries",
+    "Database queries made in each stage of the sampled requests.",
+    QUERY_COUNT_BUCKETS,
+)
+
+
+def render_metrics() -> str:
+    return stage_durations.render() + stage_queries.render()
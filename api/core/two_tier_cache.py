@@ -0,0 +1,302 @@
+"""
+A django cache backend that keeps a small, short-lived copy of recently used
+entries in process memory, in front of a shared cache backend (e.g. redis).
+
+Entries are kept in the local tier pickled, like in django's local memory cache,
+so each read returns a copy that the caller is free to mutate, without a network
+round trip.
+
+When the shared cache is a django-redis cache, deletions are broadcast to every
+process over redis pub/sub so that local copies are evicted straight away.
+Otherwise, local copies of deleted entries from other processes are kept until
+they expire, so the local timeout should be kept short.
+
+Usage:
+------
+
+```python
+# settings.py
+
+CACHES = {
+    "shared-cache-name": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": "redis://...",
+    },
+    "cache_name": {
+        "BACKEND": "core.two_tier_cache.TwoTierCache",
+        "LOCATION": "shared-cache-name",
+        "OPTIONS": {
+            "LOCAL_TIMEOUT": 5,
+            "LOCAL_MAX_ENTRIES": 1000,
+            "INVALIDATION_CHANNEL": "cache_name-invalidation",
+        },
+    },
+}
+```
+"""
+
+import logging
+import os
+import pickle
+import threading
+import time
+import typing
+from collections import OrderedDict
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+logger = logging.getLogger(__name__)
+
+SUBSCRIBER_RECONNECT_INTERVAL_SECONDS = 5
+
+_MISSING = object()
+
+
+class LocalCache:
+    """
+    A thread safe, bounded, LRU cache with a fixed time to live.
+
+    Values are kept and returned as-is, so the callers must not mutate them.
+    """
+
+    def __init__(self, max_entries: int, timeout: float) -> None:
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._entries: OrderedDict[str, tuple[float, typing.Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, default: typing.Any = _MISSING) -> typing.Any:
+        with self._lock:
+            expires_at, value = self._entries.get(key, (0, _MISSING))
+            if value is _MISSING:
+                return default
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: typing.Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.timeout, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete_many(self, keys: typing.Iterable[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class TwoTierCache(BaseCache):
+    def __init__(self, location: str, params: dict[str, typing.Any]) -> None:
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+
+        self._shared_cache_name = location
+        self._local = LocalCache(
+            max_entries=options.get("LOCAL_MAX_ENTRIES", 1000),
+            timeout=options.get("LOCAL_TIMEOUT", 5),
+        )
+        self._invalidation_channel = options.get("INVALIDATION_CHANNEL")
+        self._stats_log_interval = options.get("STATS_LOG_INTERVAL", 0)
+
+        self._stats = dict.fromkeys(
+            ("local_hits", "local_misses", "shared_hits", "shared_misses"), 0
+        )
+        self._stats_lock = threading.Lock()
+        self._next_stats_log_at = time.monotonic() + self._stats_log_interval
+
+        self._subscriber_pid: int | None = None
+        self._subscriber_lock = threading.Lock()
+
+    @property
+    def shared(self) -> BaseCache:
+        return caches[self._shared_cache_name]
+
+    def get(
+        self,
+        key: str,
+        default: typing.Any = None,
+        version: int | None = None,
+    ) -> typing.Any:
+        self._ensure_subscriber()
+        local_key = self.make_and_validate_key(key, version=version)
+
+        pickled = self._local.get(local_key)
+        if pickled is not _MISSING:
+            self._record("local_hits")
+            return pickle.loads(pickled)
+        self._record("local_misses")
+
+        value = self.shared.get(key, _MISSING, version=version)
+        if value is _MISSING:
+            self._record("shared_misses")
+            return default
+        self._record("shared_hits")
+
+        self._local.set(local_key, self._pickle(value))
+        return value
+
+    def set(
+        self,
+        key: str,
+        value: typing.Any,
+        timeout: float | None = DEFAULT_TIMEOUT,
+        version: int | None = None,
+    ) -> None:
+        self._ensure_subscriber()
+        self.shared.set(
+            key, value, timeout=self._get_shared_timeout(timeout), version=version
+        )
+        self._local.set(
+            self.make_and_validate_key(key, version=version), self._pickle(value)
+        )
+
+    def add(
+        self,
+        key: str,
+        value: typing.Any,
+        timeout: float | None = DEFAULT_TIMEOUT,
+        version: int | None = None,
+    ) -> bool:
+        self._ensure_subscriber()
+        added = self.shared.add(
+            key, value, timeout=self._get_shared_timeout(timeout), version=version
+        )
+        if added:
+            self._local.set(
+                self.make_and_validate_key(key, version=version), self._pickle(value)
+            )
+        return added
+
+    def touch(
+        self,
+        key: str,
+        timeout: float | None = DEFAULT_TIMEOUT,
+        version: int | None = None,
+    ) -> bool:
+        return self.shared.touch(
+            key, timeout=self._get_shared_timeout(timeout), version=version
+        )
+
+    def delete(self, key: str, version: int | None = None) -> bool:
+        deleted = self.shared.delete(key, version=version)
+        self._invalidate([self.make_and_validate_key(key, version=version)])
+        return deleted
+
+    def delete_many(
+        self, keys: typing.Iterable[str], version: int | None = None
+    ) -> None:
+        keys = list(keys)
+        self.shared.delete_many(keys, version=version)
+        self._invalidate(
+            [self.make_and_validate_key(key, version=version) for key in keys]
+        )
+
+    def clear(self) -> None:
+        self.shared.clear()
+        self._local.clear()
+
+    def get_stats(self) -> dict[str, int]:
+        """
+        Get the number of hits and misses for each tier in this process.
+        """
+        with self._stats_lock:
+            return dict(self._stats)
+
+    @staticmethod
+    def _pickle(value: typing.Any) -> bytes:
+        return pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+    def _get_shared_timeout(
+        self, timeout: float | None = DEFAULT_TIMEOUT
+    ) -> float | None:
+        return self.default_timeout if timeout is DEFAULT_TIMEOUT else timeout
+
+    def _record(self, stat: str) -> None:
+        with self._stats_lock:
+            self._stats[stat] += 1
+            if (
+                not self._stats_log_interval
+                or time.monotonic() < self._next_stats_log_at
+            ):
+                return
+            self._next_stats_log_at = time.monotonic() + self._stats_log_interval
+            stats = dict(self._stats)
+        logger.info(
+            "Two tier cache %s stats: %s",
+            self._shared_cache_name,
+            ", ".join(f"{name}={count}" for name, count in stats.items()),
+        )
+
+    def _invalidate(self, local_keys: list[str]) -> None:
+        self._local.delete_many(local_keys)
+        if not local_keys or not (redis_client := self._get_redis_client()):
+            return
+        try:
+            redis_client.publish(self._invalidation_channel, "\n".join(local_keys))
+        except Exception:
+            logger.warning(
+                "Failed to publish invalidation for cache %s",
+                self._shared_cache_name,
+                exc_info=True,
+            )
+
+    def _get_redis_client(self) -> typing.Any:
+        if not self._invalidation_channel:
+            return None
+        # django-redis caches expose their client, other backends can't
+        # be used to broadcast invalidations.
+        client = getattr(self.shared, "client", None)
+        if client is None or not hasattr(client, "get_client"):
+            return None
+        return client.get_client(write=True)
+
+    def _ensure_subscriber(self) -> None:
+        # The subscriber thread has to be started in each (forked) process.
+        if self._subscriber_pid == (pid := os.getpid()):
+            return
+        with self._subscriber_lock:
+            if self._subscriber_pid == pid:
+                return
+            self._subscriber_pid = pid
+            # anything cached before forking may have been invalidated since
+            self._local.clear()
+            if self._get_redis_client() is None:
+                return
+            threading.Thread(
+                target=self._listen_for_invalidations,
+                name=f"{self._shared_cache_name}-invalidations",
+                daemon=True,
+            ).start()
+
+    def _listen_for_invalidations(self) -> None:
+        while True:
+            try:
+                pubsub = self._get_redis_client().pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self._invalidation_channel)
+                # we may have missed invalidations while (re)connecting
+                self._local.clear()
+                for message in pubsub.listen():
+                    self._handle_invalidation_message(message)
+            except Exception:
+                logger.warning(
+                    "Lost subscription to invalidations for cache %s",
+                    self._shared_cache_name,
+                    exc_info=True,
+                )
+                self._local.clear()
+                time.sleep(SUBSCRIBER_RECONNECT_INTERVAL_SECONDS)
+
+    def _handle_invalidation_message(self, message: dict[str, typing.Any]) -> None:
+        data = message["data"]
+        if isinstance(data, bytes):
+            data = data.decode()
+        self._local.delete_many(data.split("\n"))
@@ -0,0 +1,110 @@
+from dataclasses import dataclass, field
+
+from core.constants import STRING
+from flag_engine.segments.constants import EQUAL
+
+from environments.identities.models import Identity
+from environments.identities.traits.models import Trait
+from environments.models import Environment, EnvironmentAPIKey
+from features.models import Feature, FeatureSegment, FeatureState
+from organisations.models import Organisation
+from projects.models import Project
+from segments.models import Condition, Segment, SegmentRule
+
+BENCHMARK_ORGANISATION_NAME = "Benchmark Ltd"
+
+
+@dataclass
+class BenchmarkSeedConfig:
+    features: int = 50
+    segments: int = 10
+    conditions_per_segment: int = 3
+    identities: int = 100
+    traits_per_identity: int = 5
+
+
+@dataclass
+class BenchmarkSeed:
+    environment: Environment
+    server_api_key: str
+    feature_names: list[str] = field(default_factory=list)
+    identifiers: list[str] = field(default_factory=list)
+
+
+def seed_benchmark_data(config: BenchmarkSeedConfig) -> BenchmarkSeed:
+    """
+    Create a project with one environment, populated with the configured number
+    of features, segments (each overriding a feature) and identities with traits.
+
+    Identity `n` has the traits `trait_0`...`trait_m` all set to `n % 2`, and
+    segment `n` has conditions on the same traits, matching the value `n % 2`,
+    so every identity matches about half of the segments.
+    """
+    organisation = Organisation.objects.create(name=BENCHMARK_ORGANISATION_NAME)
+    project = Project.objects.create(
+        name="Benchmark Project", organisation=organisation
+    )
+    environment = Environment.objects.create(name="Benchmark", project=project)
+    server_api_key = EnvironmentAPIKey.objects.create(
+        environment=environment, name="Benchmark"
+    )
+
+    # Creating a feature creates its feature state in the environment.
+    features = [
+        Feature.objects.create(
+            name=f"benchmark_feature_{i}",
+            project=project,
+            initial_value=f"value_{i}",
+        )
+        for i in range(config.features)
+    ]
+
+    traits_per_identity = max(config.traits_per_identity, 1)
+    for i in range(config.segments):
+        segment = Segment.objects.create(name=f"benchmark_segment_{i}", project=project)
+        parent_rule = SegmentRule.objects.create(
+            segment=segment, type=SegmentRule.ALL_RULE
+        )
+        rule = SegmentRule.objects.create(rule=parent_rule, type=SegmentRule.ALL_RULE)
+        Condition.objects.bulk_create(
+            Condition(
+                rule=rule,
+                property=f"trait_{j % traits_per_identity}",
+                operator=EQUAL,
+                value=str(i % 2),
+            )
+            for j in range(config.conditions_per_segment)
+        )
+
+        if features:
+            feature = features[i % len(features)]
+            FeatureState.objects.create(
+                feature=feature,
+                environment=environment,
+                feature_segment=FeatureSegment.objects.create(
+                    feature=feature, segment=segment, environment=environment
+                ),
+                enabled=True,
+            )
+
+    identities = Identity.objects.bulk_create(
+        Identity(identifier=f"benchmark_identity_{i}", environment=environment)
+        for i in range(config.identities)
+    )
+    Trait.objects.bulk_create(
+        Trait(
+            identity=identity,
+            trait_key=f"trait_{j}",
+            value_type=STRING,
+            string_value=str(i % 2),
+        )
+        for i, identity in enumerate(identities)
+        for j in range(config.traits_per_identity)
+    )
+
+    return BenchmarkSeed(
+        environment=environment,
+        server_api_key=server_api_key.key,
+        feature_names=[feature.name for feature in features],
+        identifiers=[identity.identifier for identity in identities],
+    )
@@ -0,0 +1,169 @@
+"""
+Benchmarks for the SDK endpoints, run in-process through the full middleware
+stack with the Django test client, against the configured database.
+
+Each scenario is timed over a number of requests, after a warm up. The number
+of queries and the memory allocated are measured separately, over a few more
+requests, since tracing allocations slows requests down considerably.
+"""
+
+import itertools
+import json
+import statistics
+import time
+import tracemalloc
+import typing
+from dataclasses import asdict, dataclass
+
+from django.conf import settings
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from e2etests.benchmark_seed_data import BenchmarkSeed
+
+PROFILED_REQUESTS = 10
+
+
+@dataclass
+class BenchmarkScenario:
+    name: str
+    method: str
+    path: str
+    api_key: str
+    get_data: typing.Callable[[], dict | None]
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    requests: int
+    p50_ms: float
+    p99_ms: float
+    queries_per_request: float
+    allocated_kib_per_request: float
+
+    def to_dict(self) -> dict[str, typing.Any]:
+        return asdict(self)
+
+
+def get_sdk_scenarios(seed: BenchmarkSeed) -> list[BenchmarkScenario]:
+    environment_key = seed.environment.api_key
+    identifiers = itertools.cycle(seed.identifiers or ["benchmark_identity"])
+    feature_names = seed.feature_names[:10]
+
+    return [
+        BenchmarkScenario(
+            name="GET /api/v1/flags/",
+            method="get",
+            path="/api/v1/flags/",
+            api_key=environment_key,
+            get_data=lambda: None,
+        ),
+        BenchmarkScenario(
+            name="GET /api/v1/identities/",
+            method="get",
+            path="/api/v1/identities/",
+            api_key=environment_key,
+            get_data=lambda: {"identifier": next(identifiers)},
+        ),
+        BenchmarkScenario(
+            name="POST /api/v1/identities/",
+            method="post",
+            path="/api/v1/identities/",
+            api_key=environment_key,
+            get_data=lambda: {
+                "identifier": next(identifiers),
+                "traits": [{"trait_key": "trait_0", "trait_value": "1"}],
+            },
+        ),
+        BenchmarkScenario(
+            name="GET /api/v1/environment-document/",
+            method="get",
+            path="/api/v1/environment-document/",
+            api_key=seed.server_api_key,
+            get_data=lambda: None,
+        ),
+        BenchmarkScenario(
+            name="POST /api/v1/analytics/flags/",
+            method="post",
+            path="/api/v1/analytics/flags/",
+            api_key=environment_key,
+            get_data=lambda: {feature_name: 1 for feature_name in feature_names},
+        ),
+    ]
+
+
+def run_benchmarks(
+    scenarios: list[BenchmarkScenario], requests: int = 200, warmup: int = 20
+) -> list[BenchmarkResult]:
+    # The test client uses "testserver" as the host.
+    with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+        client = Client()
+        return [
+            _run_scenario(client, scenario, requests, warmup) for scenario in scenarios
+        ]
+
+
+def _run_scenario(
+    client: Client, scenario: BenchmarkScenario, requests: int, warmup: int
+) -> BenchmarkResult:
+    for _ in range(warmup):
+        _request(client, scenario)
+
+    timings = []
+    for _ in range(requests):
+        started_at = time.perf_counter()
+        _request(client, scenario)
+        timings.append((time.perf_counter() - started_at) * 1000)
+
+    queries = 0
+    allocated = 0
+    tracemalloc.start()
+    try:
+        for _ in range(PROFILED_REQUESTS):
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            with CaptureQueriesContext(connection) as context:
+                _request(client, scenario)
+            _, peak = tracemalloc.get_traced_memory()
+            queries += len(context.captured_queries)
+            allocated += peak - baseline
+    finally:
+        tracemalloc.stop()
+
+    return BenchmarkResult(
+        name=scenario.name,
+        requests=requests,
+        p50_ms=_percentile(timings, 50),
+        p99_ms=_percentile(timings, 99),
+        queries_per_request=queries / PROFILED_REQUESTS,
+        allocated_kib_per_request=allocated / PROFILED_REQUESTS / 1024,
+    )
+
+
+def _request(client: Client, scenario: BenchmarkScenario) -> None:
+    data = scenario.get_data()
+    if scenario.method == "get":
+        response = client.get(
+            scenario.path, data, HTTP_X_ENVIRONMENT_KEY=scenario.api_key
+        )
+    else:
+        response = client.post(
+            scenario.path,
+            json.dumps(data),
+            content_type="application/json",
+            HTTP_X_ENVIRONMENT_KEY=scenario.api_key,
+        )
+
+    if response.status_code >= 400:
+        raise RuntimeError(
+            f"{scenario.name} returned {response.status_code}: "
+            f"{response.content[:200]!r}"
+        )
+
+
+def _percentile(timings: list[float], percentile: int) -> float:
+    if len(timings) < 2:
+        return timings[0] if timings else 0.0
+    return statistics.quantiles(timings, n=100, method="inclusive")[percentile - 1]
@@ -0,0 +1,102 @@
+import argparse
+import json
+from typing import Any
+
+from django.core.management import BaseCommand
+from django.db import transaction
+
+from e2etests.benchmark_seed_data import (
+    BenchmarkSeedConfig,
+    seed_benchmark_data,
+)
+from e2etests.benchmarks import get_sdk_scenarios, run_benchmarks
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a project and benchmark the SDK endpoints against it, reporting the "
+        "p50/p99 latency, queries and memory allocated per request."
+    )
+
+    def add_arguments(self, parser: argparse.ArgumentParser) -> None:
+        defaults = BenchmarkSeedConfig()
+        parser.add_argument("--features", type=int, default=defaults.features)
+        parser.add_argument("--segments", type=int, default=defaults.segments)
+        parser.add_argument(
+            "--conditions-per-segment",
+            type=int,
+            dest="conditions_per_segment",
+            default=defaults.conditions_per_segment,
+        )
+        parser.add_argument("--identities", type=int, default=defaults.identities)
+        parser.add_argument(
+            "--traits-per-identity",
+            type=int,
+            dest="traits_per_identity",
+            default=defaults.traits_per_identity,
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=200,
+            help="Number of timed requests per endpoint",
+        )
+        parser.add_argument(
+            "--warmup",
+            type=int,
+            default=20,
+            help="Number of requests per endpoint to make before timing",
+        )
+        parser.add_argument(
+            "--json",
+            action="store_true",
+            dest="as_json",
+            help="Output the results as JSON, e.g. to compare them between runs",
+        )
+        parser.add_argument(
+            "--keep-data",
+            action="store_true",
+            dest="keep_data",
+            help="Keep the seeded data, rather than rolling it back afterwards",
+        )
+
+    def handle(
+        self,
+        *args: Any,
+        requests: int,
+        warmup: int,
+        as_json: bool,
+        keep_data: bool,
+        **options: Any,
+    ) -> None:
+        config = BenchmarkSeedConfig(
+            features=options["features"],
+            segments=options["segments"],
+            conditions_per_segment=options["conditions_per_segment"],
+            identities=options["identities"],
+            traits_per_identity=options["traits_per_identity"],
+        )
+
+        with transaction.atomic():
+            seed = seed_benchmark_data(config)
+            results = run_benchmarks(
+                get_sdk_scenarios(seed), requests=requests, warmup=warmup
+            )
+            transaction.set_rollback(not keep_data)
+
+        if as_json:
+            self.stdout.write(
+                json.dumps([result.to_dict() for result in results], indent=2)
+            )
+            return
+
+        self.stdout.write(
+            f"{'Endpoint':<36}{'p50 (ms)':>10}{'p99 (ms)':>10}"
+            f"{'Queries':>10}{'Alloc (KiB)':>13}"
+        )
+        for result in results:
+            self.stdout.write(
+                f"{result.name:<36}{result.p50_ms:>10.2f}{result.p99_ms:>10.2f}"
+                f"{result.queries_per_request:>10.1f}"
+                f"{result.allocated_kib_per_request:>13.1f}"
+            )
@@ -1,16 +1,21 @@
+from core.middleware.base import SyncAndAsyncMiddleware
 from django.conf import settings
 
 
-class E2ETestMiddleware:
-    def __init__(self, get_response):
-        self.get_response = get_response
+class E2ETestMiddleware(SyncAndAsyncMiddleware):
+    def handle(self, request):
+        self._set_is_e2e(request)
+        return self.get_response(request)
+
+    async def ahandle(self, request):
+        self._set_is_e2e(request)
+        return await self.get_response(request)
 
-    def __call__(self, request):
+    @staticmethod
+    def _set_is_e2e(request) -> None:
         request.is_e2e = False
         if (
             request.META.get("HTTP_X_E2E_TEST_AUTH_TOKEN")
             == settings.E2E_TEST_AUTH_TOKEN
         ):
             request.is_e2e = True
-
-        return self.get_response(request)
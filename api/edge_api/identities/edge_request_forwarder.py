@@ -1,18 +1,88 @@
 import json
+import logging
+import os
+import threading
+import time
+import typing
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 
 import requests
+from core.background_flusher import BackgroundFlusher
 from core.constants import FLAGSMITH_SIGNATURE_HEADER
 from core.signing import sign_payload
 from django.conf import settings
+from requests.adapters import HTTPAdapter
 from task_processor.decorators import register_task_handler
 from task_processor.models import TaskPriority
 
 from environments.dynamodb.migrator import IdentityMigrator
 
+logger = logging.getLogger(__name__)
+
+FORWARDED_REQUEST_KIND_IDENTITY = "identity"
+FORWARDED_REQUEST_KIND_TRAIT = "trait"
+
+ForwardedRequest: typing.TypeAlias = dict[str, typing.Any]
+
+# Identity migrations are never undone, so the projects that have been migrated
+# are remembered for the lifetime of the process. The others are checked again
+# for each request, so that no request is skipped once the migration is done.
+_migrated_project_ids: set[int] = set()
+
+_session: requests.Session | None = None
+_session_pid: int | None = None
+_session_lock = threading.Lock()
+
+_stats = dict.fromkeys(("forwarded", "failed", "skipped"), 0)
+_stats_lock = threading.Lock()
+
 
 def _should_forward(project_id: int) -> bool:
+    if project_id in _migrated_project_ids:
+        return True
+
     migrator = IdentityMigrator(project_id)
-    return bool(migrator.is_migration_done)
+    if migrator.is_migration_done:
+        _migrated_project_ids.add(project_id)
+        return True
+    return False
+
+
+def _get_session() -> requests.Session:
+    """
+    Get the session used to send requests to the edge API, which keeps the
+    connections to it open between requests.
+    """
+    global _session, _session_pid
+
+    # Connections can't be shared with forked processes.
+    if _session_pid == (pid := os.getpid()):
+        return _session
+    with _session_lock:
+        if _session_pid != pid:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_maxsize=settings.EDGE_REQUEST_FORWARDING_MAX_WORKERS
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session, _session_pid = session, pid
+    return _session
+
+
+def get_forwarding_stats() -> dict[str, int]:
+    """
+    Get the number of requests this process has forwarded to the edge API,
+    failed to forward, and skipped since the project isn't migrated yet.
+    """
+    with _stats_lock:
+        return dict(_stats)
+
+
+def _record(stat: str, count: int = 1) -> None:
+    with _stats_lock:
+        _stats[stat] += count
 
 
 @register_task_handler(queue_size=2000, priority=TaskPriority.LOW)
@@ -22,6 +92,18 @@ def forward_identity_request(
     project_id: int,
     query_params: dict = None,
     request_data: dict = None,
+):
+    return forward_identity_request_sync(
+        request_method, headers, project_id, query_params, request_data
+    )
+
+
+def forward_identity_request_sync(
+    request_method: str,
+    headers: dict,
+    project_id: int,
+    query_params: dict = None,
+    request_data: dict = None,
 ):
     if not _should_forward(project_id):
         return
@@ -31,9 +113,14 @@ def forward_identity_request(
         request_method, headers, json.dumps(request_data) if request_data else ""
     )
     if request_method == "POST":
-        requests.post(url, data=json.dumps(request_data), headers=headers, timeout=5)
-        return
-    requests.get(url, params=query_params, headers=headers, timeout=5)
+        response = _get_session().post(
+            url, data=json.dumps(request_data), headers=headers, timeout=5
+        )
+    else:
+        response = _get_session().get(
+            url, params=query_params, headers=headers, timeout=5
+        )
+    response.raise_for_status()
 
 
 @register_task_handler(queue_size=2000, priority=TaskPriority.LOW)
@@ -54,12 +141,13 @@ def forward_trait_request_sync(
 
     url = settings.EDGE_API_URL + "traits/"
     payload = json.dumps(payload)
-    requests.post(
+    response = _get_session().post(
         url,
         data=payload,
         headers=_get_headers(request_method, headers, payload),
         timeout=5,
     )
+    response.raise_for_status()
 
 
 @register_task_handler(queue_size=1000, priority=TaskPriority.LOW)
@@ -69,8 +157,205 @@ def forward_trait_requests(
     project_id: int,
     payload: dict,
 ):
-    for trait_data in payload:
-        forward_trait_request_sync(request_method, headers, project_id, trait_data)
+    _forward_requests(
+        [
+            _get_trait_request(request_method, headers, project_id, trait_data)
+            for trait_data in payload
+        ]
+    )
+
+
+@register_task_handler(queue_size=1000, priority=TaskPriority.LOW)
+def forward_requests(forwarded_requests: list[ForwardedRequest]) -> None:
+    _forward_requests(forwarded_requests)
+
+
+def _forward_requests(forwarded_requests: list[ForwardedRequest]) -> None:
+    """
+    Forward requests to the edge API, up to EDGE_REQUEST_FORWARDING_MAX_WORKERS
+    at a time. The requests for each identity are forwarded one after the other,
+    in the order they were made.
+    """
+    requests_by_identity: dict[tuple, list[ForwardedRequest]] = {}
+    # check each project's migration status once for the whole batch
+    should_forward_by_project_id: dict[int, bool] = {}
+    for forwarded_request in forwarded_requests:
+        project_id = forwarded_request["kwargs"]["project_id"]
+        if project_id not in should_forward_by_project_id:
+            should_forward_by_project_id[project_id] = _should_forward(project_id)
+        if not should_forward_by_project_id[project_id]:
+            _record("skipped")
+            continue
+        requests_by_identity.setdefault(
+            _get_identity_key(forwarded_request), []
+        ).append(forwarded_request)
+
+    started_at = time.perf_counter()
+    workers = min(
+        settings.EDGE_REQUEST_FORWARDING_MAX_WORKERS, len(requests_by_identity)
+    )
+    if workers <= 1:
+        for identity_requests in requests_by_identity.values():
+            _forward_identity_requests(identity_requests)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # consume the results to surface any errors
+            list(
+                executor.map(_forward_identity_requests, requests_by_identity.values())
+            )
+
+    logger.info(
+        "Forwarded %d request(s) to the edge API in %.1fms. Totals: %s",
+        len(forwarded_requests),
+        (time.perf_counter() - started_at) * 1000,
+        ", ".join(f"{name}={count}" for name, count in get_forwarding_stats().items()),
+    )
+
+
+def _forward_identity_requests(forwarded_requests: list[ForwardedRequest]) -> None:
+    for forwarded_request in forwarded_requests:
+        try:
+            if forwarded_request["kind"] == FORWARDED_REQUEST_KIND_IDENTITY:
+                forward_identity_request_sync(**forwarded_request["kwargs"])
+            else:
+                forward_trait_request_sync(**forwarded_request["kwargs"])
+        except requests.RequestException:
+            _record("failed")
+            logger.warning(
+                "Failed to forward %s request for project %d to the edge API",
+                forwarded_request["kind"],
+                forwarded_request["kwargs"]["project_id"],
+                exc_info=True,
+            )
+        else:
+            _record("forwarded")
+
+
+def _get_identity_key(forwarded_request: ForwardedRequest) -> tuple:
+    kwargs = forwarded_request["kwargs"]
+    if forwarded_request["kind"] == FORWARDED_REQUEST_KIND_IDENTITY:
+        identifier = (kwargs["query_params"] or kwargs["request_data"] or {}).get(
+            "identifier"
+        )
+    else:
+        identifier = (kwargs["payload"].get("identity") or {}).get("identifier")
+    return kwargs["headers"].get("X-Environment-Key"), identifier
+
+
+def _get_identity_request(
+    request_method: str,
+    headers: dict,
+    project_id: int,
+    query_params: dict = None,
+    request_data: dict = None,
+) -> ForwardedRequest:
+    return {
+        "kind": FORWARDED_REQUEST_KIND_IDENTITY,
+        "kwargs": {
+            "request_method": request_method,
+            "headers": headers,
+            "project_id": project_id,
+            "query_params": query_params,
+            "request_data": request_data,
+        },
+    }
+
+
+def _get_trait_request(
+    request_method: str, headers: dict, project_id: int, payload: dict
+) -> ForwardedRequest:
+    return {
+        "kind": FORWARDED_REQUEST_KIND_TRAIT,
+        "kwargs": {
+            "request_method": request_method,
+            "headers": headers,
+            "project_id": project_id,
+            "payload": payload,
+        },
+    }
+
+
+class ForwardedRequestsBuffer:
+    """
+    Collects the requests to forward to the edge API in memory, and enqueues
+    them in batches, as `forward_requests` tasks, from a background thread.
+
+    Any requests that are left when the process exits are enqueued on shutdown.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._forwarded_requests: list[ForwardedRequest] = []
+
+        self._flusher = BackgroundFlusher(
+            name=type(self).__name__,
+            flush=self.flush,
+            get_interval=lambda: settings.EDGE_REQUEST_FORWARDING_BUFFER_SECONDS,
+            on_fork=self._reset,
+        )
+
+    def add(self, forwarded_requests: list[ForwardedRequest]) -> None:
+        if not settings.EDGE_REQUEST_FORWARDING_BUFFER_SECONDS:
+            forward_requests.delay(kwargs={"forwarded_requests": forwarded_requests})
+            return
+
+        self._flusher.ensure_started()
+        with self._lock:
+            self._forwarded_requests.extend(forwarded_requests)
+            is_full = (
+                len(self._forwarded_requests)
+                >= settings.EDGE_REQUEST_FORWARDING_MAX_BATCH_SIZE
+            )
+        if is_full:
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            buffered_requests, self._forwarded_requests = self._forwarded_requests, []
+
+        buffered_requests_iterator = iter(buffered_requests)
+        while batch := list(
+            islice(
+                buffered_requests_iterator,
+                settings.EDGE_REQUEST_FORWARDING_MAX_BATCH_SIZE,
+            )
+        ):
+            forward_requests.delay(kwargs={"forwarded_requests": batch})
+
+    def _reset(self) -> None:
+        # the requests inherited from the parent process are its to flush
+        self._lock = threading.Lock()
+        self._forwarded_requests = []
+
+
+forwarded_requests_buffer = ForwardedRequestsBuffer()
+
+
+def queue_identity_request(
+    request_method: str,
+    headers: dict,
+    project_id: int,
+    query_params: dict = None,
+    request_data: dict = None,
+) -> None:
+    forwarded_requests_buffer.add(
+        [
+            _get_identity_request(
+                request_method, headers, project_id, query_params, request_data
+            )
+        ]
+    )
+
+
+def queue_trait_requests(
+    request_method: str, headers: dict, project_id: int, payloads: list[dict]
+) -> None:
+    forwarded_requests_buffer.add(
+        [
+            _get_trait_request(request_method, headers, project_id, payload)
+            for payload in payloads
+        ]
+    )
 
 
 def _get_headers(request_method: str, headers: dict, payload: str = "") -> dict:
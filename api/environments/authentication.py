@@ -1,4 +1,5 @@
 from core.request_origin import RequestOrigin
+from core.server_timing import timed_stage
 from django.conf import settings
 from django.core.cache import caches
 from rest_framework.authentication import BaseAuthentication
@@ -20,6 +21,7 @@ class EnvironmentKeyAuthentication(BaseAuthentication):
         super(EnvironmentKeyAuthentication, self).__init__(*args, **kwargs)
         self.required_key_prefix = required_key_prefix
 
+    @timed_stage("environment_auth")
     def authenticate(self, request):
         api_key = request.META.get("HTTP_X_ENVIRONMENT_KEY")
         if not (api_key and api_key.startswith(self.required_key_prefix)):
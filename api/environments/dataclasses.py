@@ -0,0 +1,36 @@
+import gzip
+import hashlib
+import typing
+from dataclasses import dataclass
+
+from rest_framework.renderers import JSONRenderer
+
+if typing.TYPE_CHECKING:  # pragma: no cover
+    from util.mappers.sdk import SDKDocument
+
+
+@dataclass(frozen=True)
+class EnvironmentDocumentPayload:
+    """
+    Pre-rendered environment document, ready to be written to the response as-is.
+
+    `etag` is derived from the uncompressed content so that it stays the same
+    regardless of the encoding the client negotiates.
+    """
+
+    content: bytes
+    etag: str
+    gzip_content: typing.Optional[bytes] = None
+
+    @classmethod
+    def from_document(
+        cls,
+        environment_document: "SDKDocument",
+        compress: bool = False,
+    ) -> "EnvironmentDocumentPayload":
+        content = JSONRenderer().render(environment_document)
+        return cls(
+            content=content,
+            etag='"%s"' % hashlib.sha256(content).hexdigest()[:32],
+            gzip_content=gzip.compress(content, mtime=0) if compress else None,
+        )
@@ -0,0 +1,401 @@
+"""
+Incremental updates of the environment documents, see `process_environment_update`.
+
+The most common changes, i.e. updating the value or enabled state of a feature
+state or segment override, or editing a segment's rules, are applied by patching
+the stored documents, rather than querying and mapping the whole environment
+again. Any other change, or a document that can't be patched, e.g. since it
+isn't stored yet, falls back to a full rebuild.
+
+Since the documents are patched in place, `rebuild_recently_updated_environment_documents`
+is run periodically to rebuild the documents of the environments that were updated
+recently, logging any that had drifted from the full rebuild.
+
+An environment's documents are locked while they're patched or rebuilt, see
+`environment_documents_lock`, so that a rebuild that read the environment before
+a change can't overwrite the patch for it. A rebuild that takes longer than
+`ENVIRONMENT_DOCUMENT_CACHE_LOCK_TIMEOUT_SECONDS` loses its locks, so a patch
+made after that can still be overwritten until the next periodic rebuild.
+"""
+
+import json
+import logging
+import time
+import typing
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
+from flag_engine.features.models import FeatureStateModel
+from flag_engine.segments.models import SegmentModel
+from pydantic import BaseModel
+from rest_framework.renderers import JSONRenderer
+
+from environments.dataclasses import EnvironmentDocumentPayload
+from environments.dynamodb.wrappers.environment_wrapper import (
+    environment_model_cache,
+)
+from environments.models import (
+    ENVIRONMENT_DOCUMENT_CACHE_LOCK_POLL_INTERVAL_SECONDS,
+    Environment,
+    environment_document_cache,
+    environment_v2_wrapper,
+    environment_wrapper,
+    get_environment_document_payload_cache_key,
+)
+from features.models import FeatureState
+from segments.models import Segment
+from util.mappers.dynamodb import map_engine_value_to_document_value
+from util.mappers.engine import (
+    map_feature_state_to_engine,
+    map_segment_to_engine,
+)
+
+if typing.TYPE_CHECKING:
+    from audit.models import AuditLog
+    from environments.dynamodb.wrappers.environment_wrapper import (
+        BaseDynamoEnvironmentWrapper,
+    )
+    from util.mappers.dynamodb import Document
+
+logger = logging.getLogger(__name__)
+
+DocumentValueEncoder = typing.Callable[[typing.Any], typing.Any]
+
+_HISTORICAL_FEATURE_STATE = "features.models.HistoricalFeatureState"
+_HISTORICAL_FEATURE_STATE_VALUE = "features.models.HistoricalFeatureStateValue"
+_HISTORICAL_SEGMENT = "segments.models.HistoricalSegment"
+_HISTORICAL_CONDITION = "segments.models.HistoricalCondition"
+
+
+@dataclass
+class EnvironmentDocumentPatch:
+    """
+    Replaces a feature state, matched on its id, or a segment's name and rules,
+    in an environment document.
+    """
+
+    feature_state: FeatureStateModel | None = None
+    # the segment that `feature_state` overrides, or the segment to replace
+    segment_id: int | None = None
+    segment: SegmentModel | None = None
+
+    def apply(
+        self,
+        document: dict[str, typing.Any],
+        updated_at: datetime,
+        encode: DocumentValueEncoder,
+    ) -> bool:
+        """
+        Apply the patch to the document, with values encoded as in the document.
+
+        :return: whether the patch could be applied
+        """
+        segment_document = None
+        if self.segment_id is not None:
+            segment_document = next(
+                (
+                    segment_document
+                    for segment_document in document["project"]["segments"]
+                    if segment_document["id"] == self.segment_id
+                ),
+                None,
+            )
+            if segment_document is None:
+                return False
+
+        if self.feature_state:
+            feature_state_documents = (segment_document or document)["feature_states"]
+            for i, feature_state_document in enumerate(feature_state_documents):
+                if feature_state_document["django_id"] == self.feature_state.django_id:
+                    feature_state_documents[i] = encode(self.feature_state)
+                    break
+            else:
+                # e.g. it isn't the feature state version that's live
+                return False
+        elif self.segment:
+            segment_document["name"] = self.segment.name
+            segment_document["rules"] = encode(self.segment.rules)
+
+        document["updated_at"] = encode(updated_at)
+        return True
+
+
+def patch_environment_documents(audit_log: "AuditLog") -> bool:
+    """
+    Apply the change recorded by the audit log to the stored environment documents.
+
+    :return: whether the documents were patched, otherwise they must be rebuilt
+    """
+    if not settings.ENVIRONMENT_DOCUMENT_INCREMENTAL_UPDATES:
+        return False
+
+    if not (patch := get_environment_document_patch(audit_log)):
+        return False
+
+    environments_filter = (
+        {"id": audit_log.environment_id}
+        if audit_log.environment_id
+        else {"project_id": audit_log.project_id}
+    )
+    environments = Environment.objects.filter(**environments_filter).select_related(
+        "project"
+    )
+    return all(
+        _patch_environment_documents_with_lock(environment, patch)
+        for environment in environments
+    )
+
+
+def get_environment_document_patch(
+    audit_log: "AuditLog",
+) -> EnvironmentDocumentPatch | None:
+    """
+    Get the patch for the change recorded by the audit log, if it's a change
+    that can be applied incrementally.
+    """
+    history_record = audit_log.history_record
+    if history_record is None:
+        return None
+
+    history_record_class_path = audit_log.history_record_class_path
+    is_update = history_record.history_type == "~"
+    if history_record_class_path == _HISTORICAL_FEATURE_STATE and is_update:
+        feature_state_id = history_record.id
+    elif history_record_class_path == _HISTORICAL_FEATURE_STATE_VALUE and is_update:
+        feature_state_id = history_record.feature_state_id
+    elif history_record_class_path == _HISTORICAL_SEGMENT and is_update:
+        return _get_segment_patch(history_record.id)
+    elif history_record_class_path == _HISTORICAL_CONDITION:
+        # conditions can be added or removed, since the segment's rules are replaced
+        return _get_segment_patch(audit_log.related_object_id)
+    else:
+        return None
+
+    feature_state = FeatureState.objects.filter(id=feature_state_id).first()
+
+    if not (
+        feature_state
+        and feature_state.environment_id == audit_log.environment_id
+        and feature_state.identity_id is None
+        and not feature_state.environment.use_v2_feature_versioning
+        and feature_state.is_live
+    ):
+        return None
+
+    return EnvironmentDocumentPatch(
+        feature_state=map_feature_state_to_engine(
+            feature_state,
+            mv_fs_values=feature_state.multivariate_feature_state_values.all(),
+        ),
+        segment_id=(
+            feature_state.feature_segment.segment_id
+            if feature_state.feature_segment_id
+            else None
+        ),
+    )
+
+
+@contextmanager
+def environment_documents_lock(
+    environment_id: int | None = None, project_id: int | None = None
+) -> typing.Generator[None, None, None]:
+    """
+    Lock the documents of the environment, or of the project's environments,
+    while they're rebuilt. A patch that can't take the lock falls back to a
+    rebuild, which waits for this one. Waits for any patch in progress, for up
+    to `ENVIRONMENT_DOCUMENT_CACHE_LOCK_TIMEOUT_SECONDS`.
+    """
+    if not settings.ENVIRONMENT_DOCUMENT_INCREMENTAL_UPDATES:
+        yield
+        return
+
+    environments_filter = (
+        {"id": environment_id} if environment_id else {"project_id": project_id}
+    )
+    # Locks are always taken in the same order, so rebuilds can't deadlock.
+    lock_keys = [
+        _get_lock_key(api_key)
+        for api_key in Environment.objects.filter(**environments_filter)
+        .order_by("api_key")
+        .values_list("api_key", flat=True)
+    ]
+    lock_timeout = settings.ENVIRONMENT_DOCUMENT_CACHE_LOCK_TIMEOUT_SECONDS
+    deadline = time.monotonic() + lock_timeout
+    locked_keys = []
+    try:
+        for lock_key in lock_keys:
+            while not environment_document_cache.add(
+                lock_key, True, timeout=lock_timeout
+            ):
+                if time.monotonic() >= deadline:
+                    logger.warning("Timed out waiting for lock %s.", lock_key)
+                    break
+                time.sleep(ENVIRONMENT_DOCUMENT_CACHE_LOCK_POLL_INTERVAL_SECONDS)
+            else:
+                locked_keys.append(lock_key)
+        yield
+    finally:
+        environment_document_cache.delete_many(locked_keys)
+
+
+def rebuild_recently_updated_environment_documents(updated_since: datetime) -> None:
+    """
+    Rebuild the documents of the environments updated since the given time,
+    logging the ones whose cached document doesn't match the rebuilt one.
+    """
+    for environment_id, api_key in Environment.objects.filter(
+        updated_at__gte=updated_since
+    ).values_list("id", "api_key"):
+        with environment_documents_lock(environment_id=environment_id):
+            _rebuild_environment_documents(environment_id, api_key)
+
+
+def _rebuild_environment_documents(environment_id: int, api_key: str) -> None:
+    if settings.CACHE_ENVIRONMENT_DOCUMENT_WRITE_THROUGH:
+        cached_payload = environment_document_cache.get(
+            get_environment_document_payload_cache_key(api_key)
+        )
+        payload = Environment._build_environment_document_payload(api_key)
+        if cached_payload and cached_payload.etag != payload.etag:
+            logger.warning(
+                "Cached document for environment %d didn't match its rebuild.",
+                environment_id,
+            )
+        environment_document_cache.set(
+            get_environment_document_payload_cache_key(api_key),
+            payload,
+            timeout=None,
+        )
+
+    Environment.write_environments_to_dynamodb(environment_id=environment_id)
+
+
+def _get_segment_patch(segment_id: int) -> EnvironmentDocumentPatch | None:
+    segment = (
+        Segment.objects.filter(id=segment_id)
+        .prefetch_related("rules", "rules__rules", "rules__conditions")
+        .first()
+    )
+    # only the current version of a segment is in the document
+    if not segment or segment.version_of_id != segment.id:
+        return None
+    return EnvironmentDocumentPatch(
+        segment_id=segment.id, segment=map_segment_to_engine(segment)
+    )
+
+
+def _patch_environment_documents_with_lock(
+    environment: Environment, patch: EnvironmentDocumentPatch
+) -> bool:
+    # Patching reads the documents and writes them back, so concurrent patches
+    # of the same environment could lose one another's changes. If another patch
+    # or a rebuild is in progress, the documents are rebuilt instead.
+    payload_cache_key = get_environment_document_payload_cache_key(environment.api_key)
+    lock_key = _get_lock_key(environment.api_key)
+    if not environment_document_cache.add(
+        lock_key,
+        True,
+        timeout=settings.ENVIRONMENT_DOCUMENT_CACHE_LOCK_TIMEOUT_SECONDS,
+    ):
+        return False
+    try:
+        return _patch_environment_documents(environment, patch, payload_cache_key)
+    finally:
+        environment_document_cache.delete(lock_key)
+
+
+def _patch_environment_documents(
+    environment: Environment,
+    patch: EnvironmentDocumentPatch,
+    payload_cache_key: str,
+) -> bool:
+    # Patch all the documents before writing any of them, so that a document
+    # that can't be patched doesn't leave the others half updated.
+    payload = None
+    if settings.CACHE_ENVIRONMENT_DOCUMENT_WRITE_THROUGH:
+        payload = _get_patched_payload(environment, patch, payload_cache_key)
+        if not payload:
+            return False
+
+    wrappers = _get_dynamodb_wrappers(environment)
+    environment_document = None
+    if wrappers:
+        environment_document = _get_patched_dynamodb_document(environment, patch)
+        if not environment_document:
+            return False
+
+    if payload:
+        environment_document_cache.set(payload_cache_key, payload, timeout=None)
+    for wrapper in wrappers:
+        wrapper.write_environment_documents([environment_document])
+    if wrappers:
+        environment_model_cache.delete_many([environment.api_key])
+
+    return True
+
+
+def _get_lock_key(api_key: str) -> str:
+    return f"{get_environment_document_payload_cache_key(api_key)}:documents-lock"
+
+
+def _get_patched_payload(
+    environment: Environment,
+    patch: EnvironmentDocumentPatch,
+    payload_cache_key: str,
+) -> EnvironmentDocumentPayload | None:
+    if not (cached_payload := environment_document_cache.get(payload_cache_key)):
+        return None
+    sdk_document = json.loads(cached_payload.content)
+    if not patch.apply(sdk_document, environment.updated_at, _encode_sdk_value):
+        return None
+    return EnvironmentDocumentPayload.from_document(
+        sdk_document, compress=settings.COMPRESS_ENVIRONMENT_DOCUMENT
+    )
+
+
+def _get_patched_dynamodb_document(
+    environment: Environment, patch: EnvironmentDocumentPatch
+) -> "Document | None":
+    try:
+        # an eventually consistent read could miss a patch written just before,
+        # which would then be reverted by writing this one
+        environment_document = environment_wrapper.get_item(
+            environment.api_key, consistent=True
+        )
+    except ObjectDoesNotExist:
+        return None
+    if not patch.apply(
+        environment_document,
+        environment.updated_at,
+        map_engine_value_to_document_value,
+    ):
+        return None
+    return environment_document
+
+
+def _get_dynamodb_wrappers(
+    environment: Environment,
+) -> list["BaseDynamoEnvironmentWrapper"]:
+    # see `Environment.write_environments_to_dynamodb`
+    if not (environment.project.enable_dynamo_db and environment_wrapper.is_enabled):
+        return []
+    if (
+        environment.project.edge_v2_environments_migrated
+        and environment_v2_wrapper.is_enabled
+    ):
+        return [environment_wrapper, environment_v2_wrapper]
+    return [environment_wrapper]
+
+
+def _encode_sdk_value(value: typing.Any) -> typing.Any:
+    # Encode the value as `map_environment_to_sdk_document` does, once rendered.
+    if isinstance(value, BaseModel):
+        value = value.model_dump()
+    elif isinstance(value, list):
+        value = [
+            item.model_dump() if isinstance(item, BaseModel) else item for item in value
+        ]
+    return json.loads(JSONRenderer().render(value))
@@ -8,3 +8,4 @@ ENVIRONMENTS_V2_SECONDARY_INDEX_PARTITION_KEY = "environment_api_key"
 
 DYNAMODB_MAX_BATCH_WRITE_ITEM_COUNT = 25
 IDENTITIES_PAGINATION_LIMIT = 1000
+DYNAMODB_MAX_ITEM_SIZE_BYTES = 400 * 1024
@@ -1,4 +1,11 @@
-from django.db.models import Prefetch
+import logging
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from queue import SimpleQueue
+
+from django.conf import settings
+from django.db.models import Prefetch, QuerySet
 
 from edge_api.identities.events import send_migration_event
 from environments.identities.models import Identity
@@ -6,7 +13,7 @@ from environments.models import Environment, EnvironmentAPIKey
 from features.models import FeatureState
 from features.multivariate.models import MultivariateFeatureStateValue
 from projects.models import Project
-from util.queryset import iterator_with_prefetch
+from util.queryset import iter_chunks_with_prefetch
 
 from .types import DynamoProjectMetadata, ProjectIdentityMigrationStatus
 from .wrappers import (
@@ -14,6 +21,9 @@ from .wrappers import (
     DynamoEnvironmentWrapper,
     DynamoIdentityWrapper,
 )
+from .wrappers.identity_wrapper import iter_identity_documents
+
+logger = logging.getLogger(__name__)
 
 
 class IdentityMigrator:
@@ -36,6 +46,13 @@ class IdentityMigrator:
             ProjectIdentityMigrationStatus.MIGRATION_SCHEDULED,
         )
 
+    @property
+    def can_resume(self) -> bool:
+        return (
+            self.migration_status
+            == ProjectIdentityMigrationStatus.MIGRATION_IN_PROGRESS
+        )
+
     def trigger_migration(self):
         # Note: since we mark the project as `migration in progress` before we start the migration,
         # there is a small chance for the project of being stuck in `migration in progress`
@@ -45,7 +62,14 @@ class IdentityMigrator:
         self.project_metadata.trigger_identity_migration()
 
     def migrate(self):
-        self.project_metadata.start_identity_migration()
+        """
+        Migrate the project's environments and identities to DynamoDB.
+
+        If a previous migration of the project was interrupted, the identities
+        it migrated are skipped, and the migration carries on from there.
+        """
+        if not self.can_resume:
+            self.project_metadata.start_identity_migration()
 
         project_id = self.project_metadata.id
 
@@ -60,7 +84,6 @@ class IdentityMigrator:
         api_keys = EnvironmentAPIKey.objects.filter(environment__project_id=project_id)
         api_key_wrapper.write_api_keys(api_keys)
 
-        identity_wrapper = DynamoIdentityWrapper()
         identities = (
             Identity.objects.filter(environment__project__id=project_id)
             .select_related("environment")
@@ -80,5 +103,73 @@ class IdentityMigrator:
                 ),
             )
         )
-        identity_wrapper.write_identities(iterator_with_prefetch(identities))
+        if last_migrated_identity_id := self.project_metadata.last_migrated_identity_id:
+            logger.info(
+                "Resuming identity migration for project %d after identity %d",
+                project_id,
+                last_migrated_identity_id,
+            )
+            identities = identities.filter(id__gt=last_migrated_identity_id)
+
+        self._write_identities(identities)
         self.project_metadata.finish_identity_migration()
+
+    def _write_identities(self, identities: QuerySet[Identity]) -> None:
+        """
+        Write the identities to DynamoDB in chunks, from a pool of writer threads.
+
+        Progress is checkpointed once every chunk up to and including a
+        given one has been written.
+        """
+        workers = settings.IDENTITY_MIGRATION_WRITE_WORKERS
+
+        # boto3 resources can't be shared between threads, so each thread
+        # borrows an identity wrapper whose table was set up on this one.
+        identity_wrappers: SimpleQueue[DynamoIdentityWrapper] = SimpleQueue()
+        for _ in range(workers):
+            identity_wrapper = DynamoIdentityWrapper()
+            if not identity_wrapper.is_enabled:
+                raise RuntimeError("Identities table is not configured.")
+            identity_wrappers.put(identity_wrapper)
+
+        def write_identity_documents(identity_documents: list[dict]) -> None:
+            identity_wrapper = identity_wrappers.get()
+            try:
+                identity_wrapper.write_identity_documents(identity_documents)
+            finally:
+                identity_wrappers.put(identity_wrapper)
+
+        pending_chunks: deque[tuple[Future, int, int]] = deque()
+        migrated_count = 0
+        started_at = time.monotonic()
+
+        def checkpoint_oldest_chunk() -> None:
+            nonlocal migrated_count
+            future, last_identity_id, count = pending_chunks.popleft()
+            future.result()
+            self.project_metadata.checkpoint_identity_migration(last_identity_id)
+            migrated_count += count
+            logger.info(
+                "Migrated %d identities for project %d (%.0f identities/s)",
+                migrated_count,
+                self.project_metadata.id,
+                migrated_count / max(time.monotonic() - started_at, 1e-3),
+            )
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for chunk in iter_chunks_with_prefetch(
+                identities, settings.IDENTITY_MIGRATION_CHUNK_SIZE
+            ):
+                future = executor.submit(
+                    write_identity_documents, list(iter_identity_documents(chunk))
+                )
+                pending_chunks.append((future, chunk[-1].id, len(chunk)))
+
+                # don't read further ahead than the writers can keep up with
+                while pending_chunks and (
+                    len(pending_chunks) > workers or pending_chunks[0][0].done()
+                ):
+                    checkpoint_oldest_chunk()
+
+            while pending_chunks:
+                checkpoint_oldest_chunk()
@@ -0,0 +1,124 @@
+"""
+Writes environments to the DynamoDB environment tables.
+
+Each environment is mapped to its document once, in a bounded thread pool,
+and the documents are then written to every table concurrently. The time
+spent in each stage is logged, to help track down propagation latency.
+"""
+
+import logging
+import time
+import typing
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import connections
+
+from environments.dynamodb.wrappers.environment_wrapper import (
+    environment_model_cache,
+)
+from util.mappers import map_environment_to_environment_document
+
+if typing.TYPE_CHECKING:
+    from environments.dynamodb.wrappers.environment_wrapper import (
+        BaseDynamoEnvironmentWrapper,
+    )
+    from environments.models import Environment
+    from util.mappers.dynamodb import Document
+
+logger = logging.getLogger(__name__)
+
+
+def write_environments_to_tables(
+    environments: list["Environment"],
+    wrappers: list["BaseDynamoEnvironmentWrapper"],
+) -> None:
+    timings: dict[str, float] = {}
+
+    with _timed(timings, "map"):
+        environment_documents = map_environments_to_environment_documents(environments)
+
+    try:
+        with _timed(timings, "write"):
+            if len(wrappers) == 1:
+                _write_environment_documents(
+                    wrappers[0], environment_documents, timings
+                )
+            else:
+                with ThreadPoolExecutor(max_workers=len(wrappers)) as executor:
+                    futures = [
+                        executor.submit(
+                            _write_environment_documents,
+                            wrapper,
+                            environment_documents,
+                            timings,
+                        )
+                        for wrapper in wrappers
+                    ]
+                # consume the results to surface any errors, e.g. for the
+                # documents that were too large to write
+                for future in futures:
+                    future.result()
+    finally:
+        # evict the written documents, even if others failed to be written;
+        # other processes will notice the new version of the documents themselves
+        environment_model_cache.delete_many(
+            environment.api_key for environment in environments
+        )
+
+    logger.info(
+        "Wrote %d environment(s) to DynamoDB: %s",
+        len(environments),
+        ", ".join(
+            f"{stage}={seconds * 1000:.1f}ms" for stage, seconds in timings.items()
+        ),
+    )
+
+
+def map_environments_to_environment_documents(
+    environments: list["Environment"],
+) -> list["Document"]:
+    workers = min(settings.DYNAMODB_ENVIRONMENT_MAPPING_MAX_WORKERS, len(environments))
+    if workers <= 1:
+        return [
+            map_environment_to_environment_document(environment)
+            for environment in environments
+        ]
+
+    chunks = [environments[i::workers] for i in range(workers)]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return [
+            environment_document
+            for environment_documents in executor.map(_map_chunk, chunks)
+            for environment_document in environment_documents
+        ]
+
+
+def _map_chunk(environments: list["Environment"]) -> list["Document"]:
+    try:
+        return [
+            map_environment_to_environment_document(environment)
+            for environment in environments
+        ]
+    finally:
+        # mapping can query the database, which opens a connection per thread
+        connections.close_all()
+
+
+def _write_environment_documents(
+    wrapper: "BaseDynamoEnvironmentWrapper",
+    environment_documents: list["Document"],
+    timings: dict[str, float],
+) -> None:
+    with _timed(timings, f"write[{wrapper.get_table_name()}]"):
+        wrapper.write_environment_documents(environment_documents)
+
+
+@contextmanager
+def _timed(timings: dict[str, float], stage: str) -> typing.Generator[None, None, None]:
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = time.perf_counter() - started_at
@@ -35,6 +35,7 @@ class DynamoProjectMetadata:
     migration_start_time: str = None
     migration_end_time: str = None
     triggered_at: str = None
+    last_migrated_identity_id: int = None
 
     @classmethod
     def get_or_new(cls, project_id: int) -> "DynamoProjectMetadata":
@@ -67,6 +68,13 @@ class DynamoProjectMetadata:
         self.migration_start_time = datetime.now().isoformat()
         self._save()
 
+    def checkpoint_identity_migration(self, last_migrated_identity_id: int):
+        """
+        Record the progress of an identity migration, so that it can be resumed.
+        """
+        self.last_migrated_identity_id = last_migrated_identity_id
+        self._save()
+
     def finish_identity_migration(self):
         if self.migration_end_time:
             raise AttributeError("Migration has already been finished.")
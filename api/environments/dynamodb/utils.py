@@ -1,3 +1,7 @@
+import typing
+from decimal import Decimal
+
+
 def get_environments_v2_identity_override_document_key(
     feature_id: int | None = None,
     identity_uuid: str | None = None,
@@ -11,3 +15,38 @@ def get_environments_v2_identity_override_document_key(
     if identity_uuid is None:
         return f"identity_override:{feature_id}:"
     return f"identity_override:{feature_id}:{identity_uuid}"
+
+
+def get_dynamodb_item_size(item: dict[str, typing.Any]) -> int:
+    """
+    Estimate the size, in bytes, that DynamoDB will count for an item, following
+    https://docs.aws.amazon.com/amazondynamodb/latest/developerguide/CapacityUnitCalculations.html
+
+    The estimate errs on the large side for numbers, so it can be checked
+    against DynamoDB's item size limit before writing.
+    """
+    return sum(
+        len(name.encode()) + _get_attribute_value_size(value)
+        for name, value in item.items()
+    )
+
+
+def _get_attribute_value_size(value: typing.Any) -> int:
+    if isinstance(value, str):
+        return len(value.encode())
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if value is None or isinstance(value, bool):
+        return 1
+    if isinstance(value, (int, float, Decimal)):
+        return len(str(value)) // 2 + 2
+    if isinstance(value, dict):
+        return 3 + sum(
+            len(name.encode()) + _get_attribute_value_size(item_value) + 1
+            for name, item_value in value.items()
+        )
+    if isinstance(value, (list, tuple, set)):
+        return 3 + sum(
+            _get_attribute_value_size(item_value) + 1 for item_value in value
+        )
+    return len(str(value).encode())
@@ -1,34 +1,49 @@
+import logging
 import typing
+from abc import ABC, abstractmethod
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Any, Iterable
 
 from boto3.dynamodb.conditions import Key
+from core.two_tier_cache import LocalCache
 from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
 
 from environments.dynamodb.constants import (
     DYNAMODB_MAX_BATCH_WRITE_ITEM_COUNT,
+    DYNAMODB_MAX_ITEM_SIZE_BYTES,
     ENVIRONMENTS_V2_PARTITION_KEY,
     ENVIRONMENTS_V2_SORT_KEY,
 )
 from environments.dynamodb.types import IdentityOverridesV2Changeset
 from environments.dynamodb.utils import (
+    get_dynamodb_item_size,
     get_environments_v2_identity_override_document_key,
 )
 from util.mappers import (
+    map_environment_document_to_environment_v2_document,
     map_environment_to_environment_document,
-    map_environment_to_environment_v2_document,
     map_identity_override_to_identity_override_document,
 )
 from util.util import iter_paired_chunks
 
 from .base import BaseDynamoWrapper
+from .exceptions import EnvironmentDocumentsTooLarge
 
 if typing.TYPE_CHECKING:
     from mypy_boto3_dynamodb.type_defs import QueryInputRequestTypeDef
 
     from environments.models import Environment
+    from util.mappers.dynamodb import Document
+
+logger = logging.getLogger(__name__)
+
+# Validated engine models of the environment documents, by api key.
+environment_model_cache = LocalCache(
+    max_entries=settings.EDGE_ENVIRONMENT_MODEL_CACHE_MAX_ENTRIES,
+    timeout=settings.EDGE_ENVIRONMENT_MODEL_CACHE_SECONDS,
+)
 
 
 @dataclass
@@ -37,11 +52,55 @@ class IdentityOverridesQueryResponse:
     is_num_identity_overrides_complete: bool
 
 
-class BaseDynamoEnvironmentWrapper(BaseDynamoWrapper):
+class BaseDynamoEnvironmentWrapper(BaseDynamoWrapper, ABC):
     def write_environment(self, environment: "Environment") -> None:
         self.write_environments([environment])
 
     def write_environments(self, environments: Iterable["Environment"]) -> None:
+        self.write_environment_documents(
+            map_environment_to_environment_document(environment)
+            for environment in environments
+        )
+
+    def write_environment_documents(
+        self, environment_documents: Iterable["Document"]
+    ) -> None:
+        """
+        Write environments to the table, given their environment documents.
+
+        Items that exceed DynamoDB's item size limit are skipped, rather than
+        failing the whole batch, and `EnvironmentDocumentsTooLarge` is raised
+        for them once the other items are written.
+        """
+        items = []
+        oversized_api_keys = []
+        for environment_document in environment_documents:
+            item = self.map_environment_document_to_item(environment_document)
+            item_size = get_dynamodb_item_size(item)
+            if item_size > DYNAMODB_MAX_ITEM_SIZE_BYTES:
+                logger.error(
+                    "Environment %s is too large to write to %s (%d bytes)",
+                    environment_document["api_key"],
+                    self.get_table_name(),
+                    item_size,
+                )
+                oversized_api_keys.append(environment_document["api_key"])
+                continue
+            items.append(item)
+
+        with self.table.batch_writer() as writer:
+            for item in items:
+                writer.put_item(Item=item)
+
+        if oversized_api_keys:
+            raise EnvironmentDocumentsTooLarge(
+                self.get_table_name(), oversized_api_keys
+            )
+
+    @abstractmethod
+    def map_environment_document_to_item(
+        self, environment_document: "Document"
+    ) -> "Document":
         raise NotImplementedError()
 
 
@@ -49,16 +108,20 @@ class DynamoEnvironmentWrapper(BaseDynamoEnvironmentWrapper):
     def get_table_name(self) -> str | None:
         return settings.ENVIRONMENTS_TABLE_NAME_DYNAMO
 
-    def write_environments(self, environments: Iterable["Environment"]):
-        with self.table.batch_writer() as writer:
-            for environment in environments:
-                writer.put_item(
-                    Item=map_environment_to_environment_document(environment),
-                )
+    def map_environment_document_to_item(
+        self, environment_document: "Document"
+    ) -> "Document":
+        return environment_document
 
-    def get_item(self, api_key: str) -> dict:
+    def get_item(self, api_key: str, consistent: bool = False) -> dict:
+        """
+        :param consistent: read the item with a strongly consistent read, e.g. to
+            update it, rather than an eventually consistent one
+        """
         try:
-            return self.table.get_item(Key={"api_key": api_key})["Item"]
+            return self.table.get_item(
+                Key={"api_key": api_key}, ConsistentRead=consistent
+            )["Item"]
         except KeyError as e:
             raise ObjectDoesNotExist() from e
 
@@ -158,12 +221,10 @@ class DynamoEnvironmentV2Wrapper(BaseDynamoEnvironmentWrapper):
                         ),
                     )
 
-    def write_environments(self, environments: Iterable["Environment"]) -> None:
-        with self.table.batch_writer() as writer:
-            for environment in environments:
-                writer.put_item(
-                    Item=map_environment_to_environment_v2_document(environment),
-                )
+    def map_environment_document_to_item(
+        self, environment_document: "Document"
+    ) -> "Document":
+        return map_environment_document_to_environment_v2_document(environment_document)
 
     def delete_environment(self, environment_id: int):
         environment_id = str(environment_id)
@@ -9,3 +9,17 @@ class CapacityBudgetExceeded(Exception):
     ) -> None:
         self.capacity_budget = capacity_budget
         self.capacity_spent = capacity_spent
+
+
+class EnvironmentDocumentsTooLarge(Exception):
+    def __init__(
+        self,
+        table_name: str | None,
+        api_keys: list[str],
+    ) -> None:
+        super().__init__(
+            f"Environment(s) {', '.join(api_keys)} are too large to write to "
+            f"{table_name}"
+        )
+        self.table_name = table_name
+        self.api_keys = api_keys
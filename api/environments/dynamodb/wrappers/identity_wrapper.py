@@ -18,7 +18,10 @@ from environments.dynamodb.wrappers.exceptions import CapacityBudgetExceeded
 from util.mappers import map_identity_to_identity_document
 
 from .base import BaseDynamoWrapper
-from .environment_wrapper import DynamoEnvironmentWrapper
+from .environment_wrapper import (
+    DynamoEnvironmentWrapper,
+    environment_model_cache,
+)
 
 if typing.TYPE_CHECKING:
     from boto3.dynamodb.conditions import ConditionBase
@@ -33,6 +36,22 @@ if typing.TYPE_CHECKING:
 logger = logging.getLogger()
 
 
+def iter_identity_documents(
+    identities: Iterable["Identity"],
+) -> typing.Generator[dict, None, None]:
+    """
+    Map identities to their documents, skipping those that can't be written.
+    """
+    for identity in identities:
+        identity_document = map_identity_to_identity_document(identity)
+        # Since sort keys can not be greater than 1024
+        # https://docs.aws.amazon.com/amazondynamodb/latest/developerguide/ServiceQuotas.html#limits-partition-sort-keys
+        if len(identity_document["identifier"]) > 1024:
+            logger.warning(f"Can't migrate identity {identity.id}; identifier too long")
+            continue
+        yield identity_document
+
+
 class DynamoIdentityWrapper(BaseDynamoWrapper):
     def get_table_name(self) -> str | None:
         return settings.IDENTITIES_TABLE_NAME_DYNAMO
@@ -44,16 +63,11 @@ class DynamoIdentityWrapper(BaseDynamoWrapper):
         self.table.put_item(Item=identity_dict)
 
     def write_identities(self, identities: Iterable["Identity"]):
+        self.write_identity_documents(iter_identity_documents(identities))
+
+    def write_identity_documents(self, identity_documents: Iterable[dict]):
         with self.table.batch_writer() as batch:
-            for identity in identities:
-                identity_document = map_identity_to_identity_document(identity)
-                # Since sort keys can not be greater than 1024
-                # https://docs.aws.amazon.com/amazondynamodb/latest/developerguide/ServiceQuotas.html#limits-partition-sort-keys
-                if len(identity_document["identifier"]) > 1024:
-                    logger.warning(
-                        f"Can't migrate identity {identity.id}; identifier too long"
-                    )
-                    continue
+            for identity_document in identity_documents:
                 batch.put_item(Item=identity_document)
 
     def get_item(self, composite_key: str) -> typing.Optional[dict]:
@@ -183,11 +197,32 @@ class DynamoIdentityWrapper(BaseDynamoWrapper):
             identity = identity_model or IdentityModel.model_validate(
                 self.get_item_from_uuid(identity_pk)
             )
-            environment_wrapper = DynamoEnvironmentWrapper()
-            environment = EnvironmentModel.model_validate(
-                environment_wrapper.get_item(identity.environment_api_key)
-            )
+            environment = self._get_environment_model(identity.environment_api_key)
             segments = get_identity_segments(environment, identity)
             return [segment.id for segment in segments]
 
         return []
+
+    @staticmethod
+    def _get_environment_model(api_key: str) -> EnvironmentModel:
+        """
+        Get the engine model of an environment's document, reading and
+        validating the document only when the environment has changed since
+        it was last cached by this process.
+        """
+        from environments.models import Environment
+
+        updated_at = (
+            Environment.objects.filter(api_key=api_key)
+            .values_list("updated_at", flat=True)
+            .first()
+        )
+        environment = environment_model_cache.get(api_key, default=None)
+        if environment and environment.updated_at == updated_at:
+            return environment
+
+        environment = EnvironmentModel.model_validate(
+            DynamoEnvironmentWrapper().get_item(api_key)
+        )
+        environment_model_cache.set(api_key, environment)
+        return environment
@@ -1,10 +1,12 @@
 import typing
 from itertools import chain
+from operator import attrgetter
 
+from core.server_timing import timed_stage
+from django.conf import settings
 from django.db import models
 from django.db.models import Prefetch, Q
 from django.utils import timezone
-from flag_engine.segments.evaluator import evaluate_identity_in_segment
 
 from environments.identities.managers import IdentityManager
 from environments.identities.traits.models import Trait
@@ -12,12 +14,14 @@ from environments.models import Environment
 from environments.sdk.types import SDKTraitData
 from features.models import FeatureState
 from features.multivariate.models import MultivariateFeatureStateValue
-from segments.models import Segment
-from util.mappers.engine import (
-    map_identity_to_engine,
-    map_segment_to_engine,
-    map_traits_to_engine,
+from segments.evaluator import (
+    IdentityKey,
+    SegmentSnapshot,
+    TraitValuesByKey,
+    get_compiled_segment,
+    get_trait_values_by_key,
 )
+from util.mappers.engine import map_traits_to_engine
 
 
 class Identity(models.Model):
@@ -55,6 +59,7 @@ class Identity(models.Model):
             else str(self.id)
         )
 
+    @timed_stage("feature_states")
     def get_all_feature_states(
         self,
         traits: list[Trait] | None = None,
@@ -72,6 +77,80 @@ class Identity(models.Model):
         :return: (list) flags for an identity with the correct values based on
             identity / segment priorities
         """
+        if settings.ENVIRONMENT_FEATURE_STATES_CACHE_SECONDS > 0:
+            all_flags = self._get_candidate_feature_states_from_cache(
+                traits, additional_filters
+            )
+        else:
+            all_flags = self._get_candidate_feature_states_from_db(
+                traits, additional_filters
+            )
+
+        return self._get_highest_priority_feature_states(all_flags)
+
+    @classmethod
+    @timed_stage("feature_states")
+    def get_all_feature_states_for_identities(
+        cls,
+        environment: Environment,
+        identities_and_traits: list[tuple["Identity", list[Trait] | None]],
+        additional_filters: Q | None = None,
+    ) -> list[list[FeatureState]]:
+        """
+        Get all feature states for a number of identities in the same environment,
+        see `get_all_feature_states`.
+
+        The environment defaults and segment overrides are loaded once, from the
+        environment's cached feature states, and the identity overrides for all
+        the identities are loaded in a single query.
+
+        :return: the flags for each of the identities, in the order given
+        """
+        environment_feature_states = environment.get_feature_states_from_cache(
+            additional_filters
+        )
+        identity_overrides = cls._get_identity_overrides(
+            environment,
+            # skip identity overrides for transient identities
+            [identity.id for identity, _ in identities_and_traits if identity.id],
+            additional_filters,
+        )
+        return [
+            identity._get_highest_priority_feature_states(
+                identity._get_candidate_feature_states(
+                    environment_feature_states,
+                    identity_overrides.get(identity.id, []),
+                    traits,
+                )
+            )
+            for identity, traits in identities_and_traits
+        ]
+
+    def _get_highest_priority_feature_states(
+        self, all_flags: typing.Iterable[FeatureState]
+    ) -> list[FeatureState]:
+        # iterate over all the flags and build a dictionary keyed on feature with the highest priority flag
+        # for the given identity as the value.
+        identity_flags = {}
+        for flag in all_flags:
+            if flag.feature_id not in identity_flags:
+                identity_flags[flag.feature_id] = flag
+            else:
+                current_flag = identity_flags[flag.feature_id]
+                if flag > current_flag:
+                    identity_flags[flag.feature_id] = flag
+
+        if self.environment.get_hide_disabled_flags() is True:
+            # filter out any flags that are disabled
+            return [value for value in identity_flags.values() if value.enabled]
+
+        return list(identity_flags.values())
+
+    def _get_candidate_feature_states_from_db(
+        self,
+        traits: list[Trait] | None,
+        additional_filters: Q | None,
+    ) -> typing.Iterable[FeatureState]:
         segments = self.get_segments(traits=traits, overrides_only=True)
 
         # define sub queries
@@ -82,7 +161,7 @@ class Identity(models.Model):
             # skip identity overrides for transient identities
             overridden_for_identity_query = Q()
         overridden_for_segment_query = Q(
-            feature_segment__segment__in=segments,
+            feature_segment__segment_id__in=[segment.id for segment in segments],
             feature_segment__environment=self.environment,
         )
         environment_default_query = Q(identity=None, feature_segment=None)
@@ -117,7 +196,7 @@ class Identity(models.Model):
             "identity",
         ]
 
-        all_flags = (
+        return (
             FeatureState.objects.select_related(*select_related_args)
             .prefetch_related(
                 Prefetch(
@@ -130,22 +209,107 @@ class Identity(models.Model):
             .filter(full_query)
         )
 
-        # iterate over all the flags and build a dictionary keyed on feature with the highest priority flag
-        # for the given identity as the value.
-        identity_flags = {}
-        for flag in all_flags:
-            if flag.feature_id not in identity_flags:
-                identity_flags[flag.feature_id] = flag
-            else:
-                current_flag = identity_flags[flag.feature_id]
-                if flag > current_flag:
-                    identity_flags[flag.feature_id] = flag
+    def _get_candidate_feature_states_from_cache(
+        self,
+        traits: list[Trait] | None,
+        additional_filters: Q | None,
+    ) -> list[FeatureState]:
+        """
+        Equivalent to `_get_candidate_feature_states_from_db`, but only the identity
+        overrides are read from the database. The environment defaults and segment
+        overrides come from the environment's cached feature states, and segments
+        are evaluated in memory.
+        """
+        identity_overrides = (
+            self._get_identity_overrides(
+                self.environment, [self.id], additional_filters
+            ).get(self.id, [])
+            # skip identity overrides for transient identities
+            if self.id
+            else []
+        )
+        return self._get_candidate_feature_states(
+            self.environment.get_feature_states_from_cache(additional_filters),
+            identity_overrides,
+            traits,
+        )
 
-        if self.environment.get_hide_disabled_flags() is True:
-            # filter out any flags that are disabled
-            return [value for value in identity_flags.values() if value.enabled]
+    def _get_candidate_feature_states(
+        self,
+        environment_feature_states: list[FeatureState],
+        identity_overrides: list[FeatureState],
+        traits: list[Trait] | None,
+    ) -> list[FeatureState]:
+        now = timezone.now()
+        use_v2_feature_versioning = self.environment.use_v2_feature_versioning
+        trait_values, identity_key = self.get_segment_evaluation_args(traits)
+        segment_matches: dict[int, bool] = {}
+
+        candidates = []
+        for feature_state in environment_feature_states:
+            live_from = (
+                feature_state.environment_feature_version.live_from
+                if use_v2_feature_versioning
+                else feature_state.live_from
+            )
+            if live_from is None or live_from > now:
+                continue
 
-        return list(identity_flags.values())
+            if feature_state.feature_segment_id:
+                segment = feature_state.feature_segment.segment
+                if segment.id not in segment_matches:
+                    segment_matches[segment.id] = get_compiled_segment(
+                        segment
+                    ).evaluate(trait_values, identity_key)
+                if not segment_matches[segment.id]:
+                    continue
+
+            candidates.append(feature_state)
+
+        candidates.extend(identity_overrides)
+
+        # match the ordering of the database query, so that ties between
+        # feature states are resolved in the same way
+        return sorted(candidates, key=attrgetter("id"))
+
+    @staticmethod
+    def _get_identity_overrides(
+        environment: Environment,
+        identity_ids: list[int],
+        additional_filters: Q | None,
+    ) -> dict[int, list[FeatureState]]:
+        """
+        :return: the live identity overrides in the environment, keyed on identity id
+        """
+        if not identity_ids:
+            return {}
+
+        identity_overrides = FeatureState.objects.filter(
+            environment=environment, identity_id__in=identity_ids
+        )
+        if not environment.use_v2_feature_versioning:
+            # identity overrides are not versioned in v2 versioning
+            identity_overrides = identity_overrides.filter(
+                live_from__lte=timezone.now(), version__isnull=False
+            )
+        if additional_filters:
+            identity_overrides = identity_overrides.filter(additional_filters)
+
+        identity_overrides_by_identity_id: dict[int, list[FeatureState]] = {}
+        for identity_override in identity_overrides.select_related(
+            "environment", "feature", "feature_state_value", "identity"
+        ).prefetch_related(
+            Prefetch(
+                "multivariate_feature_state_values",
+                queryset=MultivariateFeatureStateValue.objects.select_related(
+                    "multivariate_feature_option"
+                ),
+            )
+        ):
+            identity_overrides_by_identity_id.setdefault(
+                identity_override.identity_id, []
+            ).append(identity_override)
+        return identity_overrides_by_identity_id
 
     def get_overridden_feature_states(self) -> dict[int, FeatureState]:
         """
@@ -156,9 +320,10 @@ class Identity(models.Model):
 
         return {fs.feature_id: fs for fs in self.identity_features.all()}
 
+    @timed_stage("segment_evaluation")
     def get_segments(
         self, traits: typing.List[Trait] = None, overrides_only: bool = False
-    ) -> typing.List[Segment]:
+    ) -> typing.List[SegmentSnapshot]:
         """
         Get the list of segments this identity is a part of.
 
@@ -167,34 +332,31 @@ class Identity(models.Model):
         :return: List of matching segments
         """
         matching_segments = []
-        traits = (
-            self.identity_traits.all() if (traits is None and self.id) else traits or []
-        )
 
         if overrides_only:
             all_segments = self.environment.get_segments_from_cache()
         else:
             all_segments = self.environment.project.get_segments_from_cache()
 
-        engine_identity = map_identity_to_engine(
-            self,
-            with_overrides=False,
-            with_traits=False,
-        )
-        engine_traits = map_traits_to_engine(traits)
+        trait_values, identity_key = self.get_segment_evaluation_args(traits)
 
         for segment in all_segments:
-            engine_segment = map_segment_to_engine(segment)
-
-            if evaluate_identity_in_segment(
-                identity=engine_identity,
-                segment=engine_segment,
-                override_traits=engine_traits,
-            ):
+            if get_compiled_segment(segment).evaluate(trait_values, identity_key):
                 matching_segments.append(segment)
 
         return matching_segments
 
+    def get_segment_evaluation_args(
+        self, traits: typing.List[Trait] | None = None
+    ) -> tuple[TraitValuesByKey, IdentityKey]:
+        traits = (
+            self.identity_traits.all() if (traits is None and self.id) else traits or []
+        )
+        trait_values = get_trait_values_by_key(map_traits_to_engine(traits))
+        # Transient identities are hashed using their composite key,
+        # matching the engine's behaviour.
+        return trait_values, self.id or self.composite_key
+
     def get_all_user_traits(self):
         # this is pointless, we should probably replace all uses with the below code
         return self.identity_traits.all()
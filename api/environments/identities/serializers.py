@@ -64,6 +64,10 @@ class SDKIdentitiesResponseSerializer(serializers.Serializer):
     traits = serializers.ListSerializer(child=_TraitSerializer())
 
 
+class SDKBulkIdentitiesResponseSerializer(serializers.Serializer):
+    identities = serializers.ListField(child=SDKIdentitiesResponseSerializer())
+
+
 class SDKIdentitiesQuerySerializer(serializers.Serializer):
     identifier = serializers.CharField(required=True)
     transient = serializers.BooleanField(default=False)
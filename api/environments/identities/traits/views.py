@@ -9,10 +9,7 @@ from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from edge_api.identities.edge_request_forwarder import (
-    forward_trait_request,
-    forward_trait_requests,
-)
+from edge_api.identities.edge_request_forwarder import queue_trait_requests
 from environments.authentication import EnvironmentKeyAuthentication
 from environments.identities.models import Identity
 from environments.identities.traits.models import Trait
@@ -199,13 +196,11 @@ class SDKTraits(mixins.CreateModelMixin, viewsets.GenericViewSet):
         response = super(SDKTraits, self).create(request, *args, **kwargs)
         response.status_code = status.HTTP_200_OK
         if settings.EDGE_API_URL and request.environment.project.enable_dynamo_db:
-            forward_trait_request.delay(
-                args=(
-                    request.method,
-                    dict(request.headers),
-                    request.environment.project.id,
-                    request.data,
-                )
+            queue_trait_requests(
+                request.method,
+                dict(request.headers),
+                request.environment.project.id,
+                [request.data],
             )
 
         return response
@@ -224,13 +219,11 @@ class SDKTraits(mixins.CreateModelMixin, viewsets.GenericViewSet):
             # Convert the payload to the structure expected by /traits
             payload = serializer.data.copy()
             payload.update({"identity": {"identifier": payload.pop("identifier")}})
-            forward_trait_request.delay(
-                args=(
-                    request.method,
-                    dict(request.headers),
-                    request.environment.project.id,
-                    payload,
-                )
+            queue_trait_requests(
+                request.method,
+                dict(request.headers),
+                request.environment.project.id,
+                [payload],
             )
 
         return Response(serializer.data, status=200)
@@ -265,13 +258,11 @@ class SDKTraits(mixins.CreateModelMixin, viewsets.GenericViewSet):
             serializer.save()
 
             if settings.EDGE_API_URL and request.environment.project.enable_dynamo_db:
-                forward_trait_requests.delay(
-                    args=(
-                        request.method,
-                        dict(request.headers),
-                        request.environment.project.id,
-                        request.data,
-                    )
+                queue_trait_requests(
+                    request.method,
+                    dict(request.headers),
+                    request.environment.project.id,
+                    request.data,
                 )
 
             return Response(serializer.data, status=200)
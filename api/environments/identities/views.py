@@ -4,6 +4,7 @@ from collections import namedtuple
 from common.environments.permissions import MANAGE_IDENTITIES, VIEW_IDENTITIES
 from core.constants import FLAGSMITH_UPDATED_AT_HEADER
 from core.request_origin import RequestOrigin
+from core.server_timing import timed_stage
 from django.conf import settings
 from django.db.models import Q
 from django.utils import timezone
@@ -15,10 +16,11 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from app.pagination import CustomPagination
-from edge_api.identities.edge_request_forwarder import forward_identity_request
+from edge_api.identities.edge_request_forwarder import queue_identity_request
 from environments.identities.models import Identity
 from environments.identities.serializers import (
     IdentitySerializer,
+    SDKBulkIdentitiesResponseSerializer,
     SDKIdentitiesQuerySerializer,
     SDKIdentitiesResponseSerializer,
 )
@@ -27,6 +29,7 @@ from environments.permissions.permissions import NestedEnvironmentPermissions
 from environments.sdk.serializers import (
     IdentifyWithTraitsSerializer,
     IdentitySerializerWithTraitsAndSegments,
+    SDKBulkIdentifySerializer,
 )
 from features.serializers import SDKFeatureStateSerializer
 from integrations.integration import (
@@ -186,13 +189,11 @@ class SDKIdentities(SDKAPIView):
         self.identity = identity
 
         if settings.EDGE_API_URL and request.environment.project.enable_dynamo_db:
-            forward_identity_request.delay(
-                args=(
-                    request.method,
-                    dict(request.headers),
-                    request.environment.project.id,
-                ),
-                kwargs={"query_params": request.GET.dict()},
+            queue_identity_request(
+                request.method,
+                dict(request.headers),
+                request.environment.project.id,
+                query_params=request.GET.dict(),
             )
 
         # Note that we send the environment updated_at value here since it covers most use cases
@@ -238,13 +239,11 @@ class SDKIdentities(SDKAPIView):
         self.identity = instance.get("identity")
 
         if settings.EDGE_API_URL and request.environment.project.enable_dynamo_db:
-            forward_identity_request.delay(
-                args=(
-                    request.method,
-                    dict(request.headers),
-                    request.environment.project.id,
-                ),
-                kwargs={"request_data": request.data},
+            queue_identity_request(
+                request.method,
+                dict(request.headers),
+                request.environment.project.id,
+                request_data=request.data,
             )
 
         # we need to serialize the response again to ensure that the
@@ -253,8 +252,10 @@ class SDKIdentities(SDKAPIView):
             instance=instance,
             context=self.get_serializer_context(),
         )
+        with timed_stage("serialization"):
+            data = response_serializer.data
         return Response(
-            response_serializer.data,
+            data,
             headers={
                 FLAGSMITH_UPDATED_AT_HEADER: request.environment.updated_at.timestamp()
             },
@@ -311,9 +312,57 @@ class SDKIdentities(SDKAPIView):
             },
             context=self.get_serializer_context(),
         )
+        with timed_stage("serialization"):
+            data = serializer.data
 
         identify_integrations(identity, all_feature_states)
 
+        return Response(data=data, status=status.HTTP_200_OK, headers=headers)
+
+
+class SDKBulkIdentities(SDKAPIView):
+    serializer_class = SDKBulkIdentifySerializer
+    pagination_class = None  # set here to ensure documentation is correct
+    throttle_classes = []
+
+    @swagger_auto_schema(
+        request_body=SDKBulkIdentifySerializer(),
+        responses={200: SDKBulkIdentitiesResponseSerializer()},
+        operation_id="bulk_identify_users",
+    )
+    def post(self, request):
+        """
+        Get the flags for a number of identities in one request. Identities and
+        traits are not persisted, i.e. each identity is identified as per
+        `"transient": true` in `POST /api/v1/identities/`.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        context = self.get_serializer_context()
         return Response(
-            data=serializer.data, status=status.HTTP_200_OK, headers=headers
+            {
+                "identities": [
+                    IdentifyWithTraitsSerializer(
+                        instance=instance,
+                        context={**context, "identity": instance["identity"]},
+                    ).data
+                    for instance in serializer.save()
+                ]
+            },
+            headers={
+                FLAGSMITH_UPDATED_AT_HEADER: request.environment.updated_at.timestamp()
+            },
         )
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if hasattr(self.request, "environment"):
+            # only set it if the request has the attribute to ensure that the
+            # documentation works correctly still
+            context["environment"] = self.request.environment
+        if self.request.originated_from is RequestOrigin.CLIENT:
+            context["feature_states_additional_filters"] = Q(
+                feature__is_server_key_only=False
+            )
+        return context
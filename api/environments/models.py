@@ -1,4 +1,6 @@
+import hashlib
 import logging
+import time
 import typing
 import uuid
 from copy import deepcopy
@@ -33,17 +35,25 @@ from environments.api_keys import (
     generate_server_api_key,
 )
 from environments.constants import IDENTITY_INTEGRATIONS_RELATION_NAMES
+from environments.dataclasses import EnvironmentDocumentPayload
 from environments.dynamodb import (
     DynamoEnvironmentAPIKeyWrapper,
     DynamoEnvironmentV2Wrapper,
     DynamoEnvironmentWrapper,
 )
+from environments.dynamodb.pipeline import write_environments_to_tables
 from environments.exceptions import EnvironmentHeaderNotPresentError
 from environments.managers import EnvironmentManager
+from features.constants import FlagsCacheVariant
 from features.models import Feature, FeatureSegment, FeatureState
 from features.multivariate.models import MultivariateFeatureStateValue
 from metadata.models import Metadata
 from projects.models import Project
+from segments.evaluator import (
+    SEGMENT_SNAPSHOT_VERSION,
+    SegmentSnapshot,
+    get_segment_snapshot,
+)
 from segments.models import Segment
 from util.mappers import map_environment_to_sdk_document
 from webhooks.models import AbstractBaseExportableWebhookModel
@@ -53,7 +63,15 @@ logger = logging.getLogger(__name__)
 environment_cache = caches[settings.ENVIRONMENT_CACHE_NAME]
 environment_document_cache = caches[settings.ENVIRONMENT_DOCUMENT_CACHE_LOCATION]
 environment_segments_cache = caches[settings.ENVIRONMENT_SEGMENTS_CACHE_NAME]
+environment_feature_states_cache = caches[
+    settings.ENVIRONMENT_FEATURE_STATES_CACHE_NAME
+]
 bad_environments_cache = caches[settings.BAD_ENVIRONMENTS_CACHE_LOCATION]
+flags_cache = caches[settings.FLAGS_CACHE_LOCATION]
+
+# Bump this when the format of the cached environment document payload changes.
+ENVIRONMENT_DOCUMENT_PAYLOAD_CACHE_VERSION = 1
+ENVIRONMENT_DOCUMENT_CACHE_LOCK_POLL_INTERVAL_SECONDS = 0.05
 
 # Intialize the dynamo environment wrapper(s) globaly
 environment_wrapper = DynamoEnvironmentWrapper()
@@ -61,6 +79,26 @@ environment_v2_wrapper = DynamoEnvironmentV2Wrapper()
 environment_api_key_wrapper = DynamoEnvironmentAPIKeyWrapper()
 
 
+def get_environment_document_payload_cache_key(api_key: str) -> str:
+    return f"{api_key}:payload:v{ENVIRONMENT_DOCUMENT_PAYLOAD_CACHE_VERSION}"
+
+
+def get_flags_cache_key(api_key: str, variant: FlagsCacheVariant) -> str:
+    return f"{api_key}:{variant}"
+
+
+def get_flags_cache_variant(
+    environment: "Environment", originated_from: RequestOrigin
+) -> FlagsCacheVariant:
+    if environment.get_hide_disabled_flags() is True:
+        return FlagsCacheVariant.HIDE_DISABLED
+
+    if originated_from is RequestOrigin.CLIENT:
+        return FlagsCacheVariant.CLIENT
+
+    return FlagsCacheVariant.SERVER
+
+
 class Environment(
     LifecycleModel,
     abstract_base_auditable_model_factory(
@@ -283,10 +321,11 @@ class Environment(
         if not all([project, project.enable_dynamo_db, environment_wrapper.is_enabled]):
             return
 
-        environment_wrapper.write_environments(environments)
-
+        wrappers = [environment_wrapper]
         if project.edge_v2_environments_migrated and environment_v2_wrapper.is_enabled:
-            environment_v2_wrapper.write_environments(environments)
+            wrappers.append(environment_v2_wrapper)
+
+        write_environments_to_tables(environments, wrappers)
 
     def get_feature_state(
         self, feature_id: int, filter_kwargs: dict = None
@@ -332,14 +371,17 @@ class Environment(
             == RequestOrigin.SERVER
         )
 
-    def get_segments_from_cache(self) -> typing.List[Segment]:
+    def get_segments_from_cache(self) -> tuple[SegmentSnapshot, ...]:
         """
         Get any segments that have been overridden in this environment.
         """
-        segments = environment_segments_cache.get(self.id)
-        if not segments:
-            segments = list(
-                Segment.live_objects.filter(
+        segments = environment_segments_cache.get(
+            self.id, version=SEGMENT_SNAPSHOT_VERSION
+        )
+        if segments is None:
+            segments = tuple(
+                get_segment_snapshot(segment)
+                for segment in Segment.live_objects.filter(
                     feature_segments__feature_states__environment=self
                 ).prefetch_related(
                     "rules",
@@ -349,9 +391,77 @@ class Environment(
                     "rules__rules__rules",
                 )
             )
-            environment_segments_cache.set(self.id, segments)
+            environment_segments_cache.set(
+                self.id, segments, version=SEGMENT_SNAPSHOT_VERSION
+            )
         return segments
 
+    def get_feature_states_from_cache(
+        self, additional_filters: Q | None = None
+    ) -> list[FeatureState]:
+        """
+        Get the environment default and live segment override feature states
+        that are candidates for an identity's flags, i.e. everything except the
+        identity overrides.
+
+        The cache key includes the environment's `updated_at`, which is bumped,
+        and the cached environment cleared, by the audit log created for each
+        change to the environment's flags. Scheduled feature states are
+        included, so callers must check `live_from` themselves.
+        """
+        cache_key = f"{self.id}:{self.updated_at.timestamp()}"
+        if additional_filters:
+            cache_key += f":{hashlib.md5(str(additional_filters).encode()).hexdigest()}"
+
+        feature_states = environment_feature_states_cache.get(cache_key)
+        if feature_states is None:
+            queryset = FeatureState.objects.filter(
+                Q(feature_segment=None)
+                | Q(
+                    feature_segment__segment__in=Segment.live_objects.all(),
+                    feature_segment__environment=self,
+                ),
+                environment=self,
+                identity=None,
+            )
+            if self.use_v2_feature_versioning:
+                queryset = queryset.filter(
+                    environment_feature_version__live_from__isnull=False
+                )
+            else:
+                queryset = queryset.filter(version__isnull=False)
+            if additional_filters:
+                queryset = queryset.filter(additional_filters)
+
+            feature_states = list(
+                queryset.select_related(
+                    "environment",
+                    "feature",
+                    "feature_state_value",
+                    "feature_segment",
+                    "feature_segment__segment",
+                    "environment_feature_version",
+                ).prefetch_related(
+                    Prefetch(
+                        "multivariate_feature_state_values",
+                        queryset=MultivariateFeatureStateValue.objects.select_related(
+                            "multivariate_feature_option"
+                        ),
+                    ),
+                    "feature_segment__segment__rules",
+                    "feature_segment__segment__rules__conditions",
+                    "feature_segment__segment__rules__rules",
+                    "feature_segment__segment__rules__rules__conditions",
+                    "feature_segment__segment__rules__rules__rules",
+                )
+            )
+            environment_feature_states_cache.set(
+                cache_key,
+                feature_states,
+                timeout=settings.ENVIRONMENT_FEATURE_STATES_CACHE_SECONDS,
+            )
+        return feature_states
+
     @classmethod
     def get_environment_document(
         cls,
@@ -361,6 +471,68 @@ class Environment(
             return cls._get_environment_document_from_cache(api_key)
         return cls._get_environment_document_from_db(api_key)
 
+    @classmethod
+    def get_environment_document_payload(
+        cls,
+        api_key: str,
+    ) -> EnvironmentDocumentPayload:
+        """
+        Get the environment document pre-rendered to JSON bytes, so that
+        it can be returned to the SDKs without being re-serialised on every request.
+        """
+        if (
+            settings.CACHE_ENVIRONMENT_DOCUMENT_SECONDS > 0
+            or settings.CACHE_ENVIRONMENT_DOCUMENT_WRITE_THROUGH
+        ):
+            return cls._get_environment_document_payload_from_cache(api_key)
+        return cls._build_environment_document_payload(api_key)
+
+    @classmethod
+    def write_environment_documents_to_cache(
+        cls, environment_id: int = None, project_id: int = None
+    ) -> None:
+        """
+        Rebuild the cached environment document(s) so that SDK requests are
+        always served a ready document, rather than building it on a cache miss.
+        """
+        if not settings.CACHE_ENVIRONMENT_DOCUMENT_WRITE_THROUGH:
+            return
+
+        environments_filter = (
+            Q(id=environment_id) if environment_id else Q(project_id=project_id)
+        )
+        for api_key in cls.objects.filter(environments_filter).values_list(
+            "api_key", flat=True
+        ):
+            environment_document_cache.set(
+                get_environment_document_payload_cache_key(api_key),
+                cls._build_environment_document_payload(api_key),
+                timeout=None,
+            )
+
+    @classmethod
+    def clear_flags_cache(
+        cls, environment_id: int = None, project_id: int = None
+    ) -> None:
+        """
+        Clear every cached variant of the flags for the given environment(s).
+        """
+        if not settings.CACHE_FLAGS_SECONDS > 0:
+            return
+
+        environments_filter = (
+            Q(id=environment_id) if environment_id else Q(project_id=project_id)
+        )
+        flags_cache.delete_many(
+            [
+                get_flags_cache_key(api_key, variant)
+                for api_key in cls.objects.filter(environments_filter).values_list(
+                    "api_key", flat=True
+                )
+                for variant in FlagsCacheVariant
+            ]
+        )
+
     def get_create_log_message(self, history_instance) -> typing.Optional[str]:
         return ENVIRONMENT_CREATED_MESSAGE % self.name
 
@@ -384,6 +556,56 @@ class Environment(
             environment_document_cache.set(api_key, environment_document)
         return environment_document
 
+    @classmethod
+    def _get_environment_document_payload_from_cache(
+        cls,
+        api_key: str,
+    ) -> EnvironmentDocumentPayload:
+        cache_key = get_environment_document_payload_cache_key(api_key)
+        if payload := environment_document_cache.get(cache_key):
+            return payload
+
+        # Make sure only one worker builds the document on a cold start,
+        # while the others wait for it to appear in the cache.
+        lock_key = f"{cache_key}:lock"
+        lock_timeout = settings.ENVIRONMENT_DOCUMENT_CACHE_LOCK_TIMEOUT_SECONDS
+        if not environment_document_cache.add(lock_key, True, timeout=lock_timeout):
+            deadline = time.monotonic() + lock_timeout
+            while time.monotonic() < deadline:
+                time.sleep(ENVIRONMENT_DOCUMENT_CACHE_LOCK_POLL_INTERVAL_SECONDS)
+                if payload := environment_document_cache.get(cache_key):
+                    return payload
+            logger.warning(
+                "Timed out waiting for environment document for %s to be built.",
+                api_key,
+            )
+            return cls._build_environment_document_payload(api_key)
+
+        try:
+            payload = cls._build_environment_document_payload(api_key)
+            environment_document_cache.set(
+                cache_key,
+                payload,
+                timeout=(
+                    None
+                    if settings.CACHE_ENVIRONMENT_DOCUMENT_WRITE_THROUGH
+                    else settings.CACHE_ENVIRONMENT_DOCUMENT_SECONDS
+                ),
+            )
+        finally:
+            environment_document_cache.delete(lock_key)
+        return payload
+
+    @classmethod
+    def _build_environment_document_payload(
+        cls,
+        api_key: str,
+    ) -> EnvironmentDocumentPayload:
+        return EnvironmentDocumentPayload.from_document(
+            cls._get_environment_document_from_db(api_key),
+            compress=settings.COMPRESS_ENVIRONMENT_DOCUMENT,
+        )
+
     @classmethod
     def _get_environment_document_from_db(
         cls,
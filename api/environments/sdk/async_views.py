@@ -0,0 +1,110 @@
+"""
+Async variants of the SDK views that are polled the most, used when the API
+is served over ASGI (see `app.asgi`) with USE_ASYNC_SDK_VIEWS enabled.
+
+Requests that can be answered from the caches are handled on the event loop,
+using the async cache API, without tying up a worker thread. Any other request
+(a cache miss, an invalid key, a query for a single feature, etc.) is handed
+over to the regular DRF view, which runs in a worker thread, so the responses
+are the same either way.
+
+The requests only stay on the event loop while every middleware in MIDDLEWARE
+can handle them asynchronously, as the repo's middleware can (see
+`core.middleware.base.SyncAndAsyncMiddleware`). Django hands the requests over
+to a worker thread for any that can't, e.g. the OpenCensus middleware added
+with APPLICATION_INSIGHTS_CONNECTION_STRING.
+"""
+
+from asgiref.sync import sync_to_async
+from core.constants import FLAGSMITH_UPDATED_AT_HEADER
+from core.request_origin import RequestOrigin
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+
+from environments.api_keys import SERVER_API_KEY_PREFIX
+from environments.models import (
+    Environment,
+    environment_cache,
+    environment_document_cache,
+    flags_cache,
+    get_environment_document_payload_cache_key,
+    get_flags_cache_key,
+    get_flags_cache_variant,
+)
+from environments.sdk.views import (
+    SDKEnvironmentAPIView,
+    get_environment_document_response,
+)
+from features.views import SDKFeatureStates
+
+# The sync views run in a worker thread, like any sync view served over ASGI.
+_sdk_environment_document_view = sync_to_async(SDKEnvironmentAPIView.as_view())
+_sdk_flags_view = sync_to_async(SDKFeatureStates.as_view())
+
+
+async def sdk_environment_document_view(request: HttpRequest) -> HttpResponse:
+    if (
+        settings.CACHE_ENVIRONMENT_DOCUMENT_SECONDS > 0
+        or settings.CACHE_ENVIRONMENT_DOCUMENT_WRITE_THROUGH
+    ) and (
+        environment := await _get_cached_environment(
+            request, required_key_prefix=SERVER_API_KEY_PREFIX
+        )
+    ):
+        payload = await environment_document_cache.aget(
+            get_environment_document_payload_cache_key(environment.api_key)
+        )
+        if payload:
+            return get_environment_document_response(
+                request, payload, environment.updated_at
+            )
+
+    return await _sdk_environment_document_view(request)
+
+
+async def sdk_flags_view(request: HttpRequest) -> HttpResponse:
+    if (
+        settings.CACHE_FLAGS_SECONDS > 0
+        and not settings.GET_FLAGS_ENDPOINT_CACHE_SECONDS
+        and request.method == "GET"
+        and "feature" not in request.GET
+        and (environment := await _get_cached_environment(request))
+    ):
+        originated_from = (
+            RequestOrigin.SERVER
+            if request.headers["X-Environment-Key"].startswith(SERVER_API_KEY_PREFIX)
+            else RequestOrigin.CLIENT
+        )
+        content = await flags_cache.aget(
+            get_flags_cache_key(
+                environment.api_key,
+                get_flags_cache_variant(environment, originated_from),
+            )
+        )
+        if content is not None:
+            return HttpResponse(
+                content,
+                content_type="application/json",
+                headers={
+                    FLAGSMITH_UPDATED_AT_HEADER: environment.updated_at.timestamp()
+                },
+            )
+
+    return await _sdk_flags_view(request)
+
+
+async def _get_cached_environment(
+    request: HttpRequest, required_key_prefix: str = ""
+) -> Environment | None:
+    """
+    Get the environment for the request's key, if it is cached and allowed
+    to serve flags. See `EnvironmentKeyAuthentication`.
+    """
+    api_key = request.headers.get("X-Environment-Key")
+    if not (api_key and api_key.startswith(required_key_prefix)):
+        return None
+
+    environment = await environment_cache.aget(api_key)
+    if not environment or environment.project.organisation.stop_serving_flags:
+        return None
+    return environment
@@ -2,6 +2,7 @@ import typing
 from collections import defaultdict
 
 from core.constants import BOOLEAN, FLOAT, INTEGER, STRING
+from django.conf import settings
 from rest_framework import serializers
 
 from environments.identities.models import Identity
@@ -12,6 +13,7 @@ from environments.identities.traits.fields import TraitValueField
 from environments.identities.traits.models import Trait
 from environments.identities.traits.serializers import TraitSerializerBasic
 from environments.sdk.services import (
+    get_identified_transient_identities_and_traits,
     get_identified_transient_identity_and_traits,
     get_persisted_identity_and_traits,
     get_transient_identity_and_traits,
@@ -21,7 +23,10 @@ from features.serializers import (
     FeatureStateSerializerFull,
     SDKFeatureStateSerializer,
 )
-from integrations.integration import identify_integrations
+from integrations.integration import (
+    bulk_identify_integrations,
+    identify_integrations,
+)
 from segments.serializers import SegmentSerializerBasic
 
 from .serializers_mixins import HideSensitiveFieldsSerializerMixin
@@ -196,3 +201,71 @@ class IdentifyWithTraitsSerializer(
                 "Setting traits not allowed with client key."
             )
         return traits
+
+
+class SDKBulkIdentifyIdentitySerializer(serializers.Serializer):
+    identifier = serializers.CharField()
+    traits = TraitSerializerBasic(required=False, many=True)
+
+
+class SDKBulkIdentifySerializer(serializers.Serializer):
+    identities = SDKBulkIdentifyIdentitySerializer(many=True, allow_empty=False)
+
+    def save(self, **kwargs) -> list[dict]:
+        """
+        Get the flags for each of the identities, without persisting the
+        identities or their traits, as per `"transient": true` in
+        `IdentifyWithTraitsSerializer`.
+        """
+        environment = self.context["environment"]
+        identities_and_traits = get_identified_transient_identities_and_traits(
+            environment=environment,
+            identifiers_and_sdk_trait_data=[
+                (identity_data["identifier"], identity_data.get("traits", []))
+                for identity_data in self.validated_data["identities"]
+            ],
+        )
+        all_feature_states = Identity.get_all_feature_states_for_identities(
+            environment=environment,
+            identities_and_traits=identities_and_traits,
+            additional_filters=self.context.get("feature_states_additional_filters"),
+        )
+
+        # The identities are sent to each of the environment's integrations in
+        # a single batch, rather than from a thread per identity.
+        bulk_identify_integrations(
+            environment,
+            [
+                (identity, feature_states, traits)
+                for (identity, traits), feature_states in zip(
+                    identities_and_traits, all_feature_states
+                )
+            ],
+        )
+
+        return [
+            {
+                "identity": identity,
+                "identifier": identity.identifier,
+                "traits": traits,
+                "flags": feature_states,
+            }
+            for (identity, traits), feature_states in zip(
+                identities_and_traits, all_feature_states
+            )
+        ]
+
+    def validate_identities(self, identities: list[dict]) -> list[dict]:
+        if len(identities) > settings.SDK_BULK_IDENTIFY_MAX_IDENTITIES:
+            raise serializers.ValidationError(
+                f"Cannot identify more than {settings.SDK_BULK_IDENTIFY_MAX_IDENTITIES} "
+                "identities at a time."
+            )
+        request = self.context["request"]
+        if any(
+            identity_data.get("traits") for identity_data in identities
+        ) and not request.environment.trait_persistence_allowed(request):
+            raise serializers.ValidationError(
+                "Setting traits not allowed with client key."
+            )
+        return identities
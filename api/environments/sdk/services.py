@@ -58,6 +58,46 @@ def get_identified_transient_identity_and_traits(
     ), identity.generate_traits(sdk_trait_data, persist=False)
 
 
+def get_identified_transient_identities_and_traits(
+    environment: Environment,
+    identifiers_and_sdk_trait_data: list[tuple[str, list[SDKTraitData]]],
+) -> list[IdentityAndTraits]:
+    """
+    Get a transient `Identity` instance, and its traits, for each of the given
+    identifiers, as per `get_identified_transient_identity_and_traits`.
+
+    The identities that are present in storage are retrieved, along with
+    their traits, in a single query each.
+    """
+    persisted_identities = {
+        identity.identifier: identity
+        for identity in Identity.objects.filter(
+            environment=environment,
+            identifier__in={
+                identifier for identifier, _ in identifiers_and_sdk_trait_data
+            },
+        ).prefetch_related("identity_traits")
+    }
+
+    identities_and_traits = []
+    for identifier, sdk_trait_data in identifiers_and_sdk_trait_data:
+        sdk_trait_data = _ensure_transient(sdk_trait_data)
+        if identity := persisted_identities.get(identifier):
+            identity.environment = environment
+            identities_and_traits.append(
+                (identity, identity.update_traits(sdk_trait_data))
+            )
+            continue
+        identity = _get_transient_identity(
+            environment=environment,
+            identifier=identifier,
+        )
+        identities_and_traits.append(
+            (identity, identity.generate_traits(sdk_trait_data, persist=False))
+        )
+    return identities_and_traits
+
+
 def get_persisted_identity_and_traits(
     environment: Environment,
     identifier: str,
@@ -1,10 +1,15 @@
+import datetime
+
 from core.constants import FLAGSMITH_UPDATED_AT_HEADER
-from django.http import HttpRequest
+from django.http import HttpRequest, HttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
 from drf_yasg.utils import swagger_auto_schema
-from rest_framework.response import Response
+from rest_framework import status
 from rest_framework.views import APIView
 
 from environments.authentication import EnvironmentKeyAuthentication
+from environments.dataclasses import EnvironmentDocumentPayload
 from environments.models import Environment
 from environments.permissions.permissions import EnvironmentKeyPermissions
 from environments.sdk.schemas import SDKEnvironmentDocumentModel
@@ -18,12 +23,55 @@ class SDKEnvironmentAPIView(APIView):
         return [EnvironmentKeyAuthentication(required_key_prefix="ser.")]
 
     @swagger_auto_schema(responses={200: SDKEnvironmentDocumentModel})
-    def get(self, request: HttpRequest) -> Response:
-        environment_document = Environment.get_environment_document(
+    def get(self, request: HttpRequest) -> HttpResponse:
+        payload = Environment.get_environment_document_payload(
             request.environment.api_key
         )
-        updated_at = self.request.environment.updated_at
-        return Response(
-            environment_document,
-            headers={FLAGSMITH_UPDATED_AT_HEADER: updated_at.timestamp()},
+        return get_environment_document_response(
+            request, payload, request.environment.updated_at
         )
+
+
+def get_environment_document_response(
+    request: HttpRequest,
+    payload: EnvironmentDocumentPayload,
+    updated_at: datetime.datetime,
+) -> HttpResponse:
+    if _etag_matches(request, payload):
+        response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+    elif payload.gzip_content and _accepts_gzip(request):
+        response = HttpResponse(payload.gzip_content, content_type="application/json")
+        response["Content-Encoding"] = "gzip"
+    else:
+        response = HttpResponse(payload.content, content_type="application/json")
+
+    response["ETag"] = payload.etag
+    response[FLAGSMITH_UPDATED_AT_HEADER] = updated_at.timestamp()
+    patch_vary_headers(response, ("Accept-Encoding",))
+    return response
+
+
+def _etag_matches(request: HttpRequest, payload: EnvironmentDocumentPayload) -> bool:
+    if not (if_none_match := request.headers.get("If-None-Match")):
+        return False
+    # If-None-Match uses the weak comparison function, see RFC 9110 13.1.2.
+    etags = {etag.removeprefix("W/") for etag in parse_etags(if_none_match)}
+    return "*" in etags or payload.etag in etags
+
+
+def _accepts_gzip(request: HttpRequest) -> bool:
+    # Accept-Encoding lists content codings with optional weights, where a
+    # weight of 0 means "not acceptable", see RFC 9110 12.5.3.
+    qvalues = {}
+    for coding in request.headers.get("Accept-Encoding", "").split(","):
+        name, *params = (part.strip() for part in coding.split(";"))
+        qvalue = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    qvalue = float(value)
+                except ValueError:
+                    qvalue = 0.0
+        qvalues[name.lower()] = qvalue
+    return qvalues.get("gzip", qvalues.get("*", 0.0)) > 0
@@ -1,13 +1,26 @@
-from task_processor.decorators import register_task_handler
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from task_processor.decorators import (
+    register_recurring_task,
+    register_task_handler,
+)
 from task_processor.models import TaskPriority
 
 from audit.models import AuditLog
+from environments.document_updates import (
+    environment_documents_lock,
+    patch_environment_documents,
+    rebuild_recently_updated_environment_documents,
+)
 from environments.dynamodb import DynamoIdentityWrapper
 from environments.models import (
     Environment,
     environment_v2_wrapper,
     environment_wrapper,
 )
+from environments.update_coalescing import pop_coalesced_update_count
 from features.versioning.models import EnvironmentFeatureVersion
 from sse import (
     send_environment_update_message_for_environment,
@@ -16,16 +29,43 @@ from sse import (
 
 
 @register_task_handler(priority=TaskPriority.HIGH)
-def rebuild_environment_document(environment_id: int) -> None:
-    Environment.write_environments_to_dynamodb(environment_id=environment_id)
+def rebuild_environment_document(
+    environment_id: int, coalescing_key: str | None = None
+) -> None:
+    if coalescing_key:
+        pop_coalesced_update_count(coalescing_key)
+    with environment_documents_lock(environment_id=environment_id):
+        Environment.write_environment_documents_to_cache(environment_id=environment_id)
+        Environment.write_environments_to_dynamodb(environment_id=environment_id)
 
 
 @register_task_handler(priority=TaskPriority.HIGHEST)
-def process_environment_update(audit_log_id: int):
+def process_environment_update(audit_log_id: int, coalescing_key: str | None = None):
     audit_log = AuditLog.objects.get(id=audit_log_id)
 
-    # Send environment document to dynamodb
-    Environment.write_environments_to_dynamodb(
+    # Patch the environment document(s) in place where possible, rather than
+    # rebuilding them. When other updates were merged into this one, only a
+    # rebuild includes them.
+    is_single_update = (
+        coalescing_key is None or pop_coalesced_update_count(coalescing_key) == 1
+    )
+    if not (is_single_update and patch_environment_documents(audit_log)):
+        with environment_documents_lock(
+            environment_id=audit_log.environment_id, project_id=audit_log.project_id
+        ):
+            # Rebuild the cached environment document(s) served to the SDKs
+            Environment.write_environment_documents_to_cache(
+                environment_id=audit_log.environment_id,
+                project_id=audit_log.project_id,
+            )
+
+            # Send environment document to dynamodb
+            Environment.write_environments_to_dynamodb(
+                environment_id=audit_log.environment_id,
+                project_id=audit_log.project_id,
+            )
+
+    Environment.clear_flags_cache(
         environment_id=audit_log.environment_id, project_id=audit_log.project_id
     )
 
@@ -36,6 +76,24 @@ def process_environment_update(audit_log_id: int):
         send_environment_update_message_for_project(audit_log.project)
 
 
+if settings.ENVIRONMENT_DOCUMENT_INCREMENTAL_UPDATES:
+
+    @register_recurring_task(
+        run_every=timedelta(
+            minutes=settings.ENVIRONMENT_DOCUMENT_REBUILD_INTERVAL_MINUTES
+        ),
+    )
+    def rebuild_incrementally_updated_environment_documents() -> None:
+        # Cover the environments updated since the previous run, with some leeway
+        # in case it ran late.
+        rebuild_recently_updated_environment_documents(
+            updated_since=timezone.now()
+            - timedelta(
+                minutes=settings.ENVIRONMENT_DOCUMENT_REBUILD_INTERVAL_MINUTES * 2
+            )
+        )
+
+
 @register_task_handler()
 def delete_environment_from_dynamo(api_key: str, environment_id: str):
     # Delete environment
@@ -0,0 +1,144 @@
+"""
+Coalescing of the environment document rebuilds triggered by a burst of changes,
+e.g. a bulk edit of flags, see `ENVIRONMENT_UPDATE_COALESCE_SECONDS`.
+
+Time is split into windows of that many seconds. The first update of an
+environment (or project) in a window schedules its processing for the end of
+the window, and the further updates in the window are merged into it. Since the
+documents are rebuilt from the latest state when it's processed, the merged
+updates are included. The number of updates merged is tracked in the environment
+document cache, so it must be shared by the API and the task processor, as the
+default database cache is.
+"""
+
+import logging
+import math
+import typing
+from datetime import datetime, timedelta, timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone as django_timezone
+
+from environments.models import environment_document_cache
+
+if typing.TYPE_CHECKING:
+    from audit.models import AuditLog
+
+logger = logging.getLogger(__name__)
+
+# How long the count of the updates merged in a window is kept once the window
+# has ended, i.e. how late the task processor can run the scheduled task.
+COALESCED_UPDATES_TIMEOUT_SECONDS = 60 * 60
+
+
+def schedule_environment_update(audit_log: "AuditLog") -> None:
+    """
+    Schedule the processing of the change recorded by the audit log, see
+    `process_environment_update`.
+    """
+    from environments.tasks import process_environment_update
+
+    if not settings.ENVIRONMENT_UPDATE_COALESCE_SECONDS:
+        process_environment_update.delay(args=(audit_log.id,))
+        return
+
+    scope = (
+        f"environment:{audit_log.environment_id}"
+        if audit_log.environment_id
+        else f"project:{audit_log.project_id}"
+    )
+
+    def schedule() -> None:
+        coalescing_key, scheduled_for = _coalesce(f"environment-update:{scope}")
+        if coalescing_key:
+            process_environment_update.delay(
+                kwargs={"audit_log_id": audit_log.id, "coalescing_key": coalescing_key},
+                delay_until=scheduled_for,
+            )
+
+    # The scheduled task must see every change merged into it, so the changes
+    # are only merged once committed.
+    transaction.on_commit(schedule)
+
+
+def schedule_environment_document_rebuild(
+    environment_id: int, delay_until: datetime | None = None
+) -> None:
+    """
+    Schedule a rebuild of the environment's documents, see
+    `rebuild_environment_document`.
+    """
+    from environments.tasks import rebuild_environment_document
+
+    if not settings.ENVIRONMENT_UPDATE_COALESCE_SECONDS:
+        rebuild_environment_document.delay(
+            kwargs={"environment_id": environment_id}, delay_until=delay_until
+        )
+        return
+
+    def schedule() -> None:
+        coalescing_key, scheduled_for = _coalesce(
+            f"environment-document-rebuild:{environment_id}", delay_until
+        )
+        if coalescing_key:
+            rebuild_environment_document.delay(
+                kwargs={
+                    "environment_id": environment_id,
+                    "coalescing_key": coalescing_key,
+                },
+                delay_until=scheduled_for,
+            )
+
+    transaction.on_commit(schedule)
+
+
+def pop_coalesced_update_count(coalescing_key: str) -> int | None:
+    """
+    Get the number of updates coalesced into the scheduled task, logging any
+    that were merged.
+
+    :return: the number of updates, or None if it's no longer known
+    """
+    update_count = environment_document_cache.get(coalescing_key)
+    environment_document_cache.delete(coalescing_key)
+    if update_count is None:
+        logger.warning("Count of the updates coalesced in %s expired.", coalescing_key)
+    elif update_count > 1:
+        logger.info(
+            "Merged %d updates into one in %s.", update_count - 1, coalescing_key
+        )
+    return update_count
+
+
+def _coalesce(
+    key_prefix: str, delay_until: datetime | None = None
+) -> tuple[str | None, datetime]:
+    # Returns the key for the window the update falls into, if it's the first
+    # update in the window, along with the end of the window.
+    window_seconds = settings.ENVIRONMENT_UPDATE_COALESCE_SECONDS
+    now = django_timezone.now()
+    run_at = max(now, delay_until) if delay_until else now
+
+    # The window always ends after the update, so the task scheduled for the
+    # end of the window can't have run yet.
+    window = math.floor(run_at.timestamp() / window_seconds) + 1
+    scheduled_for = datetime.fromtimestamp(window * window_seconds, tz=timezone.utc)
+
+    coalescing_key = f"{key_prefix}:{window}"
+    timeout = (scheduled_for - now) + timedelta(
+        seconds=COALESCED_UPDATES_TIMEOUT_SECONDS
+    )
+    if environment_document_cache.add(
+        coalescing_key, 1, timeout=timeout.total_seconds()
+    ):
+        return coalescing_key, scheduled_for
+
+    try:
+        environment_document_cache.incr(coalescing_key)
+    except ValueError:
+        # the count expired, but this update must still be counted as merged
+        environment_document_cache.set(
+            coalescing_key, 2, timeout=timeout.total_seconds()
+        )
+    return None, scheduled_for
@@ -1,3 +1,5 @@
+from django.db import models
+
 # Feature state types
 FEATURE_SEGMENT = "FEATURE_SEGMENT"
 IDENTITY = "IDENTITY"
@@ -7,6 +9,14 @@ ENVIRONMENT = "ENVIRONMENT"
 COMMITTED = "COMMITTED"
 DRAFT = "DRAFT"
 
+
+# Variants of the environment flags returned to the SDKs, which are cached separately
+class FlagsCacheVariant(models.TextChoices):
+    SERVER = "server"
+    CLIENT = "client"
+    HIDE_DISABLED = "hide-disabled"
+
+
 # Tag filtering strategy
 UNION = "UNION"
 INTERSECTION = "INTERSECTION"
@@ -2,7 +2,9 @@ from django.db.models.signals import post_init, post_save, pre_save
 from django.dispatch import receiver
 from django.utils import timezone
 
-from environments.tasks import rebuild_environment_document
+from environments.update_coalescing import (
+    schedule_environment_document_rebuild,
+)
 from features.versioning.models import EnvironmentFeatureVersion
 from features.versioning.signals import environment_feature_version_published
 from features.versioning.tasks import (
@@ -41,9 +43,8 @@ def cache_fields(instance: EnvironmentFeatureVersion, **kwargs):
 
 @receiver(environment_feature_version_published, sender=EnvironmentFeatureVersion)
 def update_environment_document(instance: EnvironmentFeatureVersion, **kwargs):
-    rebuild_environment_document.delay(
-        kwargs={"environment_id": instance.environment_id},
-        delay_until=instance.live_from,
+    schedule_environment_document_rebuild(
+        instance.environment_id, delay_until=instance.live_from
     )
 
 
@@ -7,10 +7,10 @@ from app_analytics.analytics_db_service import get_feature_evaluation_data
 from app_analytics.influxdb_wrapper import get_multiple_event_list_for_feature
 from common.projects.permissions import VIEW_PROJECT
 from core.constants import FLAGSMITH_UPDATED_AT_HEADER
-from core.request_origin import RequestOrigin
+from core.server_timing import timed_stage
 from django.conf import settings
-from django.core.cache import caches
 from django.db.models import Max, Q, QuerySet
+from django.http import HttpResponse
 from django.utils import timezone
 from django.utils.decorators import method_decorator
 from django.views.decorators.cache import cache_page
@@ -32,7 +32,12 @@ from environments.identities.serializers import (
     IdentityAllFeatureStatesSerializer,
     IdentitySourceIdentityRequestSerializer,
 )
-from environments.models import Environment
+from environments.models import (
+    Environment,
+    flags_cache,
+    get_flags_cache_key,
+    get_flags_cache_variant,
+)
 from environments.permissions.permissions import (
     EnvironmentKeyPermissions,
     NestedEnvironmentPermissions,
@@ -42,7 +47,7 @@ from projects.models import Project
 from users.models import FFAdminUser, UserPermissionGroup
 from webhooks.webhooks import WebhookEventType
 
-from .constants import INTERSECTION, UNION
+from .constants import INTERSECTION, UNION, FlagsCacheVariant
 from .features_service import get_overrides_data
 from .models import Feature, FeatureState
 from .permissions import (
@@ -83,8 +88,6 @@ from .versioning.versioning_service import (
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-flags_cache = caches[settings.FLAGS_CACHE_LOCATION]
-
 
 @swagger_auto_schema(responses={200: CreateFeatureSerializer()}, method="get")
 @api_view(["GET"])
@@ -811,48 +814,59 @@ class SDKFeatureStates(GenericAPIView):
 
             return Response(self.get_serializer(feature_states[0]).data)
 
+        updated_at = self.request.environment.updated_at
+        headers = {FLAGSMITH_UPDATED_AT_HEADER: updated_at.timestamp()}
+
         if settings.CACHE_FLAGS_SECONDS > 0:
-            data = self._get_flags_from_cache(request.environment)
-        else:
-            data = self.get_serializer(
-                get_environment_flags_list(
-                    environment=request.environment,
-                    additional_filters=self._additional_filters,
-                ),
-                many=True,
-            ).data
+            return HttpResponse(
+                self._get_flags_from_cache(request.environment),
+                content_type="application/json",
+                headers=headers,
+            )
 
-        updated_at = self.request.environment.updated_at
-        return Response(
-            data,
-            headers={FLAGSMITH_UPDATED_AT_HEADER: updated_at.timestamp()},
+        data = self._get_flags_data(request.environment)
+        return Response(data, headers=headers)
+
+    @property
+    def _flags_cache_variant(self) -> FlagsCacheVariant:
+        return get_flags_cache_variant(
+            self.request.environment, self.request.originated_from
         )
 
     @property
     def _additional_filters(self) -> Q:
         filters = Q(feature_segment=None, identity=None)
 
-        if self.request.environment.get_hide_disabled_flags() is True:
+        variant = self._flags_cache_variant
+        if variant == FlagsCacheVariant.HIDE_DISABLED:
             return filters & Q(enabled=True)
 
-        if self.request.originated_from is RequestOrigin.CLIENT:
+        if variant == FlagsCacheVariant.CLIENT:
             return filters & Q(feature__is_server_key_only=False)
 
         return filters
 
-    def _get_flags_from_cache(self, environment):
-        data = flags_cache.get(environment.api_key)
-        if not data:
-            data = self.get_serializer(
-                get_environment_flags_list(
-                    environment=environment,
-                    additional_filters=self._additional_filters,
-                ),
-                many=True,
-            ).data
-            flags_cache.set(environment.api_key, data, settings.CACHE_FLAGS_SECONDS)
+    def _get_flags_from_cache(self, environment: Environment) -> bytes:
+        """
+        Get the rendered flags for the request's variant from the cache, which
+        is cleared by `Environment.clear_flags_cache` when the environment changes.
+        """
+        cache_key = get_flags_cache_key(environment.api_key, self._flags_cache_variant)
+        content = flags_cache.get(cache_key)
+        if content is None:
+            content = JSONRenderer().render(self._get_flags_data(environment))
+            flags_cache.set(cache_key, content, settings.CACHE_FLAGS_SECONDS)
+
+        return content
 
-        return data
+    def _get_flags_data(self, environment: Environment) -> list[dict[str, typing.Any]]:
+        with timed_stage("feature_states"):
+            feature_states = get_environment_flags_list(
+                environment=environment,
+                additional_filters=self._additional_filters,
+            )
+        with timed_stage("serialization"):
+            return self.get_serializer(feature_states, many=True).data
 
     def _get_flags_response_with_identifier(self, request, identifier):
         identity, _ = Identity.objects.get_or_create(
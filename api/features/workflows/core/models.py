@@ -36,7 +36,6 @@ from audit.tasks import (
     create_feature_state_updated_by_change_request_audit_log,
     create_feature_state_went_live_audit_log,
 )
-from environments.tasks import rebuild_environment_document
 from features.models import FeatureState
 from features.versioning.models import EnvironmentFeatureVersion
 from features.versioning.signals import environment_feature_version_published
@@ -183,10 +182,6 @@ class ChangeRequest(
                     },
                     delay_until=environment_feature_version.live_from,
                 )
-                rebuild_environment_document.delay(
-                    kwargs={"environment_id": self.environment_id},
-                    delay_until=environment_feature_version.live_from,
-                )
                 environment_feature_version_published.send(
                     EnvironmentFeatureVersion, instance=environment_feature_version
                 )
@@ -18,6 +18,11 @@ class AbstractBaseEventIntegrationWrapper(ABC):
     def track_event_async(self, event: dict) -> None:
         self._track_event(event)
 
+    def track_events(self, events: list[dict]) -> None:
+        # Integrations whose API takes many events in a request override this.
+        for event in events:
+            self._track_event(event)
+
     @staticmethod
     @abstractmethod
     def generate_event_data(*args, **kwargs) -> ...:
@@ -33,6 +38,11 @@ class AbstractBaseIdentityIntegrationWrapper(ABC):
     def identify_user_async(self, data: dict) -> None:
         self._identify_user(data)
 
+    @postpone
+    def identify_users_async(self, data: list[dict]) -> None:
+        for user_data in data:
+            self._identify_user(user_data)
+
     @abstractmethod
     def generate_user_data(
         self,
@@ -25,10 +25,11 @@ class DynatraceWrapper(AbstractBaseEventIntegrationWrapper):
         self.api_key = api_key
         self.entity_selector = entity_selector
         self.url = f"{self.base_url}{EVENTS_API_URI}?api-token={self.api_key}"
+        self.session = requests.Session()
 
     def _track_event(self, event: dict) -> None:
         event["entitySelector"] = self.entity_selector
-        response = requests.post(
+        response = self.session.post(
             self.url, headers=self._headers(), data=json.dumps(event)
         )
         logger.debug(
@@ -20,6 +20,7 @@ class GrafanaWrapper(AbstractBaseEventIntegrationWrapper):
         base_url = base_url[:-1] if base_url.endswith("/") else base_url
         self.url = f"{base_url}{ROUTE_API_ANNOTATIONS}"
         self.api_key = api_key
+        self.session = requests.Session()
 
     @staticmethod
     def generate_event_data(audit_log_record: AuditLog) -> dict[str, Any]:
@@ -32,7 +33,7 @@ class GrafanaWrapper(AbstractBaseEventIntegrationWrapper):
         }
 
     def _track_event(self, event: dict[str, Any]) -> None:
-        response = requests.post(
+        response = self.session.post(
             url=self.url,
             headers=self._headers(),
             data=json.dumps(event),
@@ -1,4 +1,6 @@
-from typing import Type, TypedDict
+from typing import Generator, Type, TypedDict
+
+from core.server_timing import timed_stage
 
 from environments.constants import IDENTITY_INTEGRATIONS_RELATION_NAMES
 from integrations.amplitude.amplitude import AmplitudeWrapper
@@ -36,15 +38,48 @@ assert set(IDENTITY_INTEGRATIONS_RELATION_NAMES) == (
 )
 
 
-def identify_integrations(identity, all_feature_states, trait_models=None):
+def _get_identity_integration_wrappers(
+    environment,
+) -> Generator[AbstractBaseIdentityIntegrationWrapper, None, None]:
     for integration in IDENTITY_INTEGRATIONS:
-        config = getattr(identity.environment, integration.get("relation_name"), None)
+        config = getattr(environment, integration.get("relation_name"), None)
         if config and not config.deleted:
             wrapper = integration.get("wrapper")
-            wrapper_instance = wrapper(config)
-            user_data = wrapper_instance.generate_user_data(
-                identity=identity,
-                feature_states=all_feature_states,
-                trait_models=trait_models,
-            )
-            wrapper_instance.identify_user_async(data=user_data)
+            yield wrapper(config)
+
+
+@timed_stage("identify_integrations")
+def identify_integrations(identity, all_feature_states, trait_models=None):
+    for wrapper_instance in _get_identity_integration_wrappers(identity.environment):
+        user_data = wrapper_instance.generate_user_data(
+            identity=identity,
+            feature_states=all_feature_states,
+            trait_models=trait_models,
+        )
+        wrapper_instance.identify_user_async(data=user_data)
+
+
+@timed_stage("identify_integrations")
+def bulk_identify_integrations(
+    environment, identities_feature_states_and_traits: list[tuple]
+) -> None:
+    """
+    Identify many identities of the environment with its integrations, in a
+    single background thread per integration rather than one per identity.
+
+    :param identities_feature_states_and_traits: a list of
+        `(identity, all_feature_states, trait_models)` tuples.
+    """
+    for wrapper_instance in _get_identity_integration_wrappers(environment):
+        wrapper_instance.identify_users_async(
+            data=[
+                wrapper_instance.generate_user_data(
+                    identity=identity,
+                    feature_states=all_feature_states,
+                    trait_models=trait_models,
+                )
+                for identity, all_feature_states, trait_models in (
+                    identities_feature_states_and_traits
+                )
+            ]
+        )
@@ -17,9 +17,10 @@ class NewRelicWrapper(AbstractBaseEventIntegrationWrapper):
         self.api_key = api_key
         self.app_id = app_id
         self.url = f"{self.base_url}{EVENTS_API_URI}{self.app_id}/deployments.json"
+        self.session = requests.Session()
 
     def _track_event(self, event: dict) -> None:
-        response = requests.post(
+        response = self.session.post(
             self.url, headers=self._headers(), data=json.dumps(event)
         )
         logger.debug(
@@ -1,12 +1,13 @@
 import logging
 
 import sentry_sdk
+from core.middleware.base import SyncAndAsyncMiddleware
 from django.conf import settings
 
 logger = logging.getLogger(__name__)
 
 
-class ForceSentryTraceMiddleware:
+class ForceSentryTraceMiddleware(SyncAndAsyncMiddleware):
     """
     Middleware class to allow us to force Sentry traces on given requests.
 
@@ -19,10 +20,10 @@ class ForceSentryTraceMiddleware:
     FORCE_SENTRY_TRACE_HEADER = "X-Force-Sentry-Trace-Key"
 
     def __init__(self, get_response):
-        self.get_response = get_response
+        super().__init__(get_response)
         self.auth_key = settings.FORCE_SENTRY_TRACE_KEY
 
-    def __call__(self, request):
+    def handle(self, request):
         auth = request.headers.get(self.FORCE_SENTRY_TRACE_HEADER)
         if auth == self.auth_key:
             transaction_name = f"{request.method} {request.path}"
@@ -32,3 +33,14 @@ class ForceSentryTraceMiddleware:
             response = self.get_response(request)
 
         return response
+
+    async def ahandle(self, request):
+        auth = request.headers.get(self.FORCE_SENTRY_TRACE_HEADER)
+        if auth == self.auth_key:
+            transaction_name = f"{request.method} {request.path}"
+            with sentry_sdk.start_transaction(name=transaction_name, sampled=True):
+                response = await self.get_response(request)
+        else:
+            response = await self.get_response(request)
+
+        return response
@@ -11,6 +11,9 @@ from integrations.common.wrapper import AbstractBaseEventIntegrationWrapper
 
 from .exceptions import SlackChannelJoinError
 
+# the maximum number of blocks in a message
+SLACK_MAX_MESSAGE_BLOCKS = 50
+
 
 @dataclass
 class SlackChannel:
@@ -87,3 +90,15 @@ class SlackWrapper(AbstractBaseEventIntegrationWrapper):
 
     def _track_event(self, event: dict) -> None:
         self._client.chat_postMessage(channel=self.channel_id, blocks=event["blocks"])
+
+    def track_events(self, events: list[dict]) -> None:
+        # Combine the events into as few messages as possible.
+        client = self._client
+        blocks = []
+        for event in events:
+            if len(blocks) + len(event["blocks"]) > SLACK_MAX_MESSAGE_BLOCKS:
+                client.chat_postMessage(channel=self.channel_id, blocks=blocks)
+                blocks = []
+            blocks.extend(event["blocks"])
+        if blocks:
+            client.chat_postMessage(channel=self.channel_id, blocks=blocks)
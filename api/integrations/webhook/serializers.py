@@ -1,15 +1,14 @@
 import typing
 
 from django.db.models import Q
-from flag_engine.segments.evaluator import evaluate_identity_in_segment
 from rest_framework import serializers
 
 from features.serializers import FeatureStateSerializerFull
 from integrations.common.serializers import (
     BaseEnvironmentIntegrationModelSerializer,
 )
+from segments.evaluator import SegmentSnapshot, get_compiled_segment
 from segments.models import Segment
-from util.mappers.engine import map_identity_to_engine, map_segment_to_engine
 
 from .models import WebhookConfiguration
 
@@ -21,21 +20,21 @@ class WebhookConfigurationSerializer(BaseEnvironmentIntegrationModelSerializer):
 
 
 class SegmentSerializer(serializers.ModelSerializer):
+    """
+    Expects the identity's segment evaluation args, see
+    `Identity.get_segment_evaluation_args`, in the context, so that they're
+    only retrieved once for all the segments.
+    """
+
     member = serializers.SerializerMethodField()
 
     class Meta:
         model = Segment
         fields = ("id", "name", "member")
 
-    def get_member(self, obj: Segment) -> bool:
-        engine_identity = map_identity_to_engine(
-            self.context.get("identity"),
-            with_overrides=False,
-        )
-        engine_segment = map_segment_to_engine(obj)
-        return evaluate_identity_in_segment(
-            identity=engine_identity,
-            segment=engine_segment,
+    def get_member(self, obj: Segment | SegmentSnapshot) -> bool:
+        return get_compiled_segment(obj).evaluate(
+            *self.context["segment_evaluation_args"]
         )
 
 
@@ -42,7 +42,7 @@ class WebhookWrapper(AbstractBaseIdentityIntegrationWrapper):
         serialized_segments = SegmentSerializer(
             identity.environment.project.get_segments_from_cache(),
             many=True,
-            context={"identity": identity},
+            context={"segment_evaluation_args": identity.get_segment_evaluation_args()},
         )
 
         data = {
@@ -1,5 +1,7 @@
 API_USAGE_ALERT_THRESHOLDS = [75, 90, 100, 120, 200, 300, 400, 500]
 API_USAGE_GRACE_PERIOD = 7
+# The longest an organisation's API usage period can be, i.e. a month.
+API_USAGE_PERIOD_MAX_DAYS = 31
 ALERT_EMAIL_MESSAGE = (
     "Organisation %s has used %d seats which is over their plan limit of %d (plan: %s)"
 )
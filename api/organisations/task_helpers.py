@@ -1,5 +1,5 @@
 import logging
-from datetime import timedelta
+from datetime import datetime, timedelta
 
 from app_analytics.influxdb_wrapper import get_current_api_usage
 from core.helpers import get_current_site_url
@@ -94,7 +94,15 @@ def _send_api_usage_notification(
     )
 
 
-def handle_api_usage_notification_for_organisation(organisation: Organisation) -> None:
+def get_api_usage_period(
+    organisation: Organisation,
+) -> tuple[datetime, int] | None:
+    """
+    Get the start of the organisation's current API usage period, along with
+    the number of API calls allowed in it.
+
+    :return: None if the period of a paid organisation isn't known
+    """
     now = timezone.now()
 
     if (
@@ -111,7 +119,7 @@ def handle_api_usage_notification_for_organisation(organisation: Organisation) -
         logger.error(
             f"Paid organisation {organisation.id} is missing subscription information cache"
         )
-        return
+        return None
     else:
         subscription_cache = organisation.subscription_information_cache
         billing_starts_at = subscription_cache.current_billing_term_starts_at
@@ -122,7 +130,7 @@ def handle_api_usage_notification_for_organisation(organisation: Organisation) -
             logger.error(
                 f"Paid organisation {organisation.id} is missing billing_starts_at datetime"
             )
-            return
+            return None
 
         # Truncate to the closest active month to get start of current period.
         month_delta = relativedelta(now, billing_starts_at).months
@@ -130,19 +138,44 @@ def handle_api_usage_notification_for_organisation(organisation: Organisation) -
 
         allowed_api_calls = subscription_cache.allowed_30d_api_calls
 
-    api_usage = get_current_api_usage(organisation.id, period_starts_at)
-
     # For some reason the allowed API calls is set to 0 so default to the max free plan.
-    allowed_api_calls = allowed_api_calls or MAX_API_CALLS_IN_FREE_PLAN
+    return period_starts_at, allowed_api_calls or MAX_API_CALLS_IN_FREE_PLAN
 
-    api_usage_percent = int(100 * api_usage / allowed_api_calls)
 
-    matched_threshold = None
-    for threshold in API_USAGE_ALERT_THRESHOLDS:
-        if threshold > api_usage_percent:
-            break
+def is_api_usage_notification_due(
+    organisation: Organisation, max_api_usage: int
+) -> bool:
+    """
+    Check whether a notification could be due for the organisation, given its
+    API usage over a window at least as long as its current usage period, e.g.
+    the last 31 days. Since that's at least its usage in the period, the
+    organisation's exact usage only needs to be queried if this is True.
+    """
+    if not (api_usage_period := get_api_usage_period(organisation)):
+        return False
+    period_starts_at, allowed_api_calls = api_usage_period
 
-        matched_threshold = threshold
+    matched_threshold = _get_matched_threshold(max_api_usage, allowed_api_calls)
+    if matched_threshold is None:
+        return False
+
+    # The exact usage can't match a higher threshold, so if this one has been
+    # notified already, so have all the lower ones.
+    return not OrganisationAPIUsageNotification.objects.filter(
+        organisation_id=organisation.id,
+        notified_at__gt=period_starts_at,
+        percent_usage__gte=matched_threshold,
+    ).exists()
+
+
+def handle_api_usage_notification_for_organisation(organisation: Organisation) -> None:
+    if not (api_usage_period := get_api_usage_period(organisation)):
+        return
+    period_starts_at, allowed_api_calls = api_usage_period
+
+    api_usage = get_current_api_usage(organisation.id, period_starts_at)
+
+    matched_threshold = _get_matched_threshold(api_usage, allowed_api_calls)
 
     # Didn't match even the lowest threshold, so no notification.
     if matched_threshold is None:
@@ -157,3 +190,16 @@ def handle_api_usage_notification_for_organisation(organisation: Organisation) -
         return
 
     _send_api_usage_notification(organisation, matched_threshold)
+
+
+def _get_matched_threshold(api_usage: int, allowed_api_calls: int) -> int | None:
+    api_usage_percent = int(100 * api_usage / allowed_api_calls)
+
+    matched_threshold = None
+    for threshold in API_USAGE_ALERT_THRESHOLDS:
+        if threshold > api_usage_percent:
+            break
+
+        matched_threshold = threshold
+
+    return matched_threshold
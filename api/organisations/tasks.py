@@ -2,7 +2,10 @@ import logging
 import math
 from datetime import timedelta
 
-from app_analytics.influxdb_wrapper import get_current_api_usage
+from app_analytics.influxdb_wrapper import (
+    get_current_api_usage,
+    get_current_api_usage_by_organisation,
+)
 from django.conf import settings
 from django.core.mail import send_mail
 from django.db.models import F, Max, Q
@@ -33,6 +36,7 @@ from .constants import (
     ALERT_EMAIL_MESSAGE,
     ALERT_EMAIL_SUBJECT,
     API_USAGE_GRACE_PERIOD,
+    API_USAGE_PERIOD_MAX_DAYS,
 )
 from .subscriptions.constants import (
     SCALE_UP,
@@ -43,6 +47,7 @@ from .subscriptions.constants import (
 )
 from .task_helpers import (
     handle_api_usage_notification_for_organisation,
+    is_api_usage_notification_due,
     send_api_flags_blocked_notification,
 )
 
@@ -121,11 +126,22 @@ def finish_subscription_cancellation() -> None:
 
 # Task enqueued in register_recurring_tasks below.
 def handle_api_usage_notifications() -> None:
+    # Query the usage of every organisation at once, over the longest possible
+    # usage period, so that the exact usage is only queried for the
+    # organisations that could be due a notification.
+    api_usage_by_organisation = get_current_api_usage_by_organisation(
+        timezone.now() - timedelta(days=API_USAGE_PERIOD_MAX_DAYS)
+    )
     flagsmith_client = get_client("local", local_eval=True)
 
     for organisation in Organisation.objects.all().select_related(
         "subscription", "subscription_information_cache"
     ):
+        if not is_api_usage_notification_due(
+            organisation, api_usage_by_organisation.get(organisation.id, 0)
+        ):
+            continue
+
         feature_enabled = flagsmith_client.get_identity_flags(
             organisation.flagsmith_identifier,
             traits={
@@ -174,9 +190,7 @@ def charge_for_api_call_count_overages():
         ).values_list("organisation_id", flat=True)
     )
 
-    flagsmith_client = get_client("local", local_eval=True)
-
-    for organisation in (
+    organisations = list(
         Organisation.objects.filter(
             id__in=organisation_ids,
             subscription_information_cache__current_billing_term_ends_at__lte=closing_billing_term,
@@ -198,7 +212,14 @@ def charge_for_api_call_count_overages():
             "subscription_information_cache",
             "subscription",
         )
-    ):
+    )
+    # Query the usage of all the organisations being charged at once.
+    api_usage_by_organisation = (
+        get_current_api_usage_by_organisation() if organisations else {}
+    )
+    flagsmith_client = get_client("local", local_eval=True)
+
+    for organisation in organisations:
         flags = flagsmith_client.get_identity_flags(
             organisation.flagsmith_identifier,
             traits={
@@ -210,7 +231,7 @@ def charge_for_api_call_count_overages():
             continue
 
         subscription_cache = organisation.subscription_information_cache
-        api_usage = get_current_api_usage(organisation.id)
+        api_usage = api_usage_by_organisation.get(organisation.id, 0)
 
         # Grace period for organisations < 200% of usage.
         if (
@@ -31,6 +31,7 @@ from projects.tasks import (
     migrate_project_environments_to_v2,
     write_environments_to_dynamodb,
 )
+from segments.evaluator import SegmentSnapshot
 
 environment_cache = caches[settings.ENVIRONMENT_CACHE_NAME]
 
@@ -142,7 +143,7 @@ class Project(LifecycleModelMixin, SoftDeleteExportableModel):
     def edge_v2_identity_overrides_migrated(self) -> bool:
         return self.edge_v2_migration_status == EdgeV2MigrationStatus.COMPLETE
 
-    def get_segments_from_cache(self):
+    def get_segments_from_cache(self) -> tuple[SegmentSnapshot, ...]:
         return get_project_segments_from_cache(self.id)
 
     @hook(BEFORE_CREATE)
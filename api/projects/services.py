@@ -4,32 +4,40 @@ from django.apps import apps
 from django.conf import settings
 from django.core.cache import caches
 
-if typing.TYPE_CHECKING:
-    from django.db.models import QuerySet
+from segments.evaluator import SEGMENT_SNAPSHOT_VERSION, get_segment_snapshot
 
-    from segments.models import Segment
+if typing.TYPE_CHECKING:
+    from segments.evaluator import SegmentSnapshot
 
 project_segments_cache = caches[settings.PROJECT_SEGMENTS_CACHE_LOCATION]
 
 
-def get_project_segments_from_cache(project_id: int) -> "QuerySet[Segment]":
+def get_project_segments_from_cache(project_id: int) -> tuple["SegmentSnapshot", ...]:
     Segment = apps.get_model("segments", "Segment")
 
-    segments = project_segments_cache.get(project_id)
-    if not segments:
+    segments = project_segments_cache.get(project_id, version=SEGMENT_SNAPSHOT_VERSION)
+    if segments is None:
         # This is optimised to account for rules nested one levels deep (since we
         # don't support anything above that from the UI at the moment). Anything
         # past that will require additional queries / thought on how to optimise.
-        segments = Segment.live_objects.filter(project_id=project_id).prefetch_related(
-            "rules",
-            "rules__conditions",
-            "rules__rules",
-            "rules__rules__conditions",
-            "rules__rules__rules",
+        segments = tuple(
+            get_segment_snapshot(segment)
+            for segment in Segment.live_objects.filter(
+                project_id=project_id
+            ).prefetch_related(
+                "rules",
+                "rules__conditions",
+                "rules__rules",
+                "rules__rules__conditions",
+                "rules__rules__rules",
+            )
         )
 
         project_segments_cache.set(
-            project_id, segments, timeout=settings.CACHE_PROJECT_SEGMENTS_SECONDS
+            project_id,
+            segments,
+            timeout=settings.CACHE_PROJECT_SEGMENTS_SECONDS,
+            version=SEGMENT_SNAPSHOT_VERSION,
         )
 
     return segments
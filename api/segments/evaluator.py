@@ -0,0 +1,400 @@
+"""
+Compiled segment evaluation.
+
+Segments are compiled into a tree of plain Python closures, with regular
+expressions, semantic versions, percentage split values, etc. parsed up front.
+Compiled segments are cached per process, keyed on the segment id and the
+content of its rules, so any change to a segment or its rules and conditions
+results in a fresh compilation.
+
+The semantics mirror `flag_engine.segments.evaluator.evaluate_identity_in_segment`
+exactly, including the handling of invalid condition values.
+
+Segments are cached as `SegmentSnapshot`s: immutable copies of a segment and
+the signatures of its rules, which can be compiled without touching the
+database, and are cheap to pickle.
+"""
+
+import operator
+import re
+import typing
+from dataclasses import dataclass
+from functools import lru_cache
+
+import semver
+from django.conf import settings
+from flag_engine.identities.traits.models import TraitModel
+from flag_engine.identities.traits.types import TraitValue
+from flag_engine.segments import constants
+from flag_engine.segments.evaluator import MATCH_FUNCS_BY_OPERATOR
+from flag_engine.utils.hashing import get_hashed_percentage_for_object_ids
+from flag_engine.utils.semver import is_semver, remove_semver_suffix
+
+if typing.TYPE_CHECKING:  # pragma: no cover
+    from segments.models import Segment, SegmentRule
+
+TraitValuesByKey: typing.TypeAlias = dict[str, TraitValue]
+IdentityKey: typing.TypeAlias = int | str
+ConditionMatcher: typing.TypeAlias = typing.Callable[
+    [TraitValuesByKey, IdentityKey], bool
+]
+TraitValueMatcher: typing.TypeAlias = typing.Callable[[TraitValue], bool]
+
+# (operator, property, value)
+ConditionSignature: typing.TypeAlias = tuple[str, str | None, str | None]
+# (type, conditions, rules)
+RuleSignature: typing.TypeAlias = tuple[
+    str, tuple[ConditionSignature, ...], tuple["RuleSignature", ...]
+]
+
+MATCHING_FUNCTIONS_BY_RULE_TYPE: dict[
+    str, typing.Callable[[typing.Iterable[bool]], bool]
+] = {
+    constants.ANY_RULE: any,
+    constants.ALL_RULE: all,
+    constants.NONE_RULE: lambda iterable: not any(iterable),
+}
+
+TYPED_OPERATORS: dict[str, typing.Callable[[typing.Any, typing.Any], bool]] = {
+    constants.EQUAL: operator.eq,
+    constants.GREATER_THAN: operator.gt,
+    constants.GREATER_THAN_INCLUSIVE: operator.ge,
+    constants.LESS_THAN: operator.lt,
+    constants.LESS_THAN_INCLUSIVE: operator.le,
+    constants.NOT_EQUAL: operator.ne,
+    constants.CONTAINS: operator.contains,
+}
+
+# `semver.Version` parses string operands of these operators before comparing,
+# so comparing against a pre-parsed version gives the same result.
+SEMVER_COMPARISON_OPERATORS = {
+    constants.EQUAL,
+    constants.GREATER_THAN,
+    constants.GREATER_THAN_INCLUSIVE,
+    constants.LESS_THAN,
+    constants.LESS_THAN_INCLUSIVE,
+    constants.NOT_EQUAL,
+}
+
+
+class _Invalid:
+    """
+    Marks a segment value that could not be cast or parsed during compilation.
+    """
+
+
+INVALID = _Invalid()
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledSegmentRule:
+    matching_function: typing.Callable[[typing.Iterable[bool]], bool]
+    conditions: tuple[ConditionMatcher, ...]
+    rules: tuple["CompiledSegmentRule", ...]
+    # The engine evaluates every condition of a rule before applying the
+    # matching function. We only do that when one of the conditions can raise,
+    # and short-circuit otherwise.
+    eager: bool = False
+
+    def evaluate(
+        self,
+        trait_values: TraitValuesByKey,
+        identity_key: IdentityKey,
+    ) -> bool:
+        if self.conditions:
+            results = (
+                condition(trait_values, identity_key) for condition in self.conditions
+            )
+            if not self.matching_function(list(results) if self.eager else results):
+                return False
+        return all(rule.evaluate(trait_values, identity_key) for rule in self.rules)
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledSegment:
+    id: int
+    rules: tuple[CompiledSegmentRule, ...]
+
+    def evaluate(
+        self,
+        trait_values: TraitValuesByKey,
+        identity_key: IdentityKey,
+    ) -> bool:
+        """
+        :param trait_values: the identity's trait values, see `get_trait_values_by_key`
+        :param identity_key: the identity's id, or its composite key for transient identities
+        """
+        return bool(self.rules) and all(
+            rule.evaluate(trait_values, identity_key) for rule in self.rules
+        )
+
+
+# The version of the cached segment snapshots. Bump it whenever the shape of
+# `SegmentSnapshot`, or of the rule signatures, changes.
+SEGMENT_SNAPSHOT_VERSION = 1
+
+
+@dataclass(frozen=True, slots=True)
+class SegmentSnapshot:
+    id: int
+    name: str
+    description: str | None
+    rules: tuple[RuleSignature, ...]
+
+
+def get_segment_snapshot(segment: "Segment") -> SegmentSnapshot:
+    """
+    Expects the segment's rules and conditions to be prefetched.
+    """
+    return SegmentSnapshot(
+        id=segment.pk,
+        name=segment.name,
+        description=segment.description,
+        rules=tuple(_get_rule_signature(rule) for rule in segment.rules.all()),
+    )
+
+
+def get_compiled_segment(segment: "Segment | SegmentSnapshot") -> CompiledSegment:
+    """
+    Get the compiled program for a segment, compiling it if the segment, or
+    any of its rules and conditions, has not been seen in its current state.
+
+    Expects the rules and conditions of a `Segment` to be prefetched.
+    """
+    if not isinstance(segment, SegmentSnapshot):
+        segment = get_segment_snapshot(segment)
+    return _compile_segment(segment.id, segment.rules)
+
+
+def get_trait_values_by_key(traits: typing.Iterable[TraitModel]) -> TraitValuesByKey:
+    trait_values: TraitValuesByKey = {}
+    for trait in traits:
+        # The engine matches conditions against the first trait with a given key.
+        trait_values.setdefault(trait.trait_key, trait.trait_value)
+    return trait_values
+
+
+def _get_rule_signature(rule: "SegmentRule") -> RuleSignature:
+    return (
+        rule.type,
+        tuple(
+            (
+                condition.operator,
+                condition.property,
+                None if condition.value is None else str(condition.value),
+            )
+            for condition in rule.conditions.all()
+        ),
+        tuple(_get_rule_signature(sub_rule) for sub_rule in rule.rules.all()),
+    )
+
+
+@lru_cache(maxsize=settings.COMPILED_SEGMENTS_CACHE_SIZE)
+def _compile_segment(
+    segment_id: int,
+    rules: tuple[RuleSignature, ...],
+) -> CompiledSegment:
+    return CompiledSegment(
+        id=segment_id,
+        rules=tuple(_compile_rule(rule, segment_id) for rule in rules),
+    )
+
+
+def _compile_rule(
+    rule: RuleSignature,
+    segment_id: int,
+) -> CompiledSegmentRule:
+    rule_type, conditions, sub_rules = rule
+
+    eager = False
+    compiled_conditions = []
+    for condition in conditions:
+        matcher, can_raise = _compile_condition(condition, segment_id)
+        eager = eager or can_raise
+        compiled_conditions.append(matcher)
+
+    return CompiledSegmentRule(
+        matching_function=MATCHING_FUNCTIONS_BY_RULE_TYPE[rule_type],
+        conditions=tuple(compiled_conditions),
+        rules=tuple(_compile_rule(sub_rule, segment_id) for sub_rule in sub_rules),
+        eager=eager,
+    )
+
+
+def _compile_condition(
+    condition: ConditionSignature,
+    segment_id: int,
+) -> tuple[ConditionMatcher, bool]:
+    """
+    :return: the condition matcher, and whether it can raise during evaluation
+    """
+    operator_, property_, value = condition
+
+    if operator_ == constants.PERCENTAGE_SPLIT:
+        percentage = _cast_or_invalid(float, value) if value else INVALID
+        if percentage is INVALID:
+            # Let the error surface at evaluation time, like the engine does.
+            return _raise_invalid_percentage_split(value), True
+        return (
+            lambda trait_values, identity_key: (
+                get_hashed_percentage_for_object_ids([segment_id, identity_key])
+                <= percentage
+            ),
+            False,
+        )
+
+    if operator_ == constants.IS_SET:
+        return lambda trait_values, identity_key: property_ in trait_values, False
+
+    if operator_ == constants.IS_NOT_SET:
+        return lambda trait_values, identity_key: property_ not in trait_values, False
+
+    match_trait_value, can_raise = _compile_trait_value_matcher(operator_, value)
+
+    def matcher(trait_values: TraitValuesByKey, identity_key: IdentityKey) -> bool:
+        if property_ not in trait_values:
+            return False
+        return match_trait_value(trait_values[property_])
+
+    return matcher, can_raise
+
+
+def _compile_trait_value_matcher(
+    operator_: str,
+    value: str | None,
+) -> tuple[TraitValueMatcher, bool]:
+    if compile_matcher := UNTYPED_MATCHER_COMPILERS_BY_OPERATOR.get(operator_):
+        return compile_matcher(value)
+
+    if operator_ in TYPED_OPERATORS:
+        return _compile_typed_matcher(TYPED_OPERATORS[operator_], operator_, value)
+
+    return lambda trait_value: False, False
+
+
+def _compile_regex_matcher(value: str | None) -> tuple[TraitValueMatcher, bool]:
+    try:
+        pattern = re.compile(str(value))
+    except re.error:
+        # Let the error surface at evaluation time, like the engine does.
+        match_func = MATCH_FUNCS_BY_OPERATOR[constants.REGEX]
+        return lambda trait_value: match_func(value, trait_value), True
+    return (
+        lambda trait_value: (
+            trait_value is not None and pattern.match(str(trait_value)) is not None
+        ),
+        False,
+    )
+
+
+def _compile_not_contains_matcher(
+    value: str | None,
+) -> tuple[TraitValueMatcher, bool]:
+    str_value = str(value)
+    return (
+        lambda trait_value: (
+            isinstance(trait_value, str) and str_value not in trait_value
+        ),
+        False,
+    )
+
+
+def _compile_modulo_matcher(value: str | None) -> tuple[TraitValueMatcher, bool]:
+    try:
+        divisor_part, remainder_part = value.split("|")
+        divisor = float(divisor_part)
+        remainder = float(remainder_part)
+    except (AttributeError, ValueError):
+        return lambda trait_value: False, False
+    return (
+        lambda trait_value: (
+            isinstance(trait_value, (int, float)) and trait_value % divisor == remainder
+        ),
+        # modulo by zero raises in the engine too
+        divisor == 0,
+    )
+
+
+def _compile_in_matcher(value: str | None) -> tuple[TraitValueMatcher, bool]:
+    if not value:
+        return lambda trait_value: False, False
+    in_values = frozenset(value.split(","))
+    return (
+        lambda trait_value: (
+            trait_value in in_values
+            if isinstance(trait_value, str)
+            else (
+                type(trait_value) is not bool
+                and isinstance(trait_value, int)
+                and str(trait_value) in in_values
+            )
+        ),
+        False,
+    )
+
+
+UNTYPED_MATCHER_COMPILERS_BY_OPERATOR: dict[
+    str, typing.Callable[[str | None], tuple[TraitValueMatcher, bool]]
+] = {
+    constants.REGEX: _compile_regex_matcher,
+    constants.NOT_CONTAINS: _compile_not_contains_matcher,
+    constants.MODULO: _compile_modulo_matcher,
+    constants.IN: _compile_in_matcher,
+}
+
+
+def _compile_typed_matcher(
+    func: typing.Callable[[typing.Any, typing.Any], bool],
+    operator_: str,
+    value: str | None,
+) -> tuple[TraitValueMatcher, bool]:
+    """
+    Mirrors `flag_engine.segments.evaluator._trait_value_typed`, with the segment
+    value cast to each of the possible trait value types up front.
+    """
+    casted_values = {
+        bool: value not in ("False", "false"),
+        int: _cast_or_invalid(int, value),
+        float: _cast_or_invalid(float, value),
+        str: str(value),
+    }
+
+    semver_value: typing.Any = None
+    if value_is_semver := is_semver(value):
+        semver_value = remove_semver_suffix(value)
+        if operator_ in SEMVER_COMPARISON_OPERATORS:
+            semver_value = _cast_or_invalid(semver.Version.parse, semver_value)
+
+    def matcher(trait_value: TraitValue) -> bool:
+        try:
+            if value_is_semver and isinstance(trait_value, str):
+                if semver_value is INVALID:
+                    return False
+                return func(semver.Version.parse(trait_value), semver_value)
+
+            match_value = casted_values.get(type(trait_value), casted_values[str])
+            if match_value is INVALID:
+                return False
+            return func(trait_value, match_value)
+        except (TypeError, ValueError):
+            return False
+
+    return matcher, False
+
+
+def _raise_invalid_percentage_split(value: str | None) -> ConditionMatcher:
+    def matcher(trait_values: TraitValuesByKey, identity_key: IdentityKey) -> bool:
+        assert value
+        return float(value) >= 0  # raises for an invalid value
+
+    return matcher
+
+
+def _cast_or_invalid(
+    cast: typing.Callable[[typing.Any], typing.Any],
+    value: str | None,
+) -> typing.Any:
+    try:
+        return cast(value)
+    except (TypeError, ValueError):
+        return INVALID
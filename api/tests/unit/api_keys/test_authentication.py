@@ -1,8 +1,14 @@
+import typing
+
 import pytest
+from django.test import RequestFactory
 from django.utils import timezone
+from pytest_django.fixtures import SettingsWrapper
+from pytest_mock import MockerFixture
 from rest_framework.exceptions import AuthenticationFailed
 
 from api_keys.authentication import MasterAPIKeyAuthentication
+from api_keys.models import MasterAPIKey
 
 
 def test_authenticate_returns_api_key_user_for_valid_key(master_api_key, rf):
@@ -64,3 +70,84 @@ def test_authenticate_raises_error_for_revoked_key(rf, master_api_key):
         MasterAPIKeyAuthentication().authenticate(request)
 
     # Then - exception was raised
+
+
+def test_authenticate_caches_verified_key(
+    rf: RequestFactory,
+    master_api_key: tuple[MasterAPIKey, str],
+    settings: SettingsWrapper,
+    mocker: MockerFixture,
+) -> None:
+    # Given
+    settings.MASTER_API_KEY_CACHE_SECONDS = 30
+    master_api_key, key = master_api_key
+    request = rf.get("/some-endpoint", HTTP_AUTHORIZATION="Api-Key " + key)
+    get_from_key_spy = mocker.spy(MasterAPIKey.objects, "get_from_key")
+
+    # When
+    MasterAPIKeyAuthentication().authenticate(request)
+    user, _ = MasterAPIKeyAuthentication().authenticate(request)
+
+    # Then
+    assert user.key == master_api_key
+    get_from_key_spy.assert_called_once_with(key)
+
+
+def test_authenticate_does_not_use_cached_key_for_different_secret(
+    rf: RequestFactory,
+    master_api_key: tuple[MasterAPIKey, str],
+    settings: SettingsWrapper,
+) -> None:
+    # Given
+    settings.MASTER_API_KEY_CACHE_SECONDS = 30
+    _, key = master_api_key
+    MasterAPIKeyAuthentication().authenticate(
+        rf.get("/some-endpoint", HTTP_AUTHORIZATION="Api-Key " + key)
+    )
+
+    prefix, _, _ = key.partition(".")
+    request = rf.get(
+        "/some-endpoint", HTTP_AUTHORIZATION=f"Api-Key {prefix}.something_random"
+    )
+
+    # When
+    with pytest.raises(AuthenticationFailed):
+        MasterAPIKeyAuthentication().authenticate(request)
+
+    # Then - exception was raised
+
+
+def _revoke(master_api_key: MasterAPIKey) -> None:
+    master_api_key.revoked = True
+    master_api_key.save()
+
+
+def _expire(master_api_key: MasterAPIKey) -> None:
+    master_api_key.expiry_date = timezone.now()
+    master_api_key.save()
+
+
+@pytest.mark.parametrize(
+    "invalidate",
+    (_revoke, _expire, MasterAPIKey.delete),
+    ids=("revoke", "expire", "soft-delete"),
+)
+def test_authenticate_raises_error_for_cached_key_that_is_no_longer_valid(
+    rf: RequestFactory,
+    master_api_key: tuple[MasterAPIKey, str],
+    settings: SettingsWrapper,
+    invalidate: typing.Callable[[MasterAPIKey], None],
+) -> None:
+    # Given
+    settings.MASTER_API_KEY_CACHE_SECONDS = 30
+    master_api_key, key = master_api_key
+    request = rf.get("/some-endpoint", HTTP_AUTHORIZATION="Api-Key " + key)
+    MasterAPIKeyAuthentication().authenticate(request)
+
+    invalidate(master_api_key)
+
+    # When
+    with pytest.raises(AuthenticationFailed):
+        MasterAPIKeyAuthentication().authenticate(request)
+
+    # Then - exception was raised
@@ -1,7 +1,13 @@
+import pytest
+from core.server_timing import render_metrics
+from django.test import RequestFactory
 from django.urls import reverse
+from pytest_django.fixtures import SettingsWrapper
 from rest_framework import status
 from rest_framework.test import APIClient
 
+from app.views import server_timing_metrics
+
 
 def test_get_version_info(api_client: APIClient) -> None:
     # Given
@@ -18,3 +24,38 @@ def test_get_version_info(api_client: APIClient) -> None:
         "is_enterprise": False,
         "is_saas": False,
     }
+
+
+def test_server_timing_metrics__valid_token__returns_metrics(
+    rf: RequestFactory,
+    settings: SettingsWrapper,
+) -> None:
+    # Given
+    settings.SERVER_TIMING_METRICS_TOKEN = "secret"
+    request = rf.get("/metrics/server-timing", HTTP_AUTHORIZATION="Bearer secret")
+
+    # When
+    response = server_timing_metrics(request)
+
+    # Then
+    assert response.status_code == status.HTTP_200_OK
+    assert response.content.decode() == render_metrics()
+
+
+@pytest.mark.parametrize("token", ("", "wrong"))
+@pytest.mark.parametrize("metrics_token", ("", "secret"))
+def test_server_timing_metrics__invalid_token__returns_401(
+    rf: RequestFactory,
+    settings: SettingsWrapper,
+    token: str,
+    metrics_token: str,
+) -> None:
+    # Given
+    settings.SERVER_TIMING_METRICS_TOKEN = metrics_token
+    request = rf.get("/metrics/server-timing", HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    # When
+    response = server_timing_metrics(request)
+
+    # Then
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import Any
 
 import pytest
@@ -69,3 +70,44 @@ def test_populate_buckets__postgres_analytics_enabled__calls_expected(
         expected_bucket_size,
         expected_call_every,
     )
+
+
+def test_populate_buckets__workers__populates_time_buckets_in_parallel_chunks(
+    settings: SettingsWrapper,
+    mocker: MockerFixture,
+) -> None:
+    # Given
+    settings.USE_POSTGRES_FOR_ANALYTICS = True
+    module = "app_analytics.management.commands.populate_buckets"
+    time_buckets = [
+        (datetime(2024, 1, 1, hour), datetime(2024, 1, 1, hour + 1))
+        for hour in range(5)
+    ]
+    get_time_buckets_mock = mocker.patch(
+        f"{module}.get_time_buckets", return_value=time_buckets
+    )
+    populate_api_usage_time_bucket_mock = mocker.patch(
+        f"{module}.populate_api_usage_time_bucket"
+    )
+    populate_feature_evaluation_time_bucket_mock = mocker.patch(
+        f"{module}.populate_feature_evaluation_time_bucket"
+    )
+    populate_api_usage_bucket_mock = mocker.patch(f"{module}.populate_api_usage_bucket")
+    mocker.patch(f"{module}.ANALYTICS_READ_BUCKET_SIZE", new=60)
+
+    # When
+    call_command("populate_buckets", days_to_populate=1, workers=2)
+
+    # Then
+    get_time_buckets_mock.assert_called_once_with(60, 1440)
+    populate_api_usage_time_bucket_mock.assert_has_calls(
+        [mocker.call(60, start, end) for start, end in time_buckets],
+        any_order=True,
+    )
+    assert populate_api_usage_time_bucket_mock.call_count == len(time_buckets)
+    populate_feature_evaluation_time_bucket_mock.assert_has_calls(
+        [mocker.call(60, start, end) for start, end in time_buckets],
+        any_order=True,
+    )
+    assert populate_feature_evaluation_time_bucket_mock.call_count == len(time_buckets)
+    populate_api_usage_bucket_mock.assert_not_called()
@@ -1,5 +1,5 @@
 import pytest
-from app_analytics.middleware import APIUsageMiddleware
+from app_analytics.middleware import APIUsageMiddleware, InfluxDBMiddleware
 from app_analytics.models import Resource
 from django.test import RequestFactory
 from pytest_django.fixtures import SettingsWrapper
@@ -66,7 +66,7 @@ def test_APIUsageMiddleware_calls_track_request_correctly_without_cache(
     request = rf.get(path, **headers)
     settings.USE_CACHE_FOR_USAGE_DATA = False
 
-    mocked_track_request = mocker.patch("app_analytics.middleware.track_request")
+    mocked_track_requests = mocker.patch("app_analytics.middleware.track_requests")
 
     mocked_get_response = mocker.MagicMock()
     middleware = APIUsageMiddleware(mocked_get_response)
@@ -75,11 +75,15 @@ def test_APIUsageMiddleware_calls_track_request_correctly_without_cache(
     middleware(request)
 
     # Then
-    mocked_track_request.delay.assert_called_once_with(
+    mocked_track_requests.delay.assert_called_once_with(
         kwargs={
-            "resource": enum_resource_value,
-            "environment_key": environment_key,
-            "host": "testserver",
+            "requests": [
+                {
+                    "resource": enum_resource_value,
+                    "environment_key": environment_key,
+                    "host": "testserver",
+                }
+            ]
         }
     )
 
@@ -94,7 +98,7 @@ def test_APIUsageMiddleware_avoids_calling_track_request_if_resoure_is_not_track
     request = rf.get(path, **headers)
     settings.USE_CACHE_FOR_USAGE_DATA = False
 
-    mocked_track_request = mocker.patch("app_analytics.middleware.track_request")
+    mocked_track_requests = mocker.patch("app_analytics.middleware.track_requests")
 
     mocked_get_response = mocker.MagicMock()
     middleware = APIUsageMiddleware(mocked_get_response)
@@ -103,4 +107,48 @@ def test_APIUsageMiddleware_avoids_calling_track_request_if_resoure_is_not_track
     middleware(request)
 
     # Then
-    mocked_track_request.delay.assert_not_called()
+    mocked_track_requests.delay.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "path, expected_resource",
+    [
+        ("/api/v1/flags/", "flags"),
+        ("/api/v1/identities/", "identities"),
+        ("/api/v1/environment-document/", "environment-document"),
+    ],
+)
+def test_InfluxDBMiddleware_counts_tracked_requests(
+    rf: RequestFactory, mocker: MockerFixture, path: str, expected_resource: str
+) -> None:
+    # Given
+    request = rf.get(path, HTTP_X_ENVIRONMENT_KEY="test")
+    mocked_influxdb_request_cache = mocker.patch(
+        "app_analytics.middleware.influxdb_request_cache"
+    )
+    middleware = InfluxDBMiddleware(mocker.MagicMock())
+
+    # When
+    middleware(request)
+
+    # Then
+    mocked_influxdb_request_cache.track_request.assert_called_once_with(
+        expected_resource, "testserver", "test"
+    )
+
+
+def test_InfluxDBMiddleware_does_not_count_untracked_requests(
+    rf: RequestFactory, mocker: MockerFixture
+) -> None:
+    # Given
+    request = rf.get("/health", HTTP_X_ENVIRONMENT_KEY="test")
+    mocked_influxdb_request_cache = mocker.patch(
+        "app_analytics.middleware.influxdb_request_cache"
+    )
+    middleware = InfluxDBMiddleware(mocker.MagicMock())
+
+    # When
+    middleware(request)
+
+    # Then
+    mocked_influxdb_request_cache.track_request.assert_not_called()
@@ -14,12 +14,15 @@ from app_analytics.tasks import (
     populate_feature_evaluation_bucket,
     track_feature_evaluation,
     track_request,
+    track_requests,
 )
 from django.conf import settings
 from django.utils import timezone
 from freezegun.api import FrozenDateTimeFactory
 from pytest_django.fixtures import SettingsWrapper
 
+from environments.models import Environment, EnvironmentAPIKey
+
 if "analytics" not in settings.DATABASES:
     pytest.skip(
         "Skip test if analytics database is configured", allow_module_level=True
@@ -168,6 +171,46 @@ def test_track_request(environment):
     )
 
 
+@pytest.mark.django_db(databases=["analytics", "default"])
+def test_track_requests(
+    environment: Environment,
+    environment_api_key: EnvironmentAPIKey,
+) -> None:
+    # Given
+    host = "testserver"
+    requests = [
+        {
+            "resource": Resource.FLAGS,
+            "host": host,
+            "environment_key": environment.api_key,
+            "count": 10,
+        },
+        {
+            "resource": Resource.IDENTITIES,
+            "host": host,
+            "environment_key": environment_api_key.key,
+            "count": 2,
+        },
+        {
+            "resource": Resource.FLAGS,
+            "host": host,
+            "environment_key": "unknown-key",
+            "count": 1,
+        },
+    ]
+
+    # When
+    track_requests(requests)
+
+    # Then
+    assert set(
+        APIUsageRaw.objects.values_list("environment_id", "resource", "host", "count")
+    ) == {
+        (environment.id, Resource.FLAGS, host, 10),
+        (environment.id, Resource.IDENTITIES, host, 2),
+    }
+
+
 @pytest.mark.django_db(databases=["analytics"])
 def test_track_feature_evaluation():
     # Given
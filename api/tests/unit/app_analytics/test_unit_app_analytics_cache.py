@@ -1,82 +1,84 @@
-from app_analytics.cache import APIUsageCache, FeatureEvaluationCache
+import threading
+
+from app_analytics.cache import (
+    APIUsageCache,
+    FeatureEvaluationCache,
+    InfluxDBRequestCache,
+)
 from app_analytics.models import Resource
-from django.utils import timezone
-from freezegun import freeze_time
+from core.background_flusher import BackgroundFlusher
 from pytest_django.fixtures import SettingsWrapper
 from pytest_mock import MockerFixture
 
 
+def _request_sort_key(request: dict) -> tuple:
+    return request["resource"], request["environment_key"]
+
+
 def test_api_usage_cache(
     mocker: MockerFixture,
-    settings: SettingsWrapper,
 ) -> None:
     # Given
-    settings.PG_API_USAGE_CACHE_SECONDS = 60
-
+    mocker.patch.object(BackgroundFlusher, "ensure_started")
     cache = APIUsageCache()
-    now = timezone.now()
-    mocked_track_request_task = mocker.patch("app_analytics.cache.track_request")
+    mocked_track_requests_task = mocker.patch("app_analytics.cache.track_requests")
     host = "host"
     environment_key_1 = "environment_key_1"
     environment_key_2 = "environment_key_2"
 
-    with freeze_time(now) as frozen_time:
-        # Make some tracking requests
-        for _ in range(10):
+    # Make some tracking requests, from a couple of threads
+    def _track_requests() -> None:
+        for _ in range(5):
             for resource in Resource:
                 cache.track_request(resource, host, environment_key_1)
                 cache.track_request(resource, host, environment_key_2)
 
-        # make sure track_request task was not called
-        assert not mocked_track_request_task.called
+    threads = [threading.Thread(target=_track_requests) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    cache.track_request(Resource.FLAGS, host, environment_key_1)
 
-        # Now, let's move the time forward
-        frozen_time.tick(settings.PG_API_USAGE_CACHE_SECONDS + 1)
+    # make sure track_requests task was not called
+    assert not mocked_track_requests_task.called
 
-        # let's track another request(to trigger flush)
-        cache.track_request(
-            Resource.FLAGS,
-            host,
-            environment_key_1,
-        )
+    # When
+    cache.flush()
 
-        # Then - track request lambda was called for every resource and environment_key combination
-        expected_calls = []
-        for resource in Resource:
-            expected_calls.append(
-                mocker.call(
-                    kwargs={
-                        "resource": resource,
-                        "host": host,
-                        "environment_key": environment_key_1,
-                        "count": 11 if resource == Resource.FLAGS else 10,
-                    }
-                )
-            )
-            expected_calls.append(
-                mocker.call(
-                    kwargs={
-                        "resource": resource,
-                        "host": host,
-                        "environment_key": environment_key_2,
-                        "count": 10,
-                    }
-                )
-            )
-        mocked_track_request_task.delay.assert_has_calls(expected_calls)
-
-        # Next, let's reset the mock
-        mocked_track_request_task.reset_mock()
-
-        # and track another request
-        cache.track_request(
-            Resource.FLAGS,
-            host,
-            environment_key_1,
+    # Then - a single task was enqueued for every resource and environment_key combination
+    expected_requests = []
+    for resource in Resource:
+        expected_requests.append(
+            {
+                "resource": resource,
+                "host": host,
+                "environment_key": environment_key_1,
+                "count": 11 if resource == Resource.FLAGS else 10,
+            }
+        )
+        expected_requests.append(
+            {
+                "resource": resource,
+                "host": host,
+                "environment_key": environment_key_2,
+                "count": 10,
+            }
         )
+    mocked_track_requests_task.delay.assert_called_once()
+    requests = mocked_track_requests_task.delay.call_args.kwargs["kwargs"]["requests"]
+    assert sorted(requests, key=_request_sort_key) == sorted(
+        expected_requests, key=_request_sort_key
+    )
+
+    # Next, let's reset the mock
+    mocked_track_requests_task.reset_mock()
+
+    # and flush again
+    cache.flush()
 
-        # finally, make sure track_request task was not called
-        assert not mocked_track_request_task.called
+    # finally, make sure track_requests task was not called
+    assert not mocked_track_requests_task.called
 
 
 def test_feature_evaluation_cache(
@@ -84,10 +86,10 @@ def test_feature_evaluation_cache(
     settings: SettingsWrapper,
 ):
     # Given
-    settings.FEATURE_EVALUATION_CACHE_SECONDS = 60
     settings.USE_POSTGRES_FOR_ANALYTICS = False
     settings.INFLUXDB_TOKEN = "token"
 
+    mocker.patch.object(BackgroundFlusher, "ensure_started")
     mocked_track_evaluation_task = mocker.patch(
         "app_analytics.cache.track_feature_evaluation"
     )
@@ -100,69 +102,195 @@ def test_feature_evaluation_cache(
     feature_2_name = "feature_2_name"
 
     cache = FeatureEvaluationCache()
-    now = timezone.now()
 
-    with freeze_time(now) as frozen_time:
-        # Track some feature evaluations
-        for _ in range(10):
-            cache.track_feature_evaluation(environment_1_id, feature_1_name, 1)
-            cache.track_feature_evaluation(environment_1_id, feature_2_name, 1)
-            cache.track_feature_evaluation(environment_2_id, feature_2_name, 1)
+    # Track some feature evaluations
+    for _ in range(10):
+        cache.track_feature_evaluation(environment_1_id, feature_1_name, 1)
+        cache.track_feature_evaluation(environment_1_id, feature_2_name, 1)
+        cache.track_feature_evaluation(environment_2_id, feature_2_name, 1)
 
-        # Make sure the internal tasks were not called
-        assert not mocked_track_evaluation_task.delay.called
-        assert not mocked_track_feature_evaluation_influxdb_task.delay.called
+    # Make sure the internal tasks were not called
+    assert not mocked_track_evaluation_task.delay.called
+    assert not mocked_track_feature_evaluation_influxdb_task.delay.called
 
-        # Now, let's move the time forward
-        frozen_time.tick(settings.FEATURE_EVALUATION_CACHE_SECONDS + 1)
+    # When
+    cache.flush()
 
-        # track another evaluation(to trigger cache flush)
-        cache.track_feature_evaluation(environment_1_id, feature_1_name, 1)
-
-        # Then
-        mocked_track_feature_evaluation_influxdb_task.delay.assert_has_calls(
-            [
-                mocker.call(
-                    kwargs={
-                        "environment_id": environment_1_id,
-                        "feature_evaluations": {
-                            feature_1_name: 11,
-                            feature_2_name: 10,
-                        },
-                    },
-                ),
-                mocker.call(
-                    kwargs={
-                        "environment_id": environment_2_id,
-                        "feature_evaluations": {feature_2_name: 10},
+    # Then
+    mocked_track_feature_evaluation_influxdb_task.delay.assert_has_calls(
+        [
+            mocker.call(
+                kwargs={
+                    "environment_id": environment_1_id,
+                    "feature_evaluations": {
+                        feature_1_name: 10,
+                        feature_2_name: 10,
                     },
-                ),
+                },
+            ),
+            mocker.call(
+                kwargs={
+                    "environment_id": environment_2_id,
+                    "feature_evaluations": {feature_2_name: 10},
+                },
+            ),
+        ]
+    )
+    # task responsible for tracking evaluation using postgres was not called
+    assert not mocked_track_evaluation_task.delay.called
+
+    # Next, let's enable postgres tracking
+    settings.USE_POSTGRES_FOR_ANALYTICS = True
+
+    # rest the mock
+    mocked_track_feature_evaluation_influxdb_task.reset_mock()
+
+    # Track some more evaluations
+    cache.track_feature_evaluation(environment_1_id, feature_1_name, 1)
+    cache.track_feature_evaluation(environment_1_id, feature_1_name, 1)
+
+    # and flush again
+    cache.flush()
+
+    # Assert that the call was made with only the data tracked after the previous flush.
+    mocked_track_evaluation_task.delay.assert_called_once_with(
+        kwargs={
+            "environment_id": environment_1_id,
+            "feature_evaluations": {feature_1_name: 2},
+        }
+    )
+    # and the task for influx was not called
+    assert not mocked_track_feature_evaluation_influxdb_task.delay.called
+
+
+def test_api_usage_cache__starts_flusher_thread_once_per_process(
+    mocker: MockerFixture,
+) -> None:
+    # Given
+    mocked_thread = mocker.patch("core.background_flusher.threading.Thread")
+    mocked_atexit = mocker.patch("core.background_flusher.atexit")
+    cache = APIUsageCache()
+
+    # When
+    cache.track_request(Resource.FLAGS, "host", "environment_key")
+    cache.track_request(Resource.FLAGS, "host", "environment_key")
+
+    # Then
+    mocked_thread.assert_called_once_with(
+        target=cache._flusher._run, name="APIUsageCache-flusher", daemon=True
+    )
+    mocked_thread.return_value.start.assert_called_once_with()
+    mocked_atexit.register.assert_called_once_with(cache._flusher._flush_on_exit)
+
+
+def test_api_usage_cache__flush_on_exit__flushes_remaining_counts(
+    mocker: MockerFixture,
+) -> None:
+    # Given
+    mocker.patch("core.background_flusher.threading.Thread")
+    mocker.patch("core.background_flusher.atexit")
+    mocked_track_requests_task = mocker.patch("app_analytics.cache.track_requests")
+    cache = APIUsageCache()
+    cache.track_request(Resource.FLAGS, "host", "environment_key")
+
+    # When
+    cache._flusher._flush_on_exit()
+
+    # Then
+    mocked_track_requests_task.delay.assert_called_once_with(
+        kwargs={
+            "requests": [
+                {
+                    "resource": Resource.FLAGS,
+                    "host": "host",
+                    "environment_key": "environment_key",
+                    "count": 1,
+                }
             ]
-        )
-        # task responsible for tracking evaluation using postgres was not called
-        assert not mocked_track_evaluation_task.delay.called
+        }
+    )
 
-        # Next, let's enable postgres tracking
-        settings.USE_POSTGRES_FOR_ANALYTICS = True
 
-        # rest the mock
-        mocked_track_feature_evaluation_influxdb_task.reset_mock()
+def test_api_usage_cache__flush_fails__merges_counts_back(
+    mocker: MockerFixture,
+) -> None:
+    # Given
+    mocker.patch.object(BackgroundFlusher, "ensure_started")
+    mocked_track_requests_task = mocker.patch("app_analytics.cache.track_requests")
+    mocked_track_requests_task.delay.side_effect = [Exception("Broker down"), None]
+    cache = APIUsageCache()
+    cache.track_request(Resource.FLAGS, "host", "environment_key")
 
-        # Track another evaluation
-        cache.track_feature_evaluation(environment_1_id, feature_1_name, 1)
+    # When
+    cache._flusher.flush_safely()
+    cache.track_request(Resource.FLAGS, "host", "environment_key")
+    cache.flush()
 
-        # move time forward again
-        frozen_time.tick(settings.FEATURE_EVALUATION_CACHE_SECONDS + 1)
+    # Then
+    assert mocked_track_requests_task.delay.call_count == 2
+    mocked_track_requests_task.delay.assert_called_with(
+        kwargs={
+            "requests": [
+                {
+                    "resource": Resource.FLAGS,
+                    "host": "host",
+                    "environment_key": "environment_key",
+                    "count": 2,
+                }
+            ]
+        }
+    )
 
-        # track another one(to trigger cache flush)
-        cache.track_feature_evaluation(environment_1_id, feature_1_name, 1)
 
-        # Assert that the call was made with only the data tracked after the flush interval.
-        mocked_track_evaluation_task.delay.assert_called_once_with(
-            kwargs={
-                "environment_id": environment_1_id,
-                "feature_evaluations": {feature_1_name: 2},
-            }
-        )
-        # and the task for influx was not called
-        assert not mocked_track_feature_evaluation_influxdb_task.delay.called
+def test_influxdb_request_cache__flush__sends_counts_in_one_write(
+    mocker: MockerFixture,
+) -> None:
+    # Given
+    mocker.patch.object(BackgroundFlusher, "ensure_started")
+    mocked_track_request_counts_influxdb = mocker.patch(
+        "app_analytics.cache.track_request_counts_influxdb"
+    )
+    cache = InfluxDBRequestCache()
+    for _ in range(3):
+        cache.track_request("flags", "host", "environment_key")
+    cache.track_request("identities", "host", "environment_key")
+
+    # When
+    cache.flush()
+
+    # Then
+    mocked_track_request_counts_influxdb.assert_called_once_with(
+        {
+            ("flags", "host", "environment_key"): 3,
+            ("identities", "host", "environment_key"): 1,
+        }
+    )
+
+
+def test_influxdb_request_cache__full__drops_new_keys(
+    mocker: MockerFixture,
+    settings: SettingsWrapper,
+) -> None:
+    # Given
+    settings.REQUEST_TRACKING_CACHE_MAX_KEYS = 32  # i.e. 2 per shard
+    mocker.patch.object(BackgroundFlusher, "ensure_started")
+    mocked_track_request_counts_influxdb = mocker.patch(
+        "app_analytics.cache.track_request_counts_influxdb"
+    )
+    mocked_logger = mocker.patch("app_analytics.cache.logger")
+    cache = InfluxDBRequestCache()
+
+    # When
+    for environment_key in ("key_1", "key_2", "key_3", "key_1"):
+        cache.track_request("flags", "host", environment_key)
+    cache.flush()
+
+    # Then
+    mocked_track_request_counts_influxdb.assert_called_once_with(
+        {("flags", "host", "key_1"): 2, ("flags", "host", "key_2"): 1}
+    )
+    mocked_logger.warning.assert_called_once_with(
+        "%s dropped %d counts since the last flush, as it was full.",
+        "InfluxDBRequestCache",
+        1,
+    )
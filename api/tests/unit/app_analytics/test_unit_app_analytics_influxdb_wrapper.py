@@ -10,6 +10,7 @@ from app_analytics.influxdb_wrapper import (
     InfluxDBWrapper,
     build_filter_string,
     get_current_api_usage,
+    get_current_api_usage_by_organisation,
     get_event_list_for_organisation,
     get_events_for_organisation,
     get_feature_evaluation_data,
@@ -550,3 +551,31 @@ def test_get_current_api_usage(mocker: MockerFixture) -> None:
 
     # Then
     assert result == 43
+
+
+def test_get_current_api_usage_by_organisation(mocker: MockerFixture) -> None:
+    # Given
+    influx_mock = mocker.patch(
+        "app_analytics.influxdb_wrapper.InfluxDBWrapper.influx_query_manager"
+    )
+    record_mock_1 = mock.MagicMock()
+    record_mock_1.values = {"organisation_id": "1"}
+    record_mock_1.get_value.return_value = 43
+    record_mock_2 = mock.MagicMock()
+    record_mock_2.values = {"organisation_id": "2"}
+    record_mock_2.get_value.return_value = 12
+    bad_record_mock = mock.MagicMock()
+    bad_record_mock.values = {"organisation_id": "unknown"}
+
+    result = mock.MagicMock()
+    result.records = [record_mock_1, record_mock_2, bad_record_mock]
+    influx_mock.return_value = [result]
+
+    # When
+    usage = get_current_api_usage_by_organisation()
+
+    # Then
+    assert usage == {1: 43, 2: 12}
+    assert (
+        'group(columns: ["organisation_id"])' in influx_mock.call_args.kwargs["extra"]
+    )
@@ -2,15 +2,16 @@ from unittest import mock
 
 import pytest
 from app_analytics.track import (
+    GOOGLE_ANALYTICS_BATCH_URL,
     track_feature_evaluation_influxdb,
-    track_request_googleanalytics,
-    track_request_influxdb,
+    track_request_counts_googleanalytics,
+    track_request_counts_influxdb,
 )
 from pytest_mock import MockerFixture
 
 
 @pytest.mark.parametrize(
-    "request_uri, expected_ga_requests",
+    "request_uri, expected_ga_hits",
     (
         ("/api/v1/flags/", 2),
         ("/api/v1/identities/", 2),
@@ -21,116 +22,100 @@ from pytest_mock import MockerFixture
 )
 @mock.patch("app_analytics.track.requests")
 @mock.patch("app_analytics.track.Environment")
-def test_track_request_googleanalytics(
-    MockEnvironment, mock_requests, request_uri, expected_ga_requests
+def test_track_request_counts_googleanalytics(
+    MockEnvironment, mock_requests, request_uri, expected_ga_hits
 ):
     """
-    Verify that the correct number of calls are made to GA for the various uris.
+    Verify that the correct number of hits are sent to GA for the various uris.
 
-    All SDK endpoints should send 2 requests as they send a page view and an event (for managing number of API
+    All SDK endpoints should send 2 hits as they send a page view and an event (for managing number of API
     requests made by an organisation). All API requests made to the 'admin' API, for managing flags, etc. should
-    only send a page view request.
+    only send a page view hit.
     """
     # Given
-    request = mock.MagicMock()
-    request.path = request_uri
     environment_api_key = "test"
-    request.headers = {"X-Environment-Key": environment_api_key}
+    organisation = MockEnvironment.get_from_cache.return_value.project.organisation
+    organisation.get_unique_slug.return_value = "organisation-slug"
 
     # When
-    track_request_googleanalytics(request)
+    track_request_counts_googleanalytics({(request_uri, environment_api_key): 1})
 
     # Then
-    assert mock_requests.post.call_count == expected_ga_requests
+    mock_requests.post.assert_called_once()
+    assert mock_requests.post.call_args.args == (GOOGLE_ANALYTICS_BATCH_URL,)
+    assert (
+        len(mock_requests.post.call_args.kwargs["data"].splitlines())
+        == expected_ga_hits
+    )
 
 
-@pytest.mark.parametrize(
-    "request_uri, expected_resource",
-    (
-        ("/api/v1/flags/", "flags"),
-        ("/api/v1/identities/", "identities"),
-        ("/api/v1/traits/", "traits"),
-        ("/api/v1/environment-document/", "environment-document"),
-    ),
-)
-@mock.patch("app_analytics.track.InfluxDBWrapper")
+@mock.patch("app_analytics.track.requests")
 @mock.patch("app_analytics.track.Environment")
-def test_track_request_sends_data_to_influxdb_for_tracked_uris(
-    MockEnvironment, MockInfluxDBWrapper, request_uri, expected_resource
+def test_track_request_counts_googleanalytics__many_requests__sends_hits_in_batches(
+    MockEnvironment, mock_requests
 ):
-    """
-    Verify that the correct number of calls are made to InfluxDB for the various uris.
-    """
     # Given
-    request = mock.MagicMock()
-    request.path = request_uri
-    environment_api_key = "test"
-    request.headers = {"X-Environment-Key": environment_api_key}
-
-    mock_influxdb = mock.MagicMock()
-    MockInfluxDBWrapper.return_value = mock_influxdb
+    request_counts = {("/api/v1/flags/", "test"): 15}
+    organisation = MockEnvironment.get_from_cache.return_value.project.organisation
+    organisation.get_unique_slug.return_value = "organisation-slug"
 
     # When
-    track_request_influxdb(request)
+    track_request_counts_googleanalytics(request_counts)
 
     # Then
-    call_list = MockInfluxDBWrapper.call_args_list
-    assert len(call_list) == 1
-    assert (
-        mock_influxdb.add_data_point.call_args_list[0][1]["tags"]["resource"]
-        == expected_resource
-    )
+    # a page view and an event for each request, in batches of 20
+    assert [
+        len(call.kwargs["data"].splitlines())
+        for call in mock_requests.post.call_args_list
+    ] == [20, 10]
 
 
+@pytest.mark.parametrize(
+    "resource",
+    ("flags", "identities", "traits", "environment-document"),
+)
 @mock.patch("app_analytics.track.InfluxDBWrapper")
 @mock.patch("app_analytics.track.Environment")
-def test_track_request_sends_host_data_to_influxdb(
-    MockEnvironment, MockInfluxDBWrapper, rf
+def test_track_request_counts_sends_data_to_influxdb(
+    MockEnvironment, MockInfluxDBWrapper, resource
 ):
     """
-    Verify that host is part of the data send to influxDB
+    Verify that the request counts are sent to InfluxDB, along with the host.
     """
     # Given
     environment_api_key = "test"
-    headers = {"X-Environment-Key": environment_api_key}
-
-    request = rf.get("/api/v1/flags/", headers=headers)
-
     mock_influxdb = mock.MagicMock()
     MockInfluxDBWrapper.return_value = mock_influxdb
 
     # When
-    track_request_influxdb(request)
+    track_request_counts_influxdb({(resource, "testserver", environment_api_key): 3})
 
     # Then
-    assert (
-        mock_influxdb.add_data_point.call_args_list[0][1]["tags"]["host"]
-        == "testserver"
-    )
+    MockInfluxDBWrapper.assert_called_once_with("api_call")
+    mock_influxdb.add_data_point.assert_called_once()
+    assert mock_influxdb.add_data_point.call_args.args == ("request_count", 3)
+    tags = mock_influxdb.add_data_point.call_args.kwargs["tags"]
+    assert tags["resource"] == resource
+    assert tags["host"] == "testserver"
+    mock_influxdb.write.assert_called_once_with()
 
 
 @mock.patch("app_analytics.track.InfluxDBWrapper")
 @mock.patch("app_analytics.track.Environment")
-def test_track_request_does_not_send_data_to_influxdb_for_not_tracked_uris(
+def test_track_request_counts_influxdb__unknown_environment__does_not_write(
     MockEnvironment, MockInfluxDBWrapper
 ):
-    """
-    Verify that the correct number of calls are made to InfluxDB for the various uris.
-    """
     # Given
-    request = mock.MagicMock()
-    request.path = "/health"
-    environment_api_key = "test"
-    request.headers = {"X-Environment-Key": environment_api_key}
-
-    mock_influxdb = mock.MagicMock()
+    MockEnvironment.get_from_cache.return_value = None
+    mock_influxdb = mock.MagicMock(records=[])
     MockInfluxDBWrapper.return_value = mock_influxdb
 
     # When
-    track_request_influxdb(request)
+    track_request_counts_influxdb({("flags", "testserver", "unknown"): 1})
 
     # Then
-    MockInfluxDBWrapper.assert_not_called()
+    mock_influxdb.add_data_point.assert_not_called()
+    mock_influxdb.write.assert_not_called()
 
 
 def test_track_feature_evaluation_influxdb(mocker: MockerFixture) -> None:
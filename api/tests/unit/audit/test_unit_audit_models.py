@@ -4,6 +4,11 @@ from pytest_mock import MockerFixture
 from audit.models import AuditLog
 from audit.related_object_type import RelatedObjectType
 from audit.serializers import AuditLogListSerializer
+from environments.models import (
+    Environment,
+    EnvironmentAPIKey,
+    environment_cache,
+)
 from integrations.datadog.models import DataDogConfiguration
 from organisations.models import Organisation, OrganisationWebhook
 from projects.models import Project
@@ -212,6 +217,28 @@ def test_creating_audit_logs_creates_process_environment_update_task(
     assert environment.updated_at == audit_log.created_date
 
 
+def test_creating_audit_logs__clears_environment_cache(
+    environment: Environment,
+    environment_api_key: EnvironmentAPIKey,
+    mocker: MockerFixture,
+) -> None:
+    # Given
+    mocker.patch("environments.tasks.process_environment_update")
+    Environment.get_from_cache(environment.api_key)
+    Environment.get_from_cache(environment_api_key.key)
+
+    # When
+    audit_log = AuditLog.objects.create(environment=environment)
+
+    # Then
+    assert environment_cache.get(environment.api_key) is None
+    assert environment_cache.get(environment_api_key.key) is None
+    assert (
+        Environment.get_from_cache(environment.api_key).updated_at
+        == audit_log.created_date
+    )
+
+
 def test_creating_audit_logs_for_change_request_does_not_trigger_process_environment_update(
     environment, mocker, project
 ):
@@ -1,22 +1,20 @@
 import json
 
 import responses
+from pytest_django import DjangoAssertNumQueries
 from pytest_django.fixtures import SettingsWrapper
 from pytest_mock import MockerFixture
 
+from audit.integrations import _AuditLogEventBuffer, get_audit_log_integrations
 from audit.models import AuditLog
 from audit.related_object_type import RelatedObjectType
-from audit.signals import (
-    call_webhooks,
-    send_audit_log_event_to_dynatrace,
-    send_audit_log_event_to_grafana,
-)
+from audit.signals import call_webhooks, send_audit_log_event_to_integrations
 from environments.models import Environment
 from features.models import Feature
 from features.versioning.models import EnvironmentFeatureVersion
-from integrations.dynatrace.dynatrace import EVENTS_API_URI
+from integrations.dynatrace.dynatrace import EVENTS_API_URI, DynatraceWrapper
 from integrations.dynatrace.models import DynatraceConfiguration
-from integrations.grafana.grafana import ROUTE_API_ANNOTATIONS
+from integrations.grafana.grafana import ROUTE_API_ANNOTATIONS, GrafanaWrapper
 from integrations.grafana.models import (
     GrafanaOrganisationConfiguration,
     GrafanaProjectConfiguration,
@@ -112,25 +110,29 @@ def test_send_audit_log_event_to_grafana__project_grafana_config__calls_expected
         project=project,
         related_object_type=RelatedObjectType.FEATURE.name,
     )
-    grafana_wrapper_mock = mocker.patch("audit.signals.GrafanaWrapper", autospec=True)
+    grafana_wrapper_mock = mocker.MagicMock(spec=GrafanaWrapper)
+    mocker.patch.dict(
+        "audit.integrations._WRAPPER_CLASSES", {"grafana_config": grafana_wrapper_mock}
+    )
     grafana_wrapper_instance_mock = grafana_wrapper_mock.return_value
 
-    grafana_config = GrafanaProjectConfiguration(base_url="test.com", api_key="test")
-    project.grafana_config = grafana_config
+    grafana_config = GrafanaProjectConfiguration.objects.create(
+        base_url="test.com", api_key="test", project=project
+    )
 
     # When
-    send_audit_log_event_to_grafana(AuditLog, audit_log_record)
+    send_audit_log_event_to_integrations(AuditLog, audit_log_record)
 
     # Then
     grafana_wrapper_mock.assert_called_once_with(
         base_url=grafana_config.base_url,
         api_key=grafana_config.api_key,
     )
-    grafana_wrapper_instance_mock.generate_event_data.assert_called_once_with(
-        audit_log_record
+    grafana_wrapper_mock.generate_event_data.assert_called_once_with(
+        audit_log_record=audit_log_record
     )
     grafana_wrapper_instance_mock.track_event_async.assert_called_once_with(
-        event=grafana_wrapper_instance_mock.generate_event_data.return_value
+        event=grafana_wrapper_mock.generate_event_data.return_value
     )
 
 
@@ -144,27 +146,65 @@ def test_send_audit_log_event_to_grafana__organisation_grafana_config__calls_exp
         project=project,
         related_object_type=RelatedObjectType.FEATURE.name,
     )
-    grafana_wrapper_mock = mocker.patch("audit.signals.GrafanaWrapper", autospec=True)
+    grafana_wrapper_mock = mocker.MagicMock(spec=GrafanaWrapper)
+    mocker.patch.dict(
+        "audit.integrations._WRAPPER_CLASSES", {"grafana_config": grafana_wrapper_mock}
+    )
     grafana_wrapper_instance_mock = grafana_wrapper_mock.return_value
 
-    grafana_config = GrafanaOrganisationConfiguration(
-        base_url="test.com", api_key="test"
+    grafana_config = GrafanaOrganisationConfiguration.objects.create(
+        base_url="test.com", api_key="test", organisation=organisation
     )
-    organisation.grafana_config = grafana_config
 
     # When
-    send_audit_log_event_to_grafana(AuditLog, audit_log_record)
+    send_audit_log_event_to_integrations(AuditLog, audit_log_record)
 
     # Then
     grafana_wrapper_mock.assert_called_once_with(
         base_url=grafana_config.base_url,
         api_key=grafana_config.api_key,
     )
-    grafana_wrapper_instance_mock.generate_event_data.assert_called_once_with(
-        audit_log_record
+    grafana_wrapper_mock.generate_event_data.assert_called_once_with(
+        audit_log_record=audit_log_record
+    )
+    grafana_wrapper_instance_mock.track_event_async.assert_called_once_with(
+        event=grafana_wrapper_mock.generate_event_data.return_value
+    )
+
+
+def test_send_audit_log_event_to_grafana__project_config_deleted__uses_organisation_config(
+    mocker: MockerFixture,
+    organisation: Organisation,
+    project: Project,
+) -> None:
+    # Given
+    audit_log_record = AuditLog.objects.create(
+        project=project,
+        related_object_type=RelatedObjectType.FEATURE.name,
+    )
+    grafana_wrapper_mock = mocker.MagicMock(spec=GrafanaWrapper)
+    mocker.patch.dict(
+        "audit.integrations._WRAPPER_CLASSES", {"grafana_config": grafana_wrapper_mock}
+    )
+    grafana_wrapper_instance_mock = grafana_wrapper_mock.return_value
+
+    GrafanaProjectConfiguration.objects.create(
+        base_url="project.test.com", api_key="project", project=project
+    ).delete()
+    grafana_config = GrafanaOrganisationConfiguration.objects.create(
+        base_url="test.com", api_key="test", organisation=organisation
+    )
+
+    # When
+    send_audit_log_event_to_integrations(AuditLog, audit_log_record)
+
+    # Then
+    grafana_wrapper_mock.assert_called_once_with(
+        base_url=grafana_config.base_url,
+        api_key=grafana_config.api_key,
     )
     grafana_wrapper_instance_mock.track_event_async.assert_called_once_with(
-        event=grafana_wrapper_instance_mock.generate_event_data.return_value
+        event=grafana_wrapper_mock.generate_event_data.return_value
     )
 
 
@@ -201,7 +241,7 @@ def test_send_environment_feature_version_audit_log_event_to_grafana(
     )
 
     # When
-    send_audit_log_event_to_grafana(AuditLog, audit_log_record)
+    send_audit_log_event_to_integrations(AuditLog, audit_log_record)
 
     # Then
     expected_time = int(audit_log_record.created_date.timestamp() * 1000)
@@ -234,8 +274,10 @@ def test_send_audit_log_event_to_dynatrace__environment_dynatrace_config__calls_
         environment=environment,
         related_object_type=RelatedObjectType.FEATURE.name,
     )
-    dynatrace_wrapper_mock = mocker.patch(
-        "audit.signals.DynatraceWrapper", autospec=True
+    dynatrace_wrapper_mock = mocker.MagicMock(spec=DynatraceWrapper)
+    mocker.patch.dict(
+        "audit.integrations._WRAPPER_CLASSES",
+        {"dynatrace_config": dynatrace_wrapper_mock},
     )
     dynatrace_wrapper_instance_mock = dynatrace_wrapper_mock.return_value
 
@@ -244,7 +286,7 @@ def test_send_audit_log_event_to_dynatrace__environment_dynatrace_config__calls_
     )
 
     # When
-    send_audit_log_event_to_dynatrace(AuditLog, audit_log_record)
+    send_audit_log_event_to_integrations(AuditLog, audit_log_record)
 
     # Then
     dynatrace_wrapper_mock.assert_called_once_with(
@@ -252,11 +294,11 @@ def test_send_audit_log_event_to_dynatrace__environment_dynatrace_config__calls_
         api_key=dynatrace_config.api_key,
         entity_selector=dynatrace_config.entity_selector,
     )
-    dynatrace_wrapper_instance_mock.generate_event_data.assert_called_once_with(
-        audit_log_record
+    dynatrace_wrapper_mock.generate_event_data.assert_called_once_with(
+        audit_log_record=audit_log_record
     )
     dynatrace_wrapper_instance_mock.track_event_async.assert_called_once_with(
-        event=dynatrace_wrapper_instance_mock.generate_event_data.return_value
+        event=dynatrace_wrapper_mock.generate_event_data.return_value
     )
 
 
@@ -290,7 +332,7 @@ def test_send_environment_feature_version_audit_log_event_to_dynatrace(
     )
 
     # When
-    send_audit_log_event_to_dynatrace(AuditLog, audit_log_record)
+    send_audit_log_event_to_integrations(AuditLog, audit_log_record)
 
     # Then
     assert len(responses.calls) == 1
@@ -306,6 +348,73 @@ def test_send_environment_feature_version_audit_log_event_to_dynatrace(
     }
 
 
+def test_get_audit_log_integrations__cached__does_not_query_configurations(
+    project: Project,
+    settings: SettingsWrapper,
+    django_assert_num_queries: DjangoAssertNumQueries,
+    reset_cache: None,
+) -> None:
+    # Given
+    settings.CACHE_AUDIT_LOG_INTEGRATIONS_SECONDS = 60
+    GrafanaProjectConfiguration.objects.create(
+        base_url="https://test.com", api_key="test", project=project
+    )
+    audit_log_record = AuditLog.objects.create(project=project)
+    get_audit_log_integrations(audit_log_record)
+
+    # When
+    with django_assert_num_queries(0):
+        integrations = get_audit_log_integrations(audit_log_record)
+
+    # Then
+    assert integrations == [
+        (
+            "grafana_config",
+            (("base_url", "https://test.com"), ("api_key", "test")),
+        )
+    ]
+
+
+def test_send_audit_log_event_to_integrations__batching_enabled__sends_events_in_batch(
+    mocker: MockerFixture,
+    project: Project,
+    settings: SettingsWrapper,
+) -> None:
+    # Given
+    settings.AUDIT_LOG_INTEGRATION_BATCH_SECONDS = 5
+    audit_log_event_buffer = _AuditLogEventBuffer()
+    mocker.patch.object(audit_log_event_buffer._flusher, "ensure_started")
+    mocker.patch("audit.integrations.audit_log_event_buffer", audit_log_event_buffer)
+    grafana_wrapper_mock = mocker.MagicMock(spec=GrafanaWrapper)
+    grafana_wrapper_mock.generate_event_data.side_effect = lambda audit_log_record: {
+        "text": audit_log_record.log
+    }
+    mocker.patch.dict(
+        "audit.integrations._WRAPPER_CLASSES", {"grafana_config": grafana_wrapper_mock}
+    )
+    GrafanaProjectConfiguration.objects.create(
+        base_url="https://test.com", api_key="test", project=project
+    )
+
+    # When
+    for log in ("first change", "second change"):
+        AuditLog.objects.create(
+            project=project,
+            log=log,
+            related_object_type=RelatedObjectType.FEATURE.name,
+        )
+    audit_log_event_buffer.flush()
+
+    # Then
+    grafana_wrapper_mock.return_value.track_event_async.assert_not_called()
+    grafana_wrapper_mock.assert_called_once_with(
+        base_url="https://test.com", api_key="test"
+    )
+    grafana_wrapper_mock.return_value.track_events.assert_called_once_with(
+        [{"text": "first change"}, {"text": "second change"}]
+    )
+
+
 def _create_and_publish_environment_feature_version(
     environment: Environment,
     feature: Feature,
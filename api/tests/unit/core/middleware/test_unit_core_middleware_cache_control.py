@@ -1,3 +1,4 @@
+from asgiref.sync import async_to_sync
 from core.middleware.cache_control import NeverCacheMiddleware
 from django.http import HttpResponse
 
@@ -19,3 +20,22 @@ def test_NoCacheMiddleware_adds_cache_control_headers(mocker):
         == "max-age=0, no-cache, no-store, must-revalidate, private"
     )
     assert response.headers["Pragma"] == "no-cache"
+
+
+def test_NoCacheMiddleware__async__adds_cache_control_headers(mocker):
+    # Given
+    a_response = HttpResponse()
+    mocked_get_response = mocker.AsyncMock(return_value=a_response)
+    mock_request = mocker.MagicMock()
+
+    middleware = NeverCacheMiddleware(mocked_get_response)
+
+    # When
+    response = async_to_sync(middleware)(mock_request)
+
+    # Then
+    assert (
+        response.headers["Cache-Control"]
+        == "max-age=0, no-cache, no-store, must-revalidate, private"
+    )
+    assert response.headers["Pragma"] == "no-cache"
@@ -0,0 +1,48 @@
+from core.middleware.server_timing import ServerTimingMiddleware
+from core.server_timing import stage_durations, timed_stage
+from django.http import HttpResponse
+from pytest_django.fixtures import SettingsWrapper
+from pytest_mock import MockerFixture
+
+
+def test_server_timing_middleware__sampled__adds_server_timing_header(
+    settings: SettingsWrapper,
+    mocker: MockerFixture,
+) -> None:
+    # Given
+    settings.SERVER_TIMING_SAMPLE_RATE = 1.0
+    stage_durations.clear()
+
+    def get_response(request: object) -> HttpResponse:
+        with timed_stage("environment_auth"):
+            pass
+        return HttpResponse()
+
+    middleware = ServerTimingMiddleware(get_response)
+
+    # When
+    response = middleware(mocker.MagicMock())
+
+    # Then
+    stages = [metric.split(";")[0] for metric in response["Server-Timing"].split(", ")]
+    assert stages == ["environment_auth", "total"]
+    assert 'desc="0 queries"' in response["Server-Timing"]
+    assert (
+        'flagsmith_request_stage_duration_milliseconds_count{stage="total"} 1'
+        in stage_durations.render()
+    )
+
+
+def test_server_timing_middleware__not_sampled__does_not_add_header(
+    settings: SettingsWrapper,
+    mocker: MockerFixture,
+) -> None:
+    # Given
+    settings.SERVER_TIMING_SAMPLE_RATE = 0.0
+    middleware = ServerTimingMiddleware(mocker.MagicMock(return_value=HttpResponse()))
+
+    # When
+    response = middleware(mocker.MagicMock())
+
+    # Then
+    assert "Server-Timing" not in response
@@ -0,0 +1,56 @@
+from core.background_flusher import BackgroundFlusher
+from pytest_mock import MockerFixture
+
+
+def test_background_flusher__ensure_started__starts_thread_once_per_process(
+    mocker: MockerFixture,
+) -> None:
+    # Given
+    mocked_thread = mocker.patch("core.background_flusher.threading.Thread")
+    mocked_atexit = mocker.patch("core.background_flusher.atexit")
+    mocked_getpid = mocker.patch("core.background_flusher.os.getpid", return_value=1)
+    on_fork = mocker.MagicMock()
+    flusher = BackgroundFlusher(
+        name="Buffer",
+        flush=mocker.MagicMock(),
+        get_interval=lambda: 1,
+        on_fork=on_fork,
+    )
+
+    # When
+    flusher.ensure_started()
+    flusher.ensure_started()
+
+    # Then
+    mocked_thread.assert_called_once_with(
+        target=flusher._run, name="Buffer-flusher", daemon=True
+    )
+    mocked_atexit.register.assert_called_once_with(flusher._flush_on_exit)
+    on_fork.assert_not_called()
+
+    # When - the process is forked
+    mocked_getpid.return_value = 2
+    flusher.ensure_started()
+
+    # Then
+    assert mocked_thread.call_count == 2
+    mocked_atexit.register.assert_called_once()
+    on_fork.assert_called_once_with()
+
+
+def test_background_flusher__flush_safely__closes_old_connections(
+    mocker: MockerFixture,
+) -> None:
+    # Given
+    mocked_close_old_connections = mocker.patch(
+        "core.background_flusher.close_old_connections"
+    )
+    flush = mocker.MagicMock(side_effect=Exception("Flush failed"))
+    flusher = BackgroundFlusher(name="Buffer", flush=flush, get_interval=lambda: 1)
+
+    # When
+    flusher.flush_safely()
+
+    # Then
+    flush.assert_called_once_with()
+    assert mocked_close_old_connections.call_count == 2
@@ -0,0 +1,64 @@
+from core.server_timing import (
+    StageHistogram,
+    collect_request_timings,
+    timed_stage,
+)
+from pytest_mock import MockerFixture
+
+from environments.models import Environment
+
+
+def test_timed_stage__not_collecting__does_nothing() -> None:
+    # Given
+    @timed_stage("stage")
+    def stage() -> str:
+        return "result"
+
+    # When
+    result = stage()
+
+    # Then
+    assert result == "result"
+
+
+def test_collect_request_timings__counts_queries_per_stage(
+    environment: Environment,
+) -> None:
+    # When
+    with collect_request_timings() as timings:
+        with timed_stage("query"):
+            list(Environment.objects.all())
+            list(Environment.objects.all())
+        with timed_stage("query"):
+            list(Environment.objects.all())
+
+    # Then
+    assert list(timings.stages) == ["query"]
+    duration_ms, queries = timings.stages["query"]
+    assert duration_ms > 0
+    assert queries == 3
+
+
+def test_stage_histogram__render__returns_cumulative_buckets(
+    mocker: MockerFixture,
+) -> None:
+    # Given
+    mocker.patch("core.server_timing.os.getpid", return_value=123)
+    histogram = StageHistogram("test_metric", "A test metric.", (1, 10))
+    histogram.observe("stage", 0.5)
+    histogram.observe("stage", 5)
+    histogram.observe("stage", 50)
+
+    # When
+    rendered = histogram.render()
+
+    # Then
+    assert rendered == (
+        "# HELP test_metric A test metric.\n"
+        "# TYPE test_metric histogram\n"
+        'test_metric_bucket{pid="123",stage="stage",le="1"} 1\n'
+        'test_metric_bucket{pid="123",stage="stage",le="10"} 2\n'
+        'test_metric_bucket{pid="123",stage="stage",le="+Inf"} 3\n'
+        'test_metric_sum{pid="123",stage="stage"} 55.5\n'
+        'test_metric_count{pid="123",stage="stage"} 3\n'
+    )
@@ -0,0 +1,181 @@
+import pytest
+from core.two_tier_cache import TwoTierCache
+from django.core.cache import caches
+from pytest_mock import MockerFixture
+
+SHARED_CACHE_NAME = "default"
+
+
+@pytest.fixture()
+def two_tier_cache() -> TwoTierCache:
+    caches[SHARED_CACHE_NAME].clear()
+    return TwoTierCache(
+        SHARED_CACHE_NAME,
+        {
+            "TIMEOUT": 60,
+            "OPTIONS": {
+                "LOCAL_TIMEOUT": 5,
+                "LOCAL_MAX_ENTRIES": 2,
+                "INVALIDATION_CHANNEL": "invalidations",
+            },
+        },
+    )
+
+
+def test_two_tier_cache__get__populates_local_tier_from_shared_tier(
+    two_tier_cache: TwoTierCache,
+) -> None:
+    # Given
+    caches[SHARED_CACHE_NAME].set("key", "value")
+
+    # When
+    first_value = two_tier_cache.get("key")
+    caches[SHARED_CACHE_NAME].delete("key")
+    second_value = two_tier_cache.get("key")
+
+    # Then
+    assert first_value == second_value == "value"
+    assert two_tier_cache.get_stats() == {
+        "local_hits": 1,
+        "local_misses": 1,
+        "shared_hits": 1,
+        "shared_misses": 0,
+    }
+
+
+def test_two_tier_cache__get__returns_copy_of_local_entry(
+    two_tier_cache: TwoTierCache,
+) -> None:
+    # Given
+    value = {"items": [1]}
+    two_tier_cache.set("key", value)
+    value["items"].append(2)
+
+    # When
+    first_value = two_tier_cache.get("key")
+    first_value["items"].append(3)
+    second_value = two_tier_cache.get("key")
+
+    # Then
+    assert second_value == {"items": [1]}
+    assert second_value is not first_value
+    assert two_tier_cache.get_stats()["local_hits"] == 2
+
+
+def test_two_tier_cache__get__returns_default_when_missing_from_both_tiers(
+    two_tier_cache: TwoTierCache,
+) -> None:
+    # When
+    value = two_tier_cache.get("key", "default")
+
+    # Then
+    assert value == "default"
+    assert two_tier_cache.get_stats() == {
+        "local_hits": 0,
+        "local_misses": 1,
+        "shared_hits": 0,
+        "shared_misses": 1,
+    }
+
+
+def test_two_tier_cache__set__writes_to_both_tiers(
+    two_tier_cache: TwoTierCache,
+) -> None:
+    # When
+    two_tier_cache.set("key", "value")
+
+    # Then
+    assert caches[SHARED_CACHE_NAME].get("key") == "value"
+    assert two_tier_cache.get("key") == "value"
+    assert two_tier_cache.get_stats()["local_hits"] == 1
+
+
+def test_two_tier_cache__get__reads_shared_tier_once_local_entry_expires(
+    two_tier_cache: TwoTierCache,
+    mocker: MockerFixture,
+) -> None:
+    # Given
+    mock_monotonic = mocker.patch("core.two_tier_cache.time.monotonic")
+    mock_monotonic.return_value = 100
+    two_tier_cache.set("key", "value")
+    caches[SHARED_CACHE_NAME].set("key", "new-value")
+
+    # When
+    mock_monotonic.return_value = 106
+    value = two_tier_cache.get("key")
+
+    # Then
+    assert value == "new-value"
+
+
+def test_two_tier_cache__set__evicts_least_recently_used_local_entry(
+    two_tier_cache: TwoTierCache,
+) -> None:
+    # Given
+    two_tier_cache.set("key-1", "value-1")
+    two_tier_cache.set("key-2", "value-2")
+    two_tier_cache.get("key-1")
+
+    # When
+    two_tier_cache.set("key-3", "value-3")
+    caches[SHARED_CACHE_NAME].clear()
+
+    # Then
+    assert two_tier_cache.get("key-1") == "value-1"
+    assert two_tier_cache.get("key-2") is None
+    assert two_tier_cache.get("key-3") == "value-3"
+
+
+def test_two_tier_cache__delete__removes_from_both_tiers(
+    two_tier_cache: TwoTierCache,
+) -> None:
+    # Given
+    two_tier_cache.set("key", "value")
+
+    # When
+    two_tier_cache.delete("key")
+
+    # Then
+    assert caches[SHARED_CACHE_NAME].get("key") is None
+    assert two_tier_cache.get("key") is None
+
+
+def test_two_tier_cache__delete_many__publishes_invalidation_to_redis(
+    two_tier_cache: TwoTierCache,
+    mocker: MockerFixture,
+) -> None:
+    # Given
+    mocker.patch.object(two_tier_cache, "_ensure_subscriber")
+    mock_redis_client = mocker.MagicMock()
+    mocker.patch.object(
+        two_tier_cache, "_get_redis_client", return_value=mock_redis_client
+    )
+
+    # When
+    two_tier_cache.delete_many(["key-1", "key-2"])
+
+    # Then
+    mock_redis_client.publish.assert_called_once_with(
+        "invalidations",
+        f"{two_tier_cache.make_key('key-1')}\n{two_tier_cache.make_key('key-2')}",
+    )
+
+
+def test_two_tier_cache__handle_invalidation_message__evicts_local_entries(
+    two_tier_cache: TwoTierCache,
+) -> None:
+    # Given
+    two_tier_cache.set("key-1", "value-1")
+    two_tier_cache.set("key-2", "value-2")
+
+    # and both keys have since been removed from the shared tier
+    caches[SHARED_CACHE_NAME].delete_many(["key-1", "key-2"])
+
+    # When
+    two_tier_cache._handle_invalidation_message(
+        {"data": two_tier_cache.make_key("key-1").encode()}
+    )
+
+    # Then
+    assert two_tier_cache.get("key-1") is None
+    assert two_tier_cache.get("key-2") == "value-2"
@@ -0,0 +1,40 @@
+import json
+
+from _pytest.capture import CaptureFixture
+from django.core.management import call_command
+
+from organisations.models import Organisation
+
+
+def test_benchmark_sdk__json__reports_results_and_rolls_back_seed_data(
+    db: None,
+    capsys: CaptureFixture[str],
+) -> None:
+    # When
+    call_command(
+        "benchmark_sdk",
+        "--features=3",
+        "--segments=2",
+        "--identities=2",
+        "--traits-per-identity=2",
+        "--requests=2",
+        "--warmup=1",
+        "--json",
+    )
+
+    # Then
+    results = json.loads(capsys.readouterr().out)
+    assert [result["name"] for result in results] == [
+        "GET /api/v1/flags/",
+        "GET /api/v1/identities/",
+        "POST /api/v1/identities/",
+        "GET /api/v1/environment-document/",
+        "POST /api/v1/analytics/flags/",
+    ]
+    for result in results:
+        assert result["requests"] == 2
+        assert result["p99_ms"] >= result["p50_ms"] > 0
+        assert result["queries_per_request"] > 0
+        assert result["allocated_kib_per_request"] > 0
+
+    assert not Organisation.objects.exists()
@@ -1,5 +1,6 @@
 import pytest
 
+from edge_api.identities import edge_request_forwarder
 from edge_api.identities.models import EdgeIdentity
 from environments.models import Environment
 from features.models import Feature
@@ -7,6 +8,9 @@ from features.models import Feature
 
 @pytest.fixture()
 def forwarder_mocked_migrator(mocker):
+    # forget the migration status of the projects from other tests
+    mocker.patch.object(edge_request_forwarder, "_migrated_project_ids", set())
+
     return mocker.patch(
         "edge_api.identities.edge_request_forwarder.IdentityMigrator",
         autospec=True,
@@ -17,10 +21,9 @@ def forwarder_mocked_migrator(mocker):
 @pytest.fixture()
 def forwarder_mocked_requests(mocker):
     return mocker.patch(
-        "edge_api.identities.edge_request_forwarder.requests",
+        "edge_api.identities.edge_request_forwarder._get_session",
         autospec=True,
-        spec_set=True,
-    )
+    ).return_value
 
 
 @pytest.fixture()
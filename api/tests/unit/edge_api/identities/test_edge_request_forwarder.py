@@ -1,13 +1,23 @@
 import json
+from collections import defaultdict
+from unittest.mock import MagicMock
 
 import pytest
+import requests
+from core.background_flusher import BackgroundFlusher
 from core.constants import FLAGSMITH_SIGNATURE_HEADER
+from pytest_django.fixtures import SettingsWrapper
+from pytest_mock import MockerFixture
 
 from edge_api.identities.edge_request_forwarder import (
+    ForwardedRequestsBuffer,
+    _get_trait_request,
     forward_identity_request,
+    forward_requests,
     forward_trait_request,
     forward_trait_request_sync,
     forward_trait_requests,
+    get_forwarding_stats,
 )
 
 
@@ -151,7 +161,9 @@ def test_forward_trait_request_calls_sync_function_correctly(mocker):
     )
 
 
-def test_forward_trait_requests_calls_sync_function_correctly(mocker):
+def test_forward_trait_requests_calls_sync_function_correctly(
+    mocker, forwarder_mocked_migrator
+):
     # Given
     mocked_forward_trait_request = mocker.patch(
         "edge_api.identities.edge_request_forwarder.forward_trait_request_sync",
@@ -165,13 +177,171 @@ def test_forward_trait_requests_calls_sync_function_correctly(mocker):
         {"identity": {"identifier": "test_user_456"}},
     ]
 
+    forwarder_mocked_migrator.return_value.is_migration_done = True
+
     # When
     forward_trait_requests(request_method, headers, project_id, payload)
 
     # Then
     mocked_forward_trait_request.assert_has_calls(
         [
-            mocker.call(request_method, headers, project_id, payload[0]),
-            mocker.call(request_method, headers, project_id, payload[1]),
+            mocker.call(
+                request_method=request_method,
+                headers=headers,
+                project_id=project_id,
+                payload=payload[0],
+            ),
+            mocker.call(
+                request_method=request_method,
+                headers=headers,
+                project_id=project_id,
+                payload=payload[1],
+            ),
+        ],
+        any_order=True,
+    )
+
+
+def test_forward_requests__forwards_requests_for_each_identity_in_order(
+    mocker: MockerFixture,
+    forward_enable_settings: SettingsWrapper,
+    forwarder_mocked_migrator: MagicMock,
+    forwarder_mocked_requests: MagicMock,
+) -> None:
+    # Given
+    forward_enable_settings.EDGE_REQUEST_FORWARDING_MAX_WORKERS = 4
+    forwarder_mocked_migrator.return_value.is_migration_done = True
+    project_id = 1
+    headers = {"X-Environment-Key": "test_api_key"}
+    payloads = [
+        {"identity": {"identifier": f"identity_{i % 3}"}, "trait_value": i}
+        for i in range(30)
+    ]
+
+    initial_stats = get_forwarding_stats()
+
+    # a request that fails shouldn't stop the others from being forwarded
+    forwarder_mocked_requests.post.side_effect = [
+        requests.ConnectionError(),
+        *[mocker.MagicMock()] * 29,
+    ]
+
+    # When
+    forward_requests(
+        [
+            _get_trait_request("POST", headers, project_id, payload)
+            for payload in payloads
+        ]
+    )
+
+    # Then
+    trait_values_by_identifier = defaultdict(list)
+    for call in forwarder_mocked_requests.post.call_args_list:
+        payload = json.loads(call.kwargs["data"])
+        trait_values_by_identifier[payload["identity"]["identifier"]].append(
+            payload["trait_value"]
+        )
+    assert trait_values_by_identifier == {
+        f"identity_{i}": list(range(i, 30, 3)) for i in range(3)
+    }
+
+    # the migration status was only read once
+    forwarder_mocked_migrator.assert_called_once_with(project_id)
+
+    assert get_forwarding_stats() == {
+        "forwarded": initial_stats["forwarded"] + 29,
+        "failed": initial_stats["failed"] + 1,
+        "skipped": initial_stats["skipped"],
+    }
+
+
+def test_forward_requests__error_response__records_failed(
+    forward_enable_settings: SettingsWrapper,
+    forwarder_mocked_migrator: MagicMock,
+    forwarder_mocked_requests: MagicMock,
+) -> None:
+    # Given
+    forwarder_mocked_migrator.return_value.is_migration_done = True
+    forwarder_mocked_requests.post.return_value.raise_for_status.side_effect = (
+        requests.HTTPError()
+    )
+    initial_stats = get_forwarding_stats()
+
+    # When
+    forward_requests(
+        [_get_trait_request("POST", {}, 1, {"identity": {"identifier": "test"}})]
+    )
+
+    # Then
+    assert get_forwarding_stats() == {
+        "forwarded": initial_stats["forwarded"],
+        "failed": initial_stats["failed"] + 1,
+        "skipped": initial_stats["skipped"],
+    }
+
+
+def test_forward_requests__project_migrated_since_last_batch__forwards_requests(
+    forward_enable_settings: SettingsWrapper,
+    forwarder_mocked_migrator: MagicMock,
+    forwarder_mocked_requests: MagicMock,
+) -> None:
+    # Given
+    forwarder_mocked_migrator.return_value.is_migration_done = False
+    forwarded_requests = [
+        _get_trait_request("POST", {}, 1, {"identity": {"identifier": "test"}})
+    ]
+    forward_requests(forwarded_requests)
+    initial_stats = get_forwarding_stats()
+
+    # When
+    forwarder_mocked_migrator.return_value.is_migration_done = True
+    forward_requests(forwarded_requests)
+
+    # Then
+    forwarder_mocked_requests.post.assert_called_once()
+    assert get_forwarding_stats() == {
+        "forwarded": initial_stats["forwarded"] + 1,
+        "failed": initial_stats["failed"],
+        "skipped": initial_stats["skipped"],
+    }
+
+
+def test_forwarded_requests_buffer__flush__enqueues_batches(
+    mocker: MockerFixture,
+    settings: SettingsWrapper,
+) -> None:
+    # Given
+    settings.EDGE_REQUEST_FORWARDING_BUFFER_SECONDS = 1
+    settings.EDGE_REQUEST_FORWARDING_MAX_BATCH_SIZE = 2
+    mocker.patch.object(BackgroundFlusher, "ensure_started")
+    mocked_forward_requests = mocker.patch(
+        "edge_api.identities.edge_request_forwarder.forward_requests"
+    )
+    buffer = ForwardedRequestsBuffer()
+    forwarded_requests = [
+        _get_trait_request("POST", {}, 1, {"trait_value": i}) for i in range(3)
+    ]
+
+    # When
+    buffer.add(forwarded_requests[:1])
+
+    # Then
+    mocked_forward_requests.delay.assert_not_called()
+
+    # When - the buffer is full
+    buffer.add(forwarded_requests[1:])
+
+    # Then
+    mocked_forward_requests.delay.assert_has_calls(
+        [
+            mocker.call(kwargs={"forwarded_requests": forwarded_requests[:2]}),
+            mocker.call(kwargs={"forwarded_requests": forwarded_requests[2:]}),
         ]
     )
+
+    # When - there's nothing left to flush
+    mocked_forward_requests.reset_mock()
+    buffer.flush()
+
+    # Then
+    mocked_forward_requests.delay.assert_not_called()
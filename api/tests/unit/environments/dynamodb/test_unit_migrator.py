@@ -1,4 +1,6 @@
 from pytest_django.asserts import assertQuerysetEqual as assert_queryset_equal
+from pytest_django.fixtures import SettingsWrapper
+from pytest_mock import MockerFixture
 
 from environments.dynamodb.migrator import IdentityMigrator
 from environments.dynamodb.types import (
@@ -7,6 +9,8 @@ from environments.dynamodb.types import (
 )
 from environments.identities.models import Identity
 from environments.models import Environment, EnvironmentAPIKey
+from projects.models import Project
+from util.mappers import map_identity_to_identity_document
 
 
 def test_migrate_calls_internal_methods_with_correct_arguments(
@@ -26,7 +30,10 @@ def test_migrate_calls_internal_methods_with_correct_arguments(
         "environments.dynamodb.migrator.DynamoEnvironmentAPIKeyWrapper", autospec=True
     )
     mocked_project_metadata_instance = mocker.MagicMock(
-        spec=DynamoProjectMetadata, id=project.id
+        spec=DynamoProjectMetadata,
+        id=project.id,
+        identity_migration_status=ProjectIdentityMigrationStatus.MIGRATION_SCHEDULED,
+        last_migrated_identity_id=None,
     )
     mocked_project_metadata.get_or_new.return_value = mocked_project_metadata_instance
 
@@ -41,12 +48,12 @@ def test_migrate_calls_internal_methods_with_correct_arguments(
 
     # Then
     mocked_identity_wrapper.assert_called_with()
-
-    args, kwargs = mocked_identity_wrapper.return_value.write_identities.call_args
-    assert kwargs == {}
-
-    assert_queryset_equal(
-        args[0], Identity.objects.filter(environment__project__id=project.id)
+    mocked_identity_wrapper.return_value.write_identity_documents.assert_called_once_with(
+        [map_identity_to_identity_document(identity)]
+    )
+    mocked_project_metadata_instance.start_identity_migration.assert_called_once_with()
+    mocked_project_metadata_instance.checkpoint_identity_migration.assert_called_once_with(
+        identity.id
     )
     # and
     args, kwargs = mocked_environment_wrapper.return_value.write_environments.call_args
@@ -166,3 +173,63 @@ def test_get_migration_status_returns_correct_migraion_status_for_in_progress_mi
     # Then
     assert status == ProjectIdentityMigrationStatus.MIGRATION_IN_PROGRESS
     mocked_project_metadata.get_or_new.assert_called_with(project_id)
+
+
+def test_migrate__migration_in_progress__resumes_after_last_migrated_identity(
+    mocker: MockerFixture,
+    settings: SettingsWrapper,
+    project: Project,
+    environment: Environment,
+) -> None:
+    # Given
+    settings.IDENTITY_MIGRATION_CHUNK_SIZE = 2
+    settings.IDENTITY_MIGRATION_WRITE_WORKERS = 2
+
+    identities = [
+        Identity.objects.create(identifier=f"identity_{i}", environment=environment)
+        for i in range(7)
+    ]
+
+    mocked_project_metadata = mocker.patch(
+        "environments.dynamodb.migrator.DynamoProjectMetadata", autospec=True
+    )
+    mocker.patch("environments.dynamodb.migrator.DynamoEnvironmentWrapper")
+    mocker.patch("environments.dynamodb.migrator.DynamoEnvironmentAPIKeyWrapper")
+    mocked_identity_wrapper = mocker.patch(
+        "environments.dynamodb.migrator.DynamoIdentityWrapper", autospec=True
+    )
+
+    # the migration was interrupted after migrating the first two identities
+    mocked_project_metadata_instance = mocker.MagicMock(
+        spec=DynamoProjectMetadata,
+        id=project.id,
+        identity_migration_status=ProjectIdentityMigrationStatus.MIGRATION_IN_PROGRESS,
+        last_migrated_identity_id=identities[1].id,
+    )
+    mocked_project_metadata.get_or_new.return_value = mocked_project_metadata_instance
+
+    identity_migrator = IdentityMigrator(project.id)
+
+    # When
+    identity_migrator.migrate()
+
+    # Then
+    mocked_project_metadata_instance.start_identity_migration.assert_not_called()
+
+    written_identifiers = {
+        identity_document["identifier"]
+        for call in mocked_identity_wrapper.return_value.write_identity_documents.call_args_list
+        for identity_document in call.args[0]
+    }
+    assert written_identifiers == {identity.identifier for identity in identities[2:]}
+
+    # and progress was checkpointed after each chunk, in order
+    assert (
+        mocked_project_metadata_instance.checkpoint_identity_migration.call_args_list
+        == [
+            mocker.call(identities[3].id),
+            mocker.call(identities[5].id),
+            mocker.call(identities[6].id),
+        ]
+    )
+    mocked_project_metadata_instance.finish_identity_migration.assert_called_once_with()
@@ -83,6 +83,7 @@ def test_start_identity_migration_calls_put_item_with_correct_arguments(mocker):
             "migration_end_time": None,
             "migration_start_time": migration_start_time.isoformat(),
             "triggered_at": None,
+            "last_migrated_identity_id": None,
         }
     )
 
@@ -146,6 +147,35 @@ def test_finish_identity_migration_calls_put_item_with_correct_arguments(
             "migration_start_time": migration_start_time,
             "migration_end_time": migration_end_time.isoformat(),
             "triggered_at": None,
+            "last_migrated_identity_id": None,
+        }
+    )
+
+
+def test_checkpoint_identity_migration__saves_last_migrated_identity_id(
+    mocker: MockerFixture,
+) -> None:
+    # Given
+    project_id = 1
+    migration_start_time = datetime.now().isoformat()
+    mocked_dynamo_table = mocker.patch(
+        "environments.dynamodb.types.project_metadata_table"
+    )
+    project_metadata = DynamoProjectMetadata(
+        id=project_id, migration_start_time=migration_start_time
+    )
+
+    # When
+    project_metadata.checkpoint_identity_migration(last_migrated_identity_id=10)
+
+    # Then
+    mocked_dynamo_table.put_item.assert_called_with(
+        Item={
+            "id": project_id,
+            "migration_start_time": migration_start_time,
+            "migration_end_time": None,
+            "triggered_at": None,
+            "last_migrated_identity_id": 10,
         }
     )
 
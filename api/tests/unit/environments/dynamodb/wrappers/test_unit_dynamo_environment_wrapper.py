@@ -3,6 +3,10 @@ from django.core.exceptions import ObjectDoesNotExist
 from mypy_boto3_dynamodb.service_resource import Table
 
 from environments.dynamodb import DynamoEnvironmentWrapper
+from environments.dynamodb.constants import DYNAMODB_MAX_ITEM_SIZE_BYTES
+from environments.dynamodb.wrappers.exceptions import (
+    EnvironmentDocumentsTooLarge,
+)
 from environments.models import Environment
 from util.mappers import map_environment_to_environment_document
 
@@ -44,10 +48,28 @@ def test_get_item_calls_dynamo_get_item_with_correct_arguments(mocker):
     returned_item = dynamo_environment_wrapper.get_item(api_key)
 
     # Then
-    mocked_dynamo_table.get_item.assert_called_with(Key={"api_key": api_key})
+    mocked_dynamo_table.get_item.assert_called_with(
+        Key={"api_key": api_key}, ConsistentRead=False
+    )
     assert returned_item == expected_document
 
 
+def test_get_item__consistent__makes_consistent_read(mocker):
+    # Given
+    dynamo_environment_wrapper = DynamoEnvironmentWrapper()
+    api_key = "test_key"
+    mocked_dynamo_table = mocker.patch.object(dynamo_environment_wrapper, "_table")
+    mocked_dynamo_table.get_item.return_value = {"Item": {"key": "value"}}
+
+    # When
+    dynamo_environment_wrapper.get_item(api_key, consistent=True)
+
+    # Then
+    mocked_dynamo_table.get_item.assert_called_with(
+        Key={"api_key": api_key}, ConsistentRead=True
+    )
+
+
 def test_get_item_raises_object_does_not_exists_if_get_item_does_not_return_any_item(
     mocker,
 ):
@@ -76,3 +98,33 @@ def test_delete_environment__removes_environment_document_from_dynamodb(
 
     # Then
     assert flagsmith_environment_table.scan()["Count"] == 0
+
+
+def test_write_environment_documents__documents_exceeding_item_size_limit__writes_others_and_raises(
+    mocker,
+    project,
+    environment,
+):
+    # Given
+    dynamo_environment_wrapper = DynamoEnvironmentWrapper()
+    mocked_dynamo_table = mocker.patch.object(dynamo_environment_wrapper, "_table")
+
+    environment_document = map_environment_to_environment_document(environment)
+    oversized_environment_document = {
+        **environment_document,
+        "api_key": "oversized",
+        "name": "a" * DYNAMODB_MAX_ITEM_SIZE_BYTES,
+    }
+
+    # When
+    with pytest.raises(EnvironmentDocumentsTooLarge) as exc_info:
+        dynamo_environment_wrapper.write_environment_documents(
+            [oversized_environment_document, environment_document]
+        )
+
+    # Then
+    assert exc_info.value.api_keys == ["oversized"]
+    mocked_put_item = (
+        mocked_dynamo_table.batch_writer.return_value.__enter__.return_value.put_item
+    )
+    mocked_put_item.assert_called_once_with(Item=environment_document)
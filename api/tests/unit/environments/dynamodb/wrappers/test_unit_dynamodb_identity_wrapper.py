@@ -5,6 +5,7 @@ import pytest
 from boto3.dynamodb.conditions import Key
 from core.constants import INTEGER
 from django.core.exceptions import ObjectDoesNotExist
+from django.utils import timezone
 from flag_engine.identities.models import IdentityModel
 from flag_engine.segments.constants import IN
 from mypy_boto3_dynamodb.service_resource import Table
@@ -16,10 +17,21 @@ from edge_api.identities.search import (
     EdgeIdentitySearchData,
     EdgeIdentitySearchType,
 )
-from environments.dynamodb import DynamoIdentityWrapper
-from environments.dynamodb.wrappers.exceptions import CapacityBudgetExceeded
+from environments.dynamodb import (
+    DynamoEnvironmentWrapper,
+    DynamoIdentityWrapper,
+)
+from environments.dynamodb.pipeline import write_environments_to_tables
+from environments.dynamodb.wrappers.environment_wrapper import (
+    environment_model_cache,
+)
+from environments.dynamodb.wrappers.exceptions import (
+    CapacityBudgetExceeded,
+    EnvironmentDocumentsTooLarge,
+)
 from environments.identities.models import Identity
 from environments.identities.traits.models import Trait
+from environments.models import Environment
 from segments.models import Condition, Segment, SegmentRule
 from util.mappers import (
     map_environment_to_environment_document,
@@ -27,7 +39,6 @@ from util.mappers import (
 )
 
 if typing.TYPE_CHECKING:
-    from environments.models import Environment
     from projects.models import Project
 
 
@@ -601,3 +612,90 @@ def test_delete_all_identities__deletes_all_identities_documents_from_dynamodb(
     # Then
     assert flagsmith_identities_table.scan()["Count"] == 1
     assert flagsmith_identities_table.scan()["Items"][0] == identity_three
+
+
+def test_get_segment_ids__repeat_calls__reads_environment_document_once_per_version(
+    dynamo_enabled_project_environment_one: "Environment",
+    dynamo_enabled_project_environment_one_document: dict,
+    dynamo_environment_wrapper: DynamoEnvironmentWrapper,
+    mocker: MockerFixture,
+) -> None:
+    # Given
+    identity_model = IdentityModel(
+        identifier="identifier",
+        environment_api_key=dynamo_enabled_project_environment_one.api_key,
+    )
+    dynamo_identity_wrapper = DynamoIdentityWrapper()
+    get_item_spy = mocker.spy(DynamoEnvironmentWrapper, "get_item")
+
+    # When
+    for _ in range(3):
+        dynamo_identity_wrapper.get_segment_ids(identity_model=identity_model)
+
+    # Then
+    get_item_spy.assert_called_once_with(
+        mocker.ANY, dynamo_enabled_project_environment_one.api_key
+    )
+
+    # When - the environment is updated
+    Environment.objects.filter(id=dynamo_enabled_project_environment_one.id).update(
+        updated_at=timezone.now()
+    )
+    dynamo_identity_wrapper.get_segment_ids(identity_model=identity_model)
+
+    # Then - the environment document is read again
+    assert get_item_spy.call_count == 2
+
+
+def test_write_environments_to_tables__evicts_cached_environment_models(
+    dynamo_enabled_project_environment_one: "Environment",
+    dynamo_enabled_project_environment_one_document: dict,
+    dynamo_environment_wrapper: DynamoEnvironmentWrapper,
+) -> None:
+    # Given
+    api_key = dynamo_enabled_project_environment_one.api_key
+    DynamoIdentityWrapper().get_segment_ids(
+        identity_model=IdentityModel(
+            identifier="identifier", environment_api_key=api_key
+        )
+    )
+    assert environment_model_cache.get(api_key, default=None)
+
+    # When
+    write_environments_to_tables(
+        [dynamo_enabled_project_environment_one], [dynamo_environment_wrapper]
+    )
+
+    # Then
+    assert environment_model_cache.get(api_key, default=None) is None
+
+
+def test_write_environments_to_tables__write_fails__evicts_cached_environment_models(
+    mocker: MockerFixture,
+    dynamo_enabled_project_environment_one: "Environment",
+    dynamo_enabled_project_environment_one_document: dict,
+    dynamo_environment_wrapper: DynamoEnvironmentWrapper,
+) -> None:
+    # Given
+    api_key = dynamo_enabled_project_environment_one.api_key
+    DynamoIdentityWrapper().get_segment_ids(
+        identity_model=IdentityModel(
+            identifier="identifier", environment_api_key=api_key
+        )
+    )
+    mocker.patch.object(
+        dynamo_environment_wrapper,
+        "write_environment_documents",
+        side_effect=EnvironmentDocumentsTooLarge(
+            dynamo_environment_wrapper.get_table_name(), [api_key]
+        ),
+    )
+
+    # When
+    with pytest.raises(EnvironmentDocumentsTooLarge):
+        write_environments_to_tables(
+            [dynamo_enabled_project_environment_one], [dynamo_environment_wrapper]
+        )
+
+    # Then
+    assert environment_model_cache.get(api_key, default=None) is None
@@ -9,6 +9,7 @@ from flag_engine.segments.constants import (
     NOT_EQUAL,
 )
 from pytest_django import DjangoAssertNumQueries
+from pytest_django.fixtures import SettingsWrapper
 
 from environments.identities.models import Identity
 from environments.identities.traits.models import Trait
@@ -798,7 +799,7 @@ def test_get_identity_segments(
     # Then
     # the number of queries are what we expect (see above context manager) and
     # the segment is returned
-    assert len(segments) == 1 and segments[0] == segment
+    assert len(segments) == 1 and segments[0].id == segment.id
 
 
 def test_get_segments_with_overrides_only_only_returns_segments_overridden_in_environment(
@@ -843,7 +844,7 @@ def test_get_segments_with_overrides_only_only_returns_segments_overridden_in_en
 
     # Then
     assert len(identity_segments) == 1
-    assert identity_segments[0] == segment_1
+    assert identity_segments[0].id == segment_1.id
 
 
 def test_get_all_feature_states_does_not_return_null_versions(
@@ -1024,3 +1025,138 @@ def test_identity_get_all_feature_states__returns_identity_override__when_v2_fea
     # Then
     assert len(all_feature_states) == 1
     assert all_feature_states[0] == identity_override
+
+
+def test_get_all_feature_states_from_environment_feature_states_cache_matches_db(
+    environment: Environment,
+    project: Project,
+    identity: Identity,
+    feature: Feature,
+    segment: Segment,
+    segment_rule: SegmentRule,
+    feature_segment: FeatureSegment,
+    segment_featurestate: FeatureState,
+    settings: SettingsWrapper,
+) -> None:
+    # Given
+    Condition.objects.create(
+        rule=segment_rule, property="foo", operator=EQUAL, value="bar"
+    )
+    Trait.objects.create(
+        identity=identity, trait_key="foo", string_value="bar", value_type=STRING
+    )
+
+    # a second feature with an identity override and a scheduled segment override
+    another_feature = Feature.objects.create(name="another_feature", project=project)
+    identity_override = FeatureState.objects.create(
+        feature=another_feature, environment=environment, identity=identity
+    )
+    FeatureState.objects.create(
+        feature=another_feature,
+        environment=environment,
+        feature_segment=FeatureSegment.objects.create(
+            feature=another_feature, segment=segment, environment=environment
+        ),
+        live_from=timezone.now() + timezone.timedelta(days=1),
+    )
+
+    # and a third feature with an override for a segment the identity is not in
+    not_matching_segment = Segment.objects.create(name="not-matching", project=project)
+    Condition.objects.create(
+        rule=SegmentRule.objects.create(
+            segment=not_matching_segment, type=SegmentRule.ALL_RULE
+        ),
+        property="foo",
+        operator=EQUAL,
+        value="baz",
+    )
+    third_feature = Feature.objects.create(name="third_feature", project=project)
+    FeatureState.objects.create(
+        feature=third_feature,
+        environment=environment,
+        feature_segment=FeatureSegment.objects.create(
+            feature=third_feature,
+            segment=not_matching_segment,
+            environment=environment,
+        ),
+    )
+
+    expected_feature_states = identity.get_all_feature_states()
+    settings.ENVIRONMENT_FEATURE_STATES_CACHE_SECONDS = 60
+
+    # When
+    feature_states = identity.get_all_feature_states()
+
+    # Then
+    assert sorted(feature_states, key=lambda fs: fs.id) == sorted(
+        expected_feature_states, key=lambda fs: fs.id
+    )
+    assert {fs.feature_id: fs for fs in feature_states} == {
+        feature.id: segment_featurestate,
+        another_feature.id: identity_override,
+        third_feature.id: FeatureState.objects.get(
+            feature=third_feature,
+            environment=environment,
+            feature_segment=None,
+            identity=None,
+        ),
+    }
+
+
+def test_get_all_feature_states_from_environment_feature_states_cache_only_queries_identity_data(
+    environment: Environment,
+    identity: Identity,
+    feature: Feature,
+    segment_rule: SegmentRule,
+    segment_featurestate: FeatureState,
+    identity_featurestate: FeatureState,
+    settings: SettingsWrapper,
+    django_assert_num_queries: DjangoAssertNumQueries,
+) -> None:
+    # Given
+    Condition.objects.create(
+        rule=segment_rule, property="foo", operator=EQUAL, value="bar"
+    )
+    settings.ENVIRONMENT_FEATURE_STATES_CACHE_SECONDS = 60
+
+    # the environment's feature states have been cached by a previous request
+    identity.get_all_feature_states()
+
+    # When
+    # 1 query for the traits, and 2 for the identity overrides and their
+    # multivariate values
+    with django_assert_num_queries(3):
+        feature_states = identity.get_all_feature_states()
+
+    # Then
+    assert feature_states == [identity_featurestate]
+
+
+def test_get_all_feature_states_from_environment_feature_states_cache_with_v2_versioning(
+    environment_v2_versioning: Environment,
+    identity: Identity,
+    feature: Feature,
+    settings: SettingsWrapper,
+) -> None:
+    # Given
+    another_feature = Feature.objects.create(
+        name="another_feature", project=environment_v2_versioning.project
+    )
+    identity_override = FeatureState.objects.create(
+        environment=environment_v2_versioning,
+        identity=identity,
+        feature=another_feature,
+    )
+    identity.refresh_from_db()
+    settings.ENVIRONMENT_FEATURE_STATES_CACHE_SECONDS = 60
+
+    # When
+    feature_states = identity.get_all_feature_states()
+
+    # Then
+    assert {fs.feature_id: fs for fs in feature_states} == {
+        feature.id: FeatureState.objects.get(
+            feature=feature, environment=environment_v2_versioning, identity=None
+        ),
+        another_feature.id: identity_override,
+    }
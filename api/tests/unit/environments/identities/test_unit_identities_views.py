@@ -6,11 +6,14 @@ from unittest import mock
 import pytest
 from common.environments.permissions import MANAGE_IDENTITIES, VIEW_IDENTITIES
 from core.constants import FLAGSMITH_UPDATED_AT_HEADER, STRING
+from django.db import connection
 from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 from flag_engine.segments.constants import PERCENTAGE_SPLIT
 from pytest_django import DjangoAssertNumQueries
+from pytest_django.fixtures import SettingsWrapper
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.test import APIClient
@@ -763,9 +766,9 @@ def test_post_identify_without_persistence(
 
 
 @override_settings(EDGE_API_URL="http://localhost")
-@mock.patch("environments.identities.views.forward_identity_request")
-def test_post_identities_calls_forward_identity_request_with_correct_arguments(
-    mocked_forward_identity_request: mock.MagicMock,
+@mock.patch("environments.identities.views.queue_identity_request")
+def test_post_identities_calls_queue_identity_request_with_correct_arguments(
+    mocked_queue_identity_request: mock.MagicMock,
     identity: Identity,
     api_client: APIClient,
     environment: Environment,
@@ -790,19 +793,18 @@ def test_post_identities_calls_forward_identity_request_with_correct_arguments(
     api_client.post(url, data=json.dumps(data), content_type="application/json")
 
     # Then
-    args, kwargs = mocked_forward_identity_request.delay.call_args_list[0]
-    assert args == ()
-    assert kwargs["args"][0] == "POST"
-    assert kwargs["args"][1].get("X-Environment-Key") == environment.api_key
-    assert kwargs["args"][2] == environment.project.id
+    args, kwargs = mocked_queue_identity_request.call_args_list[0]
+    assert args[0] == "POST"
+    assert args[1].get("X-Environment-Key") == environment.api_key
+    assert args[2] == environment.project.id
 
-    assert kwargs["kwargs"]["request_data"] == data
+    assert kwargs == {"request_data": data}
 
 
 @override_settings(EDGE_API_URL="http://localhost")
-@mock.patch("environments.identities.views.forward_identity_request")
-def test_get_identities_calls_forward_identity_request_with_correct_arguments(
-    mocked_forward_identity_request: mock.MagicMock,
+@mock.patch("environments.identities.views.queue_identity_request")
+def test_get_identities_calls_queue_identity_request_with_correct_arguments(
+    mocked_queue_identity_request: mock.MagicMock,
     identity: Identity,
     api_client: APIClient,
     environment: Environment,
@@ -820,13 +822,12 @@ def test_get_identities_calls_forward_identity_request_with_correct_arguments(
     api_client.get(url)
 
     # Then
-    args, kwargs = mocked_forward_identity_request.delay.call_args_list[0]
-    assert args == ()
-    assert kwargs["args"][0] == "GET"
-    assert kwargs["args"][1].get("X-Environment-Key") == environment.api_key
-    assert kwargs["args"][2] == project.id
+    args, kwargs = mocked_queue_identity_request.call_args_list[0]
+    assert args[0] == "GET"
+    assert args[1].get("X-Environment-Key") == environment.api_key
+    assert args[2] == project.id
 
-    assert kwargs["kwargs"]["query_params"] == {"identifier": identity.identifier}
+    assert kwargs == {"query_params": {"identifier": identity.identifier}}
 
 
 def test_post_identities_with_traits_fails_if_client_cannot_set_traits(
@@ -1350,3 +1351,136 @@ def test_identity_view_set_get_permissions():
         "partial_update": MANAGE_IDENTITIES,
         "destroy": MANAGE_IDENTITIES,
     }
+
+
+def test_post_bulk_identities__returns_flags_for_each_identity__no_persistence(
+    environment: Environment,
+    project: Project,
+    feature: Feature,
+    identity: Identity,
+    identity_featurestate: FeatureState,
+    api_client: APIClient,
+) -> None:
+    # Given
+    identity_override_value = "identity override"
+    identity_featurestate.feature_state_value.string_value = identity_override_value
+    identity_featurestate.feature_state_value.save()
+
+    segment = Segment.objects.create(name="segment", project=project)
+    rule = SegmentRule.objects.create(segment=segment, type=SegmentRule.ALL_RULE)
+    Condition.objects.create(
+        rule=rule, property="plan", operator="EQUAL", value="enterprise"
+    )
+    segment_override_value = "segment override"
+    segment_feature_state = FeatureState.objects.create(
+        feature_segment=FeatureSegment.objects.create(
+            feature=feature, segment=segment, environment=environment
+        ),
+        feature=feature,
+        environment=environment,
+    )
+    segment_feature_state.feature_state_value.string_value = segment_override_value
+    segment_feature_state.feature_state_value.save()
+
+    api_client.credentials(HTTP_X_ENVIRONMENT_KEY=environment.api_key)
+    url = reverse("api-v1:sdk-identities-bulk")
+    data = {
+        "identities": [
+            {"identifier": identity.identifier},
+            {
+                "identifier": "new-enterprise-identity",
+                "traits": [{"trait_key": "plan", "trait_value": "enterprise"}],
+            },
+            {"identifier": "new-identity"},
+        ]
+    }
+
+    # When
+    response = api_client.post(
+        url, data=json.dumps(data), content_type="application/json"
+    )
+
+    # Then
+    assert response.status_code == status.HTTP_200_OK
+    response_identities = response.json()["identities"]
+    assert [
+        (
+            response_identity["identifier"],
+            response_identity["flags"][0]["feature_state_value"],
+        )
+        for response_identity in response_identities
+    ] == [
+        (identity.identifier, identity_override_value),
+        ("new-enterprise-identity", segment_override_value),
+        ("new-identity", None),
+    ]
+    assert response_identities[1]["traits"][0]["transient"] is True
+
+    assert list(Identity.objects.all()) == [identity]
+    assert not Trait.objects.exists()
+
+
+def test_post_bulk_identities__number_of_queries_does_not_depend_on_identities(
+    environment: Environment,
+    feature: Feature,
+    api_client: APIClient,
+) -> None:
+    # Given
+    for i in range(5):
+        identity = Identity.objects.create(
+            identifier=f"identity-{i}", environment=environment
+        )
+        Trait.objects.create(
+            identity=identity, trait_key="foo", value_type=STRING, string_value="bar"
+        )
+        FeatureState.objects.create(
+            identity=identity, feature=feature, environment=environment
+        )
+
+    api_client.credentials(HTTP_X_ENVIRONMENT_KEY=environment.api_key)
+    url = reverse("api-v1:sdk-identities-bulk")
+
+    def _post_bulk_identities(identifiers: list[str]) -> int:
+        data = {
+            "identities": [{"identifier": identifier} for identifier in identifiers]
+        }
+        with CaptureQueriesContext(connection) as captured_queries:
+            response = api_client.post(
+                url, data=json.dumps(data), content_type="application/json"
+            )
+        assert response.status_code == status.HTTP_200_OK
+        return len(captured_queries)
+
+    # warm up the environment cache
+    _post_bulk_identities(["identity-0"])
+
+    # When
+    single_identity_num_queries = _post_bulk_identities(["identity-0"])
+    multiple_identities_num_queries = _post_bulk_identities(
+        [f"identity-{i}" for i in range(5)] + ["new-identity"]
+    )
+
+    # Then
+    assert multiple_identities_num_queries == single_identity_num_queries
+
+
+def test_post_bulk_identities__too_many_identities__returns_400(
+    environment: Environment,
+    api_client: APIClient,
+    settings: SettingsWrapper,
+) -> None:
+    # Given
+    settings.SDK_BULK_IDENTIFY_MAX_IDENTITIES = 2
+
+    api_client.credentials(HTTP_X_ENVIRONMENT_KEY=environment.api_key)
+    url = reverse("api-v1:sdk-identities-bulk")
+    data = {"identities": [{"identifier": f"identity-{i}"} for i in range(3)]}
+
+    # When
+    response = api_client.post(
+        url, data=json.dumps(data), content_type="application/json"
+    )
+
+    # Then
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "identities" in response.json()
@@ -601,9 +601,9 @@ def test_bulk_create_traits_when_float_value_sent_then_trait_value_correct(
 
 
 @override_settings(EDGE_API_URL="http://localhost")
-@mock.patch("environments.identities.traits.views.forward_trait_request")
-def test_post_trait_calls_forward_trait_request_with_correct_arguments(
-    mocked_forward_trait_request: mock.MagicMock,
+@mock.patch("environments.identities.traits.views.queue_trait_requests")
+def test_post_trait_calls_queue_trait_requests_with_correct_arguments(
+    mocked_queue_trait_requests: mock.MagicMock,
     identity: Identity,
     api_client: APIClient,
     project: Project,
@@ -627,18 +627,18 @@ def test_post_trait_calls_forward_trait_request_with_correct_arguments(
     api_client.post(url, data=json.dumps(data), content_type="application/json")
 
     # Then
-    args, kwargs = mocked_forward_trait_request.delay.call_args_list[0]
-    assert args == ()
-    assert kwargs["args"][0] == "POST"
-    assert kwargs["args"][1].get("X-Environment-Key") == environment.api_key
-    assert kwargs["args"][2] == environment.project.id
-    assert kwargs["args"][3] == data
+    args, kwargs = mocked_queue_trait_requests.call_args_list[0]
+    assert kwargs == {}
+    assert args[0] == "POST"
+    assert args[1].get("X-Environment-Key") == environment.api_key
+    assert args[2] == environment.project.id
+    assert args[3] == [data]
 
 
 @override_settings(EDGE_API_URL="http://localhost")
-@mock.patch("environments.identities.traits.views.forward_trait_request")
-def test_increment_value_calls_forward_trait_request_with_correct_arguments(
-    mocked_forward_trait_request: mock.MagicMock,
+@mock.patch("environments.identities.traits.views.queue_trait_requests")
+def test_increment_value_calls_queue_trait_requests_with_correct_arguments(
+    mocked_queue_trait_requests: mock.MagicMock,
     identity: Identity,
     api_client: APIClient,
     project: Project,
@@ -661,22 +661,23 @@ def test_increment_value_calls_forward_trait_request_with_correct_arguments(
     api_client.post(url, data=data)
 
     # Then
-    args, kwargs = mocked_forward_trait_request.delay.call_args_list[0]
-    assert args == ()
-    assert kwargs["args"][0] == "POST"
-    assert kwargs["args"][1].get("X-Environment-Key") == environment.api_key
-    assert kwargs["args"][2] == project.id
+    args, kwargs = mocked_queue_trait_requests.call_args_list[0]
+    assert kwargs == {}
+    assert args[0] == "POST"
+    assert args[1].get("X-Environment-Key") == environment.api_key
+    assert args[2] == project.id
 
     # And the structure of payload was correct.
-    assert kwargs["args"][3]["identity"]["identifier"] == data["identifier"]
-    assert kwargs["args"][3]["trait_key"] == data["trait_key"]
-    assert kwargs["args"][3]["trait_value"]
+    [payload] = args[3]
+    assert payload["identity"]["identifier"] == data["identifier"]
+    assert payload["trait_key"] == data["trait_key"]
+    assert payload["trait_value"]
 
 
 @override_settings(EDGE_API_URL="http://localhost")
-@mock.patch("environments.identities.traits.views.forward_trait_requests")
-def test_bulk_create_traits_calls_forward_trait_request_with_correct_arguments(
-    mocked_forward_trait_requests: mock.MagicMock,
+@mock.patch("environments.identities.traits.views.queue_trait_requests")
+def test_bulk_create_traits_calls_queue_trait_requests_with_correct_arguments(
+    mocked_queue_trait_requests: mock.MagicMock,
     api_client: APIClient,
     environment: Environment,
     project: Project,
@@ -704,12 +705,12 @@ def test_bulk_create_traits_calls_forward_trait_request_with_correct_arguments(
     api_client.put(url, data=json.dumps(data), content_type="application/json")
 
     # Then
-    args, kwargs = mocked_forward_trait_requests.delay.call_args_list[0]
-    assert args == ()
-    assert kwargs["args"][0] == "PUT"
-    assert kwargs["args"][1].get("X-Environment-Key") == environment.api_key
-    assert kwargs["args"][2] == project.id
-    assert kwargs["args"][3] == data
+    args, kwargs = mocked_queue_trait_requests.call_args_list[0]
+    assert kwargs == {}
+    assert args[0] == "PUT"
+    assert args[1].get("X-Environment-Key") == environment.api_key
+    assert args[2] == project.id
+    assert args[3] == data
 
 
 def test_create_trait_returns_403_if_client_cannot_set_traits(
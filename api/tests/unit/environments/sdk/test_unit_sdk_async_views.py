@@ -0,0 +1,194 @@
+import pytest
+from asgiref.sync import async_to_sync
+from core.constants import FLAGSMITH_UPDATED_AT_HEADER
+from django.core.handlers import base
+from django.core.handlers.asgi import ASGIHandler
+from django.http import HttpResponse
+from django.test import RequestFactory
+from pytest_django.fixtures import SettingsWrapper
+from pytest_mock import MockerFixture
+
+from environments.models import (
+    Environment,
+    EnvironmentAPIKey,
+    get_flags_cache_key,
+)
+from environments.sdk import async_views
+from environments.sdk.async_views import (
+    sdk_environment_document_view,
+    sdk_flags_view,
+)
+from features.constants import FlagsCacheVariant
+
+
+def test_sdk_environment_document_view__cached__returns_cached_document(
+    environment: Environment,
+    environment_api_key: EnvironmentAPIKey,
+    settings: SettingsWrapper,
+    mocker: MockerFixture,
+    rf: RequestFactory,
+) -> None:
+    # Given
+    settings.CACHE_ENVIRONMENT_DOCUMENT_SECONDS = 60
+    payload = Environment.get_environment_document_payload(environment.api_key)
+
+    mocker.patch.object(
+        async_views.environment_cache,
+        "aget",
+        mocker.AsyncMock(return_value=environment),
+    )
+    mocker.patch.object(
+        async_views.environment_document_cache,
+        "aget",
+        mocker.AsyncMock(return_value=payload),
+    )
+    mocked_sync_view = mocker.patch.object(
+        async_views, "_sdk_environment_document_view", mocker.AsyncMock()
+    )
+    request = rf.get(
+        "/api/v1/environment-document/",
+        HTTP_X_ENVIRONMENT_KEY=environment_api_key.key,
+    )
+
+    # When
+    response = async_to_sync(sdk_environment_document_view)(request)
+
+    # Then
+    assert response.status_code == 200
+    assert response.content == payload.content
+    assert response["ETag"] == payload.etag
+    mocked_sync_view.assert_not_called()
+
+
+def test_sdk_environment_document_view__client_key__uses_sync_view(
+    environment: Environment,
+    settings: SettingsWrapper,
+    mocker: MockerFixture,
+    rf: RequestFactory,
+) -> None:
+    # Given
+    settings.CACHE_ENVIRONMENT_DOCUMENT_SECONDS = 60
+    mocked_environment_cache_get = mocker.patch.object(
+        async_views.environment_cache, "aget", mocker.AsyncMock()
+    )
+    sync_view_response = HttpResponse(status=403)
+    mocked_sync_view = mocker.patch.object(
+        async_views,
+        "_sdk_environment_document_view",
+        mocker.AsyncMock(return_value=sync_view_response),
+    )
+    request = rf.get(
+        "/api/v1/environment-document/",
+        HTTP_X_ENVIRONMENT_KEY=environment.api_key,
+    )
+
+    # When
+    response = async_to_sync(sdk_environment_document_view)(request)
+
+    # Then
+    assert response is sync_view_response
+    mocked_sync_view.assert_awaited_once_with(request)
+    mocked_environment_cache_get.assert_not_called()
+
+
+def test_sdk_flags_view__cached__returns_cached_flags(
+    environment: Environment,
+    settings: SettingsWrapper,
+    mocker: MockerFixture,
+    rf: RequestFactory,
+) -> None:
+    # Given
+    settings.CACHE_FLAGS_SECONDS = 60
+    content = b'[{"feature": "cached"}]'
+
+    mocker.patch.object(
+        async_views.environment_cache,
+        "aget",
+        mocker.AsyncMock(return_value=environment),
+    )
+    mocked_flags_cache_get = mocker.patch.object(
+        async_views.flags_cache, "aget", mocker.AsyncMock(return_value=content)
+    )
+    mocked_sync_view = mocker.patch.object(
+        async_views, "_sdk_flags_view", mocker.AsyncMock()
+    )
+    request = rf.get("/api/v1/flags/", HTTP_X_ENVIRONMENT_KEY=environment.api_key)
+
+    # When
+    response = async_to_sync(sdk_flags_view)(request)
+
+    # Then
+    assert response.status_code == 200
+    assert response.content == content
+    assert response[FLAGSMITH_UPDATED_AT_HEADER] == str(
+        environment.updated_at.timestamp()
+    )
+    mocked_flags_cache_get.assert_awaited_once_with(
+        get_flags_cache_key(environment.api_key, FlagsCacheVariant.CLIENT)
+    )
+    mocked_sync_view.assert_not_called()
+
+
+def test_sdk_flags_view__not_cached__uses_sync_view(
+    environment: Environment,
+    settings: SettingsWrapper,
+    mocker: MockerFixture,
+    rf: RequestFactory,
+) -> None:
+    # Given
+    settings.CACHE_FLAGS_SECONDS = 60
+
+    mocker.patch.object(
+        async_views.environment_cache,
+        "aget",
+        mocker.AsyncMock(return_value=environment),
+    )
+    mocker.patch.object(
+        async_views.flags_cache, "aget", mocker.AsyncMock(return_value=None)
+    )
+    sync_view_response = HttpResponse(b"[]")
+    mocked_sync_view = mocker.patch.object(
+        async_views,
+        "_sdk_flags_view",
+        mocker.AsyncMock(return_value=sync_view_response),
+    )
+    request = rf.get("/api/v1/flags/", HTTP_X_ENVIRONMENT_KEY=environment.api_key)
+
+    # When
+    response = async_to_sync(sdk_flags_view)(request)
+
+    # Then
+    assert response is sync_view_response
+    mocked_sync_view.assert_awaited_once_with(request)
+
+
+@pytest.mark.parametrize(
+    "optional_middleware",
+    (
+        [],
+        [
+            "core.middleware.server_timing.ServerTimingMiddleware",
+            "app_analytics.middleware.GoogleAnalyticsMiddleware",
+            "app_analytics.middleware.APIUsageMiddleware",
+            "app_analytics.middleware.InfluxDBMiddleware",
+            "core.middleware.admin.AdminWhitelistMiddleware",
+            "integrations.sentry.middleware.ForceSentryTraceMiddleware",
+            "e2etests.middleware.E2ETestMiddleware",
+        ],
+    ),
+)
+def test_asgi_handler__configured_middleware__keeps_requests_async(
+    settings: SettingsWrapper,
+    mocker: MockerFixture,
+    optional_middleware: list[str],
+) -> None:
+    # Given
+    settings.MIDDLEWARE = [*settings.MIDDLEWARE, *optional_middleware]
+    # Django hands the requests over to a thread for any sync only middleware
+    sync_to_async_spy = mocker.spy(base, "sync_to_async")
+
+    # When
+    ASGIHandler()
+
+    # Then
+    sync_to_async_spy.assert_not_called()
@@ -0,0 +1,164 @@
+from flag_engine.segments.constants import EQUAL
+from pytest_django.fixtures import SettingsWrapper
+from pytest_mock import MockerFixture
+
+from environments.document_updates import _get_lock_key
+from environments.dynamodb import DynamoEnvironmentWrapper
+from environments.models import (
+    Environment,
+    environment_document_cache,
+    get_environment_document_payload_cache_key,
+)
+from features.models import Feature, FeatureState
+from segments.models import Condition, SegmentRule
+from util.mappers import map_environment_to_environment_document
+
+
+def test_process_environment_update__feature_state_value_updated__patches_cached_document(
+    environment: Environment,
+    feature_with_value: Feature,
+    settings: SettingsWrapper,
+    mocker: MockerFixture,
+) -> None:
+    # Given
+    settings.CACHE_ENVIRONMENT_DOCUMENT_WRITE_THROUGH = True
+    settings.ENVIRONMENT_DOCUMENT_INCREMENTAL_UPDATES = True
+    Environment.write_environment_documents_to_cache(environment_id=environment.id)
+
+    feature_state = FeatureState.objects.get(
+        environment=environment, feature=feature_with_value
+    )
+    build_payload_spy = mocker.spy(Environment, "_build_environment_document_payload")
+
+    # When
+    feature_state.enabled = True
+    feature_state.save()
+    feature_state.feature_state_value.string_value = "updated"
+    feature_state.feature_state_value.save()
+
+    # Then
+    build_payload_spy.assert_not_called()
+    assert environment_document_cache.get(
+        get_environment_document_payload_cache_key(environment.api_key)
+    ) == Environment._build_environment_document_payload(environment.api_key)
+
+
+def test_process_environment_update__segment_condition_updated__patches_cached_document(
+    environment: Environment,
+    segment_rule: SegmentRule,
+    settings: SettingsWrapper,
+    mocker: MockerFixture,
+) -> None:
+    # Given
+    settings.CACHE_ENVIRONMENT_DOCUMENT_WRITE_THROUGH = True
+    settings.ENVIRONMENT_DOCUMENT_INCREMENTAL_UPDATES = True
+    condition = Condition.objects.create(
+        rule=SegmentRule.objects.create(rule=segment_rule, type=SegmentRule.ANY_RULE),
+        property="plan",
+        operator=EQUAL,
+        value="free",
+    )
+    Environment.write_environment_documents_to_cache(environment_id=environment.id)
+    build_payload_spy = mocker.spy(Environment, "_build_environment_document_payload")
+
+    # When
+    condition.value = "premium"
+    condition.save()
+
+    # Then
+    build_payload_spy.assert_not_called()
+    assert environment_document_cache.get(
+        get_environment_document_payload_cache_key(environment.api_key)
+    ) == Environment._build_environment_document_payload(environment.api_key)
+
+
+def test_process_environment_update__document_not_cached__rebuilds_document(
+    environment: Environment,
+    feature_with_value: Feature,
+    settings: SettingsWrapper,
+) -> None:
+    # Given
+    settings.CACHE_ENVIRONMENT_DOCUMENT_WRITE_THROUGH = True
+    settings.ENVIRONMENT_DOCUMENT_INCREMENTAL_UPDATES = True
+    environment_document_cache.delete(
+        get_environment_document_payload_cache_key(environment.api_key)
+    )
+    feature_state = FeatureState.objects.get(
+        environment=environment, feature=feature_with_value
+    )
+
+    # When
+    feature_state.enabled = True
+    feature_state.save()
+
+    # Then
+    assert environment_document_cache.get(
+        get_environment_document_payload_cache_key(environment.api_key)
+    ) == Environment._build_environment_document_payload(environment.api_key)
+
+
+def test_process_environment_update__feature_state_updated__patches_dynamodb_document(
+    dynamo_enabled_project_environment_one: Environment,
+    dynamo_environment_wrapper: DynamoEnvironmentWrapper,
+    settings: SettingsWrapper,
+    mocker: MockerFixture,
+) -> None:
+    # Given
+    settings.ENVIRONMENT_DOCUMENT_INCREMENTAL_UPDATES = True
+    environment = dynamo_enabled_project_environment_one
+    mocker.patch(
+        "environments.document_updates.environment_wrapper", dynamo_environment_wrapper
+    )
+    feature = Feature.objects.create(
+        name="dynamo_feature", project=environment.project, initial_value="value"
+    )
+    dynamo_environment_wrapper.write_environment_documents(
+        [map_environment_to_environment_document(environment)]
+    )
+    feature_state = FeatureState.objects.get(environment=environment, feature=feature)
+
+    write_environments_to_dynamodb_spy = mocker.spy(
+        Environment, "write_environments_to_dynamodb"
+    )
+    clear_flags_cache_spy = mocker.spy(Environment, "clear_flags_cache")
+
+    # When
+    feature_state.enabled = True
+    feature_state.save()
+
+    # Then
+    write_environments_to_dynamodb_spy.assert_not_called()
+    clear_flags_cache_spy.assert_called_once()
+    environment_document = dynamo_environment_wrapper.get_item(environment.api_key)
+    assert next(
+        feature_state_document["enabled"]
+        for feature_state_document in environment_document["feature_states"]
+        if feature_state_document["django_id"] == feature_state.id
+    )
+
+
+def test_process_environment_update__documents_locked__rebuilds_document(
+    environment: Environment,
+    feature_with_value: Feature,
+    settings: SettingsWrapper,
+    mocker: MockerFixture,
+) -> None:
+    # Given
+    settings.CACHE_ENVIRONMENT_DOCUMENT_WRITE_THROUGH = True
+    settings.ENVIRONMENT_DOCUMENT_INCREMENTAL_UPDATES = True
+    Environment.write_environment_documents_to_cache(environment_id=environment.id)
+    feature_state = FeatureState.objects.get(
+        environment=environment, feature=feature_with_value
+    )
+    build_payload_spy = mocker.spy(Environment, "_build_environment_document_payload")
+
+    # a rebuild is in progress, and the rebuild of the update doesn't wait for it
+    environment_document_cache.add(_get_lock_key(environment.api_key), True, timeout=60)
+    settings.ENVIRONMENT_DOCUMENT_CACHE_LOCK_TIMEOUT_SECONDS = 0
+
+    # When
+    feature_state.enabled = True
+    feature_state.save()
+
+    # Then
+    build_payload_spy.assert_called_once()
@@ -1,3 +1,5 @@
+import gzip
+import json
 import typing
 from copy import copy
 from datetime import timedelta
@@ -11,17 +13,19 @@ from django.test import override_settings
 from django.utils import timezone
 from mypy_boto3_dynamodb.service_resource import Table
 from pytest_django import DjangoAssertNumQueries
-from pytest_django.asserts import assertQuerysetEqual as assert_queryset_equal
+from pytest_django.fixtures import SettingsWrapper
 from pytest_mock import MockerFixture
 
 from audit.models import AuditLog
 from audit.related_object_type import RelatedObjectType
+from environments.dataclasses import EnvironmentDocumentPayload
 from environments.identities.models import Identity
 from environments.models import (
     Environment,
     EnvironmentAPIKey,
     Webhook,
     environment_cache,
+    get_environment_document_payload_cache_key,
 )
 from features.feature_types import MULTIVARIATE
 from features.models import Feature, FeatureState
@@ -33,6 +37,7 @@ from features.versioning.versioning_service import (
 )
 from organisations.models import Organisation, OrganisationRole
 from projects.models import EdgeV2MigrationStatus, Project
+from segments.evaluator import SEGMENT_SNAPSHOT_VERSION, get_segment_snapshot
 from segments.models import Segment
 from util.mappers import map_environment_to_environment_document
 
@@ -446,12 +451,12 @@ def test_write_environments_to_dynamodb_with_environment(
     )
 
     # Then
-    args, kwargs = mock_dynamo_env_wrapper.write_environments.call_args
-    assert kwargs == {}
-    assert len(args) == 1
-    assert_queryset_equal(
-        args[0],
-        Environment.objects.filter(id=dynamo_enabled_project_environment_one.id),
+    mock_dynamo_env_wrapper.write_environment_documents.assert_called_once_with(
+        [
+            map_environment_to_environment_document(
+                dynamo_enabled_project_environment_one
+            )
+        ]
     )
 
 
@@ -468,12 +473,13 @@ def test_write_environments_to_dynamodb_project(
     Environment.write_environments_to_dynamodb(project_id=dynamo_enabled_project.id)
 
     # Then
-    args, kwargs = mock_dynamo_env_wrapper.write_environments.call_args
+    args, kwargs = mock_dynamo_env_wrapper.write_environment_documents.call_args
     assert kwargs == {}
     assert len(args) == 1
-    assert_queryset_equal(
-        args[0], Environment.objects.filter(project=dynamo_enabled_project)
-    )
+    assert {environment_document["api_key"] for environment_document in args[0]} == {
+        dynamo_enabled_project_environment_one.api_key,
+        dynamo_enabled_project_environment_two.api_key,
+    }
 
 
 def test_write_environments_to_dynamodb_with_environment_and_project(
@@ -490,12 +496,12 @@ def test_write_environments_to_dynamodb_with_environment_and_project(
     )
 
     # Then
-    args, kwargs = mock_dynamo_env_wrapper.write_environments.call_args
-    assert kwargs == {}
-    assert len(args) == 1
-    assert_queryset_equal(
-        args[0],
-        Environment.objects.filter(id=dynamo_enabled_project_environment_one.id),
+    mock_dynamo_env_wrapper.write_environment_documents.assert_called_once_with(
+        [
+            map_environment_to_environment_document(
+                dynamo_enabled_project_environment_one
+            )
+        ]
     )
 
 
@@ -515,11 +521,17 @@ def test_write_environments_to_dynamodb__project_environments_v2_migrated__call_
     Environment.write_environments_to_dynamodb(project_id=dynamo_enabled_project.id)
 
     # Then
-    args, kwargs = mock_dynamo_env_v2_wrapper.write_environments.call_args
+    args, kwargs = mock_dynamo_env_v2_wrapper.write_environment_documents.call_args
     assert kwargs == {}
     assert len(args) == 1
-    assert_queryset_equal(
-        args[0], Environment.objects.filter(project=dynamo_enabled_project)
+    assert {environment_document["api_key"] for environment_document in args[0]} == {
+        dynamo_enabled_project_environment_one.api_key,
+        dynamo_enabled_project_environment_two.api_key,
+    }
+
+    # and the environments were mapped once, for both tables
+    assert (
+        args[0] is mock_dynamo_env_wrapper.write_environment_documents.call_args.args[0]
     )
 
 
@@ -539,7 +551,7 @@ def test_write_environments_to_dynamodb__project_environments_v2_migrated__wrapp
     Environment.write_environments_to_dynamodb(project_id=dynamo_enabled_project.id)
 
     # Then
-    mock_dynamo_env_v2_wrapper.write_environments.assert_not_called()
+    mock_dynamo_env_v2_wrapper.write_environment_documents.assert_not_called()
 
 
 @pytest.mark.parametrize(
@@ -566,7 +578,7 @@ def test_write_environments_to_dynamodb__project_environments_v2_not_migrated__w
     Environment.write_environments_to_dynamodb(project_id=dynamo_enabled_project.id)
 
     # Then
-    mock_dynamo_env_v2_wrapper.write_environments.assert_not_called()
+    mock_dynamo_env_v2_wrapper.write_environment_documents.assert_not_called()
 
 
 @pytest.mark.parametrize(
@@ -705,6 +717,181 @@ def test_environment_get_environment_document_with_caching_when_document_not_in_
     )
 
 
+def test_environment_get_environment_document_payload(
+    environment: Environment,
+    django_assert_num_queries: DjangoAssertNumQueries,
+) -> None:
+    # When
+    with django_assert_num_queries(3):
+        payload = Environment.get_environment_document_payload(environment.api_key)
+
+    # Then
+    assert json.loads(payload.content)["api_key"] == environment.api_key
+    assert payload.etag
+    assert payload.gzip_content is None
+
+
+def test_environment_get_environment_document_payload_with_caching_when_payload_in_cache(
+    environment: Environment,
+    django_assert_num_queries: DjangoAssertNumQueries,
+    settings: SettingsWrapper,
+    mocker: MockerFixture,
+) -> None:
+    # Given
+    settings.CACHE_ENVIRONMENT_DOCUMENT_SECONDS = 60
+
+    cached_payload = EnvironmentDocumentPayload.from_document(
+        map_environment_to_environment_document(environment)
+    )
+    mocked_environment_document_cache = mocker.patch(
+        "environments.models.environment_document_cache"
+    )
+    mocked_environment_document_cache.get.return_value = cached_payload
+
+    # When
+    with django_assert_num_queries(0):
+        payload = Environment.get_environment_document_payload(environment.api_key)
+
+    # Then
+    assert payload is cached_payload
+    mocked_environment_document_cache.get.assert_called_once_with(
+        get_environment_document_payload_cache_key(environment.api_key)
+    )
+
+
+def test_environment_get_environment_document_payload_with_caching_when_payload_not_in_cache(
+    environment: Environment,
+    django_assert_num_queries: DjangoAssertNumQueries,
+    settings: SettingsWrapper,
+    mocker: MockerFixture,
+) -> None:
+    # Given
+    settings.CACHE_ENVIRONMENT_DOCUMENT_SECONDS = 60
+    settings.COMPRESS_ENVIRONMENT_DOCUMENT = True
+
+    mocked_environment_document_cache = mocker.patch(
+        "environments.models.environment_document_cache"
+    )
+    mocked_environment_document_cache.get.return_value = None
+
+    # When
+    with django_assert_num_queries(3):
+        payload = Environment.get_environment_document_payload(environment.api_key)
+
+    # Then
+    assert json.loads(payload.content)["api_key"] == environment.api_key
+    assert gzip.decompress(payload.gzip_content) == payload.content
+
+    cache_key = get_environment_document_payload_cache_key(environment.api_key)
+    mocked_environment_document_cache.set.assert_called_once_with(
+        cache_key, payload, timeout=60
+    )
+    mocked_environment_document_cache.delete.assert_called_once_with(
+        f"{cache_key}:lock"
+    )
+
+
+def test_environment_get_environment_document_payload_waits_for_other_worker_to_build_payload(
+    environment: Environment,
+    django_assert_num_queries: DjangoAssertNumQueries,
+    settings: SettingsWrapper,
+    mocker: MockerFixture,
+) -> None:
+    # Given
+    settings.CACHE_ENVIRONMENT_DOCUMENT_SECONDS = 60
+
+    payload = EnvironmentDocumentPayload.from_document(
+        map_environment_to_environment_document(environment)
+    )
+    mocked_environment_document_cache = mocker.patch(
+        "environments.models.environment_document_cache"
+    )
+    # the payload appears in the cache once the other worker has built it
+    mocked_environment_document_cache.get.side_effect = [None, None, payload]
+    # the lock is held by another worker
+    mocked_environment_document_cache.add.return_value = False
+    mocker.patch("environments.models.time.sleep")
+
+    # When
+    with django_assert_num_queries(0):
+        result = Environment.get_environment_document_payload(environment.api_key)
+
+    # Then
+    assert result is payload
+    mocked_environment_document_cache.set.assert_not_called()
+    mocked_environment_document_cache.delete.assert_not_called()
+
+
+def test_environment_get_environment_document_payload_builds_payload_if_lock_wait_times_out(
+    environment: Environment,
+    settings: SettingsWrapper,
+    mocker: MockerFixture,
+) -> None:
+    # Given
+    settings.CACHE_ENVIRONMENT_DOCUMENT_SECONDS = 60
+    settings.ENVIRONMENT_DOCUMENT_CACHE_LOCK_TIMEOUT_SECONDS = 0
+
+    mocked_environment_document_cache = mocker.patch(
+        "environments.models.environment_document_cache"
+    )
+    mocked_environment_document_cache.get.return_value = None
+    mocked_environment_document_cache.add.return_value = False
+
+    # When
+    payload = Environment.get_environment_document_payload(environment.api_key)
+
+    # Then
+    assert json.loads(payload.content)["api_key"] == environment.api_key
+    mocked_environment_document_cache.set.assert_not_called()
+
+
+def test_write_environment_documents_to_cache(
+    environment: Environment,
+    environment_two: Environment,
+    settings: SettingsWrapper,
+    mocker: MockerFixture,
+) -> None:
+    # Given
+    settings.CACHE_ENVIRONMENT_DOCUMENT_WRITE_THROUGH = True
+
+    mocked_environment_document_cache = mocker.patch(
+        "environments.models.environment_document_cache"
+    )
+
+    # When
+    Environment.write_environment_documents_to_cache(project_id=environment.project_id)
+
+    # Then
+    assert mocked_environment_document_cache.set.call_count == 2
+    for call, env in zip(
+        mocked_environment_document_cache.set.call_args_list,
+        (environment, environment_two),
+    ):
+        cache_key, payload = call.args
+        assert cache_key == get_environment_document_payload_cache_key(env.api_key)
+        assert json.loads(payload.content)["api_key"] == env.api_key
+        assert call.kwargs == {"timeout": None}
+
+
+def test_write_environment_documents_to_cache_does_nothing_if_write_through_disabled(
+    environment: Environment,
+    settings: SettingsWrapper,
+    mocker: MockerFixture,
+) -> None:
+    # Given
+    settings.CACHE_ENVIRONMENT_DOCUMENT_WRITE_THROUGH = False
+
+    mocked_environment_document_cache = mocker.patch(
+        "environments.models.environment_document_cache"
+    )
+
+    # When
+    Environment.write_environment_documents_to_cache(environment_id=environment.id)
+
+    # Then
+    mocked_environment_document_cache.set.assert_not_called()
+
+
 def test_creating_a_feature_with_defaults_does_not_set_defaults_if_disabled(project):
     # Given
     project.prevent_flag_defaults = True
@@ -731,7 +918,7 @@ def test_creating_a_feature_with_defaults_does_not_set_defaults_if_disabled(proj
 
 
 def test_get_segments_returns_no_segments_if_no_overrides(environment, segment):
-    assert environment.get_segments_from_cache() == []
+    assert environment.get_segments_from_cache() == ()
 
 
 def test_get_segments_returns_only_segments_that_have_an_override(
@@ -752,10 +939,10 @@ def test_get_segments_returns_only_segments_that_have_an_override(
     segments = environment.get_segments_from_cache()
 
     # Then
-    assert segments == [segment]
+    assert segments == (get_segment_snapshot(segment),)
 
     mock_environment_segments_cache.set.assert_called_once_with(
-        environment.id, segments
+        environment.id, segments, version=SEGMENT_SNAPSHOT_VERSION
     )
 
 
@@ -769,7 +956,7 @@ def test_get_segments_from_cache_does_not_hit_db_if_cache_hit(
 ):
     # Given
     mock_environment_segments_cache = mocker.MagicMock()
-    mock_environment_segments_cache.get.return_value = [segment]
+    mock_environment_segments_cache.get.return_value = (get_segment_snapshot(segment),)
 
     monkeypatch.setattr(
         "environments.models.environment_segments_cache",
@@ -781,7 +968,7 @@ def test_get_segments_from_cache_does_not_hit_db_if_cache_hit(
         segments = environment.get_segments_from_cache()
 
     # Then
-    assert segments == [segment_featurestate.feature_segment.segment]
+    assert [s.id for s in segments] == [segment_featurestate.feature_segment.segment_id]
 
     mock_environment_segments_cache.set.assert_not_called()
 
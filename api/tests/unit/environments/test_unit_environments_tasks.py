@@ -17,6 +17,9 @@ def test_rebuild_environment_document(
     mock_write_environments_to_dynamodb = mocker.patch(
         "environments.tasks.Environment.write_environments_to_dynamodb",
     )
+    mock_write_environment_documents_to_cache = mocker.patch(
+        "environments.tasks.Environment.write_environment_documents_to_cache",
+    )
 
     # When
     rebuild_environment_document(environment_id=environment.id)
@@ -25,6 +28,9 @@ def test_rebuild_environment_document(
     mock_write_environments_to_dynamodb.assert_called_once_with(
         environment_id=environment.id
     )
+    mock_write_environment_documents_to_cache.assert_called_once_with(
+        environment_id=environment.id
+    )
 
 
 def test_process_environment_update_with_environment_audit_log(environment, mocker):
@@ -51,6 +57,12 @@ def test_process_environment_update_with_environment_audit_log(environment, mock
     mock_environment_model_class.write_environments_to_dynamodb.assert_called_once_with(
         environment_id=environment.id, project_id=environment.project.id
     )
+    mock_environment_model_class.write_environment_documents_to_cache.assert_called_once_with(
+        environment_id=environment.id, project_id=environment.project.id
+    )
+    mock_environment_model_class.clear_flags_cache.assert_called_once_with(
+        environment_id=environment.id, project_id=environment.project.id
+    )
     mock_send_environment_update_message_for_environment.assert_called_once_with(
         environment
     )
@@ -79,6 +91,12 @@ def test_process_environment_update_with_project_audit_log(environment, mocker):
     mock_environment_model_class.write_environments_to_dynamodb.assert_called_once_with(
         environment_id=None, project_id=environment.project.id
     )
+    mock_environment_model_class.write_environment_documents_to_cache.assert_called_once_with(
+        environment_id=None, project_id=environment.project.id
+    )
+    mock_environment_model_class.clear_flags_cache.assert_called_once_with(
+        environment_id=None, project_id=environment.project.id
+    )
     mock_send_environment_update_message_for_environment.assert_not_called()
     mock_send_environment_update_message_for_project.assert_called_once_with(
         environment.project
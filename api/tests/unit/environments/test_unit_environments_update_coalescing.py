@@ -0,0 +1,112 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from pytest_django import DjangoCaptureOnCommitCallbacks
+from pytest_django.fixtures import SettingsWrapper
+from pytest_mock import MockerFixture
+
+from audit.models import AuditLog
+from environments.models import Environment
+from environments.tasks import process_environment_update
+from environments.update_coalescing import (
+    pop_coalesced_update_count,
+    schedule_environment_document_rebuild,
+)
+
+
+@pytest.mark.freeze_time("2024-01-01T09:00:02Z")
+def test_creating_audit_logs__coalescing_enabled__schedules_one_update(
+    environment: Environment,
+    settings: SettingsWrapper,
+    mocker: MockerFixture,
+    django_capture_on_commit_callbacks: DjangoCaptureOnCommitCallbacks,
+    reset_cache: None,
+) -> None:
+    # Given
+    settings.ENVIRONMENT_UPDATE_COALESCE_SECONDS = 5
+    mocked_process_environment_update = mocker.patch(
+        "environments.tasks.process_environment_update"
+    )
+
+    # When
+    with django_capture_on_commit_callbacks(execute=True):
+        first_audit_log = AuditLog.objects.create(environment=environment)
+        AuditLog.objects.create(environment=environment)
+        AuditLog.objects.create(environment=environment)
+
+    # Then
+    coalescing_key = (
+        f"environment-update:environment:{environment.id}:"
+        f"{int(datetime(2024, 1, 1, 9, 0, 5, tzinfo=timezone.utc).timestamp()) // 5}"
+    )
+    mocked_process_environment_update.delay.assert_called_once_with(
+        kwargs={"audit_log_id": first_audit_log.id, "coalescing_key": coalescing_key},
+        delay_until=datetime(2024, 1, 1, 9, 0, 5, tzinfo=timezone.utc),
+    )
+    assert pop_coalesced_update_count(coalescing_key) == 3
+
+
+def test_process_environment_update__updates_merged__rebuilds_documents(
+    environment: Environment,
+    settings: SettingsWrapper,
+    mocker: MockerFixture,
+    django_capture_on_commit_callbacks: DjangoCaptureOnCommitCallbacks,
+    reset_cache: None,
+) -> None:
+    # Given
+    settings.ENVIRONMENT_UPDATE_COALESCE_SECONDS = 5
+    mocked_process_environment_update = mocker.patch(
+        "environments.tasks.process_environment_update"
+    )
+    with django_capture_on_commit_callbacks(execute=True):
+        audit_log = AuditLog.objects.create(environment=environment)
+        AuditLog.objects.create(environment=environment)
+    coalescing_key = mocked_process_environment_update.delay.call_args.kwargs["kwargs"][
+        "coalescing_key"
+    ]
+
+    mocked_patch_environment_documents = mocker.patch(
+        "environments.tasks.patch_environment_documents"
+    )
+    mocked_environment_model_class = mocker.patch(
+        "environments.tasks.Environment", autospec=True
+    )
+
+    # When
+    process_environment_update(audit_log_id=audit_log.id, coalescing_key=coalescing_key)
+
+    # Then
+    mocked_patch_environment_documents.assert_not_called()
+    mocked_environment_model_class.write_environment_documents_to_cache.assert_called_once_with(
+        environment_id=environment.id, project_id=environment.project_id
+    )
+    mocked_environment_model_class.write_environments_to_dynamodb.assert_called_once_with(
+        environment_id=environment.id, project_id=environment.project_id
+    )
+
+
+@pytest.mark.freeze_time("2024-01-01T09:00:00Z")
+def test_schedule_environment_document_rebuild__coalescing_enabled__schedules_after_delay(
+    environment: Environment,
+    settings: SettingsWrapper,
+    mocker: MockerFixture,
+    django_capture_on_commit_callbacks: DjangoCaptureOnCommitCallbacks,
+    reset_cache: None,
+) -> None:
+    # Given
+    settings.ENVIRONMENT_UPDATE_COALESCE_SECONDS = 5
+    mocked_rebuild_environment_document = mocker.patch(
+        "environments.tasks.rebuild_environment_document"
+    )
+    live_from = datetime(2024, 1, 1, 10, 0, 1, tzinfo=timezone.utc)
+
+    # When
+    with django_capture_on_commit_callbacks(execute=True):
+        schedule_environment_document_rebuild(environment.id, delay_until=live_from)
+        schedule_environment_document_rebuild(environment.id, delay_until=live_from)
+
+    # Then
+    mocked_rebuild_environment_document.delay.assert_called_once()
+    assert mocked_rebuild_environment_document.delay.call_args.kwargs[
+        "delay_until"
+    ] == live_from + timedelta(seconds=4)
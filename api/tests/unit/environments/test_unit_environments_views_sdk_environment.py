@@ -1,5 +1,8 @@
+import gzip
+import json
 from typing import TYPE_CHECKING
 
+import pytest
 from core.constants import FLAGSMITH_UPDATED_AT_HEADER
 from django.urls import reverse
 from flag_engine.segments.constants import EQUAL
@@ -22,6 +25,7 @@ from segments.models import Condition, Segment, SegmentRule
 
 if TYPE_CHECKING:
     from pytest_django import DjangoAssertNumQueries
+    from pytest_django.fixtures import SettingsWrapper
 
     from organisations.models import Organisation
 
@@ -131,8 +135,8 @@ def test_get_environment_document(
 
     # Then
     assert response.status_code == status.HTTP_200_OK
-    assert response.json()
-    assert len(response.data["project"]["segments"]) == 10
+    response_json = response.json()
+    assert len(response_json["project"]["segments"]) == 10
     assert response.headers[FLAGSMITH_UPDATED_AT_HEADER] == str(
         environment.updated_at.timestamp()
     )
@@ -162,3 +166,134 @@ def test_get_environment_document_fails_with_invalid_key(
     # We get a 403 since only the server side API keys are able to access the
     # environment document
     assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_get_environment_document_returns_etag(
+    environment: Environment,
+    environment_api_key: EnvironmentAPIKey,
+) -> None:
+    # Given
+    client = APIClient()
+    client.credentials(HTTP_X_ENVIRONMENT_KEY=environment_api_key.key)
+    url = reverse("api-v1:environment-document")
+
+    # When
+    response = client.get(url)
+
+    # Then
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"]
+    assert response.json()["api_key"] == environment.api_key
+
+
+def test_get_environment_document_returns_304_if_etag_matches(
+    environment: Environment,
+    environment_api_key: EnvironmentAPIKey,
+) -> None:
+    # Given
+    client = APIClient()
+    client.credentials(HTTP_X_ENVIRONMENT_KEY=environment_api_key.key)
+    url = reverse("api-v1:environment-document")
+    etag = client.get(url).headers["ETag"]
+
+    # When
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    # Then
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+
+def test_get_environment_document_returns_document_if_etag_does_not_match(
+    environment: Environment,
+    environment_api_key: EnvironmentAPIKey,
+) -> None:
+    # Given
+    client = APIClient()
+    client.credentials(HTTP_X_ENVIRONMENT_KEY=environment_api_key.key)
+    url = reverse("api-v1:environment-document")
+    etag = client.get(url).headers["ETag"]
+
+    environment.name = "changed"
+    environment.save()
+
+    # When
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    # Then
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] != etag
+    assert response.json()["name"] == "changed"
+
+
+def test_get_environment_document_returns_gzip_content_if_accepted(
+    environment: Environment,
+    environment_api_key: EnvironmentAPIKey,
+    settings: "SettingsWrapper",
+) -> None:
+    # Given
+    settings.COMPRESS_ENVIRONMENT_DOCUMENT = True
+
+    client = APIClient()
+    client.credentials(HTTP_X_ENVIRONMENT_KEY=environment_api_key.key)
+    url = reverse("api-v1:environment-document")
+
+    # When
+    response = client.get(url, HTTP_ACCEPT_ENCODING="gzip, deflate")
+
+    # Then
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(response.content))["api_key"] == (
+        environment.api_key
+    )
+
+
+@pytest.mark.parametrize(
+    "accept_encoding",
+    ["", "deflate", "gzip;q=0", "br, gzip;q=0, *", "*;q=0", "x-gzip-like"],
+)
+def test_get_environment_document_returns_plain_content_if_gzip_not_accepted(
+    environment: Environment,
+    environment_api_key: EnvironmentAPIKey,
+    settings: "SettingsWrapper",
+    accept_encoding: str,
+) -> None:
+    # Given
+    settings.COMPRESS_ENVIRONMENT_DOCUMENT = True
+
+    client = APIClient()
+    client.credentials(HTTP_X_ENVIRONMENT_KEY=environment_api_key.key)
+    url = reverse("api-v1:environment-document")
+
+    # When
+    response = client.get(url, HTTP_ACCEPT_ENCODING=accept_encoding)
+
+    # Then
+    assert response.status_code == status.HTTP_200_OK
+    assert "Content-Encoding" not in response.headers
+    assert response.json()["api_key"] == environment.api_key
+
+
+@pytest.mark.parametrize(
+    "accept_encoding", ["GZIP", "br;q=1.0, gzip;q=0.5", "deflate, *;q=0.1"]
+)
+def test_get_environment_document_returns_gzip_content_if_weighted_gzip_accepted(
+    environment: Environment,
+    environment_api_key: EnvironmentAPIKey,
+    settings: "SettingsWrapper",
+    accept_encoding: str,
+) -> None:
+    # Given
+    settings.COMPRESS_ENVIRONMENT_DOCUMENT = True
+
+    client = APIClient()
+    client.credentials(HTTP_X_ENVIRONMENT_KEY=environment_api_key.key)
+    url = reverse("api-v1:environment-document")
+
+    # When
+    response = client.get(url, HTTP_ACCEPT_ENCODING=accept_encoding)
+
+    # Then
+    assert response.headers["Content-Encoding"] == "gzip"
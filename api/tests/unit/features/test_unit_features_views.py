@@ -32,8 +32,14 @@ from audit.constants import (
 )
 from audit.models import AuditLog, RelatedObjectType
 from environments.identities.models import Identity
-from environments.models import Environment, EnvironmentAPIKey
+from environments.models import (
+    Environment,
+    EnvironmentAPIKey,
+    flags_cache,
+    get_flags_cache_key,
+)
 from environments.permissions.models import UserEnvironmentPermission
+from features.constants import FlagsCacheVariant
 from features.dataclasses import EnvironmentFeatureOverridesData
 from features.feature_types import MULTIVARIATE
 from features.models import Feature, FeatureSegment, FeatureState
@@ -801,6 +807,75 @@ def test_get_flags__server_key_only_feature__server_key_auth__return_expected(
     assert response.json()
 
 
+def test_get_flags__cache_enabled__caches_rendered_flags_per_variant(
+    api_client: APIClient,
+    environment: Environment,
+    environment_api_key: EnvironmentAPIKey,
+    feature: Feature,
+    settings: SettingsWrapper,
+) -> None:
+    # Given
+    settings.CACHE_FLAGS_SECONDS = 60
+    feature.is_server_key_only = True
+    feature.save()
+
+    url = reverse("api-v1:flags")
+
+    # When
+    api_client.credentials(HTTP_X_ENVIRONMENT_KEY=environment.api_key)
+    client_response = api_client.get(url)
+    api_client.credentials(HTTP_X_ENVIRONMENT_KEY=environment_api_key.key)
+    server_response = api_client.get(url)
+
+    # Then
+    assert client_response.status_code == status.HTTP_200_OK
+    assert client_response.json() == []
+    assert server_response.status_code == status.HTTP_200_OK
+    assert [flag["feature"]["id"] for flag in server_response.json()] == [feature.id]
+
+    assert (
+        flags_cache.get(
+            get_flags_cache_key(environment.api_key, FlagsCacheVariant.CLIENT)
+        )
+        == client_response.content
+    )
+    assert (
+        flags_cache.get(
+            get_flags_cache_key(environment.api_key, FlagsCacheVariant.SERVER)
+        )
+        == server_response.content
+    )
+
+
+def test_get_flags__cache_enabled__serves_cached_flags_until_cleared(
+    api_client: APIClient,
+    environment: Environment,
+    feature: Feature,
+    feature_state: FeatureState,
+    settings: SettingsWrapper,
+) -> None:
+    # Given
+    settings.CACHE_FLAGS_SECONDS = 60
+    url = reverse("api-v1:flags")
+    api_client.credentials(HTTP_X_ENVIRONMENT_KEY=environment.api_key)
+    first_response = api_client.get(url)
+
+    # the feature state is updated without going through the usual hooks
+    FeatureState.objects.filter(id=feature_state.id).update(
+        enabled=not feature_state.enabled
+    )
+
+    # When
+    second_response = api_client.get(url)
+    Environment.clear_flags_cache(environment_id=environment.id)
+    third_response = api_client.get(url)
+
+    # Then
+    assert second_response.content == first_response.content
+    assert first_response.json()[0]["enabled"] is feature_state.enabled
+    assert third_response.json()[0]["enabled"] is not feature_state.enabled
+
+
 def test_get_feature_states_by_uuid(
     admin_client_new: APIClient,
     environment: Environment,
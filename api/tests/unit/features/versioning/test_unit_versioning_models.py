@@ -206,7 +206,7 @@ def test_publish(
     )
 
     mocked_rebuild_environment_document = mocker.patch(
-        "features.versioning.receivers.rebuild_environment_document",
+        "environments.tasks.rebuild_environment_document",
         autospec=rebuild_environment_document,
     )
 
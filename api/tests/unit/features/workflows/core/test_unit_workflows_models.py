@@ -621,7 +621,7 @@ def test_commit_change_request_publishes_environment_feature_versions(
     change_request.environment_feature_versions.add(environment_feature_version)
 
     mock_rebuild_environment_document_task = mocker.patch(
-        "features.workflows.core.models.rebuild_environment_document"
+        "environments.tasks.rebuild_environment_document"
     )
     mock_trigger_update_version_webhooks = mocker.patch(
         "features.workflows.core.models.trigger_update_version_webhooks"
@@ -4,7 +4,11 @@ from slack_sdk.errors import SlackApiError
 from audit.models import AuditLog
 from environments.models import Environment
 from integrations.slack.exceptions import SlackChannelJoinError
-from integrations.slack.slack import SlackChannel, SlackWrapper
+from integrations.slack.slack import (
+    SLACK_MAX_MESSAGE_BLOCKS,
+    SlackChannel,
+    SlackWrapper,
+)
 
 
 def test_get_channels_data_response_structure(mocker, mocked_slack_internal_client):
@@ -167,3 +171,24 @@ def test_slack_generate_event_data_with_correct_values(django_user_model):
             ],
         },
     ]
+
+
+def test_track_events_combines_events_into_messages(mocked_slack_internal_client):
+    # Given
+    channel_id = "channel_1"
+    slack_wrapper = SlackWrapper(api_token="random_token", channel_id=channel_id)
+    events = [
+        {"blocks": [{"type": "section", "text": str(i)}] * 2}
+        for i in range(SLACK_MAX_MESSAGE_BLOCKS // 2 + 1)
+    ]
+
+    # When
+    slack_wrapper.track_events(events)
+
+    # Then
+    calls = mocked_slack_internal_client.chat_postMessage.call_args_list
+    assert [len(call.kwargs["blocks"]) for call in calls] == [
+        SLACK_MAX_MESSAGE_BLOCKS,
+        2,
+    ]
+    assert all(call.kwargs["channel"] == channel_id for call in calls)
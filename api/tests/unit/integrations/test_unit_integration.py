@@ -1,7 +1,10 @@
 from integrations.amplitude.models import AmplitudeConfiguration
 from integrations.common.models import EnvironmentIntegrationModel
 from integrations.common.wrapper import AbstractBaseIdentityIntegrationWrapper
-from integrations.integration import identify_integrations
+from integrations.integration import (
+    bulk_identify_integrations,
+    identify_integrations,
+)
 from integrations.segment.models import SegmentConfiguration
 
 
@@ -115,3 +118,32 @@ def test_identify_integrations_does_not_call_deleted_integrations(
 
     # Then
     mock_segment_wrapper.assert_not_called()
+
+
+def test_bulk_identify_integrations__identifies_all_identities_in_one_call(
+    mocker, environment, identity
+):
+    # Given
+    mock_identify_users_async = mocker.patch(
+        "integrations.segment.segment.SegmentWrapper.identify_users_async"
+    )
+    mock_identify_user_async = mocker.patch(
+        "integrations.segment.segment.SegmentWrapper.identify_user_async"
+    )
+    mock_generate_user_data = mocker.patch(
+        "integrations.segment.segment.SegmentWrapper.generate_user_data"
+    )
+    SegmentConfiguration.objects.create(api_key="abc-123", environment=environment)
+    feature_states = identity.get_all_feature_states()
+
+    # When
+    bulk_identify_integrations(
+        environment,
+        [(identity, feature_states, []), (identity, feature_states, None)],
+    )
+
+    # Then
+    mock_identify_users_async.assert_called_once_with(
+        data=[mock_generate_user_data.return_value] * 2
+    )
+    mock_identify_user_async.assert_not_called()
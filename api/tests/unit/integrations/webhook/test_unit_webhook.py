@@ -33,7 +33,9 @@ def test_webhook_generate_user_data_generates_correct_data(
 
     segments = Segment.objects.filter(project=project)
     expected_segments = SegmentSerializer(
-        segments, many=True, context={"identity": identity}
+        segments,
+        many=True,
+        context={"segment_evaluation_args": identity.get_segment_evaluation_args()},
     ).data
     expected_data = {
         "identity": identity.identifier,
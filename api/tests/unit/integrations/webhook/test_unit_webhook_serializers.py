@@ -31,8 +31,30 @@ def test_segment_serializer_member_is_correct(
 ):
     # When
     serializer = SegmentSerializer(
-        identity_matching_segment, context={"identity": identity}
+        identity_matching_segment,
+        context={"segment_evaluation_args": identity.get_segment_evaluation_args()},
     )
     # Then
     assert serializer.data["member"] is True
     assert serializer.data["id"] == identity_matching_segment.id
+
+
+def test_segment_serializer__many__gets_segment_evaluation_args_once(
+    identity, trait, identity_matching_segment, mocker
+):
+    # Given
+    get_segment_evaluation_args_spy = mocker.spy(
+        identity, "get_segment_evaluation_args"
+    )
+    segments = [identity_matching_segment] * 3
+
+    # When
+    data = SegmentSerializer(
+        segments,
+        many=True,
+        context={"segment_evaluation_args": identity.get_segment_evaluation_args()},
+    ).data
+
+    # Then
+    assert [segment["member"] for segment in data] == [True] * 3
+    get_segment_evaluation_args_spy.assert_called_once_with()
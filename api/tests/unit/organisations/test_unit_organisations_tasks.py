@@ -359,6 +359,10 @@ def test_handle_api_usage_notifications_when_feature_flag_is_off(
     mock_api_usage = mocker.patch(
         "organisations.tasks.get_current_api_usage",
     )
+    mocker.patch(
+        "organisations.tasks.get_current_api_usage_by_organisation",
+        return_value={organisation.id: 100},
+    )
     get_client_mock = mocker.patch("organisations.tasks.get_client")
     client_mock = MagicMock()
     get_client_mock.return_value = client_mock
@@ -411,6 +415,10 @@ def test_handle_api_usage_notifications_below_100(
         "organisations.task_helpers.get_current_api_usage",
     )
     mock_api_usage.return_value = 91
+    mocker.patch(
+        "organisations.tasks.get_current_api_usage_by_organisation",
+        return_value={organisation.id: 91},
+    )
     get_client_mock = mocker.patch("organisations.tasks.get_client")
     client_mock = MagicMock()
     get_client_mock.return_value = client_mock
@@ -434,14 +442,8 @@ def test_handle_api_usage_notifications_below_100(
     handle_api_usage_notifications()
 
     # Then
-    assert len(mock_api_usage.call_args_list) == 2
-
-    # We only care about the call for the main organisation,
-    # not the call for 'another_organisation'
-    assert mock_api_usage.call_args_list[0].args == (
-        organisation.id,
-        now - timedelta(days=14),
-    )
+    # 'another_organisation' has no usage, so its exact usage isn't queried
+    mock_api_usage.assert_called_once_with(organisation.id, now - timedelta(days=14))
 
     assert len(mailoutbox) == 1
     email = mailoutbox[0]
@@ -519,6 +521,10 @@ def test_handle_api_usage_notifications_below_api_usage_alert_thresholds(
     usage = 21
     assert usage < min(API_USAGE_ALERT_THRESHOLDS)
     mock_api_usage.return_value = usage
+    mocker.patch(
+        "organisations.tasks.get_current_api_usage_by_organisation",
+        return_value={organisation.id: usage},
+    )
     get_client_mock = mocker.patch("organisations.tasks.get_client")
     client_mock = MagicMock()
     get_client_mock.return_value = client_mock
@@ -532,7 +538,9 @@ def test_handle_api_usage_notifications_below_api_usage_alert_thresholds(
     handle_api_usage_notifications()
 
     # Then
-    mock_api_usage.assert_called_once_with(organisation.id, now - timedelta(days=14))
+    # the usage over the last month is below the thresholds, so the usage in
+    # the current period isn't queried
+    mock_api_usage.assert_not_called()
 
     assert len(mailoutbox) == 0
 
@@ -569,6 +577,10 @@ def test_handle_api_usage_notifications_above_100(
     )
     mock_api_usage.return_value = 105
 
+    mocker.patch(
+        "organisations.tasks.get_current_api_usage_by_organisation",
+        return_value={organisation.id: 105},
+    )
     get_client_mock = mocker.patch("organisations.tasks.get_client")
     client_mock = MagicMock()
     get_client_mock.return_value = client_mock
@@ -655,6 +667,10 @@ def test_handle_api_usage_notifications_with_error(
         current_billing_term_ends_at=now + timedelta(days=320),
     )
 
+    mocker.patch(
+        "organisations.tasks.get_current_api_usage_by_organisation",
+        return_value={organisation.id: 100},
+    )
     get_client_mock = mocker.patch("organisations.tasks.get_client")
     client_mock = MagicMock()
     get_client_mock.return_value = client_mock
@@ -702,6 +718,10 @@ def test_handle_api_usage_notifications_for_free_accounts(
     )
     mock_api_usage.return_value = MAX_API_CALLS_IN_FREE_PLAN + 5_000
 
+    mocker.patch(
+        "organisations.tasks.get_current_api_usage_by_organisation",
+        return_value={organisation.id: MAX_API_CALLS_IN_FREE_PLAN + 5_000},
+    )
     get_client_mock = mocker.patch("organisations.tasks.get_client")
     client_mock = MagicMock()
     get_client_mock.return_value = client_mock
@@ -790,6 +810,10 @@ def test_handle_api_usage_notifications_missing_info_cache(
         "organisations.task_helpers.get_current_api_usage",
     )
 
+    mocker.patch(
+        "organisations.tasks.get_current_api_usage_by_organisation",
+        return_value={organisation.id: 100},
+    )
     get_client_mock = mocker.patch("organisations.tasks.get_client")
     client_mock = MagicMock()
     get_client_mock.return_value = client_mock
@@ -851,9 +875,9 @@ def test_charge_for_api_call_count_overages_scale_up(
     client_mock.get_identity_flags.return_value.is_feature_enabled.return_value = True
 
     mock_api_usage = mocker.patch(
-        "organisations.tasks.get_current_api_usage",
+        "organisations.tasks.get_current_api_usage_by_organisation",
     )
-    mock_api_usage.return_value = 212_005
+    mock_api_usage.return_value = {organisation.id: 212_005}
     assert OrganisationAPIBilling.objects.count() == 0
 
     # When
@@ -913,7 +937,7 @@ def test_charge_for_api_call_count_overages_cancellation_date(
     get_client_mock.return_value = client_mock
 
     mock_api_usage = mocker.patch(
-        "organisations.tasks.get_current_api_usage",
+        "organisations.tasks.get_current_api_usage_by_organisation",
     )
     assert OrganisationAPIBilling.objects.count() == 0
 
@@ -962,9 +986,9 @@ def test_charge_for_api_call_count_overages_scale_up_when_flagsmith_client_sets_
     client_mock.get_identity_flags.return_value.is_feature_enabled.return_value = False
 
     mock_api_usage = mocker.patch(
-        "organisations.tasks.get_current_api_usage",
+        "organisations.tasks.get_current_api_usage_by_organisation",
     )
-    mock_api_usage.return_value = 212_005
+    mock_api_usage.return_value = {organisation.id: 212_005}
     assert OrganisationAPIBilling.objects.count() == 0
 
     # When
@@ -1017,10 +1041,10 @@ def test_charge_for_api_call_count_overages_grace_period(
         "organisations.chargebee.chargebee.chargebee.Subscription.update"
     )
     mock_api_usage = mocker.patch(
-        "organisations.tasks.get_current_api_usage",
+        "organisations.tasks.get_current_api_usage_by_organisation",
     )
     # Set the return value to something less than 200% of base rate
-    mock_api_usage.return_value = 115_000
+    mock_api_usage.return_value = {organisation.id: 115_000}
     assert OrganisationAPIBilling.objects.count() == 0
 
     # When
@@ -1067,10 +1091,10 @@ def test_charge_for_api_call_count_overages_grace_period_over(
         "organisations.chargebee.chargebee.chargebee.Subscription.update"
     )
     mock_api_usage = mocker.patch(
-        "organisations.tasks.get_current_api_usage",
+        "organisations.tasks.get_current_api_usage_by_organisation",
     )
     # Set the return value to something less than 200% of base rate
-    mock_api_usage.return_value = 115_000
+    mock_api_usage.return_value = {organisation.id: 115_000}
     assert OrganisationAPIBilling.objects.count() == 0
 
     # When
@@ -1129,9 +1153,9 @@ def test_charge_for_api_call_count_overages_with_not_covered_plan(
     )
 
     mock_api_usage = mocker.patch(
-        "organisations.tasks.get_current_api_usage",
+        "organisations.tasks.get_current_api_usage_by_organisation",
     )
-    mock_api_usage.return_value = 12_005
+    mock_api_usage.return_value = {organisation.id: 12_005}
     assert OrganisationAPIBilling.objects.count() == 0
 
     # When
@@ -1178,9 +1202,9 @@ def test_charge_for_api_call_count_overages_under_api_limit(
     )
 
     mock_api_usage = mocker.patch(
-        "organisations.tasks.get_current_api_usage",
+        "organisations.tasks.get_current_api_usage_by_organisation",
     )
-    mock_api_usage.return_value = 2_000
+    mock_api_usage.return_value = {organisation.id: 2_000}
     assert OrganisationAPIBilling.objects.count() == 0
 
     # When
@@ -1226,9 +1250,9 @@ def test_charge_for_api_call_count_overages_start_up(
     )
 
     mock_api_usage = mocker.patch(
-        "organisations.tasks.get_current_api_usage",
+        "organisations.tasks.get_current_api_usage_by_organisation",
     )
-    mock_api_usage.return_value = 202_005
+    mock_api_usage.return_value = {organisation.id: 202_005}
     assert OrganisationAPIBilling.objects.count() == 0
 
     # When
@@ -1306,9 +1330,9 @@ def test_charge_for_api_call_count_overages_non_standard(
     )
 
     mock_api_usage = mocker.patch(
-        "organisations.tasks.get_current_api_usage",
+        "organisations.tasks.get_current_api_usage_by_organisation",
     )
-    mock_api_usage.return_value = 202_005
+    mock_api_usage.return_value = {organisation.id: 202_005}
 
     # When
     charge_for_api_call_count_overages()
@@ -1363,9 +1387,9 @@ def test_charge_for_api_call_count_overages_with_exception(
     )
 
     mock_api_usage = mocker.patch(
-        "organisations.tasks.get_current_api_usage",
+        "organisations.tasks.get_current_api_usage_by_organisation",
     )
-    mock_api_usage.return_value = 202_005
+    mock_api_usage.return_value = {organisation.id: 202_005}
     mocker.patch(
         "organisations.tasks.add_100k_api_calls_start_up",
         side_effect=ValueError("An error occurred"),
@@ -1424,9 +1448,9 @@ def test_charge_for_api_call_count_overages_start_up_with_api_billing(
     )
 
     mock_api_usage = mocker.patch(
-        "organisations.tasks.get_current_api_usage",
+        "organisations.tasks.get_current_api_usage_by_organisation",
     )
-    mock_api_usage.return_value = 202_005
+    mock_api_usage.return_value = {organisation.id: 202_005}
     assert OrganisationAPIBilling.objects.count() == 1
 
     # When
@@ -1481,10 +1505,10 @@ def test_charge_for_api_call_count_overages_with_yearly_account(
     )
 
     mock_api_usage = mocker.patch(
-        "organisations.tasks.get_current_api_usage",
+        "organisations.tasks.get_current_api_usage_by_organisation",
     )
 
-    mock_api_usage.return_value = 12_005
+    mock_api_usage.return_value = {organisation.id: 12_005}
     assert OrganisationAPIBilling.objects.count() == 0
 
     # When
@@ -1526,10 +1550,10 @@ def test_charge_for_api_call_count_overages_with_bad_plan(
     )
 
     mock_api_usage = mocker.patch(
-        "organisations.tasks.get_current_api_usage",
+        "organisations.tasks.get_current_api_usage_by_organisation",
     )
 
-    mock_api_usage.return_value = 12_005
+    mock_api_usage.return_value = {organisation.id: 12_005}
     assert OrganisationAPIBilling.objects.count() == 0
 
     # When
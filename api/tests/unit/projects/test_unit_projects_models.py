@@ -4,10 +4,12 @@ from unittest import mock
 import pytest
 from django.conf import settings
 from django.utils import timezone
+from pytest_django import DjangoAssertNumQueries
 from pytest_django.fixtures import SettingsWrapper
 
 from organisations.models import Organisation
 from projects.models import EdgeV2MigrationStatus, Project
+from segments.evaluator import SEGMENT_SNAPSHOT_VERSION, get_segment_snapshot
 from segments.models import Segment
 
 now = timezone.now()
@@ -29,9 +31,14 @@ def test_get_segments_from_cache(project, monkeypatch):
     segments = project.get_segments_from_cache()
 
     # Then
-    mock_project_segments_cache.get.assert_called_with(project.id)
+    mock_project_segments_cache.get.assert_called_with(
+        project.id, version=SEGMENT_SNAPSHOT_VERSION
+    )
     mock_project_segments_cache.set.assert_called_with(
-        project.id, segments, timeout=settings.CACHE_PROJECT_SEGMENTS_SECONDS
+        project.id,
+        segments,
+        timeout=settings.CACHE_PROJECT_SEGMENTS_SECONDS,
+        version=SEGMENT_SNAPSHOT_VERSION,
     )
 
 
@@ -39,7 +46,9 @@ def test_get_segments_from_cache(project, monkeypatch):
 def test_get_segments_from_cache_set_not_called(project, segments, monkeypatch):
     # Given
     mock_project_segments_cache = mock.MagicMock()
-    mock_project_segments_cache.get.return_value = project.segments.all()
+    mock_project_segments_cache.get.return_value = tuple(
+        get_segment_snapshot(segment) for segment in project.segments.all()
+    )
 
     monkeypatch.setattr(
         "projects.services.project_segments_cache", mock_project_segments_cache
@@ -52,18 +61,43 @@ def test_get_segments_from_cache_set_not_called(project, segments, monkeypatch):
     assert segments
 
     # And correct calls to cache are made
-    mock_project_segments_cache.get.assert_called_once_with(project.id)
+    mock_project_segments_cache.get.assert_called_once_with(
+        project.id, version=SEGMENT_SNAPSHOT_VERSION
+    )
+    mock_project_segments_cache.set.assert_not_called()
+
+
+def test_get_segments_from_cache_returns_cached_empty_segments(
+    project: Project,
+    segment: Segment,
+    monkeypatch: pytest.MonkeyPatch,
+    django_assert_num_queries: DjangoAssertNumQueries,
+) -> None:
+    # Given
+    mock_project_segments_cache = mock.MagicMock()
+    mock_project_segments_cache.get.return_value = ()
+
+    monkeypatch.setattr(
+        "projects.services.project_segments_cache", mock_project_segments_cache
+    )
+
+    # When
+    with django_assert_num_queries(0):
+        segments = project.get_segments_from_cache()
+
+    # Then
+    assert segments == ()
     mock_project_segments_cache.set.assert_not_called()
 
 
-def test_get_segments_from_cache_set_to_empty_list(
+def test_get_segments_from_cache_only_returns_live_segments(
     project: Project,
     segment: Segment,
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
     # Given
     mock_project_segments_cache = mock.MagicMock()
-    mock_project_segments_cache.get.return_value = []
+    mock_project_segments_cache.get.return_value = None
 
     monkeypatch.setattr(
         "projects.services.project_segments_cache", mock_project_segments_cache
@@ -76,11 +110,12 @@ def test_get_segments_from_cache_set_to_empty_list(
     # Since we're calling the live_objects manager in the method,
     # only one copy of the segment should be returned, not the
     # other versioned copy of the segment.
-    assert segments.count() == 1
-    assert segments.first() == segment
+    assert segments == (get_segment_snapshot(segment),)
 
     # And correct calls to cache are made
-    mock_project_segments_cache.get.assert_called_once_with(project.id)
+    mock_project_segments_cache.get.assert_called_once_with(
+        project.id, version=SEGMENT_SNAPSHOT_VERSION
+    )
     mock_project_segments_cache.set.assert_called_once()
 
 
@@ -0,0 +1,276 @@
+import pickle
+
+import pytest
+from flag_engine.identities.models import IdentityModel
+from flag_engine.identities.traits.models import TraitModel
+from flag_engine.segments import constants
+from flag_engine.segments.evaluator import evaluate_identity_in_segment
+from flag_engine.segments.models import (
+    SegmentConditionModel,
+    SegmentModel,
+    SegmentRuleModel,
+)
+
+from segments.evaluator import (
+    RuleSignature,
+    SegmentSnapshot,
+    _compile_segment,
+    get_compiled_segment,
+    get_segment_snapshot,
+    get_trait_values_by_key,
+)
+from segments.models import Condition, Segment, SegmentRule
+
+IDENTITY = IdentityModel(
+    identifier="identity", environment_api_key="api-key", django_id=1
+)
+TRANSIENT_IDENTITY = IdentityModel(
+    identifier="transient", environment_api_key="api-key"
+)
+
+TRAIT_VALUES = [
+    None,
+    True,
+    False,
+    0,
+    2,
+    10,
+    1.5,
+    "",
+    "abc",
+    "1",
+    "1.2.3",
+    "1.2.3-beta",
+    "1.2.4",
+    "beta",
+    "False",
+]
+
+SEGMENT_VALUES = [
+    None,
+    "",
+    "0",
+    "1",
+    "10",
+    "1.5",
+    "true",
+    "False",
+    "abc",
+    "a,abc,1",
+    "1.2.3:semver",
+    "1.2.3-beta:semver",
+    "beta:semver",
+    "2|0",
+    "0.5|0.5",
+    "x|1",
+    "[a-z]+",
+    "^1\\.",
+    "50",
+]
+
+OPERATORS = [
+    constants.EQUAL,
+    constants.NOT_EQUAL,
+    constants.GREATER_THAN,
+    constants.GREATER_THAN_INCLUSIVE,
+    constants.LESS_THAN,
+    constants.LESS_THAN_INCLUSIVE,
+    constants.CONTAINS,
+    constants.NOT_CONTAINS,
+    constants.REGEX,
+    constants.MODULO,
+    constants.IN,
+    constants.IS_SET,
+    constants.IS_NOT_SET,
+]
+
+
+def _to_engine_rule(rule: RuleSignature) -> SegmentRuleModel:
+    rule_type, conditions, sub_rules = rule
+    return SegmentRuleModel(
+        type=rule_type,
+        conditions=[
+            SegmentConditionModel(operator=operator, property_=property_, value=value)
+            for operator, property_, value in conditions
+        ],
+        rules=[_to_engine_rule(sub_rule) for sub_rule in sub_rules],
+    )
+
+
+def _assert_matches_engine(
+    segment_id: int,
+    rules: tuple[RuleSignature, ...],
+    traits: list[TraitModel],
+    identity: IdentityModel = IDENTITY,
+) -> None:
+    engine_segment = SegmentModel(
+        id=segment_id,
+        name="segment",
+        rules=[_to_engine_rule(rule) for rule in rules],
+    )
+    compiled_segment = _compile_segment(segment_id, rules)
+
+    assert compiled_segment.evaluate(
+        get_trait_values_by_key(traits),
+        identity.django_id or identity.composite_key,
+    ) is evaluate_identity_in_segment(identity, engine_segment, traits)
+
+
+@pytest.mark.parametrize("operator", OPERATORS)
+@pytest.mark.parametrize("segment_value", SEGMENT_VALUES)
+def test_compiled_segment_matches_engine_for_condition(
+    operator: str,
+    segment_value: str | None,
+) -> None:
+    # Given
+    rules = ((constants.ALL_RULE, ((operator, "foo", segment_value),), ()),)
+
+    for trait_value in TRAIT_VALUES:
+        # When / Then
+        _assert_matches_engine(
+            1, rules, [TraitModel(trait_key="foo", trait_value=trait_value)]
+        )
+
+    _assert_matches_engine(1, rules, [])
+
+
+@pytest.mark.parametrize("identity", [IDENTITY, TRANSIENT_IDENTITY])
+@pytest.mark.parametrize("percentage", ["0", "10.5", "50", "100"])
+@pytest.mark.parametrize("segment_id", [1, 2, 3])
+def test_compiled_segment_matches_engine_for_percentage_split(
+    identity: IdentityModel,
+    percentage: str,
+    segment_id: int,
+) -> None:
+    # Given
+    rules = (
+        (
+            constants.ALL_RULE,
+            ((constants.PERCENTAGE_SPLIT, None, percentage),),
+            (),
+        ),
+    )
+
+    # When / Then
+    _assert_matches_engine(segment_id, rules, [], identity=identity)
+
+
+@pytest.mark.parametrize(
+    "rule_type", [constants.ALL_RULE, constants.ANY_RULE, constants.NONE_RULE]
+)
+def test_compiled_segment_matches_engine_for_rule_types(rule_type: str) -> None:
+    # Given
+    conditions = (
+        (constants.EQUAL, "foo", "bar"),
+        (constants.IS_SET, "baz", None),
+    )
+    sub_rule = (constants.ALL_RULE, ((constants.EQUAL, "baz", "1"),), ())
+    rules = ((rule_type, conditions, (sub_rule,)),)
+
+    for traits in (
+        [],
+        [TraitModel(trait_key="foo", trait_value="bar")],
+        [TraitModel(trait_key="baz", trait_value=1)],
+        [
+            TraitModel(trait_key="foo", trait_value="bar"),
+            TraitModel(trait_key="baz", trait_value=1),
+        ],
+    ):
+        # When / Then
+        _assert_matches_engine(1, rules, traits)
+
+
+def test_compiled_segment_without_rules_does_not_match() -> None:
+    # When / Then
+    _assert_matches_engine(1, (), [])
+
+
+def test_compiled_segment_uses_first_trait_with_key() -> None:
+    # Given
+    rules = ((constants.ALL_RULE, ((constants.EQUAL, "foo", "bar"),), ()),)
+
+    # When / Then
+    _assert_matches_engine(
+        1,
+        rules,
+        [
+            TraitModel(trait_key="foo", trait_value="bar"),
+            TraitModel(trait_key="foo", trait_value="baz"),
+        ],
+    )
+
+
+def test_compiled_segment_raises_for_invalid_regex_like_engine() -> None:
+    # Given
+    rules = ((constants.ANY_RULE, ((constants.REGEX, "foo", "("),), ()),)
+    compiled_segment = _compile_segment(1, rules)
+
+    # When / Then
+    with pytest.raises(Exception) as engine_exc_info:
+        evaluate_identity_in_segment(
+            IDENTITY,
+            SegmentModel(id=1, name="segment", rules=[_to_engine_rule(rules[0])]),
+            [TraitModel(trait_key="foo", trait_value="bar")],
+        )
+    with pytest.raises(engine_exc_info.type):
+        compiled_segment.evaluate({"foo": "bar"}, 1)
+
+
+def test_get_compiled_segment_returns_cached_program(segment: Segment) -> None:
+    # Given
+    rule = SegmentRule.objects.create(segment=segment, type=SegmentRule.ALL_RULE)
+    Condition.objects.create(
+        rule=rule, property="foo", operator=constants.EQUAL, value="bar"
+    )
+
+    # When
+    first = get_compiled_segment(segment)
+    second = get_compiled_segment(Segment.objects.get(id=segment.id))
+
+    # Then
+    assert first is second
+    assert first.evaluate({"foo": "bar"}, 1) is True
+
+
+def test_get_compiled_segment_recompiles_when_condition_changes(
+    segment: Segment,
+) -> None:
+    # Given
+    rule = SegmentRule.objects.create(segment=segment, type=SegmentRule.ALL_RULE)
+    condition = Condition.objects.create(
+        rule=rule, property="foo", operator=constants.EQUAL, value="bar"
+    )
+    compiled_segment = get_compiled_segment(segment)
+
+    # When
+    condition.value = "baz"
+    condition.save()
+    recompiled_segment = get_compiled_segment(Segment.objects.get(id=segment.id))
+
+    # Then
+    assert recompiled_segment is not compiled_segment
+    assert compiled_segment.evaluate({"foo": "bar"}, 1) is True
+    assert recompiled_segment.evaluate({"foo": "bar"}, 1) is False
+    assert recompiled_segment.evaluate({"foo": "baz"}, 1) is True
+
+
+def test_get_segment_snapshot_compiles_to_the_segments_program(
+    segment: Segment,
+) -> None:
+    # Given
+    rule = SegmentRule.objects.create(segment=segment, type=SegmentRule.ALL_RULE)
+    Condition.objects.create(
+        rule=rule, property="foo", operator=constants.EQUAL, value="bar"
+    )
+
+    # When
+    snapshot = pickle.loads(pickle.dumps(get_segment_snapshot(segment)))
+
+    # Then
+    assert snapshot == SegmentSnapshot(
+        id=segment.id,
+        name=segment.name,
+        description=segment.description,
+        rules=((SegmentRule.ALL_RULE, ((constants.EQUAL, "foo", "bar"),), ()),),
+    )
+    assert get_compiled_segment(snapshot) is get_compiled_segment(segment)
@@ -1,24 +1,22 @@
+import itertools
+
+import pytest
+
 from environments.identities.models import Identity
 from environments.identities.traits.models import Trait
-from util.queryset import iterator_with_prefetch
+from util.queryset import iter_chunks_with_prefetch
 
 
-def test_iterator_with_prefetch_adds_order_by_to_queryset_if_not_present(
-    mocker, identity
-):
+def test_iter_chunks_with_prefetch_ordered_queryset_raises(environment):
     # Given
-    queryset = Identity.objects.all()
-    mocked_paginator = mocker.patch("util.queryset.Paginator")
-
-    # When
-    list(iterator_with_prefetch(queryset, chunk_size=1))
+    queryset = Identity.objects.filter(environment=environment).order_by("-identifier")
 
-    # Then
-    args, _ = mocked_paginator.call_args
-    assert args[0].query.order_by == ("pk",)
+    # When / Then
+    with pytest.raises(ValueError):
+        next(iter_chunks_with_prefetch(queryset, chunk_size=2))
 
 
-def test_iterator_with_prefetch_make_correct_number_of_queries(
+def test_iter_chunks_with_prefetch_make_correct_number_of_queries(
     mocker, environment, django_assert_num_queries
 ):
     # Given
@@ -35,15 +33,36 @@ def test_iterator_with_prefetch_make_correct_number_of_queries(
         .prefetch_related("identity_traits")
     )
     # When
-    iterator = iterator_with_prefetch(queryset, chunk_size=10)
+    chunks = iter_chunks_with_prefetch(queryset, chunk_size=10)
 
     # Then, test, that we only make 5 queries
-    # first one to fetch the count
-    # second one to fetch first page of identities
-    # third one to fetch traits for the first page of identities
-    # fourth one to fetch identities for the second page
-    # and the last one to fetch traits for the last page of identities
+    # first one to fetch first page of identities
+    # second one to fetch traits for the first page of identities
+    # third one to fetch identities for the second page
+    # fourth one to fetch traits for the second page of identities
+    # and the last one to find that there are no more identities
     with django_assert_num_queries(5):
-        for identity in iterator:
+        for identity in itertools.chain.from_iterable(chunks):
             assert identity.environment.name
             assert identity.identity_traits.all().first().trait_key
+
+
+def test_iter_chunks_with_prefetch_fetches_chunks_after_the_last_pk(
+    environment, django_assert_num_queries
+):
+    # Given
+    identities = [
+        Identity.objects.create(identifier=f"test_user_{i}", environment=environment)
+        for i in range(5)
+    ]
+    queryset = Identity.objects.filter(environment=environment)
+
+    # When
+    with django_assert_num_queries(3) as captured:
+        chunks = list(iter_chunks_with_prefetch(queryset, chunk_size=2))
+
+    # Then
+    assert chunks == [identities[:2], identities[2:4], identities[4:]]
+
+    # and no offsets were used
+    assert not any("OFFSET" in query["sql"] for query in captured.captured_queries)
@@ -1,6 +1,8 @@
 import hashlib
 import hmac
 import json
+import threading
+import time
 from typing import Type
 from unittest import mock
 from unittest.mock import MagicMock
@@ -25,11 +27,12 @@ from webhooks.webhooks import (
     call_integration_webhook,
     call_organisation_webhooks,
     call_webhook_with_failure_mail_after_retries,
+    deliver_webhooks,
     trigger_sample_webhook,
 )
 
 
-@mock.patch("webhooks.webhooks.requests")
+@mock.patch("webhooks.webhooks.webhook_session")
 def test_webhooks_requests_made_to_all_urls_for_environment(
     mock_requests: MagicMock,
     environment: Environment,
@@ -59,7 +62,7 @@ def test_webhooks_requests_made_to_all_urls_for_environment(
     assert all(str(webhook.url) in all_call_args for webhook in (webhook_1, webhook_2))
 
 
-@mock.patch("webhooks.webhooks.requests")
+@mock.patch("webhooks.webhooks.webhook_session")
 def test_webhooks_request_not_made_to_disabled_webhook(
     mock_requests: MagicMock,
     environment: Environment,
@@ -80,7 +83,7 @@ def test_webhooks_request_not_made_to_disabled_webhook(
     mock_requests.post.assert_not_called()
 
 
-@mock.patch("webhooks.webhooks.requests")
+@mock.patch("webhooks.webhooks.webhook_session")
 def test_trigger_sample_webhook_makes_correct_post_request_for_environment(
     mock_request: MagicMock,
 ) -> None:
@@ -92,7 +95,7 @@ def test_trigger_sample_webhook_makes_correct_post_request_for_environment(
     assert args[0] == url
 
 
-@mock.patch("webhooks.webhooks.requests")
+@mock.patch("webhooks.webhooks.webhook_session")
 def test_trigger_sample_webhook_makes_correct_post_request_for_organisation(
     mock_request: MagicMock,
 ) -> None:
@@ -106,7 +109,7 @@ def test_trigger_sample_webhook_makes_correct_post_request_for_organisation(
 
 
 @mock.patch("webhooks.webhooks.WebhookSerializer")
-@mock.patch("webhooks.webhooks.requests")
+@mock.patch("webhooks.webhooks.webhook_session")
 def test_request_made_with_correct_signature(
     mock_requests: MagicMock,
     webhook_serializer: MagicMock,
@@ -141,7 +144,7 @@ def test_request_made_with_correct_signature(
     assert hmac.compare_digest(expected_signature, received_signature) is True
 
 
-@mock.patch("webhooks.webhooks.requests")
+@mock.patch("webhooks.webhooks.webhook_session")
 def test_request_does_not_have_signature_header_if_secret_is_not_set(
     mock_requests: MagicMock,
     environment: Environment,
@@ -170,7 +173,7 @@ def test_call_environment_webhooks__multiple_webhooks__failure__calls_expected(
     environment: Environment,
 ) -> None:
     # Given
-    requests_post_mock = mocker.patch("webhooks.webhooks.requests.post")
+    requests_post_mock = mocker.patch("webhooks.webhooks.webhook_session.post")
     requests_post_mock.side_effect = expected_error()
     send_failure_email_mock: mock.Mock = mocker.patch(
         "webhooks.webhooks.send_failure_email"
@@ -235,7 +238,7 @@ def test_call_organisation_webhooks__multiple_webhooks__failure__calls_expected(
     settings: SettingsWrapper,
 ) -> None:
     # Given
-    requests_post_mock = mocker.patch("webhooks.webhooks.requests.post")
+    requests_post_mock = mocker.patch("webhooks.webhooks.webhook_session.post")
     requests_post_mock.side_effect = expected_error()
     send_failure_email_mock: mock.Mock = mocker.patch(
         "webhooks.webhooks.send_failure_email"
@@ -298,7 +301,7 @@ def test_call_webhook_with_failure_mail_after_retries_does_not_retry_if_not_usin
     mocker: MockerFixture, organisation: Organisation, settings: SettingsWrapper
 ):
     # Given
-    requests_post_mock = mocker.patch("webhooks.webhooks.requests.post")
+    requests_post_mock = mocker.patch("webhooks.webhooks.webhook_session.post")
     requests_post_mock.side_effect = ConnectionError
     send_failure_email_mock: mock.Mock = mocker.patch(
         "webhooks.webhooks.send_failure_email"
@@ -345,3 +348,74 @@ def test_call_integration_webhook_does_not_raise_error_on_backoff_give_up(
     # we don't get a result from the function (as expected), and no exception is
     # raised
     assert result is None
+
+
+def test_deliver_webhooks__one_delivery_fails__retries_failed_delivery_only(
+    mocker: MockerFixture,
+) -> None:
+    # Given
+    def post(url: str, **kwargs: object) -> MagicMock:
+        if url == "http://url.2.com":
+            raise ConnectionError()
+        return MagicMock()
+
+    requests_post_mock = mocker.patch(
+        "webhooks.webhooks.webhook_session.post", side_effect=post
+    )
+    send_failure_email_mock = mocker.patch("webhooks.webhooks.send_failure_email")
+
+    deliveries = [
+        {"webhook_id": 1, "url": "http://url.1.com", "signature": None},
+        {"webhook_id": 2, "url": "http://url.2.com", "signature": "signature"},
+    ]
+
+    # When
+    deliver_webhooks(
+        deliveries,
+        data={},
+        webhook_type=WebhookType.ENVIRONMENT.value,
+        max_retries=3,
+    )
+
+    # Then
+    urls = [call.args[0] for call in requests_post_mock.call_args_list]
+    assert sorted(urls) == ["http://url.1.com"] + ["http://url.2.com"] * 3
+    retried_call = requests_post_mock.call_args_list[-1]
+    assert retried_call.kwargs["headers"][FLAGSMITH_SIGNATURE_HEADER] == "signature"
+    send_failure_email_mock.assert_not_called()
+
+
+def test_deliver_webhooks__many_deliveries_to_host__limits_concurrent_requests(
+    mocker: MockerFixture,
+    settings: SettingsWrapper,
+) -> None:
+    # Given
+    settings.WEBHOOK_MAX_CONCURRENCY_PER_HOST = 2
+    lock = threading.Lock()
+    in_flight = 0
+    max_in_flight = 0
+
+    def post(url: str, **kwargs: object) -> MagicMock:
+        nonlocal in_flight, max_in_flight
+        with lock:
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+        time.sleep(0.05)
+        with lock:
+            in_flight -= 1
+        return MagicMock()
+
+    requests_post_mock = mocker.patch(
+        "webhooks.webhooks.webhook_session.post", side_effect=post
+    )
+    deliveries = [
+        {"webhook_id": i, "url": f"http://concurrency.test/{i}", "signature": None}
+        for i in range(6)
+    ]
+
+    # When
+    deliver_webhooks(deliveries, data={}, webhook_type=WebhookType.ENVIRONMENT.value)
+
+    # Then
+    assert requests_post_mock.call_count == 6
+    assert max_in_flight == 2
@@ -2,6 +2,7 @@ from util.mappers.dynamodb import (
     map_engine_feature_state_to_identity_override,
     map_engine_identity_to_identity_document,
     map_environment_api_key_to_environment_api_key_document,
+    map_environment_document_to_environment_v2_document,
     map_environment_to_environment_document,
     map_environment_to_environment_v2_document,
     map_identity_changeset_to_identity_override_changeset,
@@ -20,6 +21,7 @@ __all__ = (
     "map_engine_feature_state_to_identity_override",
     "map_engine_identity_to_identity_document",
     "map_environment_api_key_to_environment_api_key_document",
+    "map_environment_document_to_environment_v2_document",
     "map_environment_to_environment_document",
     "map_environment_to_environment_v2_document",
     "map_environment_to_sdk_document",
@@ -31,7 +31,9 @@ if TYPE_CHECKING:
 
 __all__ = (
     "map_engine_identity_to_identity_document",
+    "map_engine_value_to_document_value",
     "map_environment_api_key_to_environment_api_key_document",
+    "map_environment_document_to_environment_v2_document",
     "map_environment_to_environment_document",
     "map_environment_to_environment_v2_document",
     "map_identity_to_identity_document",
@@ -55,16 +57,32 @@ def map_environment_to_environment_document(
     }
 
 
+def map_engine_value_to_document_value(value: Any) -> DocumentValue:
+    """
+    Map a value from an engine model, e.g. a feature state model, to the value it
+    has in the environment documents, see `map_environment_to_environment_document`.
+    """
+    return _map_value_to_document_value(value)
+
+
 def map_environment_to_environment_v2_document(
     environment: "Environment",
 ) -> Document:
-    environment_document = map_environment_to_environment_document(environment)
-    environment_api_key = environment_document.pop("api_key")
+    return map_environment_document_to_environment_v2_document(
+        map_environment_to_environment_document(environment),
+    )
+
+
+def map_environment_document_to_environment_v2_document(
+    environment_document: Document,
+) -> Document:
+    environment_v2_document = dict(environment_document)
+    environment_api_key = environment_v2_document.pop("api_key")
     return {
-        **environment_document,
+        **environment_v2_document,
         "document_key": ENVIRONMENTS_V2_ENVIRONMENT_META_DOCUMENT_KEY,
         "environment_api_key": environment_api_key,
-        "environment_id": str(environment.id),
+        "environment_id": str(environment_document["id"]),
     }
 
 
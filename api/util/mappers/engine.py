@@ -3,6 +3,7 @@ from itertools import chain
 from typing import TYPE_CHECKING, Dict, List, Optional
 from uuid import UUID
 
+from core.server_timing import timed_stage
 from flag_engine.environments.integrations.models import IntegrationModel
 from flag_engine.environments.models import (
     EnvironmentAPIKeyModel,
@@ -177,6 +178,7 @@ def map_mv_option_to_engine(
     return MultivariateFeatureOptionModel(value=mv_option.value, id=mv_option.id)
 
 
+@timed_stage("map_environment_to_engine")
 def map_environment_to_engine(
     environment: "Environment",
     *,
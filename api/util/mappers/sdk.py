@@ -1,5 +1,7 @@
 from typing import TYPE_CHECKING, TypeAlias
 
+from core.server_timing import timed_stage
+
 from environments.constants import IDENTITY_INTEGRATIONS_RELATION_NAMES
 from util.mappers.engine import (
     map_environment_to_engine,
@@ -19,6 +21,7 @@ SDK_DOCUMENT_EXCLUDE = [
 ]
 
 
+@timed_stage("map_environment_to_sdk_document")
 def map_environment_to_sdk_document(environment: "Environment") -> SDKDocument:
     """
     Map an `environments.models.Environment` instance to an SDK document
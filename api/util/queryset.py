@@ -1,16 +1,38 @@
-from django.core.paginator import Paginator
+import typing
 
+from django.db.models import Model, QuerySet
 
-def iterator_with_prefetch(queryset, chunk_size=2000):
+ModelType = typing.TypeVar("ModelType", bound=Model)
+
+
+def iter_chunks_with_prefetch(
+    queryset: QuerySet[ModelType], chunk_size: int = 2000
+) -> typing.Generator[list[ModelType], None, None]:
     """
-    Since queryset.iterator() does not support prefetch_related.
-    Using Paginator() we can mimic the (somewhat)same behavior
-    https://docs.djangoproject.com/en/3.2/ref/models/querysets/#iterator
+    Iterate over the queryset in chunks, in order of primary key, running its
+    prefetch lookups for each chunk.
+
+    Each chunk is fetched with a `pk > last_pk` filter rather than an offset,
+    so fetching a chunk takes the same time wherever it is in the queryset.
+    Since that relies on the order of primary key, the queryset mustn't be
+    ordered explicitly.
     """
-    if not queryset.query.order_by:
-        # Paginator() throws a warning if there is no sorting attached to the queryset
-        queryset = queryset.order_by("pk")
+    if queryset.query.order_by:
+        raise ValueError(
+            "Can't iterate in chunks over a queryset ordered by %s."
+            % ", ".join(queryset.query.order_by)
+        )
 
-    paginator = Paginator(queryset, chunk_size)
-    for index in range(paginator.num_pages):
-        yield from paginator.get_page(index + 1)
+    queryset = queryset.order_by("pk")
+    last_pk = None
+    while True:
+        chunk_queryset = (
+            queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        )
+        chunk = list(chunk_queryset[:chunk_size])
+        if not chunk:
+            return
+        yield chunk
+        if len(chunk) < chunk_size:
+            return
+        last_pk = chunk[-1].pk
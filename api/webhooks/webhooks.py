@@ -1,8 +1,15 @@
 import enum
 import json
 import logging
+import threading
+import time
 import typing
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from http.cookiejar import DefaultCookiePolicy
 from typing import Type, Union
+from urllib.parse import urlsplit
 
 import backoff
 import requests
@@ -13,6 +20,7 @@ from django.core.mail import EmailMultiAlternatives
 from django.core.serializers.json import DjangoJSONEncoder
 from django.template.loader import get_template
 from django.utils import timezone
+from requests.adapters import HTTPAdapter
 from task_processor.decorators import register_task_handler
 from task_processor.task_run_method import TaskRunMethod
 
@@ -33,6 +41,8 @@ if typing.TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 WebhookModels = typing.Union[OrganisationWebhook, Webhook]
 
+WEBHOOK_TIMEOUT_SECONDS = 10
+
 
 class WebhookEventType(enum.Enum):
     FLAG_UPDATED = "FLAG_UPDATED"
@@ -52,6 +62,43 @@ WEBHOOK_SAMPLE_DATA = {
 }
 
 
+@dataclass(frozen=True)
+class WebhookDelivery:
+    """
+    A request to make to a webhook, with everything needed to retry it without
+    fetching the webhook again. The signature is stored rather than the secret,
+    since retries are stored as tasks.
+    """
+
+    webhook_id: int
+    url: str
+    signature: str | None = None
+
+
+def _create_webhook_session() -> requests.Session:
+    # Webhooks are called through a shared session, so that connections to the
+    # same host are reused. Cookies set by one webhook mustn't be sent to others.
+    session = requests.Session()
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    adapter = HTTPAdapter(
+        pool_connections=settings.WEBHOOK_CONNECTION_POOL_HOSTS,
+        pool_maxsize=settings.WEBHOOK_MAX_CONCURRENCY_PER_HOST,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+webhook_session = _create_webhook_session()
+
+# Limits the requests made to each host at once, across all the deliveries in
+# this process.
+_host_semaphores: dict[str, threading.BoundedSemaphore] = defaultdict(
+    lambda: threading.BoundedSemaphore(settings.WEBHOOK_MAX_CONCURRENCY_PER_HOST)
+)
+_host_semaphores_lock = threading.Lock()
+
+
 def get_webhook_model(
     webhook_type: WebhookType,
 ) -> Type[Union[OrganisationWebhook, Webhook]]:
@@ -157,8 +204,11 @@ def _call_webhook(
         headers.update({FLAGSMITH_SIGNATURE_HEADER: signature})
 
     try:
-        res = requests.post(
-            str(webhook.url), data=json_data, headers=headers, timeout=10
+        res = webhook_session.post(
+            str(webhook.url),
+            data=json_data,
+            headers=headers,
+            timeout=WEBHOOK_TIMEOUT_SECONDS,
         )
         res.raise_for_status()
         return res
@@ -203,8 +253,11 @@ def call_webhook_with_failure_mail_after_retries(
         headers.update({FLAGSMITH_SIGNATURE_HEADER: signature})
 
     try:
-        res = requests.post(
-            str(webhook.url), data=json_data, headers=headers, timeout=10
+        res = webhook_session.post(
+            str(webhook.url),
+            data=json_data,
+            headers=headers,
+            timeout=WEBHOOK_TIMEOUT_SECONDS,
         )
         res.raise_for_status()
     except requests.exceptions.RequestException as exc:
@@ -214,7 +267,7 @@ def call_webhook_with_failure_mail_after_retries(
                     webhook,
                     data,
                     webhook_type,
-                    f"{f'HTTP {exc.response.status_code}' if exc.response else 'N/A'} ({exc.__class__.__name__})",
+                    _get_failure_status(exc),
                 )
         else:
             call_webhook_with_failure_mail_after_retries.delay(
@@ -239,6 +292,140 @@ def call_webhook_with_failure_mail_after_retries(
     return res
 
 
+@register_task_handler()
+def deliver_webhooks(
+    deliveries: list[dict[str, typing.Any]],
+    data: typing.Mapping,
+    webhook_type: str,
+    send_failure_mail: bool = False,
+    max_retries: int = settings.WEBHOOK_BACKOFF_RETRIES,
+    try_count: int = 1,
+):
+    """
+    Deliver the same event to many webhooks concurrently, retrying the failed
+    deliveries together.
+
+    :param deliveries: The deliveries to make, as `WebhookDelivery` dicts.
+    :param data: A mapping containing the data to be sent in the webhook requests.
+    :param webhook_type: The type of the webhooks to be triggered.
+    :param send_failure_mail: Whether to send a failure notification email (bool, default is False).
+    :param max_retries: The maximum number of retries to attempt (int, default is 3).
+    :param try_count: Stores the current retry attempt count in scheduled tasks,
+                        not needed to be specified (int, default is 1).
+    """
+    json_data = json.dumps(data, sort_keys=True, cls=DjangoJSONEncoder)
+    errors = _post_webhook_deliveries(
+        [WebhookDelivery(**delivery) for delivery in deliveries], json_data
+    )
+    if not errors:
+        return
+
+    if try_count < max_retries and settings.RETRY_WEBHOOKS:
+        deliver_webhooks.delay(
+            delay_until=(
+                timezone.now()
+                + timezone.timedelta(seconds=settings.WEBHOOK_BACKOFF_BASE**try_count)
+                if settings.TASK_RUN_METHOD == TaskRunMethod.TASK_PROCESSOR
+                else None
+            ),
+            args=(
+                [asdict(delivery) for delivery in errors],
+                data,
+                webhook_type,
+                send_failure_mail,
+                max_retries,
+                try_count + 1,
+            ),
+        )
+    elif send_failure_mail:
+        # the webhooks are only fetched once the deliveries have given up
+        webhook_model = get_webhook_model(WebhookType(webhook_type))
+        webhooks = webhook_model.objects.in_bulk(
+            [delivery.webhook_id for delivery in errors]
+        )
+        for delivery, exc in errors.items():
+            if webhook := webhooks.get(delivery.webhook_id):
+                send_failure_email(
+                    webhook, data, webhook_type, _get_failure_status(exc)
+                )
+
+
+def _post_webhook_deliveries(
+    deliveries: list[WebhookDelivery], json_data: str
+) -> dict[WebhookDelivery, requests.exceptions.RequestException]:
+    # Post the payload to each webhook concurrently, logging the latency of the
+    # deliveries, and return the errors of the ones that failed.
+    if not deliveries:
+        return {}
+
+    started_at = time.perf_counter()
+    with ThreadPoolExecutor(
+        max_workers=min(settings.WEBHOOK_DELIVERY_MAX_WORKERS, len(deliveries))
+    ) as executor:
+        results = list(
+            executor.map(
+                lambda delivery: _post_webhook_delivery(delivery, json_data),
+                deliveries,
+            )
+        )
+
+    errors = {
+        delivery: exc
+        for delivery, (exc, _) in zip(deliveries, results)
+        if exc is not None
+    }
+    logger.info(
+        "Delivered %d of %d webhooks in %.0fms, slowest %.0fms, %d failed.",
+        len(deliveries) - len(errors),
+        len(deliveries),
+        (time.perf_counter() - started_at) * 1000,
+        max(duration_ms for _, duration_ms in results),
+        len(errors),
+    )
+    return errors
+
+
+def _post_webhook_delivery(
+    delivery: WebhookDelivery, json_data: str
+) -> tuple[requests.exceptions.RequestException | None, float]:
+    # Returns the error, if the delivery failed, and its duration in ms.
+    headers = {"content-type": "application/json"}
+    if delivery.signature:
+        headers[FLAGSMITH_SIGNATURE_HEADER] = delivery.signature
+
+    host = urlsplit(delivery.url).netloc
+    with _host_semaphores_lock:
+        semaphore = _host_semaphores[host]
+
+    with semaphore:
+        started_at = time.perf_counter()
+        try:
+            res = webhook_session.post(
+                delivery.url,
+                data=json_data,
+                headers=headers,
+                timeout=WEBHOOK_TIMEOUT_SECONDS,
+            )
+            res.raise_for_status()
+            exc = None
+        except requests.exceptions.RequestException as e:
+            exc = e
+        duration_ms = (time.perf_counter() - started_at) * 1000
+
+    if exc is not None:
+        logger.warning(
+            "Webhook %d failed after %.0fms: %s",
+            delivery.webhook_id,
+            duration_ms,
+            _get_failure_status(exc),
+        )
+    return exc, duration_ms
+
+
+def _get_failure_status(exc: requests.exceptions.RequestException) -> str:
+    return f"{f'HTTP {exc.response.status_code}' if exc.response else 'N/A'} ({exc.__class__.__name__})"
+
+
 def _call_webhooks(
     webhooks: typing.Iterable[WebhookModels],
     data: typing.Mapping,
@@ -249,9 +436,24 @@ def _call_webhooks(
     webhook_data = {"event_type": event_type, "data": data}
     serializer = WebhookSerializer(data=webhook_data)
     serializer.is_valid(raise_exception=False)
-    for webhook in webhooks:
-        call_webhook_with_failure_mail_after_retries.delay(
-            args=(webhook.id, serializer.data, webhook_type.value, True, retries)
+    json_data = json.dumps(serializer.data, sort_keys=True, cls=DjangoJSONEncoder)
+    deliveries = [
+        WebhookDelivery(
+            webhook_id=webhook.id,
+            url=str(webhook.url),
+            signature=(
+                sign_payload(json_data, key=webhook.secret) if webhook.secret else None
+            ),
+        )
+        for webhook in webhooks
+    ]
+    if deliveries:
+        deliver_webhooks(
+            [asdict(delivery) for delivery in deliveries],
+            serializer.data,
+            webhook_type.value,
+            True,
+            retries,
         )
 
 